@@ -1,7 +1,23 @@
 from ._global import AUTHOR_EMAIL  # noqa: F401
 from .base import BaseHypergraphDB  # noqa: F401
-from .hypergraph import HypergraphDB  # noqa: F401
+from .frozen import CSRIncidence, FrozenHypergraph  # noqa: F401
+from .hypergraph import HypergraphDB, HypergraphSnapshot  # noqa: F401
+from .matrix import COOMatrix  # noqa: F401
+from .parallel import SharedHypergraph  # noqa: F401
+from .sharded import ShardedHypergraphDB  # noqa: F401
+from .view import HypergraphView  # noqa: F401
 
 __version__ = "0.4.0-dev"
 
-__all__ = ["AUTHOR_EMAIL", "BaseHypergraphDB", "HypergraphDB"]
+__all__ = [
+    "AUTHOR_EMAIL",
+    "BaseHypergraphDB",
+    "COOMatrix",
+    "CSRIncidence",
+    "FrozenHypergraph",
+    "HypergraphDB",
+    "HypergraphSnapshot",
+    "HypergraphView",
+    "ShardedHypergraphDB",
+    "SharedHypergraph",
+]
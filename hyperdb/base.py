@@ -1,7 +1,36 @@
 from dataclasses import dataclass, field
-from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:
+    from .parallel import SharedHypergraph
+
+
+def _require_numpy(caller: str):
+    r"""
+    Import and return ``numpy``, with an install hint if it is missing.
+
+    Args:
+        ``caller`` (``str``): The name of the function that needs it, for the error message.
+    """
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError(f"{caller} requires numpy: pip install numpy") from e
+    return np
 
 
 @dataclass
@@ -59,10 +88,18 @@ class BaseHypergraphDB:
 
     def _clear_cache(self):
         r"""
-        Clear the cache.
+        Invalidate anything derived from the hypergraph after a mutation.
         """
         raise NotImplementedError
 
+    @property
+    def version(self) -> int:
+        r"""
+        Return the mutation version, increased by every change of the hypergraph. Hypergraphs that never change
+        stay at 0.
+        """
+        return 0
+
     def v(self, v_id: Any, default: Any = None) -> dict:
         r"""
         Return the vertex data.
@@ -92,28 +129,28 @@ class BaseHypergraphDB:
         """
         raise NotImplementedError
 
-    @cached_property
-    def all_v(self) -> Set[Any]:
+    @property
+    def all_v(self) -> AbstractSet[Any]:
         r"""
-        Return a set of all vertices in the hypergraph.
+        Return a read-only set-like view of all vertices in the hypergraph.
         """
         raise NotImplementedError
 
-    @cached_property
-    def all_e(self) -> Set[Tuple]:
+    @property
+    def all_e(self) -> AbstractSet[Tuple]:
         r"""
-        Return a set of all hyperedges in the hypergraph.
+        Return a read-only set-like view of all hyperedges in the hypergraph.
         """
         raise NotImplementedError
 
-    @cached_property
+    @property
     def num_v(self) -> int:
         r"""
         Return the number of vertices in the hypergraph.
         """
         raise NotImplementedError
 
-    @cached_property
+    @property
     def num_e(self) -> int:
         r"""
         Return the number of hyperedges in the hypergraph.
@@ -214,21 +251,23 @@ class BaseHypergraphDB:
         """
         raise NotImplementedError
 
-    def nbr_e_of_v(self, v_id: Any) -> set:
+    def nbr_e_of_v(self, v_id: Any, copy: bool = True) -> AbstractSet[Tuple]:
         r"""
         Return the hyperedge neighbors of the vertex.
 
         Args:
             ``v_id`` (``Any``): The vertex id.
+            ``copy`` (``bool``): Whether to return a new set, or a read-only view over the stored incidence.
         """
         raise NotImplementedError
 
-    def nbr_v_of_e(self, e_tuple: Tuple) -> set:
+    def nbr_v_of_e(self, e_tuple: Tuple, copy: bool = True) -> Union[set, Tuple]:
         r"""
         Return the vertex neighbors of the hyperedge.
 
         Args:
             ``e_tuple`` (``Tuple``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+            ``copy`` (``bool``): Whether to return a new set, or the stored hyperedge tuple itself.
         """
         raise NotImplementedError
 
@@ -242,6 +281,86 @@ class BaseHypergraphDB:
         """
         raise NotImplementedError
 
+    def iter_nbr_v(self, v_id: Any, exclude_self: bool = True) -> Iterator[Any]:
+        r"""
+        Lazily iterate over the vertex neighbors of the vertex, each yielded once.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``exclude_self`` (``bool``): Whether to exclude the vertex itself from neighbors.
+        """
+        raise NotImplementedError
+
+    def degree_v_many(self, v_ids: Iterable[Any], as_numpy: bool = False) -> Union[List[int], Any]:
+        r"""
+        Return the degrees of many vertices at once.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+            ``as_numpy`` (``bool``): Whether to return a NumPy ``int64`` array instead of a list.
+        """
+        raise NotImplementedError
+
+    def nbr_e_of_v_many(self, v_ids: Iterable[Any]) -> List[set]:
+        r"""
+        Return the hyperedge neighbors of many vertices at once.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+        """
+        raise NotImplementedError
+
+    def nbr_v_many(self, v_ids: Iterable[Any], exclude_self: bool = True) -> List[set]:
+        r"""
+        Return the vertex neighbors of many vertices at once.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+            ``exclude_self`` (``bool``): Whether to exclude each vertex itself from its neighbors.
+        """
+        raise NotImplementedError
+
+    def bfs(self, v_id: Any, max_depth: Optional[int] = None) -> Iterator[Tuple[Any, int]]:
+        r"""
+        Lazily iterate over the vertices reachable from the vertex in breadth-first order, each yielded once
+        with its number of hops from the vertex (the vertex itself first, with 0).
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``max_depth`` (``Optional[int]``): The maximum number of hops, ``None`` for no limit.
+        """
+        raise NotImplementedError
+
+    def shortest_path(self, src_v_id: Any, dst_v_id: Any) -> Optional[List[Any]]:
+        r"""
+        Return a path with the fewest hyperedges between two vertices, as the list of vertex ids and hyperedge
+        tuples alternating from ``src_v_id`` to ``dst_v_id``, or ``None`` if there is none.
+
+        Args:
+            ``src_v_id`` (``Any``): The source vertex id.
+            ``dst_v_id`` (``Any``): The target vertex id.
+        """
+        raise NotImplementedError
+
+    def connected_components(self) -> Iterator[Set[Any]]:
+        r"""
+        Iterate over the connected components of the hypergraph, as sets of vertex ids. Isolated vertices form
+        components of their own.
+        """
+        raise NotImplementedError
+
+    def s_connected_components(self, s: int = 1, return_singletons: bool = False) -> Iterator[Set[Tuple]]:
+        r"""
+        Iterate over the s-connected components of the hypergraph, as sets of hyperedge tuples. Two hyperedges
+        are s-adjacent when they share at least ``s`` vertices, and s-connected when a chain of s-adjacent
+        hyperedges joins them.
+
+        Args:
+            ``s`` (``int``): The number of shared vertices. Defaults to ``1``.
+            ``return_singletons`` (``bool``): Whether to include components of a single hyperedge.
+        """
+        raise NotImplementedError
+
     def sub(self, v_name_list: List[str]):
         r"""
         Return the sub-hypergraph.
@@ -249,6 +368,24 @@ class BaseHypergraphDB:
         Args:
             ``v_name_list`` (``List[str]``): The list of vertex ids.
         """
+        return self.subgraph(v_name_list)
+
+    def subgraph(self, v_ids: Iterable[Any]) -> "BaseHypergraphDB":
+        r"""
+        Return a read-only view of the vertices and the hyperedges whose vertices are all among them.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+        """
+        raise NotImplementedError
+
+    def edge_subgraph(self, e_tuples: Iterable[Union[List, Set, Tuple]]) -> "BaseHypergraphDB":
+        r"""
+        Return a read-only view of the hyperedges and their vertices.
+
+        Args:
+            ``e_tuples`` (``Iterable[Union[List, Set, Tuple]]``): The hyperedge tuples.
+        """
         raise NotImplementedError
 
     def sub_from_v(self, v_id: Any, depth: int):
@@ -259,6 +396,50 @@ class BaseHypergraphDB:
             ``v_id`` (``Any``): The vertex id.
             ``depth`` (``int``): The depth of the sub-hypergraph.
         """
+        return self.k_hop(v_id, depth)
+
+    def k_hop(
+        self,
+        v_id: Any,
+        k: int = 1,
+        max_vertices: Optional[int] = None,
+        max_edges: Optional[int] = None,
+        edge_filter: Optional[Callable[[Tuple, Dict], bool]] = None,
+    ) -> "BaseHypergraphDB":
+        r"""
+        Return the ``k``-hop neighborhood of the vertex as a read-only ``FrozenHypergraph``: the hyperedges
+        reachable from the vertex in at most ``k`` hops and all their vertices. A hop follows a hyperedge from a
+        vertex to the others, so hyperedges between vertices first reached at hop ``k`` are not included.
+
+        The search runs frontier by frontier over the stored incidence and stops at the limits, so the work is
+        bounded by them rather than by the degree of hub vertices. The vertex and hyperedge data dicts are shared
+        with the hypergraph, not copied.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``k`` (``int``): The number of hops. Defaults to ``1``.
+            ``max_vertices`` (``Optional[int]``): The maximum number of vertices, the vertex itself included.
+                Hyperedges are taken with all their vertices, those that do not fit are left out.
+            ``max_edges`` (``Optional[int]``): The maximum number of hyperedges.
+            ``edge_filter`` (``Optional[Callable[[Tuple, Dict], bool]]``): Called with the tuple and data of each
+                hyperedge reached, only the hyperedges it returns ``True`` for are followed.
+        """
+        assert isinstance(k, int) and k >= 0, "The number of hops must be a non-negative integer."
+        assert max_vertices is None or max_vertices >= 1, "max_vertices must be at least 1."
+        assert max_edges is None or max_edges >= 0, "max_edges must be non-negative."
+        return self._k_hop(v_id, k, max_vertices, max_edges, edge_filter)[0]
+
+    def _k_hop(
+        self,
+        v_id: Any,
+        k: int,
+        max_vertices: Optional[int] = None,
+        max_edges: Optional[int] = None,
+        edge_filter: Optional[Callable[[Tuple, Dict], bool]] = None,
+    ) -> Tuple["BaseHypergraphDB", bool]:
+        r"""
+        Return the ``k``-hop neighborhood of the vertex (see ``k_hop``) and whether a limit truncated it.
+        """
         raise NotImplementedError
 
     def query_v(self, filters: Dict[str, Any]) -> List[str]:
@@ -279,6 +460,125 @@ class BaseHypergraphDB:
         """
         raise NotImplementedError
 
+    def create_index(self, target: str, field: Optional[str], kind: str = "hash"):
+        r"""
+        Index the vertices or hyperedges by a field of their data.
+
+        Args:
+            ``target`` (``str``): ``"v"`` to index vertices, ``"e"`` to index hyperedges.
+            ``field`` (``str``): The field of the vertex or hyperedge data.
+            ``kind`` (``str``): ``"hash"`` for lookups by value, ``"sorted"`` for lookups by value and by range, or
+                ``"text"`` for substring search.
+        """
+        raise NotImplementedError
+
+    def find_v(self, **conditions: Any) -> Set[Any]:
+        r"""
+        Return the vertices whose data has all the given field values.
+
+        Args:
+            ``conditions`` (``Any``): The value of each field.
+        """
+        raise NotImplementedError
+
+    def find_e(self, **conditions: Any) -> Set[Tuple]:
+        r"""
+        Return the hyperedges whose data has all the given field values.
+
+        Args:
+            ``conditions`` (``Any``): The value of each field.
+        """
+        raise NotImplementedError
+
+    def range_v(self, field: str, lo: Optional[Any] = None, hi: Optional[Any] = None) -> List[Any]:
+        r"""
+        Return the vertices whose ``field`` is between ``lo`` and ``hi`` (both included), ordered by the field.
+
+        Args:
+            ``field`` (``str``): The field of the vertex data.
+            ``lo`` (``Any``, optional): The lower bound, ``None`` for no bound.
+            ``hi`` (``Any``, optional): The upper bound, ``None`` for no bound.
+        """
+        raise NotImplementedError
+
+    def range_e(self, field: str, lo: Optional[Any] = None, hi: Optional[Any] = None) -> List[Tuple]:
+        r"""
+        Return the hyperedges whose ``field`` is between ``lo`` and ``hi`` (both included), ordered by the field.
+
+        Args:
+            ``field`` (``str``): The field of the hyperedge data.
+            ``lo`` (``Any``, optional): The lower bound, ``None`` for no bound.
+            ``hi`` (``Any``, optional): The upper bound, ``None`` for no bound.
+        """
+        raise NotImplementedError
+
+    def search_v(
+        self, query: str, weights: Optional[Dict[Optional[str], int]] = None, prefix: bool = False
+    ) -> Dict[Any, int]:
+        r"""
+        Search vertices whose id or text fields contain ``query``, ignoring case, and score them.
+
+        This implementation scans all vertices, subclasses with text indexes answer from them.
+
+        Args:
+            ``query`` (``str``): The text to look for, not empty.
+            ``weights`` (``Dict[Optional[str], int]``, optional): The score of a match in each field, ``None``
+                standing for the vertex id. Defaults to ``{None: 1}``, a search of the ids.
+            ``prefix`` (``bool``): Only match values that start with ``query``. Defaults to ``False``.
+
+        Returns:
+            ``Dict[Any, int]``: The matching vertices and the sum of the weights of their matching fields.
+        """
+        assert query, "The query must not be empty."
+        if weights is None:
+            weights = {None: 1}
+        query = query.lower()
+        scores = {}
+        for v_id in self.all_v:
+            v_data = self.v(v_id, {})
+            score = 0
+            for name, weight in weights.items():
+                text = str(v_id) if name is None else v_data.get(name)
+                if isinstance(text, str):
+                    text = text.lower()
+                    if text.startswith(query) if prefix else query in text:
+                        score += weight
+            if score:
+                scores[v_id] = score
+        return scores
+
+    def share(self) -> "SharedHypergraph":
+        r"""
+        Publish a frozen copy of the hypergraph in a shared memory block for worker processes, returning the
+        ``SharedHypergraph`` to run ``map`` on. Close it when done, or use it as a context manager.
+        """
+        raise NotImplementedError
+
+    def parallel_map(
+        self,
+        fn: Callable[[Any, Any], Any],
+        v_ids: Optional[Iterable[Any]] = None,
+        workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        context: Optional[str] = None,
+    ) -> List[Any]:
+        r"""
+        Return ``[fn(graph, v_id) for v_id in v_ids]``, computed by a pool of worker processes that read a frozen
+        copy of the hypergraph published once in shared memory as ``graph``, a ``FrozenHypergraph``.
+
+        Later changes to the hypergraph are not seen by the workers. To map several functions over the same
+        copy, publish it once with ``share()`` and call ``map`` on it.
+
+        Args:
+            ``fn`` (``Callable[[FrozenHypergraph, Any], Any]``): Called with the hypergraph and a vertex id.
+            ``v_ids`` (``Optional[Iterable[Any]]``): The vertex ids, ``None`` for all the vertices.
+            ``workers`` (``Optional[int]``): The number of worker processes, ``None`` for the number of CPUs.
+            ``chunksize`` (``Optional[int]``): The number of vertices per task, ``None`` for four tasks per worker.
+            ``context`` (``Optional[str]``): The ``multiprocessing`` start method, ``None`` for the default.
+        """
+        with self.share() as shared:
+            return shared.map(fn, v_ids, workers, chunksize, context)
+
     def stats(self) -> dict:
         r"""
         Return basic statistics of the hypergraph.
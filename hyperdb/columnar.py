@@ -0,0 +1,377 @@
+import mmap
+import numbers
+import os
+import pickle as pkl
+import struct
+import sys
+from array import array
+from collections.abc import Mapping as MappingABC
+from collections.abc import Sequence as SequenceABC
+from hashlib import blake2b
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple, Union
+
+# Sections of a columnar file, in file order. Each is 8-byte aligned; the header stores the offset and size of each.
+#   v_ptr, v_edges, e_ptr, e_verts: the CSR incidence arrays (native int64)
+#   v_id_off, v_id_blob: pickled vertex ids and their offsets
+#   v_data_off, v_data_blob / e_data_off, e_data_blob: pickled data dicts and their offsets
+#   v_hash, e_hash: open-addressing hash tables (-1 marks an empty slot) mapping vertex ids and sorted hyperedges
+#   to their index, so that lookups by id do not need an in-memory index
+_SECTIONS = (
+    "v_ptr",
+    "v_edges",
+    "e_ptr",
+    "e_verts",
+    "v_id_off",
+    "v_id_blob",
+    "v_data_off",
+    "v_data_blob",
+    "e_data_off",
+    "e_data_blob",
+    "v_hash",
+    "e_hash",
+)
+_MAGIC = b"HGDBCOL2"
+# files written before vertex ids were hashed by value (see ``_v_hash``), whose table hashes the pickled ids
+_MAGIC_V1 = b"HGDBCOL1"
+# magic, a native int64 1 to detect files written on a machine with the other byte order, and a section table
+_HEADER = struct.Struct("<8sq" + "QQ" * len(_SECTIONS))
+_PICKLE_PROTOCOL = 4
+
+
+def _stable_hash(key: bytes) -> int:
+    r"""
+    Return a 63-bit hash of the key that, unlike ``hash()``, is the same in every process.
+
+    Args:
+        ``key`` (``bytes``): The key.
+    """
+    return int.from_bytes(blake2b(key, digest_size=8).digest(), "little") >> 1
+
+
+def _v_key_bytes(v_id: Any) -> bytes:
+    r"""
+    Return the bytes a vertex id is stored by.
+
+    Args:
+        ``v_id`` (``Any``): The vertex id.
+    """
+    hash(v_id)  # unhashable ids raise TypeError like they would with a dict
+    return pkl.dumps(v_id, protocol=_PICKLE_PROTOCOL)
+
+
+def _v_hash_key(v_id: Any) -> bytes:
+    r"""
+    Return bytes that are the same for equal vertex ids, which their pickles are not: ``1``, ``1.0`` and ``True``
+    pickle differently, and so do tuples that share an item and tuples of equal but distinct items. Numbers are
+    encoded by ``hash()``, which is the same for equal numbers and, unlike for strings, in every process. Strings
+    and bytes are encoded as such, and tuples and frozensets by the hashes of their items. Other ids are encoded
+    by their pickle, so equal ids of other types are only found if they pickle the same.
+
+    Args:
+        ``v_id`` (``Any``): The vertex id.
+    """
+    if isinstance(v_id, str):
+        return b"s" + v_id.encode("utf-8", "surrogatepass")
+    if isinstance(v_id, bytes):
+        return b"b" + v_id
+    if isinstance(v_id, numbers.Number):
+        return b"n" + hash(v_id).to_bytes(8, "little", signed=True)
+    if isinstance(v_id, tuple):
+        return b"t" + b"".join(_v_hash(item).to_bytes(8, "little") for item in v_id)
+    if isinstance(v_id, frozenset):
+        # the sum does not depend on the iteration order
+        return b"f" + (sum(map(_v_hash, v_id)) & ((1 << 63) - 1)).to_bytes(8, "little")
+    return b"p" + _v_key_bytes(v_id)
+
+
+def _v_hash(v_id: Any) -> int:
+    r"""
+    Return a 63-bit hash of a vertex id that is the same for equal ids and in every process.
+
+    Args:
+        ``v_id`` (``Any``): The vertex id.
+    """
+    return _stable_hash(_v_hash_key(v_id))
+
+
+def _v_hash_v1(v_id: Any) -> int:
+    r"""
+    Return the hash of a vertex id in files written before ``_v_hash``, the hash of its pickle.
+
+    Args:
+        ``v_id`` (``Any``): The vertex id.
+    """
+    return _stable_hash(_v_key_bytes(v_id))
+
+
+def _e_key_bytes(e_key: Sequence[int]) -> bytes:
+    r"""
+    Return the bytes a hyperedge is looked up by.
+
+    Args:
+        ``e_key`` (``Sequence[int]``): The sorted vertex indices of the hyperedge.
+    """
+    return array("q", e_key).tobytes()
+
+
+def _hash_table(hashes: List[int]) -> array:
+    r"""
+    Build an open-addressing (linear probing) hash table that maps each key to its position, given the hashes of
+    the keys.
+
+    Args:
+        ``hashes`` (``List[int]``): The hashes of the keys, which must be distinct.
+    """
+    size = 1
+    while size < 2 * len(hashes):
+        size *= 2
+    mask = size - 1
+    table = array("q", [-1]) * size
+    for idx, key_hash in enumerate(hashes):
+        slot = key_hash & mask
+        while table[slot] != -1:
+            slot = (slot + 1) & mask
+        table[slot] = idx
+    return table
+
+
+def _blob(items: Iterator[bytes]) -> Tuple[array, bytes]:
+    r"""
+    Concatenate byte strings and return their offsets (``len + 1`` entries) and the concatenation.
+
+    Args:
+        ``items`` (``Iterator[bytes]``): The byte strings.
+    """
+    offsets, chunks, pos = array("q", [0]), [], 0
+    for item in items:
+        chunks.append(item)
+        pos += len(item)
+        offsets.append(pos)
+    return offsets, b"".join(chunks)
+
+
+def encode_columnar(
+    v_ids: Sequence[Any],
+    csr_arrays: Sequence[Sequence[int]],
+    v_data: Sequence[Dict],
+    e_data: Sequence[Dict],
+) -> List[Any]:
+    r"""
+    Encode a hypergraph in the memory-mappable columnar format and return the chunks, header and padding
+    included, whose concatenation is the file.
+
+    Args:
+        ``v_ids`` (``Sequence[Any]``): The vertex id of each vertex index.
+        ``csr_arrays`` (``Sequence[Sequence[int]]``): The ``v_ptr``, ``v_edges``, ``e_ptr`` and ``e_verts`` arrays.
+        ``v_data`` (``Sequence[dict]``): The vertex data of each vertex index.
+        ``e_data`` (``Sequence[dict]``): The hyperedge data of each hyperedge index.
+    """
+    v_ptr, v_edges, e_ptr, e_verts = (array("q", a) for a in csr_arrays)
+    e_hashes = [_stable_hash(_e_key_bytes(sorted(e_verts[e_ptr[j] : e_ptr[j + 1]]))) for j in range(len(e_ptr) - 1)]
+    v_id_off, v_id_blob = _blob(map(_v_key_bytes, v_ids))
+    v_data_off, v_data_blob = _blob(pkl.dumps(data, protocol=_PICKLE_PROTOCOL) for data in v_data)
+    e_data_off, e_data_blob = _blob(pkl.dumps(data, protocol=_PICKLE_PROTOCOL) for data in e_data)
+    sections = {
+        "v_ptr": v_ptr,
+        "v_edges": v_edges,
+        "e_ptr": e_ptr,
+        "e_verts": e_verts,
+        "v_id_off": v_id_off,
+        "v_id_blob": v_id_blob,
+        "v_data_off": v_data_off,
+        "v_data_blob": v_data_blob,
+        "e_data_off": e_data_off,
+        "e_data_blob": e_data_blob,
+        "v_hash": _hash_table(list(map(_v_hash, v_ids))),
+        "e_hash": _hash_table(e_hashes),
+    }
+    table, chunks, pos = [], [], _HEADER.size
+    for name in _SECTIONS:
+        chunks.append(bytes(-pos % 8))
+        pos += -pos % 8
+        size = len(memoryview(sections[name]).cast("B"))
+        chunks.append(sections[name])
+        table += [pos, size]
+        pos += size
+    return [_HEADER.pack(_MAGIC, 1, *table)] + chunks
+
+
+def write_columnar(
+    file_path: Union[str, Path],
+    v_ids: Sequence[Any],
+    csr_arrays: Sequence[Sequence[int]],
+    v_data: Sequence[Dict],
+    e_data: Sequence[Dict],
+):
+    r"""
+    Write a hypergraph in the memory-mappable columnar format.
+
+    The file is written to a temporary file first and atomically moved into place.
+
+    Args:
+        ``file_path`` (``Union[str, Path]``): The file path.
+        ``v_ids`` (``Sequence[Any]``): The vertex id of each vertex index.
+        ``csr_arrays`` (``Sequence[Sequence[int]]``): The ``v_ptr``, ``v_edges``, ``e_ptr`` and ``e_verts`` arrays.
+        ``v_data`` (``Sequence[dict]``): The vertex data of each vertex index.
+        ``e_data`` (``Sequence[dict]``): The hyperedge data of each hyperedge index.
+    """
+    chunks = encode_columnar(v_ids, csr_arrays, v_data, e_data)
+    tmp_file = Path(f"{file_path}.tmp")
+    with open(tmp_file, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, file_path)
+
+
+def is_columnar(file_path: Union[str, Path]) -> bool:
+    r"""
+    Return True if the file starts with the columnar format magic.
+
+    Args:
+        ``file_path`` (``Union[str, Path]``): The file path.
+    """
+    with open(file_path, "rb") as f:
+        return f.read(len(_MAGIC)) in (_MAGIC, _MAGIC_V1)
+
+
+class _BlobSequence(SequenceABC):
+    r"""
+    Read-only sequence that unpickles its items from a mapped blob on access.
+    """
+
+    __slots__ = ("_off", "_blob")
+
+    def __init__(self, off: memoryview, blob: memoryview):
+        self._off = off
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._off) - 1
+
+    def __getitem__(self, idx: int) -> Any:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(idx)
+        return pkl.loads(self._blob[self._off[idx] : self._off[idx + 1]])
+
+
+class _MappedVertexIndex(MappingABC):
+    r"""
+    Read-only mapping from vertex id to vertex index, probing the mapped hash table. A stored id whose pickle
+    differs from the one looked up is unpickled and compared by value, like a dict does.
+    """
+
+    __slots__ = ("_table", "_v_ids", "_hash")
+
+    def __init__(self, table: memoryview, v_ids: _BlobSequence, v_hash: Callable[[Any], int] = _v_hash):
+        self._table = table
+        self._v_ids = v_ids
+        self._hash = v_hash
+
+    def __getitem__(self, v_id: Any) -> int:
+        key = _v_key_bytes(v_id)
+        table, off, blob = self._table, self._v_ids._off, self._v_ids._blob
+        mask = len(table) - 1
+        slot = self._hash(v_id) & mask
+        while True:
+            idx = table[slot]
+            if idx == -1:
+                raise KeyError(v_id)
+            stored = blob[off[idx] : off[idx + 1]]
+            if stored == key or pkl.loads(stored) == v_id:
+                return idx
+            slot = (slot + 1) & mask
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._v_ids)
+
+    def __len__(self) -> int:
+        return len(self._v_ids)
+
+
+class _MappedEdgeIndex(MappingABC):
+    r"""
+    Read-only mapping from the sorted vertex indices of a hyperedge to its index, probing the mapped hash table.
+    """
+
+    __slots__ = ("_table", "_e_ptr", "_e_verts")
+
+    def __init__(self, table: memoryview, e_ptr: memoryview, e_verts: memoryview):
+        self._table = table
+        self._e_ptr = e_ptr
+        self._e_verts = e_verts
+
+    def __getitem__(self, e_key: Tuple) -> int:
+        table, e_ptr, e_verts = self._table, self._e_ptr, self._e_verts
+        mask = len(table) - 1
+        slot = _stable_hash(_e_key_bytes(e_key)) & mask
+        while True:
+            idx = table[slot]
+            if idx == -1:
+                raise KeyError(e_key)
+            if tuple(sorted(e_verts[e_ptr[idx] : e_ptr[idx + 1]])) == e_key:
+                return idx
+            slot = (slot + 1) & mask
+
+    def __iter__(self) -> Iterator[Tuple]:
+        e_ptr, e_verts = self._e_ptr, self._e_verts
+        return (tuple(sorted(e_verts[e_ptr[j] : e_ptr[j + 1]])) for j in range(len(e_ptr) - 1))
+
+    def __len__(self) -> int:
+        return len(self._e_ptr) - 1
+
+
+class ColumnarFile:
+    r"""
+    A memory-mapped columnar hypergraph file.
+
+    Opening only reads the header: the arrays are ``memoryview`` casts of the mapping, and vertex ids and data
+    dicts are unpickled when they are accessed, so the cost of opening does not depend on the size of the file.
+
+    Args:
+        ``file_path`` (``Union[str, Path]``): The file path.
+    """
+
+    def __init__(self, file_path: Union[str, Path]):
+        with open(file_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._attach(memoryview(self._mmap), str(file_path))
+
+    @classmethod
+    def from_buffer(cls, buffer: Any, name: str = "The buffer") -> "ColumnarFile":
+        r"""
+        Read a hypergraph in the columnar format from a buffer, such as a shared memory block, without copying it.
+
+        Args:
+            ``buffer`` (``Any``): An object supporting the buffer protocol that holds the encoded hypergraph.
+            ``name`` (``str``): The name of the buffer in error messages.
+        """
+        f = cls.__new__(cls)
+        f._mmap = None
+        f._attach(memoryview(buffer), name)
+        return f
+
+    def _attach(self, buf: memoryview, name: str):
+        r"""
+        Check the header of the encoded hypergraph and map its sections.
+
+        Args:
+            ``buf`` (``memoryview``): The encoded hypergraph.
+            ``name`` (``str``): The name of the file or buffer in error messages.
+        """
+        magic, one, *table = _HEADER.unpack_from(buf)
+        assert magic in (_MAGIC, _MAGIC_V1), f"{name} is not a columnar hypergraph file."
+        assert one == 1, f"{name} was written on a machine with a different byte order than {sys.byteorder}."
+        for i, section_name in enumerate(_SECTIONS):
+            pos, size = table[2 * i], table[2 * i + 1]
+            section = buf[pos : pos + size]
+            setattr(self, section_name, section if section_name.endswith("blob") else section.cast("q"))
+        self.v_ids = _BlobSequence(self.v_id_off, self.v_id_blob)
+        self.v_data = _BlobSequence(self.v_data_off, self.v_data_blob)
+        self.e_data = _BlobSequence(self.e_data_off, self.e_data_blob)
+        self.v_index = _MappedVertexIndex(self.v_hash, self.v_ids, _v_hash if magic == _MAGIC else _v_hash_v1)
+        self.e_index = _MappedEdgeIndex(self.e_hash, self.e_ptr, self.e_verts)
@@ -1,89 +1,278 @@
+import asyncio
+import gzip
+import hashlib
 import http.server
 import json
 import socketserver
 import threading
 import webbrowser
+from collections import OrderedDict
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, ContextManager, Dict, Hashable, List, Optional, Tuple
 from urllib.parse import parse_qs, urlparse
 
 from .base import BaseHypergraphDB
 from .hypergraph import HypergraphDB
 
+# Headers sent with every response, so the API can be called from pages served elsewhere
+CORS_HEADERS = (
+    ("Access-Control-Allow-Origin", "*"),
+    ("Access-Control-Allow-Methods", "GET, POST, OPTIONS"),
+    ("Access-Control-Allow-Headers", "Content-Type"),
+)
 
-class HypergraphAPIHandler(http.server.BaseHTTPRequestHandler):
-    """HTTP request handler with API endpoints"""
+# Score of a search match in the vertex id (None), type and description
+SEARCH_WEIGHTS = {None: 3, "entity_type": 2, "description": 1}
 
-    def __init__(self, hypergraph_db: HypergraphDB, *args, **kwargs):
-        self.hypergraph_db = hypergraph_db
-        super().__init__(*args, **kwargs)
+# Vertices of a higher degree are listed after the others
+HUB_DEGREE = 50
 
-    def log_message(self, format, *args):
-        """Disable default logging"""
-        pass
+# Limits of the neighborhood returned by /api/graph, hyperedges of hub vertices beyond them are left out
+GRAPH_MAX_VERTICES = 1000
+GRAPH_MAX_EDGES = 2000
 
-    def do_GET(self):
-        """Handle GET requests"""
-        parsed_path = urlparse(self.path)
-        path = parsed_path.path
-        query_params = parse_qs(parsed_path.query)
+# Routes whose response does not depend on the hypergraph
+STATIC_ROUTES = ("/", "/index.html")
 
-        # CORS headers
-        self.send_response(200)
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+# Smaller bodies are sent uncompressed, gzip would barely shrink them
+GZIP_MIN_SIZE = 1024
 
+TEMPLATE_PATH = Path(__file__).parent / "templates" / "hypergraph_viewer.html"
+
+
+@lru_cache(maxsize=None)
+def _load_html_template(template_path: Path) -> str:
+    """Read a template once, later calls return the text read by the first one"""
+    try:
+        with open(template_path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"HTML template file not found: {template_path}")
+
+
+@dataclass
+class CachedResponse:
+    """Body of a response to a GET request, with its ETag and the gzip-compressed body (built on first use)"""
+
+    content_type: str
+    body: bytes
+    etag: str
+    gzip_body: Optional[bytes] = None
+
+    @classmethod
+    def build(cls, content_type: str, body: bytes) -> "CachedResponse":
+        # the ETag is a digest of the body, so it stays valid across versions and restarts while the body does
+        return cls(content_type, body, f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"')
+
+    def compressed(self) -> bytes:
+        if self.gzip_body is None:
+            self.gzip_body = gzip.compress(self.body, compresslevel=6)
+        return self.gzip_body
+
+
+@dataclass
+class ResponseCache:
+    """LRU cache of serialized responses, keyed by the route, its query parameters and the hypergraph version
+
+    Args:
+        max_entries: Number of responses kept
+        max_bytes: Total size of the bodies kept, a larger body is not cached
+    """
+
+    max_entries: int = 256
+    max_bytes: int = 64 * 1024 * 1024
+    entries: "OrderedDict[Hashable, CachedResponse]" = field(default_factory=OrderedDict)
+    size: int = 0
+    version: Optional[int] = None
+
+    def __post_init__(self):
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, version: Optional[int], entry: CachedResponse):
+        r"""
+        Cache ``entry`` under ``key``. ``version`` is the hypergraph version it was built from (``None`` for static
+        routes): responses of older versions can no longer be asked for and are dropped when a newer one arrives.
+        """
+        size = len(entry.body)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        with self.lock:
+            if version is not None and (self.version is None or version > self.version):
+                self.version = version
+                for old_key in [k for k in self.entries if k[-1] is not None]:
+                    self.size -= len(self.entries.pop(old_key).body)
+            elif version is not None and version < self.version:
+                return
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old.body)
+            self.entries[key] = entry
+            self.size += size
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                self.size -= len(self.entries.popitem(last=False)[1].body)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+
+def create_search_indexes(hypergraph_db: BaseHypergraphDB):
+    """Create the text indexes of the vertex search on the fields that have no index yet
+
+    Args:
+        hypergraph_db: HypergraphDB instance, other databases are searched by a scan
+    """
+    if not isinstance(hypergraph_db, HypergraphDB):
+        return
+    v_indexes = hypergraph_db.indexes["v"]
+    for name in SEARCH_WEIGHTS:
+        if name not in v_indexes:
+            hypergraph_db.create_index("v", name, kind="text")
+
+
+def create_order_indexes(hypergraph_db: BaseHypergraphDB):
+    """Create the degree and id indexes of the vertex list, if they do not exist
+
+    Args:
+        hypergraph_db: HypergraphDB instance, other databases are sorted on each request
+    """
+    if not isinstance(hypergraph_db, HypergraphDB):
+        return
+    kinds = hypergraph_db.indexes["v"].get(None, ())
+    for kind in ("degree", "sorted"):
+        if kind not in kinds:
+            hypergraph_db.create_index("v", None, kind=kind)
+
+
+class HypergraphAPI:
+    """Routes of the visualization API, shared by the HTTP servers serving them"""
+
+    hypergraph_db: BaseHypergraphDB
+    response_cache: Optional[ResponseCache] = None
+
+    def _read_lock(self) -> ContextManager:
+        """Read lock of the hypergraph, if it has one (frozen hypergraphs never change)"""
+        lock = getattr(self.hypergraph_db, "lock", None)
+        return lock.read() if lock is not None else nullcontext()
+
+    def _reader(self) -> Tuple["HypergraphAPI", ContextManager]:
+        """Routes reading a consistent state of the hypergraph, and the lock to hold while they run
+
+        A HypergraphDB is read from a snapshot, which needs no lock, so that a slow request never holds back
+        writers. Other databases are read under their read lock.
+        """
+        snapshot = getattr(self.hypergraph_db, "snapshot", None)
+        if snapshot is None:
+            return self, self._read_lock()
+        reader = HypergraphAPI()
+        reader.hypergraph_db = snapshot()
+        return reader, nullcontext()
+
+    def _cache_key(self, path: str, query_params: Dict[str, List[str]], version: Optional[int]) -> Hashable:
+        """Key of a response in the response cache, the version is last"""
+        return path, tuple(sorted((name, tuple(values)) for name, values in query_params.items())), version
+
+    def _cached(self, path: str, query_params: Dict[str, List[str]]) -> Optional[CachedResponse]:
+        """Return the cached response to a GET request, or None
+
+        The lookup takes no lock: while a mutation is applied the version is still the one before it, and the
+        cached response is the one from before the mutation.
+        """
+        if self.response_cache is None:
+            return None
+        version = None if path in STATIC_ROUTES else self.hypergraph_db.version
+        return self.response_cache.get(self._cache_key(path, query_params, version))
+
+    def _respond(self, path: str, query_params: Dict[str, List[str]]) -> CachedResponse:
+        """Return the response to a GET request from the response cache, or build and cache it
+
+        The response is built from a snapshot or under the read lock, so that it does not see a half-applied
+        mutation.
+        """
+        static = path in STATIC_ROUTES
+        reader, lock = (self, nullcontext()) if static else self._reader()
+        with lock:
+            version = None if static else reader.hypergraph_db.version
+            key = self._cache_key(path, query_params, version)
+            cache = self.response_cache
+            entry = cache.get(key) if cache is not None else None
+            if entry is None:
+                entry = CachedResponse.build(*reader._route(path, query_params))
+                if cache is not None:
+                    cache.put(key, version, entry)
+        return entry
+
+    def _http_response(
+        self, entry: CachedResponse, if_none_match: Optional[str], accept_encoding: Optional[str]
+    ) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        """Return the status, headers and body of the response, honoring If-None-Match and Accept-Encoding
+
+        Args:
+            entry: Response to send
+            if_none_match: If-None-Match header of the request, answered by 304 Not Modified when it lists the ETag
+            accept_encoding: Accept-Encoding header of the request, the body is compressed when it accepts gzip
+        """
+        use_gzip = len(entry.body) >= GZIP_MIN_SIZE and "gzip" in (accept_encoding or "").lower()
+        etag = entry.etag[:-1] + '-gzip"' if use_gzip else entry.etag
+        # clients revalidate on each request, which costs a 304 without a body while nothing changed
+        headers = [("ETag", etag), ("Cache-Control", "no-cache"), ("Vary", "Accept-Encoding")]
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if "*" in tags or entry.etag in tags or etag in tags:
+                return 304, headers, b""
+        headers.append(("Content-Type", entry.content_type))
+        if use_gzip:
+            headers.append(("Content-Encoding", "gzip"))
+            return 200, headers, entry.compressed()
+        return 200, headers, entry.body
+
+    def _route(self, path: str, query_params: Dict[str, List[str]]) -> Tuple[str, bytes]:
+        """Return the content type and body of the response to a GET request"""
         # Route handling
         if path == "/" or path == "/index.html":
-            self.send_header("Content-type", "text/html; charset=utf-8")
-            self.end_headers()
-            self.wfile.write(self._get_html_template().encode("utf-8"))
+            return "text/html; charset=utf-8", self._get_html_template().encode("utf-8")
 
         elif path == "/api/database/info":
-            self.send_header("Content-type", "application/json; charset=utf-8")
-            self.end_headers()
             response = self._get_database_info()
-            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8"))
 
         elif path == "/api/vertices":
-            self.send_header("Content-type", "application/json; charset=utf-8")
-            self.end_headers()
-
             # Parse query parameters
             page = int(query_params.get("page", ["1"])[0])
             page_size = int(query_params.get("page_size", ["50"])[0])
             search = query_params.get("search", [""])[0]
             sort_by = query_params.get("sort_by", ["degree"])[0]
             sort_order = query_params.get("sort_order", ["desc"])[0]
+            cursor = query_params.get("cursor", [None])[0]
 
-            response = self._get_vertices(page, page_size, search, sort_by, sort_order)
-            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+            response = self._get_vertices(page, page_size, search, sort_by, sort_order, cursor)
 
         elif path == "/api/graph":
-            self.send_header("Content-type", "application/json; charset=utf-8")
-            self.end_headers()
-
             vertex_id = query_params.get("vertex_id", [""])[0]
+            depth = int(query_params.get("depth", ["1"])[0])
             if vertex_id:
-                response = self._get_graph_data(vertex_id)
+                response = self._get_graph_data(vertex_id, depth)
             else:
                 response = {"error": "vertex_id parameter is required"}
 
-            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8"))
-
         else:
-            self.send_header("Content-type", "text/plain; charset=utf-8")
-            self.end_headers()
-            self.wfile.write(b"404 Not Found")
+            return "text/plain; charset=utf-8", b"404 Not Found"
 
-    def do_OPTIONS(self):
-        """Handle OPTIONS requests for CORS preflight"""
-        self.send_response(200)
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
-        self.end_headers()
+        return "application/json; charset=utf-8", json.dumps(response, ensure_ascii=False).encode("utf-8")
 
     def _get_database_info(self) -> Dict[str, Any]:
         """Get database information"""
@@ -93,98 +282,158 @@ class HypergraphAPIHandler(http.server.BaseHTTPRequestHandler):
             "edges": self.hypergraph_db.num_e,
         }
 
-    def _get_vertices(self, page: int, page_size: int, search: str, sort_by: str, sort_order: str) -> Dict[str, Any]:
-        """Get vertices with pagination and search"""
+    def _get_vertices(
+        self, page: int, page_size: int, search: str, sort_by: str, sort_order: str, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get vertices with pagination and search
+
+        Args:
+            page: Page number, from 1
+            page_size: Number of vertices per page
+            search: Text to search in the vertex ids, types and descriptions
+            sort_by: "degree" or "id", vertices of a degree above HUB_DEGREE are listed last either way
+            sort_order: "asc" or "desc"
+            cursor: With sort_by="id", the next_cursor of the previous page, instead of the page number
+        """
         hg = self.hypergraph_db
+        start = (page - 1) * page_size
+        end = start + page_size
+        descending = sort_order == "desc"
+        next_cursor = None
+        if cursor is not None and (search or sort_by != "id"):
+            return {"error": "cursor requires sort_by=id and no search"}
+
+        if search:
+            # Score only the matching vertices, looked up in the text indexes when the database has them
+            scores = hg.search_v(search, SEARCH_WEIGHTS)
+            # Sort by search score if searching (no degree filtering), then by id
+            ranked = sorted(scores, key=lambda v_id: (-scores[v_id], str(v_id)))
+            total = len(ranked)
+            v_ids = ranked[start:end]
 
-        # Get all vertices
-        all_vertices = list(hg.all_v)
-
-        # Prepare vertex data with search scoring
-        vertex_data = []
-        search_lower = search.lower() if search else ""
-
-        for v_id in all_vertices:
-            v_data = hg.v(v_id, {})
-            degree = hg.degree_v(v_id)
-            entity_type = v_data.get("entity_type", "")
-            description = v_data.get("description", "")
-
-            # Calculate search score
-            score = 0
-            if search_lower:
-                if search_lower in str(v_id).lower():
-                    score += 3
-                if search_lower in entity_type.lower():
-                    score += 2
-                if search_lower in description.lower():
-                    score += 1
-
-                # Skip if no match
-                if score == 0:
-                    continue
-
-            vertex_data.append(
-                {
-                    "id": v_id,
-                    "degree": degree,
-                    "entity_type": entity_type,
-                    "description": (description[:100] + "..." if len(description) > 100 else description),
-                    "score": score,
-                }
-            )
+        else:
+            total = hg.num_v
+            kinds = hg.indexes["v"].get(None, ()) if isinstance(hg, HypergraphDB) else ()
+            # sorted by id, one more vertex tells whether there is a next page
+            count = page_size + 1 if sort_by == "id" else page_size
+            if sort_by == "degree" and "degree" in kinds:
+                v_ids = self._get_page_by_degree(start, count, descending)
+            elif sort_by == "id" and {"degree", "sorted"} <= set(kinds):
+                v_ids = self._get_page_by_id(start, count, descending, cursor)
+            else:
+                v_ids = self._get_sorted_page(start, count, sort_by, descending, cursor)
+            if sort_by == "id":
+                if len(v_ids) > page_size:
+                    last = v_ids[page_size - 1]
+                    next_cursor = f"{int(hg.degree_v(last) > HUB_DEGREE)}:{last}"
+                v_ids = v_ids[:page_size]
+
+        pagination = {
+            "page": page,
+            "page_size": page_size,
+            "total": total,
+            "total_pages": (total + page_size - 1) // page_size,
+        }
+        if sort_by == "id" and not search:
+            pagination["next_cursor"] = next_cursor
+        return {"data": [self._get_vertex_item(v_id) for v_id in v_ids], "pagination": pagination}
 
+    def _get_page_by_degree(self, start: int, count: int, descending: bool) -> List[Any]:
+        """Get a page of vertices sorted by degree from the degree index, without sorting all of them"""
+        hg = self.hypergraph_db
+        # First, the vertices up to the degree threshold, then the others (degree > 50 goes to the end)
+        skipped = max(start - hg.count_v_by_degree(0, HUB_DEGREE), 0)
+        pages = chain(
+            hg.iter_v_by_degree(0, HUB_DEGREE, start, descending),
+            hg.iter_v_by_degree(HUB_DEGREE + 1, None, skipped, descending),
+        )
+        return list(islice(pages, count))
+
+    def _get_page_by_id(self, start: int, count: int, descending: bool, cursor: Optional[str]) -> List[Any]:
+        """Get a page of vertices sorted by id from the id and degree indexes, without sorting all of them"""
+        hg = self.hypergraph_db
+        # The few vertices above the degree threshold go to the end, they are skipped in the id order
+        hubs = sorted(hg.iter_v_by_degree(HUB_DEGREE + 1), key=str, reverse=descending)
+        hub_set = set(hubs)
+        if cursor is not None:
+            group, _, after = cursor.partition(":")
+            if group == "1":
+                others = iter(())
+                hubs = [v_id for v_id in hubs if (str(v_id) < after if descending else str(v_id) > after)]
+            else:
+                others = hg.iter_v_by_id(descending=descending, after=after)
+        elif start < hg.num_v - len(hubs):
+            # the position of the first vertex of the page in the id order of all vertices
+            ranks = (hg.rank_v_by_id(v_id) for v_id in hubs)
+            position = start
+            for rank in sorted(hg.num_v - 1 - rank if descending else rank for rank in ranks):
+                if rank > position:
+                    break
+                position += 1
+            others = hg.iter_v_by_id(position, descending)
+        else:
+            others = iter(())
+            hubs = hubs[start - (hg.num_v - len(hubs)) :]
+        pages = chain((v_id for v_id in others if v_id not in hub_set), hubs)
+        return list(islice(pages, count))
+
+    def _get_sorted_page(
+        self, start: int, count: int, sort_by: str, descending: bool, cursor: Optional[str]
+    ) -> List[Any]:
+        """Get a page of vertices by sorting all of them, for databases without the order indexes"""
+        hg = self.hypergraph_db
+        v_ids = list(hg.all_v)
         # Sort vertices
-        if search_lower:
-            # Sort by search score if searching (no degree filtering)
-            vertex_data.sort(key=lambda x: x["score"], reverse=True)
-        elif sort_by == "degree":
+        if sort_by == "degree":
             # First, separate by degree threshold (degree > 50 goes to the end)
-            vertex_data.sort(key=lambda x: (x["degree"] > 50, -x["degree"] if sort_order == "desc" else x["degree"]))
+            v_ids.sort(key=lambda v: (hg.degree_v(v) > HUB_DEGREE, -hg.degree_v(v) if descending else hg.degree_v(v)))
         elif sort_by == "id":
             # First, separate by degree threshold (degree > 50 goes to the end)
-            vertex_data.sort(key=lambda x: (x["degree"] > 50, str(x["id"])), reverse=(sort_order == "desc"))
-
-        # Remove score from output
-        for v in vertex_data:
-            v.pop("score", None)
-
-        # Pagination
-        total = len(vertex_data)
-        start = (page - 1) * page_size
-        end = start + page_size
-        paginated_data = vertex_data[start:end]
-
+            v_ids.sort(key=str, reverse=descending)
+            v_ids.sort(key=lambda v: hg.degree_v(v) > HUB_DEGREE)
+            if cursor is not None:
+                group, _, after = cursor.partition(":")
+                hub = group == "1"
+
+                def is_after(v):
+                    if (hg.degree_v(v) > HUB_DEGREE) != hub:
+                        return not hub
+                    return str(v) < after if descending else str(v) > after
+
+                start = next((i for i, v in enumerate(v_ids) if is_after(v)), len(v_ids))
+        return v_ids[start : start + count]
+
+    def _get_vertex_item(self, v_id: Any) -> Dict[str, Any]:
+        """Get the summary of a vertex listed by /api/vertices"""
+        hg = self.hypergraph_db
+        v_data = hg.v(v_id, {})
+        description = v_data.get("description", "")
         return {
-            "data": paginated_data,
-            "pagination": {
-                "page": page,
-                "page_size": page_size,
-                "total": total,
-                "total_pages": (total + page_size - 1) // page_size,
-            },
+            "id": v_id,
+            "degree": hg.degree_v(v_id),
+            "entity_type": v_data.get("entity_type", ""),
+            "description": (description[:100] + "..." if len(description) > 100 else description),
         }
 
-    def _get_graph_data(self, vertex_id: str) -> Dict[str, Any]:
-        """Get graph data for a vertex"""
+    def _get_graph_data(self, vertex_id: str, depth: int = 1) -> Dict[str, Any]:
+        """Get the hyperedges within ``depth`` hops of a vertex and their vertices
+
+        Args:
+            vertex_id: Vertex id
+            depth: Number of hops, the neighborhood is cut at GRAPH_MAX_VERTICES vertices and GRAPH_MAX_EDGES
+                hyperedges (``truncated`` is then true)
+        """
         hg = self.hypergraph_db
 
         if not hg.has_v(vertex_id):
             return {"error": f"Vertex {vertex_id} not found"}
+        if depth < 1:
+            return {"error": "depth must be at least 1"}
 
-        # Get all neighbor hyperedges of the vertex
-        neighbor_edges = hg.nbr_e_of_v(vertex_id)
+        sub, truncated = hg._k_hop(vertex_id, depth, GRAPH_MAX_VERTICES, GRAPH_MAX_EDGES)
 
-        # Collect all related vertices
-        all_vertices = {vertex_id}
         edges_data = {}
-
-        for edge_tuple in neighbor_edges:
-            # Add all vertices in the hyperedge
-            all_vertices.update(edge_tuple)
-
-            # Get hyperedge data
-            edge_data = hg.e(edge_tuple, {})
+        for edge_tuple, edge_data in zip(sub.all_e, sub.e_data):
             edge_key = "|#|".join(str(item) for item in edge_tuple)
             edges_data[edge_key] = {
                 "keywords": edge_data.get("keywords", ""),
@@ -194,22 +443,13 @@ class HypergraphAPIHandler(http.server.BaseHTTPRequestHandler):
             }
 
         # Get data for all vertices
-        vertices_data = {}
-        for v_id in all_vertices:
-            v_data = hg.v(v_id, {})
-            vertices_data[v_id] = {**v_data}
+        vertices_data = {v_id: {**v_data} for v_id, v_data in zip(sub.all_v, sub.v_data)}
 
-        return {"vertices": vertices_data, "edges": edges_data}
+        return {"vertices": vertices_data, "edges": edges_data, "truncated": truncated}
 
     def _get_html_template(self) -> str:
         """Get HTML template without embedded data"""
-        template_path = Path(__file__).parent / "templates" / "hypergraph_viewer.html"
-
-        try:
-            with open(template_path, "r", encoding="utf-8") as f:
-                html_template = f.read()
-        except FileNotFoundError:
-            raise FileNotFoundError(f"HTML template file not found: {template_path}")
+        html_template = _load_html_template(TEMPLATE_PATH)
 
         # Replace placeholder with empty object (data will be loaded via API)
         html_content = html_template.replace("{{DATA_JSON}}", "{}")
@@ -217,33 +457,102 @@ class HypergraphAPIHandler(http.server.BaseHTTPRequestHandler):
         return html_content
 
 
+class HypergraphAPIHandler(HypergraphAPI, http.server.BaseHTTPRequestHandler):
+    """HTTP request handler with API endpoints"""
+
+    def __init__(self, hypergraph_db: HypergraphDB, *args, response_cache: Optional[ResponseCache] = None, **kwargs):
+        self.hypergraph_db = hypergraph_db
+        self.response_cache = response_cache
+        super().__init__(*args, **kwargs)
+
+    def log_message(self, format, *args):
+        """Disable default logging"""
+        pass
+
+    def do_GET(self):
+        """Handle GET requests"""
+        parsed_path = urlparse(self.path)
+        path = parsed_path.path
+        query_params = parse_qs(parsed_path.query)
+
+        entry = self._cached(path, query_params) or self._respond(path, query_params)
+        status, headers, body = self._http_response(
+            entry, self.headers.get("If-None-Match"), self.headers.get("Accept-Encoding")
+        )
+
+        self.send_response(status)
+        for header, value in chain(CORS_HEADERS, headers):
+            self.send_header(header, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_OPTIONS(self):
+        """Handle OPTIONS requests for CORS preflight"""
+        self.send_response(200)
+        for header, value in CORS_HEADERS:
+            self.send_header(header, value)
+        self.end_headers()
+
+
 class HypergraphViewer:
     """Hypergraph visualization tool"""
 
-    def __init__(self, hypergraph_db: BaseHypergraphDB, port: int = 8080):
+    def __init__(
+        self,
+        hypergraph_db: BaseHypergraphDB,
+        port: int = 8080,
+        threaded: bool = True,
+        use_asyncio: bool = False,
+        indexes: bool = False,
+        cache_size: int = 256,
+    ):
+        """
+        Args:
+            hypergraph_db: HypergraphDB instance
+            port: Server port, 0 picks a free port (available as ``port`` once the server is started)
+            threaded: Serve each request in its own thread, so a slow request does not block the others.
+                Requests read a snapshot of the hypergraph, so it may be mutated while being served.
+            use_asyncio: Serve with ``AsyncHypergraphServer`` on an event loop in a background thread instead
+                (keep-alive connections, queries in a thread pool). ``threaded`` is ignored.
+            indexes: Create text indexes on the vertex ids, types and descriptions, and degree and id indexes on
+                the vertices, so that the vertex search does not scan all vertices and a page of the vertex list
+                does not sort them. Off by default: the indexes are added to the hypergraph, saved with it and
+                updated on each write, which costs memory and slows down inserts.
+            cache_size: Number of serialized responses kept in the response cache, 0 disables it. Responses are
+                cached until the hypergraph changes (its ``version``), and sent with an ETag and gzip-compressed to
+                the clients accepting it.
+        """
         self.hypergraph_db = hypergraph_db
         self.port = port
+        self.threaded = threaded
+        self.use_asyncio = use_asyncio
+        self.response_cache = ResponseCache(max_entries=cache_size)
+        if indexes:
+            create_search_indexes(hypergraph_db)
+            create_order_indexes(hypergraph_db)
 
     def start_server(self, open_browser: bool = True):
-        """Start HTTP server with API endpoints"""
+        """Start HTTP server with API endpoints, returns once the server accepts connections"""
+        if self.use_asyncio:
+            server_thread = self._start_async_server()
+        else:
 
-        def run_server():
             def handler(*args, **kwargs):
-                return HypergraphAPIHandler(self.hypergraph_db, *args, **kwargs)
+                return HypergraphAPIHandler(self.hypergraph_db, *args, response_cache=self.response_cache, **kwargs)
 
-            self.httpd = socketserver.TCPServer(("127.0.0.1", self.port), handler)
-            self.httpd.serve_forever()
+            # Bind in the calling thread, so the server accepts connections as soon as this returns
+            if self.threaded:
+                self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", self.port), handler)
+            else:
+                self.httpd = socketserver.TCPServer(("127.0.0.1", self.port), handler)
+            self.port = self.httpd.server_address[1]
 
-        # Start server in new thread
-        server_thread = threading.Thread(target=run_server, daemon=True)
-        server_thread.start()
+            # Start server in new thread
+            server_thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+            server_thread.start()
 
         if open_browser:
-            # Wait for server to start
-            import time
-
-            time.sleep(1)
-
             # Open browser
             url = f"http://127.0.0.1:{self.port}"
             print(f"🚀 Hypergraph visualization server started: {url}")
@@ -251,11 +560,44 @@ class HypergraphViewer:
 
         return server_thread
 
+    def _start_async_server(self) -> threading.Thread:
+        """Run an AsyncHypergraphServer on a new event loop in a daemon thread, and wait until it is ready"""
+        from .server import AsyncHypergraphServer
+
+        self.async_server = AsyncHypergraphServer(
+            self.hypergraph_db, port=self.port, indexes=False, response_cache=self.response_cache
+        )
+        self._loop = asyncio.new_event_loop()
+        started, errors = threading.Event(), []
+
+        def run_loop():
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._loop.run_until_complete(self.async_server.start())
+            except Exception as e:
+                errors.append(e)
+            started.set()
+            if not errors:
+                self._loop.run_forever()
+            self._loop.close()
+
+        server_thread = threading.Thread(target=run_loop, daemon=True)
+        server_thread.start()
+        started.wait()
+        if errors:
+            raise errors[0]
+        self.port = self.async_server.port
+        return server_thread
+
     def stop_server(self):
         """Stop the HTTP server"""
         if hasattr(self, "httpd"):
             self.httpd.shutdown()
             self.httpd.server_close()
+        if getattr(self, "async_server", None) is not None:
+            asyncio.run_coroutine_threadsafe(self.async_server.stop(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self.async_server = None
 
 
 def draw_hypergraph(
@@ -0,0 +1,738 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import Set as AbstractSetABC
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from hyperdb.base import BaseHypergraphDB, _require_numpy
+from hyperdb.columnar import ColumnarFile, write_columnar
+from hyperdb.traversal import (
+    bfs_search,
+    k_hop_search,
+    s_components_search,
+    shortest_path_search,
+    union_find_components,
+)
+
+if TYPE_CHECKING:
+    from hyperdb.parallel import SharedHypergraph
+
+
+class CSRIncidence(NamedTuple):
+    r"""
+    Compressed sparse row incidence structure of a hypergraph.
+
+    Vertices and hyperedges are numbered densely from 0. The hyperedges incident to vertex ``i`` are
+    ``v_edges[v_ptr[i]:v_ptr[i + 1]]`` (ascending), and the vertices of hyperedge ``j`` are
+    ``e_verts[e_ptr[j]:e_ptr[j + 1]]``, in the order of the hyperedge tuple.
+
+    Args:
+        ``v_ids`` (``Sequence[Any]``): The vertex id of each vertex index.
+        ``v_ptr`` (``array``): Offsets into ``v_edges``, ``num_v + 1`` entries.
+        ``v_edges`` (``array``): Hyperedge indices of all incidences, grouped by vertex.
+        ``e_ptr`` (``array``): Offsets into ``e_verts``, ``num_e + 1`` entries.
+        ``e_verts`` (``array``): Vertex indices of all incidences, grouped by hyperedge.
+    """
+
+    v_ids: Sequence[Any]
+    v_ptr: Sequence[int]
+    v_edges: Sequence[int]
+    e_ptr: Sequence[int]
+    e_verts: Sequence[int]
+
+    @property
+    def num_v(self) -> int:
+        r"""
+        Return the number of vertices.
+        """
+        return len(self.v_ptr) - 1
+
+    @property
+    def num_e(self) -> int:
+        r"""
+        Return the number of hyperedges.
+        """
+        return len(self.e_ptr) - 1
+
+    def to_numpy(self) -> Dict[str, Any]:
+        r"""
+        Return zero-copy NumPy ``int64`` views of the offset and index arrays. Requires ``numpy``.
+        """
+        np = _require_numpy("CSRIncidence.to_numpy()")
+        return {
+            name: np.frombuffer(getattr(self, name), dtype=np.int64)
+            for name in ("v_ptr", "v_edges", "e_ptr", "e_verts")
+        }
+
+    def to_scipy(self):
+        r"""
+        Return the ``num_v x num_e`` incidence matrix as a ``scipy.sparse.csr_matrix`` sharing the index arrays.
+        Requires ``numpy`` and ``scipy``.
+        """
+        try:
+            import numpy as np
+            from scipy.sparse import csr_matrix
+        except ImportError as e:
+            raise ImportError("CSRIncidence.to_scipy() requires numpy and scipy: pip install numpy scipy") from e
+        arrays = self.to_numpy()
+        data = np.ones(len(arrays["v_edges"]), dtype=np.float64)
+        return csr_matrix((data, arrays["v_edges"], arrays["v_ptr"]), shape=(self.num_v, self.num_e))
+
+
+def build_csr(v_ids: Sequence[Any], e_members: Iterable[Sequence[int]]) -> CSRIncidence:
+    r"""
+    Build the CSR incidence structure from the vertex ids and the vertex indices of each hyperedge.
+
+    Args:
+        ``v_ids`` (``Sequence[Any]``): The vertex id of each vertex index.
+        ``e_members`` (``Iterable[Sequence[int]]``): The vertex indices of each hyperedge.
+    """
+    num_v = len(v_ids)
+    e_ptr = array("q", [0])
+    e_verts = array("q")
+    degree = [0] * (num_v + 1)
+    for members in e_members:
+        e_verts.extend(members)
+        e_ptr.append(len(e_verts))
+        for i in members:
+            degree[i + 1] += 1
+    # prefix sums of the degrees give the vertex offsets, then a counting sort fills the hyperedges in
+    for i in range(num_v):
+        degree[i + 1] += degree[i]
+    v_ptr = array("q", degree)
+    cursor = degree[:-1]
+    v_edges = array("q", bytes(8 * len(e_verts)))
+    for j in range(len(e_ptr) - 1):
+        for k in range(e_ptr[j], e_ptr[j + 1]):
+            i = e_verts[k]
+            v_edges[cursor[i]] = j
+            cursor[i] += 1
+    return CSRIncidence(v_ids, v_ptr, v_edges, e_ptr, e_verts)
+
+
+class _FrozenEdgeView(AbstractSetABC):
+    r"""
+    Read-only set-like view of the hyperedges of a frozen hypergraph.
+    """
+
+    __slots__ = ("_hg",)
+
+    def __init__(self, hg: "FrozenHypergraph"):
+        self._hg = hg
+
+    def __len__(self) -> int:
+        return self._hg.num_e
+
+    def __iter__(self) -> Iterator[Tuple]:
+        return map(self._hg._e_label, range(self._hg.num_e))
+
+    def __contains__(self, e_tuple: Any) -> bool:
+        if not isinstance(e_tuple, tuple):
+            return False
+        try:
+            e_idx = self._hg._e_idx(e_tuple)
+        except (AssertionError, TypeError):
+            return False
+        return e_idx is not None and self._hg._e_label(e_idx) == e_tuple
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({set(self)!r})"
+
+
+class _FrozenIncidenceView(AbstractSetABC):
+    r"""
+    Read-only set-like view of the hyperedges incident to a vertex of a frozen hypergraph.
+    """
+
+    __slots__ = ("_hg", "_edges")
+
+    def __init__(self, hg: "FrozenHypergraph", v_idx: int):
+        self._hg = hg
+        # a memoryview slice shares the buffer of the CSR array instead of copying it
+        self._edges = memoryview(hg._v_edges_arr)[hg._v_ptr[v_idx] : hg._v_ptr[v_idx + 1]]
+
+    def __len__(self) -> int:
+        return len(self._edges)
+
+    def __iter__(self) -> Iterator[Tuple]:
+        return map(self._hg._e_label, self._edges)
+
+    def __contains__(self, e_tuple: Any) -> bool:
+        if not isinstance(e_tuple, tuple):
+            return False
+        try:
+            e_idx = self._hg._e_idx(e_tuple)
+        except (AssertionError, TypeError):
+            return False
+        if e_idx is None:
+            return False
+        # the incident hyperedges of a vertex are stored in ascending order
+        k = bisect_left(self._edges, e_idx)
+        return k < len(self._edges) and self._edges[k] == e_idx and self._hg._e_label(e_idx) == e_tuple
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({set(self)!r})"
+
+
+@dataclass(eq=False)
+class FrozenHypergraph(BaseHypergraphDB):
+    r"""
+    Read-only hypergraph served from a CSR incidence structure.
+
+    Create one with ``HypergraphDB.freeze()``. Topology queries read the flat offset and index arrays
+    instead of per-vertex sets, which is several times smaller than the mutable store and can be handed
+    to NumPy or SciPy without copying. The vertex and hyperedge data dicts are shared with the hypergraph
+    that was frozen, not copied.
+
+    Args:
+        ``csr`` (``CSRIncidence``): The incidence structure.
+        ``v_data`` (``Sequence[dict]``): The vertex data of each vertex index.
+        ``e_data`` (``Sequence[dict]``): The hyperedge data of each hyperedge index.
+    """
+
+    csr: CSRIncidence = field(default_factory=lambda: build_csr([], []))
+    v_data: Sequence[Dict] = field(default_factory=list)
+    e_data: Sequence[Dict] = field(default_factory=list)
+    _v_index: Optional[Mapping[Any, int]] = field(default=None, repr=False)
+    _e_index: Optional[Mapping[Tuple, int]] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self._v_index is None:
+            self._v_index = {v_id: i for i, v_id in enumerate(self.csr.v_ids)}
+        # the arrays are read on every query, skip the named tuple lookups
+        self._v_ids, self._v_ptr, self._v_edges_arr, self._e_ptr, self._e_verts = self.csr
+
+    def _v_idx(self, v_id: Any) -> Optional[int]:
+        r"""
+        Return the vertex index of the vertex id, or ``None`` if the vertex does not exist.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+        """
+        return self._v_index.get(v_id)
+
+    def _e_idx(self, e_tuple: Union[List, Set, Tuple]) -> Optional[int]:
+        r"""
+        Return the hyperedge index of the hyperedge, or ``None`` if the hyperedge does not exist.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        e_key = self._encode_e(e_tuple)
+        if self._e_index is None:
+            # built on first use: most analytics never look hyperedges up by tuple
+            e_ptr, e_verts = self._e_ptr, self._e_verts
+            self._e_index = {tuple(sorted(e_verts[e_ptr[j] : e_ptr[j + 1]])): j for j in range(len(e_ptr) - 1)}
+        return self._e_index.get(e_key)
+
+    def _encode_e(self, e_tuple: Union[List, Set, Tuple]) -> Tuple:
+        r"""
+        Check the hyperedge tuple and return the sorted tuple of its vertex indices.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
+        tmp = []
+        v_index = self._v_index
+        for v_id in set(e_tuple):
+            v_idx = v_index.get(v_id)
+            assert v_idx is not None, f"The vertex {v_id} does not exist in the hypergraph."
+            tmp.append(v_idx)
+        tmp.sort()
+        return tuple(tmp)
+
+    def _e_members(self, e_idx: int) -> Sequence[int]:
+        r"""
+        Return the vertex indices of the hyperedge index.
+
+        Args:
+            ``e_idx`` (``int``): The hyperedge index.
+        """
+        e_ptr = self._e_ptr
+        return self._e_verts[e_ptr[e_idx] : e_ptr[e_idx + 1]]
+
+    def _v_edges(self, v_idx: int) -> Sequence[int]:
+        r"""
+        Return the hyperedge indices incident to the vertex index.
+
+        Args:
+            ``v_idx`` (``int``): The vertex index.
+        """
+        v_ptr = self._v_ptr
+        return self._v_edges_arr[v_ptr[v_idx] : v_ptr[v_idx + 1]]
+
+    def _e_label(self, e_idx: int) -> Tuple:
+        r"""
+        Return the hyperedge tuple of vertex ids of the hyperedge index.
+
+        Args:
+            ``e_idx`` (``int``): The hyperedge index.
+        """
+        e_ptr = self._e_ptr
+        return tuple(map(self._v_ids.__getitem__, self._e_verts[e_ptr[e_idx] : e_ptr[e_idx + 1]]))
+
+    def _checked_v_idx(self, v_id: Any) -> int:
+        r"""
+        Return the vertex index of the vertex id, asserting that the vertex exists.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+        """
+        try:
+            v_idx = self._v_index.get(v_id)
+        except TypeError:
+            raise AssertionError("The vertex id must be hashable.") from None
+        assert v_idx is not None, f"The vertex {v_id} does not exist in the hypergraph."
+        return v_idx
+
+    def _checked_e_idx(self, e_tuple: Union[List, Set, Tuple]) -> int:
+        r"""
+        Return the hyperedge index of the hyperedge, asserting that the hyperedge exists.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        e_idx = self._e_idx(e_tuple)
+        assert e_idx is not None, f"The hyperedge {e_tuple} does not exist in the hypergraph."
+        return e_idx
+
+    def _clear_cache(self):
+        r"""
+        A frozen hypergraph never changes, so there is nothing to invalidate.
+        """
+
+    def _k_hop(
+        self,
+        v_id: Any,
+        k: int,
+        max_vertices: Optional[int] = None,
+        max_edges: Optional[int] = None,
+        edge_filter: Optional[Callable[[Tuple, Dict], bool]] = None,
+    ) -> Tuple["FrozenHypergraph", bool]:
+        r"""
+        Return the ``k``-hop neighborhood of the vertex (see ``k_hop``) and whether a limit truncated it.
+        """
+        v_idx = self._checked_v_idx(v_id)
+        if edge_filter is not None:
+            e_data, e_label = self.e_data, self._e_label
+
+            def keep(e_idx: int) -> bool:
+                return edge_filter(e_label(e_idx), e_data[e_idx])
+
+        else:
+            keep = None
+
+        v_idxs, e_idxs, truncated = k_hop_search(
+            v_idx, k, self._v_edges, self._e_members, max_vertices, max_edges, keep
+        )
+        pos = {v_idx: i for i, v_idx in enumerate(v_idxs)}
+        csr = build_csr([self._v_ids[i] for i in v_idxs], ([pos[i] for i in self._e_members(j)] for j in e_idxs))
+        sub = FrozenHypergraph(
+            csr=csr, v_data=[self.v_data[i] for i in v_idxs], e_data=[self.e_data[j] for j in e_idxs]
+        )
+        return sub, truncated
+
+    @classmethod
+    def open(cls, file_path: Union[str, Path]) -> "FrozenHypergraph":
+        r"""
+        Open a hypergraph saved in the columnar format by memory-mapping it.
+
+        Only the header is read up front, so opening takes the same time for any file size. Topology queries
+        read the mapped arrays and look ids up in the mapped hash tables; vertex ids and data dicts are
+        unpickled when they are accessed, which makes ``v()`` and ``e()`` return a fresh dict on every call.
+
+        Args:
+            ``file_path`` (``Union[str, Path]``): The file path.
+        """
+        return cls._from_columnar(ColumnarFile(file_path))
+
+    @classmethod
+    def from_buffer(cls, buffer: Any) -> "FrozenHypergraph":
+        r"""
+        Open a hypergraph encoded in the columnar format in a buffer, such as a shared memory block, without
+        copying it. Queries behave as on a hypergraph opened with ``FrozenHypergraph.open``.
+
+        Args:
+            ``buffer`` (``Any``): An object supporting the buffer protocol that holds the encoded hypergraph.
+        """
+        return cls._from_columnar(ColumnarFile.from_buffer(buffer))
+
+    @classmethod
+    def _from_columnar(cls, f: ColumnarFile) -> "FrozenHypergraph":
+        r"""
+        Return the hypergraph reading the arrays, data and hash tables of the columnar file.
+
+        Args:
+            ``f`` (``ColumnarFile``): The columnar file.
+        """
+        csr = CSRIncidence(f.v_ids, f.v_ptr, f.v_edges, f.e_ptr, f.e_verts)
+        return cls(csr=csr, v_data=f.v_data, e_data=f.e_data, _v_index=f.v_index, _e_index=f.e_index)
+
+    def save(self, file_path: Union[str, Path]) -> bool:
+        r"""
+        Save the hypergraph in the memory-mappable columnar format, to be opened with ``FrozenHypergraph.open``.
+
+        Args:
+            ``file_path`` (``Union[str, Path]``): The file path.
+
+        Returns:
+            ``bool``: True if successful, False otherwise.
+        """
+        try:
+            arrays = (self._v_ptr, self._v_edges_arr, self._e_ptr, self._e_verts)
+            write_columnar(file_path, self._v_ids, arrays, self.v_data, self.e_data)
+            return True
+        except Exception:
+            return False
+
+    def share(self) -> "SharedHypergraph":
+        r"""
+        Publish the hypergraph in a shared memory block for worker processes, returning the ``SharedHypergraph``
+        to run ``map`` on. Close it when done, or use it as a context manager.
+        """
+        from .parallel import SharedHypergraph
+
+        return SharedHypergraph(self)
+
+    def v(self, v_id: Any, default: Any = None) -> dict:
+        r"""
+        Return the vertex data.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``default`` (``Any``): The default value if the vertex does not exist.
+        """
+        try:
+            v_idx = self._v_index.get(v_id)
+        except TypeError:
+            raise AssertionError("The vertex id must be hashable.") from None
+        if v_idx is None:
+            return default
+        return self.v_data[v_idx]
+
+    def e(self, e_tuple: Union[List, Set, Tuple], default: Any = None) -> dict:
+        r"""
+        Return the hyperedge data.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+            ``default`` (``Any``): The default value if the hyperedge does not exist.
+        """
+        e_idx = self._e_idx(e_tuple)
+        if e_idx is None:
+            return default
+        return self.e_data[e_idx]
+
+    def encode_e(self, e_tuple: Union[List, Set, Tuple]) -> Tuple:
+        r"""
+        Check the hyperedge tuple and return it in stored order if the hyperedge exists, or ordered by vertex
+        index otherwise.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        e_idx = self._e_idx(e_tuple)
+        if e_idx is not None:
+            return self._e_label(e_idx)
+        return tuple(map(self._v_ids.__getitem__, self._encode_e(e_tuple)))
+
+    @property
+    def all_v(self) -> AbstractSet[Any]:
+        r"""
+        Return a read-only set-like view of all vertices in the hypergraph.
+        """
+        return self._v_index.keys()
+
+    @property
+    def all_e(self) -> AbstractSet[Tuple]:
+        r"""
+        Return a read-only set-like view of all hyperedges in the hypergraph.
+        """
+        return _FrozenEdgeView(self)
+
+    @property
+    def num_v(self) -> int:
+        r"""
+        Return the number of vertices in the hypergraph.
+        """
+        return len(self._v_ptr) - 1
+
+    @property
+    def num_e(self) -> int:
+        r"""
+        Return the number of hyperedges in the hypergraph.
+        """
+        return len(self._e_ptr) - 1
+
+    def has_v(self, v_id: Any) -> bool:
+        r"""
+        Check if the vertex exists.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+        """
+        try:
+            return v_id in self._v_index
+        except TypeError:
+            raise AssertionError("The vertex id must be hashable.") from None
+
+    def has_e(self, e_tuple: Union[List, Set, Tuple]) -> bool:
+        r"""
+        Check if the hyperedge exists.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        try:
+            return self._e_idx(e_tuple) is not None
+        except AssertionError:
+            return False
+
+    def degree_v(self, v_id: Any) -> int:
+        r"""
+        Return the degree of the vertex.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+        """
+        v_idx = self._checked_v_idx(v_id)
+        v_ptr = self._v_ptr
+        return v_ptr[v_idx + 1] - v_ptr[v_idx]
+
+    def degree_e(self, e_tuple: Union[List, Set, Tuple]) -> int:
+        r"""
+        Return the degree of the hyperedge.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        e_idx = self._checked_e_idx(e_tuple)
+        e_ptr = self._e_ptr
+        return e_ptr[e_idx + 1] - e_ptr[e_idx]
+
+    def nbr_e_of_v(self, v_id: Any, copy: bool = True) -> AbstractSet[Tuple]:
+        r"""
+        Return the incident hyperedges of the vertex.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``copy`` (``bool``): Whether to return a new set, or a read-only view over the CSR arrays.
+        """
+        v_idx = self._checked_v_idx(v_id)
+        if not copy:
+            return _FrozenIncidenceView(self, v_idx)
+        v_ids, v_ptr, e_ptr, e_verts = self._v_ids, self._v_ptr, self._e_ptr, self._e_verts
+        return {
+            tuple(map(v_ids.__getitem__, e_verts[e_ptr[j] : e_ptr[j + 1]]))
+            for j in self._v_edges_arr[v_ptr[v_idx] : v_ptr[v_idx + 1]]
+        }
+
+    def nbr_v_of_e(self, e_tuple: Union[List, Set, Tuple], copy: bool = True) -> Union[set, Tuple]:
+        r"""
+        Return the incident vertices of the hyperedge.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+            ``copy`` (``bool``): Whether to return a new set, or the hyperedge tuple in stored order.
+        """
+        e_idx = self._checked_e_idx(e_tuple)
+        if not copy:
+            return self._e_label(e_idx)
+        # the lookup matched the vertex set exactly, so the tuple itself holds the incident vertices
+        return set(e_tuple)
+
+    def nbr_v(self, v_id: Any, exclude_self=True) -> set:
+        r"""
+        Return the neighbors of the vertex.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``exclude_self`` (``bool``): Whether to exclude the vertex itself from neighbors.
+        """
+        v_idx = self._checked_v_idx(v_id)
+        v_ptr, e_ptr, e_verts = self._v_ptr, self._e_ptr, self._e_verts
+        nbrs: set = set()
+        for j in self._v_edges_arr[v_ptr[v_idx] : v_ptr[v_idx + 1]]:
+            nbrs.update(e_verts[e_ptr[j] : e_ptr[j + 1]])
+        if exclude_self:
+            nbrs.discard(v_idx)
+        return set(map(self._v_ids.__getitem__, nbrs))
+
+    def iter_nbr_v(self, v_id: Any, exclude_self: bool = True) -> Iterator[Any]:
+        r"""
+        Lazily iterate over the neighbors of the vertex, each yielded once.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``exclude_self`` (``bool``): Whether to exclude the vertex itself from neighbors.
+        """
+        return self._iter_nbr_v(self._checked_v_idx(v_id), exclude_self)
+
+    def _iter_nbr_v(self, v_idx: int, exclude_self: bool) -> Iterator[Any]:
+        r"""
+        Generator behind ``iter_nbr_v``, kept separate so that the vertex is checked when it is called.
+
+        Args:
+            ``v_idx`` (``int``): The vertex index.
+            ``exclude_self`` (``bool``): Whether to exclude the vertex itself from neighbors.
+        """
+        labels, v_ptr, e_ptr, e_verts = self._v_ids, self._v_ptr, self._e_ptr, self._e_verts
+        seen = {v_idx} if exclude_self else set()
+        for j in self._v_edges_arr[v_ptr[v_idx] : v_ptr[v_idx + 1]]:
+            for i in e_verts[e_ptr[j] : e_ptr[j + 1]]:
+                if i not in seen:
+                    seen.add(i)
+                    yield labels[i]
+
+    def _v_idxs(self, v_ids: Iterable[Any]) -> List[int]:
+        r"""
+        Return the vertex indices of many vertex ids, checking them all in one pass.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+        """
+        v_ids = list(v_ids)
+        try:
+            v_idxs = list(map(self._v_index.get, v_ids))
+        except TypeError:
+            raise AssertionError("The vertex id must be hashable.") from None
+        assert None not in v_idxs, f"The vertex {v_ids[v_idxs.index(None)]} does not exist in the hypergraph."
+        return v_idxs
+
+    def degree_v_many(self, v_ids: Iterable[Any], as_numpy: bool = False) -> Union[List[int], Any]:
+        r"""
+        Return the degrees of many vertices at once.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+            ``as_numpy`` (``bool``): Whether to return a NumPy ``int64`` array instead of a list. Requires ``numpy``.
+        """
+        v_idxs = self._v_idxs(v_ids)
+        v_ptr = self._v_ptr
+        if as_numpy:
+            np = _require_numpy("degree_v_many(as_numpy=True)")
+            ptr = np.frombuffer(v_ptr, dtype=np.int64)
+            idx = np.array(v_idxs, dtype=np.int64)
+            return ptr[idx + 1] - ptr[idx]
+        return [v_ptr[i + 1] - v_ptr[i] for i in v_idxs]
+
+    def nbr_e_of_v_many(self, v_ids: Iterable[Any]) -> List[set]:
+        r"""
+        Return the incident hyperedges of many vertices at once.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+        """
+        labels, v_ptr, v_edges, e_ptr, e_verts = (
+            self._v_ids,
+            self._v_ptr,
+            self._v_edges_arr,
+            self._e_ptr,
+            self._e_verts,
+        )
+        return [
+            {
+                tuple(map(labels.__getitem__, e_verts[e_ptr[j] : e_ptr[j + 1]]))
+                for j in v_edges[v_ptr[i] : v_ptr[i + 1]]
+            }
+            for i in self._v_idxs(v_ids)
+        ]
+
+    def nbr_v_many(self, v_ids: Iterable[Any], exclude_self: bool = True) -> List[set]:
+        r"""
+        Return the neighbors of many vertices at once.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+            ``exclude_self`` (``bool``): Whether to exclude each vertex itself from its neighbors.
+        """
+        labels, v_ptr, v_edges, e_ptr, e_verts = (
+            self._v_ids,
+            self._v_ptr,
+            self._v_edges_arr,
+            self._e_ptr,
+            self._e_verts,
+        )
+        result = []
+        for i in self._v_idxs(v_ids):
+            nbrs: set = set()
+            for j in v_edges[v_ptr[i] : v_ptr[i + 1]]:
+                nbrs.update(e_verts[e_ptr[j] : e_ptr[j + 1]])
+            if exclude_self:
+                nbrs.discard(i)
+            result.append(set(map(labels.__getitem__, nbrs)))
+        return result
+
+    def bfs(self, v_id: Any, max_depth: Optional[int] = None) -> Iterator[Tuple[Any, int]]:
+        r"""
+        Lazily iterate over the vertices reachable from the vertex in breadth-first order, each yielded once
+        with its number of hops from the vertex (the vertex itself first, with 0).
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``max_depth`` (``Optional[int]``): The maximum number of hops, ``None`` for no limit.
+        """
+        v_idx = self._checked_v_idx(v_id)
+        labels = self._v_ids
+        visits = bfs_search(v_idx, self._v_edges, self._e_members, max_depth)
+        return ((labels[i], depth) for i, depth in visits)
+
+    def shortest_path(self, src_v_id: Any, dst_v_id: Any) -> Optional[List[Any]]:
+        r"""
+        Return a path with the fewest hyperedges between two vertices, as the list of vertex ids and hyperedge
+        tuples alternating from ``src_v_id`` to ``dst_v_id``, or ``None`` if there is none.
+
+        Args:
+            ``src_v_id`` (``Any``): The source vertex id.
+            ``dst_v_id`` (``Any``): The target vertex id.
+        """
+        src, dst = self._v_idxs((src_v_id, dst_v_id))
+        path = shortest_path_search(src, dst, self._v_edges, self._e_members)
+        if path is None:
+            return None
+        path[::2] = map(self._v_ids.__getitem__, path[::2])
+        path[1::2] = map(self._e_label, path[1::2])
+        return path
+
+    def connected_components(self) -> Iterator[Set[Any]]:
+        r"""
+        Iterate over the connected components of the hypergraph, as sets of vertex ids. Isolated vertices form
+        components of their own.
+        """
+        components = union_find_components(range(self.num_v), map(self._e_members, range(self.num_e)))
+        labels = self._v_ids
+        return (set(map(labels.__getitem__, component)) for component in components)
+
+    def s_connected_components(self, s: int = 1, return_singletons: bool = False) -> Iterator[Set[Tuple]]:
+        r"""
+        Iterate over the s-connected components of the hypergraph, as sets of hyperedge tuples. Two hyperedges
+        are s-adjacent when they share at least ``s`` vertices, and s-connected when a chain of s-adjacent
+        hyperedges joins them.
+
+        Args:
+            ``s`` (``int``): The number of shared vertices. Defaults to ``1``.
+            ``return_singletons`` (``bool``): Whether to include components of a single hyperedge.
+        """
+        assert isinstance(s, int) and s >= 1, "s must be a positive integer."
+        components = s_components_search(range(self.num_e), self._v_edges, self._e_members, s)
+        return (
+            set(map(self._e_label, component)) for component in components if return_singletons or len(component) > 1
+        )
@@ -0,0 +1,205 @@
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, TextIO, Tuple
+
+# Only encoders without ``indent`` use the C accelerated implementation of the json module.
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+_decoder = json.JSONDecoder()
+# An array separator with the whitespace around it.
+_SEPARATOR = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*")
+# What may follow the part of a number that is decoded when the buffer cuts it, like "1" of "1.5" or "1e3".
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+
+# Array elements are joined and written in chunks of this many elements.
+_WRITE_BATCH = 1024
+
+
+def _write_array(f: TextIO, items: Iterator[Any]):
+    r"""
+    Write the elements of a JSON array, one element per line, without the brackets.
+
+    Args:
+        ``f`` (``TextIO``): The output file.
+        ``items`` (``Iterator[Any]``): The elements.
+    """
+    sep, batch = "\n", []
+    for item in items:
+        batch.append(_encode(item))
+        if len(batch) == _WRITE_BATCH:
+            f.write(sep + ",\n".join(batch))
+            sep, batch = ",\n", []
+    if batch:
+        f.write(sep + ",\n".join(batch))
+    f.write("\n")
+
+
+def write_hif(
+    f: TextIO,
+    incidences: Iterable[Dict],
+    nodes: Iterable[Dict] = (),
+    edges: Iterable[Dict] = (),
+    network_type: str = "undirected",
+):
+    r"""
+    Write a HIF document incrementally, one array element per line.
+
+    Only one batch of encoded elements is held in memory at a time, so the document is never built as a
+    whole. ``nodes`` and ``edges`` are left out of the document if they are empty.
+
+    Args:
+        ``f`` (``TextIO``): The output file.
+        ``incidences`` (``Iterable[dict]``): The incidence records.
+        ``nodes`` (``Iterable[dict]``): The node records.
+        ``edges`` (``Iterable[dict]``): The edge records.
+        ``network_type`` (``str``): The network type.
+    """
+    f.write('{"incidences": [')
+    _write_array(f, iter(incidences))
+    f.write('], "network-type": ' + _encode(network_type))
+    for key, items in (("nodes", nodes), ("edges", edges)):
+        items = iter(items)
+        first = next(items, None)
+        if first is None:
+            continue
+        f.write(f", {_encode(key)}: [")
+        _write_array(f, _chain_first(first, items))
+        f.write("]")
+    f.write("}\n")
+
+
+def _chain_first(first: Any, rest: Iterator[Any]) -> Iterator[Any]:
+    r"""
+    Put back the element taken from an iterator to check that it is not empty.
+    """
+    yield first
+    yield from rest
+
+
+class _JSONStream:
+    r"""
+    Hand-written tokenizer over a text file that is read in chunks.
+
+    It walks the structure of the top-level object itself and hands complete values to the C accelerated
+    ``raw_decode``, reading more of the file whenever a value is cut off at the end of the buffer.
+
+    Args:
+        ``f`` (``TextIO``): The input file.
+        ``chunk_size`` (``int``): The number of characters to read at a time.
+    """
+
+    def __init__(self, f: TextIO, chunk_size: int):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        r"""
+        Drop the consumed part of the buffer and read the next chunk. Return False at the end of the file.
+        """
+        data = self._f.read(self._chunk_size)
+        if not data:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos :] + data
+        self._pos = 0
+        return True
+
+    def _error(self, msg: str) -> ValueError:
+        return ValueError(f"Invalid HIF document: {msg} near {self._buf[self._pos : self._pos + 40]!r}")
+
+    def peek(self) -> str:
+        r"""
+        Skip whitespace and return the next character without consuming it, or ``""`` at the end of the file.
+        """
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\n\r":
+                self._pos += 1
+            if self._pos < len(self._buf) or not self._fill():
+                return self._buf[self._pos : self._pos + 1]
+
+    def expect(self, chars: str) -> str:
+        r"""
+        Consume the next character, which must be one of ``chars``, and return it.
+        """
+        char = self.peek()
+        if not char or char not in chars:
+            raise self._error(f"expected one of {chars!r}")
+        self._pos += 1
+        return char
+
+    def value(self) -> Any:
+        r"""
+        Consume and return the next complete JSON value.
+        """
+        if not self.peek():
+            raise self._error("unexpected end of file")
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # a number or literal that ends the buffer may continue in the next chunk, also when its fraction or
+            # exponent is cut after the ".", "e" or sign, which leaves a shorter valid number to decode
+            if not self._eof and (
+                end == len(self._buf)
+                or (obj.__class__ in (int, float) and _NUMBER_TAIL.match(self._buf, end).end() == len(self._buf))
+            ):
+                if self._fill():
+                    continue
+            self._pos = end
+            return obj
+
+    def array(self) -> Iterator[Any]:
+        r"""
+        Consume a JSON array, yielding its elements one at a time.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            # fast path for a separator that is complete in the buffer
+            match = _SEPARATOR.match(self._buf, self._pos)
+            if match is not None:
+                self._pos = match.end()
+                if match.group(1) == "]":
+                    return
+            elif self.expect(",]") == "]":
+                return
+
+
+def iter_hif(f: TextIO, chunk_size: int = 1 << 16) -> Iterator[Tuple[str, Any]]:
+    r"""
+    Incrementally parse a HIF document, yielding ``(key, value)`` for each member of the top-level object.
+
+    Array values are yielded as iterators over their elements that read the file as they are consumed,
+    so only one element is in memory at a time. Each one must be consumed (or is skipped) before the next
+    member is read. Other values are yielded as parsed.
+
+    Args:
+        ``f`` (``TextIO``): The input file.
+        ``chunk_size`` (``int``): The number of characters to read at a time.
+    """
+    stream = _JSONStream(f, chunk_size)
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value()
+        if not isinstance(key, str):
+            raise stream._error("expected a string key")
+        stream.expect(":")
+        if stream.peek() == "[":
+            elements = stream.array()
+            yield key, elements
+            for _ in elements:
+                pass
+        else:
+            yield key, stream.value()
+        if stream.expect(",}") == "}":
+            return
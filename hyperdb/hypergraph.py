@@ -1,425 +1,2667 @@
 import json
+import os
 import pickle as pkl
+import struct
+import weakref
+import zlib
+from array import array
 from collections import defaultdict
 from collections.abc import Hashable
-from copy import deepcopy
-from dataclasses import dataclass, field
-from functools import cached_property
+from collections.abc import Set as AbstractSetABC
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from functools import wraps
+from itertools import repeat, tee
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import AbstractSet, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from hyperdb import matrix
+from hyperdb.base import BaseHypergraphDB, _require_numpy
+from hyperdb.frozen import CSRIncidence, FrozenHypergraph, build_csr
+from hyperdb.hif import iter_hif, write_hif
+from hyperdb.index import AttributeIndex, DegreeIndex, IdIndex, TextIndex
+from hyperdb.lock import RWLock
+from hyperdb.parallel import SharedHypergraph
+from hyperdb.traversal import (
+    bfs_search,
+    k_hop_search,
+    s_components_search,
+    shortest_path_search,
+    union_find_components,
+)
+from hyperdb.versions import Versions, newer_versions, versioned
+from hyperdb.view import HypergraphView
+
+# Internal key returned for vertex ids that are not interned, never present in the storage dicts.
+_MISSING = object()
+
+# The incidence of a vertex is a compact array of edge ids up to this degree, and a set beyond it.
+_INCI_ARRAY_MAX = 64
+
+# The write-ahead log starts with a magic string and the generation of the snapshot it applies to, followed by
+# records of a length and CRC32 header and a pickled ``(method name, args)`` payload.
+_WAL_HEADER = struct.Struct("<8sQ")
+_WAL_MAGIC = b"HGDBWAL1"
+_WAL_RECORD = struct.Struct("<II")
+
+# The tables that snapshots read through views keeping versions of what changes, see ``HypergraphDB.snapshot``.
+_VERSIONED = (
+    "_v_data",
+    "_v_inci",
+    "_v_index",
+    "_v_label",
+    "_v_free",
+    "_v_reuses",
+    "_e_data",
+    "_e_tuple",
+    "_e_index",
+    "_e_free",
+    "_e_reuses",
+)
+
+# The merge policies of ``remove_v`` for a shrunken hyperedge that already exists, besides callables.
+_MERGE_POLICIES = ("overwrite", "keep", "update")
+
+
+def _is_hashable(value: Any) -> bool:
+    r"""
+    Return whether ``hash(value)`` succeeds, which also hashes the items of a tuple.
+    """
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _write_locked(method):
+    r"""
+    Run a method of ``HypergraphDB`` while holding the write lock of the hypergraph.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        lock = self.lock
+        lock.acquire_write()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            lock.release_write()
+
+    return wrapper
+
+
+def _mutating(method):
+    r"""
+    Run a mutating method of ``HypergraphDB`` while holding the write lock, after dropping the versions kept for
+    the snapshots once they are all gone (see ``HypergraphDB.snapshot``).
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        lock = self.lock
+        lock.acquire_write()
+        try:
+            if self._owned_inci is not None and not self._snapshots:
+                self._stop_sharing()
+            return method(self, *args, **kwargs)
+        finally:
+            lock.release_write()
+
+    return wrapper
+
+
+@dataclass
+class _Transaction:
+    r"""
+    State of a running ``HypergraphDB.transaction()``.
+
+    Args:
+        ``undo`` (``List[Tuple[Callable, Tuple]]``): The undo log, ``(method, args)`` calls that revert the writes
+            in reverse order.
+        ``records`` (``List[bytes]``): The pickled write-ahead log records of the mutations, written as one record
+            on commit.
+        ``dirty`` (``bool``): Whether anything changed, so that the version is bumped once on exit.
+    """
+
+    undo: List[Tuple[Callable, Tuple]] = field(default_factory=list)
+    records: List[bytes] = field(default_factory=list)
+    dirty: bool = False
+
+
+class _Snapshots:
+    r"""
+    Weak references to the snapshots of a hypergraph, newest last. Like the lock, they are not copied or pickled
+    with the hypergraph.
+    """
+
+    __slots__ = ("_refs",)
+
+    def __init__(self):
+        self._refs: List[weakref.ref] = []
+
+    def __deepcopy__(self, memo) -> "_Snapshots":
+        return _Snapshots()
+
+    def __copy__(self) -> "_Snapshots":
+        return _Snapshots()
+
+    def __reduce__(self):
+        return _Snapshots, ()
+
+    def __bool__(self) -> bool:
+        self._refs = [ref for ref in self._refs if ref() is not None]
+        return bool(self._refs)
 
-from hyperdb.base import BaseHypergraphDB
+    def add(self, snapshot: "HypergraphSnapshot"):
+        self._refs.append(weakref.ref(snapshot))
+
+    def last(self) -> Optional["HypergraphSnapshot"]:
+        return self._refs[-1]() if self._refs else None
+
+
+class _InternedEdgeView(AbstractSetABC):
+    r"""
+    Read-only set-like view of the hyperedges of an interned hypergraph, translated back to vertex ids.
+    """
+
+    __slots__ = ("_hg",)
+
+    def __init__(self, hg: "HypergraphDB"):
+        self._hg = hg
+
+    def __len__(self) -> int:
+        return len(self._hg._e_index)
+
+    def __iter__(self) -> Iterator[Tuple]:
+        return map(self._hg._e_label, self._hg._e_index)
+
+    def __contains__(self, e_tuple: Any) -> bool:
+        if not isinstance(e_tuple, tuple):
+            return False
+        try:
+            e_key = self._hg._encode_e(e_tuple)
+        except (AssertionError, TypeError):
+            return False
+        return e_key in self._hg._e_index and self._hg._e_label(e_key) == e_tuple
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({set(self)!r})"
+
+
+class _IncidenceView(AbstractSetABC):
+    r"""
+    Read-only set-like view of the hyperedges incident to a vertex, read from its incidence set on every access.
+    """
+
+    __slots__ = ("_hg", "_v_key")
+
+    def __init__(self, hg: "HypergraphDB", v_key: Any):
+        self._hg = hg
+        self._v_key = v_key
+
+    def _inci(self) -> Iterable[int]:
+        # looked up on every access: the incidence set is replaced when it grows past _INCI_ARRAY_MAX
+        if self._hg.intern_v:
+            return self._hg._v_inci[self._v_key] or ()
+        return self._hg._v_inci.get(self._v_key, ())
+
+    def __len__(self) -> int:
+        return len(self._inci())
+
+    def __iter__(self) -> Iterator[Tuple]:
+        e_keys = map(self._hg._e_tuple.__getitem__, self._inci())
+        if self._hg.intern_v:
+            return map(self._hg._e_label, e_keys)
+        return e_keys
+
+    def __contains__(self, e_tuple: Any) -> bool:
+        if not isinstance(e_tuple, tuple):
+            return False
+        try:
+            e_key = self._hg._encode_e(e_tuple)
+        except (AssertionError, TypeError):
+            return False
+        e_id = self._hg._e_index.get(e_key)
+        return e_id is not None and e_id in self._inci() and self._hg._e_label(e_key) == e_tuple
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({set(self)!r})"
 
 
 @dataclass
 class HypergraphDB(BaseHypergraphDB):
     r"""
     Hypergraph database.
+
+    Every hyperedge gets an integer edge id that stays the same for as long as the hyperedge exists (ids of
+    removed hyperedges are reused). Hyperedge data and tuples are stored in lists indexed by the edge id, a
+    tuple-to-id index serves lookups by tuple, and the incidence of each vertex holds edge ids: an
+    ``array("q")`` while the degree is small, promoted to a ``set`` once it exceeds ``_INCI_ARRAY_MAX`` so
+    that removals from hub vertices stay cheap.
+
+    Args:
+        ``intern_v`` (``bool``): Map vertex ids to dense integers internally. Vertex data and incidence are
+            then stored in lists indexed by those integers and hyperedges as tuples of them, instead of tuples
+            of the original ids, which saves memory for string ids and makes hyperedge encoding independent of
+            how the ids compare. The integers of removed vertices are reused by the next new ones, so the lists
+            do not grow under churn. Hyperedge tuples returned by the API are ordered by those integers, which
+            follow the vertex insertion order until vertices are removed, instead of by vertex id. Defaults to
+            ``False``.
+        ``wal`` (``bool``): Append every mutation to a write-ahead log next to ``storage_file``
+            (``<storage_file>.wal``) and replay it on load, so that writes survive a crash without re-saving the
+            whole hypergraph. ``checkpoint()`` (or ``save(storage_file)``) compacts the log into the snapshot.
+            Defaults to ``False``.
+        ``wal_sync_every`` (``int``): Fsync the log after this many records; ``0`` leaves it to the OS. Every
+            record is flushed to the OS immediately, so only a power loss can lose unsynced records.
+            Defaults to ``1``.
+        ``wal_checkpoint_every`` (``int``): Checkpoint automatically once the log holds this many records;
+            ``0`` disables it. Defaults to ``10000``.
+        ``autoload`` (``bool``): Load ``storage_file`` on creation if it exists. Turn it off to start an empty
+            hypergraph that will be saved over an existing file; it cannot be combined with ``wal``.
+            Defaults to ``True``.
+
+    Mutations, loading and saving hold the write lock of ``lock`` (an ``RWLock``), so they are serialized with
+    each other. Reads do not take it; wrap a group of reads in ``with hg.lock.read():`` to keep writers out
+    while they run, or run them on ``hg.snapshot()``, which keeps a consistent state without holding the lock,
+    e.g. when serving the hypergraph to several threads. Group mutations in ``with hg.transaction():`` to apply
+    them all or none.
     """
 
-    _v_data: Dict[Any, Any] = field(default_factory=dict)
-    _e_data: Dict[Tuple, Any] = field(default_factory=dict)
-    _v_inci: Dict[Any, Set[Tuple]] = field(default_factory=lambda: defaultdict(set))
+    intern_v: bool = False
+    wal: bool = field(default=False, compare=False)
+    wal_sync_every: int = field(default=1, compare=False)
+    wal_checkpoint_every: int = field(default=10000, compare=False)
+    autoload: bool = field(default=True, compare=False)
+    _v_data: Union[Dict[Any, Any], List[Any]] = field(default_factory=dict)
+    _e_data: List[Optional[Dict]] = field(default_factory=list)
+    _v_inci: Union[Dict[Any, Any], List[Any]] = field(default_factory=lambda: defaultdict(set))
+    _v_index: Dict[Any, int] = field(default_factory=dict)
+    _v_label: List[Any] = field(default_factory=list)
+    _e_tuple: List[Optional[Tuple]] = field(default_factory=list)
+    _e_index: Dict[Tuple, int] = field(default_factory=dict)
+    _e_free: List[int] = field(default_factory=list)
+    _v_free: List[int] = field(default_factory=list)
+    _v_indexes: Dict[str, Union[AttributeIndex, TextIndex]] = field(default_factory=dict, compare=False)
+    _e_indexes: Dict[str, Union[AttributeIndex, TextIndex]] = field(default_factory=dict, compare=False)
+    _v_id_indexes: Dict[str, Union[IdIndex, TextIndex]] = field(default_factory=dict, compare=False)
+    _v_degree_index: Optional[DegreeIndex] = field(default=None, compare=False)
 
     def __post_init__(self):
+        self.lock = RWLock()
+        self._version = 0
+        self._txn: Optional[_Transaction] = None
+        self._matrix_cache: Dict[Any, Any] = {}
+        self._matrix_version = 0
+        self._e_reuses: Dict[int, int] = {}
+        self._v_reuses: Dict[int, int] = {}
+        self._snapshots = _Snapshots()
+        self._versions: Optional[Versions] = None
+        self._owned_inci: Optional[Set[Any]] = None
+        self._owned_v_data: Optional[Set[Any]] = None
+        self._owned_e_data: Optional[Set[int]] = None
         assert isinstance(self.storage_file, (str, Path))
+        assert self.autoload or not self.wal, "A write-ahead-logged hypergraph must load its storage file."
+        if self.intern_v and not self._v_label:
+            self._v_data, self._v_inci = [], []
         if isinstance(self.storage_file, str):
             self.storage_file = Path(self.storage_file)
-        if self.storage_file.exists():
+        self._wal_file = None
+        self._wal_gen = 0
+        self._wal_end: Optional[int] = None
+        self._wal_records = self._wal_unsynced = 0
+        self._wal_paused = False
+        if self.autoload and self.storage_file.exists():
             self.load(self.storage_file)
+        elif self.wal:
+            self._replay_wal()
+        if self.wal:
+            self._open_wal()
 
+    @_write_locked
     def load(self, storage_file: Union[str, Path]) -> bool:
         r"""
-        Load the hypergraph database from the storage file.
+        Load the hypergraph database from the storage file.
+        """
+        assert self._txn is None, "Cannot load inside a transaction."
+        try:
+            with open(storage_file, "rb") as f:
+                data = pkl.load(f)
+            if self._versions is not None:
+                # the snapshots keep the replaced tables, and these counters which are not replaced
+                self._v_reuses, self._e_reuses = dict(self._v_reuses), dict(self._e_reuses)
+            self._versions = self._owned_inci = self._owned_v_data = self._owned_e_data = None
+            self._v_data = data.get("v_data", {})
+            self._v_inci = data.get("v_inci", {})
+            self.intern_v = data.get("intern_v", False)
+            self._v_index = data.get("v_index", {})
+            self._v_label = data.get("v_label", [])
+            self._v_free = data.get("v_free")
+            if self._v_free is None:
+                # files written before the vertex keys of removed vertices were reused
+                self._v_free = (
+                    [v_key for v_key, v_data in enumerate(self._v_data) if v_data is None] if self.intern_v else []
+                )
+            if "e_index" in data:
+                self._e_data = data["e_data"]
+                self._e_tuple = data["e_tuple"]
+                self._e_index = data["e_index"]
+                self._e_free = data["e_free"]
+            else:
+                # files written before edge ids key the hyperedge data by tuple
+                self._reindex_e(data.get("e_data", {}))
+            self._v_indexes = data.get("v_indexes", {})
+            self._e_indexes = data.get("e_indexes", {})
+            self._v_id_indexes = data.get("v_id_indexes", {})
+            self._v_degree_index = data.get("v_degree_index")
+            self._wal_gen = data.get("wal_gen", 0)
+            self._stop_sharing()
+            self._clear_cache()
+            if self.wal and Path(storage_file) == self.storage_file:
+                self._replay_wal()
+            return True
+        except Exception:
+            return False
+
+    @_write_locked
+    def save(self, storage_file: Union[str, Path]) -> bool:
+        r"""
+        Save the hypergraph database to the storage file.
+
+        The file is replaced atomically. Saving a write-ahead-logged hypergraph to its own ``storage_file``
+        is a ``checkpoint()``.
+        """
+        assert self._txn is None, "Cannot save inside a transaction."
+        if self.wal and Path(storage_file) == self.storage_file:
+            return self.checkpoint()
+        return self._write_snapshot(storage_file)
+
+    def _write_snapshot(self, storage_file: Union[str, Path]) -> bool:
+        r"""
+        Pickle the hypergraph to a temporary file and atomically move it over the storage file.
+
+        Args:
+            ``storage_file`` (``Union[str, Path]``): The file path to save the hypergraph.
+        """
+        data = {
+            "v_data": self._v_data,
+            "v_inci": self._v_inci,
+            "e_data": self._e_data,
+            "intern_v": self.intern_v,
+            "v_index": self._v_index,
+            "v_label": self._v_label,
+            "e_tuple": self._e_tuple,
+            "e_index": self._e_index,
+            "e_free": self._e_free,
+            "v_free": self._v_free,
+            "v_indexes": self._v_indexes,
+            "e_indexes": self._e_indexes,
+            "v_id_indexes": self._v_id_indexes,
+            "v_degree_index": self._v_degree_index,
+            "wal_gen": self._wal_gen,
+        }
+        tmp_file = Path(f"{storage_file}.tmp")
+        try:
+            with open(tmp_file, "wb") as f:
+                pkl.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, storage_file)
+            return True
+        except Exception:
+            return False
+
+    def save_as(self, format: str, file_path: Union[str, Path]) -> bool:
+        r"""
+        Save the hypergraph to a specific format.
+
+        Args:
+            ``format`` (``str``): ``"hif"`` (see ``save_as_hif``), or ``"columnar"`` for the memory-mappable
+                format that ``FrozenHypergraph.open`` serves queries from without loading it.
+            ``file_path`` (``Union[str, Path]``): The file path to export the hypergraph.
+
+        Returns:
+            ``bool``: True if successful, False otherwise.
+        """
+        if format == "hif":
+            return self.save_as_hif(file_path)
+        assert format == "columnar", f"Unsupported format: {format}."
+        return self.freeze().save(file_path)
+
+    @_write_locked
+    def load_from(self, format: str, file_path: Union[str, Path]) -> bool:
+        r"""
+        Replace the hypergraph with one loaded from a specific format.
+
+        Args:
+            ``format`` (``str``): ``"hif"`` (see ``load_from_hif``) or ``"columnar"``.
+            ``file_path`` (``Union[str, Path]``): The file path to import the hypergraph from.
+
+        Returns:
+            ``bool``: True if successful, False otherwise.
+        """
+        if format == "hif":
+            return self.load_from_hif(file_path)
+        assert format == "columnar", f"Unsupported format: {format}."
+        try:
+            fhg = FrozenHypergraph.open(file_path)
+            # the import is logged as a checkpoint rather than as mutations
+            self._wal_paused = True
+            self._reset()
+            self.add_v_batch(fhg.csr.v_ids, fhg.v_data)
+            self.add_e_batch(fhg.all_e, fhg.e_data)
+            if self._wal_file is not None:
+                self._wal_paused = False
+                return self.checkpoint()
+            return True
+        except Exception:
+            return False
+        finally:
+            self._wal_paused = False
+
+    @property
+    def wal_file(self) -> Path:
+        r"""
+        Return the path of the write-ahead log of ``storage_file``.
+        """
+        return Path(f"{self.storage_file}.wal")
+
+    def _replay_wal(self):
+        r"""
+        Re-apply the records of the write-ahead log that belong to the loaded snapshot.
+
+        A log written for an older snapshot generation was already compacted into the snapshot and is
+        skipped. Replay stops at the first torn or corrupted record, which is where a crash interrupted a write.
+        """
+        self._wal_end, self._wal_records = None, 0
+        if not self.wal_file.exists():
+            return
+        with open(self.wal_file, "rb") as f:
+            header = f.read(_WAL_HEADER.size)
+            if len(header) < _WAL_HEADER.size:
+                return
+            magic, gen = _WAL_HEADER.unpack(header)
+            if magic != _WAL_MAGIC or gen != self._wal_gen:
+                return
+            end, records = f.tell(), 0
+            self._wal_paused = True
+            try:
+                while True:
+                    record = f.read(_WAL_RECORD.size)
+                    if len(record) < _WAL_RECORD.size:
+                        break
+                    size, crc = _WAL_RECORD.unpack(record)
+                    payload = f.read(size)
+                    if len(payload) < size or zlib.crc32(payload) != crc:
+                        break
+                    op, args = pkl.loads(payload)
+                    getattr(self, op)(*args)
+                    end, records = f.tell(), records + 1
+            finally:
+                self._wal_paused = False
+        self._wal_end, self._wal_records = end, records
+
+    def _open_wal(self):
+        r"""
+        Open the write-ahead log for appending after replay, dropping a torn tail or starting a new log.
+        """
+        if self._wal_end is None:
+            self._wal_file = open(self.wal_file, "wb")
+            self._wal_file.write(_WAL_HEADER.pack(_WAL_MAGIC, self._wal_gen))
+            self._wal_file.flush()
+            os.fsync(self._wal_file.fileno())
+            self._wal_end, self._wal_records = self._wal_file.tell(), 0
+        else:
+            self._wal_file = open(self.wal_file, "r+b")
+            self._wal_file.truncate(self._wal_end)
+            self._wal_file.seek(self._wal_end)
+        self._wal_unsynced = 0
+
+    def _log(self, op: str, *args: Any):
+        r"""
+        Append a mutation to the write-ahead log, if there is one.
+
+        Called after the mutation was applied, so only mutations that passed validation are logged, and
+        replaying the log calls the same method with the same arguments.
+
+        Args:
+            ``op`` (``str``): The name of the mutating method.
+            ``args`` (``Any``): Its arguments.
+        """
+        if self._wal_file is None or self._wal_paused:
+            return
+        payload = pkl.dumps((op, args), protocol=pkl.HIGHEST_PROTOCOL)
+        if self._txn is not None:
+            self._txn.records.append(payload)
+            return
+        self._wal_file.write(_WAL_RECORD.pack(len(payload), zlib.crc32(payload)) + payload)
+        self._wal_file.flush()
+        self._wal_records += 1
+        self._wal_unsynced += 1
+        if self.wal_sync_every and self._wal_unsynced >= self.wal_sync_every:
+            os.fsync(self._wal_file.fileno())
+            self._wal_unsynced = 0
+        if self.wal_checkpoint_every and self._wal_records >= self.wal_checkpoint_every:
+            self.checkpoint()
+
+    def _apply_records(self, records: List[bytes]):
+        r"""
+        Re-apply the mutations of a committed transaction, logged as one write-ahead log record.
+
+        Args:
+            ``records`` (``List[bytes]``): The pickled ``(method name, args)`` records of the mutations.
+        """
+        for record in records:
+            op, args = pkl.loads(record)
+            getattr(self, op)(*args)
+
+    @_write_locked
+    def checkpoint(self) -> bool:
+        r"""
+        Compact the write-ahead log: write a new snapshot to ``storage_file`` and start an empty log.
+
+        The snapshot carries a new generation number, so a crash between writing it and resetting the
+        log leaves an outdated log that is skipped on load instead of being applied twice.
+
+        Returns:
+            ``bool``: True if successful, False otherwise.
+        """
+        assert self._txn is None, "Cannot checkpoint inside a transaction."
+        self._wal_gen += 1
+        if not self._write_snapshot(self.storage_file):
+            self._wal_gen -= 1
+            return False
+        if self._wal_file is not None:
+            self._wal_file.close()
+            self._wal_end = None
+            self._open_wal()
+        return True
+
+    @_write_locked
+    def close(self):
+        r"""
+        Fsync and close the write-ahead log. Later mutations are no longer logged.
+        """
+        if self._wal_file is not None:
+            self._wal_file.flush()
+            os.fsync(self._wal_file.fileno())
+            self._wal_file.close()
+            self._wal_file = None
+
+    @contextmanager
+    def transaction(self) -> Iterator["HypergraphDB"]:
+        r"""
+        Group mutations so that they are applied all or none: ``with hg.transaction(): ...``.
+
+        Mutations run as usual inside the ``with`` block, which sees their effects, and each records how to
+        revert its writes in an undo log. If the block raises, the log is replayed backwards to restore the
+        hypergraph and the exception propagates; otherwise the mutations are committed.
+
+        The write lock is held for the whole block, so readers that take the read lock see the hypergraph
+        either before or after the transaction, never in between. ``version`` is bumped once at the end and
+        the write-ahead log gets one record for the whole transaction, written on commit, so a crash never
+        replays part of it. Transactions can be nested: a failing inner block only reverts its own mutations.
+        Saving and loading are not allowed inside a transaction.
+        """
+        self.lock.acquire_write()
+        outer = self._txn
+        txn = outer if outer is not None else _Transaction()
+        undo_mark, records_mark = len(txn.undo), len(txn.records)
+        self._txn = txn
+        committed = False
+        try:
+            yield self
+            committed = True
+        except BaseException:
+            self._rollback(txn, undo_mark)
+            del txn.records[records_mark:]
+            raise
+        finally:
+            if outer is None:
+                self._txn = None
+                if txn.dirty:
+                    self._clear_cache()
+                if committed and txn.records:
+                    self._log("_apply_records", txn.records)
+            self.lock.release_write()
+
+    def _rollback(self, txn: _Transaction, undo_mark: int):
+        r"""
+        Revert the writes of a transaction recorded after ``undo_mark`` in its undo log.
+
+        Args:
+            ``txn`` (``_Transaction``): The transaction.
+            ``undo_mark`` (``int``): The length of the undo log when the (nested) transaction started.
+        """
+        undo = txn.undo
+        self._txn = None
+        try:
+            while len(undo) > undo_mark:
+                method, args = undo.pop()
+                method(*args)
+        finally:
+            self._txn = txn
+
+    def snapshot(self) -> "HypergraphSnapshot":
+        r"""
+        Return a read-only snapshot of the hypergraph, a ``HypergraphSnapshot`` that keeps the vertices,
+        hyperedges, data and indexes of this moment while the hypergraph changes. Long-running queries and API
+        requests read it without holding the read lock, so they never see a half-applied mutation and writers
+        never wait for them.
+
+        Taking a snapshot costs constant time: it shares the storage of the hypergraph, and repeated calls
+        return the same snapshot until the hypergraph changes. The snapshot reads the tables of vertices and
+        hyperedges and the indexes through views that keep versions of what changes (see ``Versions``): while
+        snapshots are alive, a mutation saves the previous entries of the records it touches before changing
+        them, and copies the incidence or the data dict of a record before changing it for the first time since
+        the last snapshot, so it costs time in the number of touched records rather than in the size of the
+        hypergraph. Reads of a snapshot go through the views and are slower than reads of the hypergraph. Once
+        the snapshots are garbage collected, writes copy nothing. A data dict obtained from the hypergraph before
+        a snapshot may belong to the snapshot after the next write; get it again from the hypergraph.
+
+        The write lock is held for a moment, so a snapshot is never taken in the middle of a mutation or of a
+        transaction of another thread.
+        """
+        with self.lock.write():
+            assert self._txn is None, "Cannot take a snapshot inside a transaction."
+            snapshot = self._snapshots.last()
+            if snapshot is None or snapshot.version != self._version:
+                versions = self._versions = newer_versions(self._versions)
+                tables = {name: versioned(getattr(self, name), name, versions) for name in _VERSIONED}
+                kwargs = {f.name: tables.get(f.name, getattr(self, f.name)) for f in fields(self)}
+                kwargs.update(
+                    wal=False,
+                    autoload=False,
+                    _v_indexes={name: index.snapshot() for name, index in self._v_indexes.items()},
+                    _e_indexes={name: index.snapshot() for name, index in self._e_indexes.items()},
+                    _v_id_indexes={name: index.snapshot() for name, index in self._v_id_indexes.items()},
+                    _v_degree_index=None if self._v_degree_index is None else self._v_degree_index.snapshot(),
+                )
+                snapshot = HypergraphSnapshot(**kwargs)
+                snapshot._version, snapshot._e_reuses, snapshot._v_reuses = (
+                    self._version,
+                    tables["_e_reuses"],
+                    tables["_v_reuses"],
+                )
+                self._snapshots.add(snapshot)
+                self._owned_inci, self._owned_v_data, self._owned_e_data = set(), set(), set()
+        return snapshot
+
+    def _stop_sharing(self):
+        r"""
+        Write in place again without keeping versions, once no snapshot shares the storage.
+        """
+        self._versions = None
+        self._owned_inci = self._owned_v_data = self._owned_e_data = None
+        for index in (*self._v_indexes.values(), *self._e_indexes.values(), *self._v_id_indexes.values()):
+            index.unshare()
+        if self._v_degree_index is not None:
+            self._v_degree_index.unshare()
+
+    def _save_e(self, e_id: int, e_key: Tuple):
+        r"""
+        Keep the entries of a hyperedge in the tables for the snapshots before writing them, see ``snapshot``.
+
+        Args:
+            ``e_id`` (``int``): The edge id.
+            ``e_key`` (``Tuple``): The internal hyperedge key.
+        """
+        versions = self._versions
+        versions.save("_e_index", self._e_index, e_key)
+        versions.save("_e_tuple", self._e_tuple, e_id)
+        versions.save("_e_data", self._e_data, e_id)
+
+    def _save_v(self, v_id: Any, v_key: Any):
+        r"""
+        Keep the entries of a vertex in the tables for the snapshots before writing them, see ``snapshot``.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``v_key`` (``Any``): The internal key of the vertex.
+        """
+        versions = self._versions
+        if self.intern_v:
+            versions.save("_v_index", self._v_index, v_id)
+            versions.save("_v_label", self._v_label, v_key)
+        versions.save("_v_data", self._v_data, v_key)
+        versions.save("_v_inci", self._v_inci, v_key)
+
+    def _own_inci(self, v_key: Any) -> Union[array, Set[int]]:
+        r"""
+        Return the incidence of a vertex to change it, after copying it if a snapshot may share it.
+
+        Args:
+            ``v_key`` (``Any``): The internal key of the vertex.
+        """
+        inci = self._v_inci[v_key]
+        owned = self._owned_inci
+        if owned is not None and v_key not in owned:
+            owned.add(v_key)
+            self._versions.save("_v_inci", self._v_inci, v_key)
+            inci = self._v_inci[v_key] = inci.copy() if inci.__class__ is set else array("q", inci)
+        return inci
+
+    def _own_v_data(self, v_key: Any) -> Dict:
+        r"""
+        Return the data of a vertex to change it, after copying it if a snapshot may share it.
+
+        Args:
+            ``v_key`` (``Any``): The internal key of the vertex.
+        """
+        data = self._v_data[v_key]
+        owned = self._owned_v_data
+        if owned is not None and v_key not in owned:
+            owned.add(v_key)
+            self._versions.save("_v_data", self._v_data, v_key)
+            data = self._v_data[v_key] = dict(data)
+        return data
+
+    def _own_e_data(self, e_id: int) -> Dict:
+        r"""
+        Return the data of a hyperedge to change it, after copying it if a snapshot may share it.
+
+        Args:
+            ``e_id`` (``int``): The edge id.
+        """
+        data = self._e_data[e_id]
+        owned = self._owned_e_data
+        if owned is not None and e_id not in owned:
+            owned.add(e_id)
+            self._versions.save("_e_data", self._e_data, e_id)
+            data = self._e_data[e_id] = dict(data)
+        return data
+
+    def _reindex_e(self, e_data: Dict[Tuple, Dict]):
+        r"""
+        Rebuild the hyperedge tables and the incidence sets from hyperedge data keyed by internal hyperedge key.
+
+        Args:
+            ``e_data`` (``Dict[Tuple, dict]``): The hyperedge data keyed by internal hyperedge key.
+        """
+        self._e_data, self._e_tuple, self._e_index, self._e_free = [], [], {}, []
+        for v_key in self._v_index.values() if self.intern_v else self._v_data:
+            self._v_inci[v_key] = array("q")
+        for e_key, data in e_data.items():
+            self._add_e_key(e_key, data)
+
+    def _reset(self):
+        r"""
+        Remove all vertices and hyperedges.
+        """
+        assert self._txn is None, "Cannot replace the hypergraph inside a transaction."
+        self._v_data = [] if self.intern_v else {}
+        self._v_inci = [] if self.intern_v else defaultdict(set)
+        self._v_index = {}
+        self._v_label, self._v_free = [], []
+        self._e_data, self._e_tuple, self._e_index, self._e_free = [], [], {}, []
+        for index in (*self._v_indexes.values(), *self._e_indexes.values(), *self._v_id_indexes.values()):
+            index.clear()
+        if self._v_degree_index is not None:
+            self._v_degree_index.clear()
+        if self._versions is not None:
+            # the snapshots keep the replaced tables, and these counters which are not replaced
+            self._v_reuses, self._e_reuses = dict(self._v_reuses), dict(self._e_reuses)
+        self._stop_sharing()
+        self._clear_cache()
+
+    def _clear_cache(self):
+        r"""
+        Invalidate anything derived from the hypergraph after a mutation.
+
+        ``all_v``, ``all_e``, ``num_v`` and ``num_e`` are live views over the storage dicts and never
+        need to be rebuilt. Caches outside the hypergraph compare ``version``, which is bumped here, or once
+        when a transaction ends.
+        """
+        if self._txn is not None:
+            self._txn.dirty = True
+            return
+        self._version += 1
+
+    @property
+    def version(self) -> int:
+        r"""
+        Return the mutation version: a counter increased by every change of the vertices, hyperedges or their
+        data, so that anything computed from the hypergraph can be cached until the version changes. It starts
+        at 0 for each instance and is not saved.
+        """
+        return self._version
+
+    def _v_key(self, v_id: Any) -> Any:
+        r"""
+        Return the internal key of the vertex id, or ``_MISSING`` if the vertex does not exist.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+        """
+        if self.intern_v:
+            return self._v_index.get(v_id, _MISSING)
+        return v_id if v_id in self._v_data else _MISSING
+
+    def _e_label(self, e_key: Tuple) -> Tuple:
+        r"""
+        Return the hyperedge tuple of vertex ids for the internal hyperedge key.
+
+        Args:
+            ``e_key`` (``Tuple``): The internal hyperedge key.
+        """
+        if self.intern_v:
+            return tuple(map(self._v_label.__getitem__, e_key))
+        return e_key
+
+    def _v_items(self) -> Iterator[Tuple[Any, Dict]]:
+        r"""
+        Iterate over ``(v_id, v_data)`` pairs of all vertices.
+        """
+        if self.intern_v:
+            return ((v_id, self._v_data[v_key]) for v_id, v_key in self._v_index.items())
+        return iter(self._v_data.items())
+
+    def _e_items(self) -> Iterator[Tuple[Tuple, Dict]]:
+        r"""
+        Iterate over ``(e_tuple, e_data)`` pairs of all hyperedges.
+        """
+        _e_data, _e_label = self._e_data, self._e_label
+        return ((_e_label(e_key), _e_data[e_id]) for e_key, e_id in self._e_index.items())
+
+    def _encode_e(self, e_tuple: Union[List, Set, Tuple]) -> Tuple:
+        r"""
+        Sort and check the hyperedge tuple, and return its internal key.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
+        if self.intern_v:
+            tmp = []
+            for v_id in set(e_tuple):
+                v_key = self._v_index.get(v_id)
+                assert v_key is not None, f"The vertex {v_id} does not exist in the hypergraph."
+                tmp.append(v_key)
+            tmp.sort()
+            return tuple(tmp)
+        tmp = sorted(list(set(e_tuple)))
+        for v_id in tmp:
+            assert isinstance(v_id, Hashable), "The vertex id must be hashable."
+            assert v_id in self._v_data, f"The vertex {v_id} does not exist in the hypergraph."
+        return tuple(tmp)
+
+    def _e_id(self, e_tuple: Union[List, Set, Tuple]) -> Optional[int]:
+        r"""
+        Return the edge id of the hyperedge, or ``None`` if the hyperedge does not exist.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        return self._e_index.get(self._encode_e(e_tuple))
+
+    def _add_e_key(self, e_key: Tuple, e_data: Dict) -> int:
+        r"""
+        Store a new hyperedge under the next free edge id and return the id.
+
+        Args:
+            ``e_key`` (``Tuple``): The internal hyperedge key, which must not exist yet.
+            ``e_data`` (``dict``): The hyperedge data.
+        """
+        versions = self._versions
+        reused = bool(self._e_free)
+        if reused:
+            if versions is not None:
+                versions.save("_e_free", self._e_free, len(self._e_free) - 1)
+                versions.save("_e_reuses", self._e_reuses, self._e_free[-1])
+                self._save_e(self._e_free[-1], e_key)
+            e_id = self._e_free.pop()
+            self._e_tuple[e_id] = e_key
+            self._e_data[e_id] = e_data
+            # edge views tell the hyperedges they hold from later ones stored under the same id
+            self._e_reuses[e_id] = self._e_reuses.get(e_id, 0) + 1
+        else:
+            e_id = len(self._e_tuple)
+            if versions is not None:
+                self._save_e(e_id, e_key)
+            self._e_tuple.append(e_key)
+            self._e_data.append(e_data)
+        self._e_index[e_key] = e_id
+        for index in self._e_indexes.values():
+            index.add(e_id, e_data)
+        if self._txn is not None:
+            self._txn.undo.append((self._undo_add_e_key, (e_id, reused)))
+        _v_inci, degree_index, owned = self._v_inci, self._v_degree_index, self._owned_inci
+        if owned is not None:
+            self._owned_e_data.add(e_id)
+        for v in e_key:
+            inci = _v_inci[v] if owned is None else self._own_inci(v)
+            if inci.__class__ is set:
+                inci.add(e_id)
+            elif len(inci) < _INCI_ARRAY_MAX:
+                inci.append(e_id)
+            else:
+                inci = _v_inci[v] = set(inci)
+                inci.add(e_id)
+            if degree_index is not None:
+                degree_index.move(v, len(inci) - 1, len(inci))
+        return e_id
+
+    def _undo_add_e_key(self, e_id: int, reused: bool):
+        r"""
+        Undo ``_add_e_key``: remove the hyperedge and give its edge id back.
+
+        Args:
+            ``e_id`` (``int``): The edge id.
+            ``reused`` (``bool``): Whether the edge id was taken from the free list rather than appended.
+        """
+        e_key, e_data = self._e_tuple[e_id], self._e_data[e_id]
+        for v in e_key:
+            self._remove_inci(v, e_id)
+        if self._versions is not None:
+            self._save_e(e_id, e_key)
+            self._versions.save("_e_free", self._e_free, len(self._e_free))
+        del self._e_index[e_key]
+        for index in self._e_indexes.values():
+            index.remove(e_id, e_data)
+        if reused:
+            self._e_tuple[e_id] = self._e_data[e_id] = None
+            self._e_free.append(e_id)
+        else:
+            self._e_tuple.pop()
+            self._e_data.pop()
+
+    def _add_inci(self, v_key: Any, e_id: int):
+        r"""
+        Add a hyperedge to the incidence of a vertex, the inverse of ``_remove_inci``. ``_add_e_key`` inlines
+        it, which makes batch inserts noticeably faster.
+
+        Args:
+            ``v_key`` (``Any``): The internal key of the vertex.
+            ``e_id`` (``int``): The edge id.
+        """
+        inci = self._v_inci[v_key] if self._owned_inci is None else self._own_inci(v_key)
+        if inci.__class__ is set:
+            inci.add(e_id)
+        elif len(inci) < _INCI_ARRAY_MAX:
+            inci.append(e_id)
+        else:
+            inci = self._v_inci[v_key] = set(inci)
+            inci.add(e_id)
+        if self._v_degree_index is not None:
+            self._v_degree_index.move(v_key, len(inci) - 1, len(inci))
+
+    def _remove_inci(self, v_key: Any, e_id: int):
+        r"""
+        Remove a hyperedge from the incidence of a vertex.
+
+        Args:
+            ``v_key`` (``Any``): The internal key of the vertex.
+            ``e_id`` (``int``): The edge id.
+        """
+        inci = self._v_inci[v_key] if self._owned_inci is None else self._own_inci(v_key)
+        inci.remove(e_id)
+        if self._v_degree_index is not None:
+            self._v_degree_index.move(v_key, len(inci) + 1, len(inci))
+        if self._txn is not None:
+            self._txn.undo.append((self._add_inci, (v_key, e_id)))
+
+    def _drop_e_id(self, e_id: int):
+        r"""
+        Remove a hyperedge that is no longer referenced by any incidence set from the tuple index, and release
+        its edge id.
+
+        Args:
+            ``e_id`` (``int``): The edge id.
+        """
+        e_key, e_data = self._e_tuple[e_id], self._e_data[e_id]
+        if self._versions is not None:
+            self._save_e(e_id, e_key)
+            self._versions.save("_e_free", self._e_free, len(self._e_free))
+        del self._e_index[e_key]
+        for index in self._e_indexes.values():
+            index.remove(e_id, e_data)
+        self._e_tuple[e_id] = self._e_data[e_id] = None
+        self._e_free.append(e_id)
+        if self._txn is not None:
+            self._txn.undo.append((self._restore_e_id, (e_id, e_key, e_data)))
+
+    def _restore_e_id(self, e_id: int, e_key: Tuple, e_data: Dict):
+        r"""
+        Undo ``_drop_e_id``: take the edge id back from the free list and store the hyperedge under it again.
+
+        Args:
+            ``e_id`` (``int``): The edge id, the last one of the free list.
+            ``e_key`` (``Tuple``): The internal hyperedge key.
+            ``e_data`` (``dict``): The hyperedge data.
+        """
+        if self._versions is not None:
+            self._save_e(e_id, e_key)
+            self._versions.save("_e_free", self._e_free, len(self._e_free) - 1)
+        self._e_free.pop()
+        self._e_tuple[e_id], self._e_data[e_id] = e_key, e_data
+        if self._owned_e_data is not None:
+            self._owned_e_data.discard(e_id)
+        self._e_index[e_key] = e_id
+        for index in self._e_indexes.values():
+            index.add(e_id, e_data)
+
+    def _rekey_e(self, e_id: int, e_key: Tuple):
+        r"""
+        Store a hyperedge under a new internal key, keeping its edge id.
+
+        Args:
+            ``e_id`` (``int``): The edge id.
+            ``e_key`` (``Tuple``): The new internal hyperedge key, which must not exist yet.
+        """
+        old_e_key = self._e_tuple[e_id]
+        if self._versions is not None:
+            self._save_e(e_id, old_e_key)
+            self._versions.save("_e_index", self._e_index, e_key)
+        del self._e_index[old_e_key]
+        self._e_tuple[e_id] = e_key
+        self._e_index[e_key] = e_id
+        if self._txn is not None:
+            self._txn.undo.append((self._rekey_e, (e_id, old_e_key)))
+
+    def _replace_e_data(self, e_id: int, e_data: Dict):
+        r"""
+        Replace the data of a hyperedge by another dict, keeping the indexes up to date.
+
+        Args:
+            ``e_id`` (``int``): The edge id.
+            ``e_data`` (``dict``): The new hyperedge data.
+        """
+        old_e_data = self._e_data[e_id]
+        for index in self._e_indexes.values():
+            index.remove(e_id, old_e_data)
+            index.add(e_id, e_data)
+        if self._versions is not None:
+            self._versions.save("_e_data", self._e_data, e_id)
+        self._e_data[e_id] = e_data
+        if self._owned_e_data is not None:
+            # the data may come from a hyperedge that a snapshot holds
+            self._owned_e_data.discard(e_id)
+        if self._txn is not None:
+            self._txn.undo.append((self._replace_e_data, (e_id, old_e_data)))
+
+    def _index_new_v(self, v_key: Any, v_id: Any, v_data: Dict, degree: int = 0):
+        r"""
+        Add a new vertex to the indexes.
+
+        Args:
+            ``v_key`` (``Any``): The internal key of the vertex.
+            ``v_id`` (``Any``): The vertex id.
+            ``v_data`` (``dict``): The vertex data.
+            ``degree`` (``int``): The degree of the vertex.
+        """
+        for index in self._v_indexes.values():
+            index.add(v_key, v_data)
+        for index in self._v_id_indexes.values():
+            index.add_text(v_key, str(v_id))
+        if self._v_degree_index is not None:
+            self._v_degree_index.add(v_key, degree)
+
+    def _new_v(self, v_id: Any, v_data: Dict):
+        r"""
+        Store a vertex that does not exist yet, without indexing it.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``v_data`` (``dict``): The vertex data.
+        """
+        versions = self._versions
+        reused = False
+        if self.intern_v:
+            reused = bool(self._v_free)
+            if reused:
+                if versions is not None:
+                    versions.save("_v_free", self._v_free, len(self._v_free) - 1)
+                    versions.save("_v_reuses", self._v_reuses, self._v_free[-1])
+                    self._save_v(v_id, self._v_free[-1])
+                v_key = self._v_free.pop()
+                self._v_label[v_key], self._v_data[v_key], self._v_inci[v_key] = v_id, v_data, array("q")
+                # views tell the vertices they hold from later ones stored under the same key
+                self._v_reuses[v_key] = self._v_reuses.get(v_key, 0) + 1
+            else:
+                v_key = len(self._v_label)
+                if versions is not None:
+                    self._save_v(v_id, v_key)
+                self._v_label.append(v_id)
+                self._v_data.append(v_data)
+                self._v_inci.append(array("q"))
+            self._v_index[v_id] = v_key
+        else:
+            v_key = v_id
+            if versions is not None:
+                self._save_v(v_id, v_key)
+            self._v_data[v_id] = v_data
+            self._v_inci[v_id] = array("q")
+        if self._owned_inci is not None:
+            self._owned_inci.add(v_key)
+            self._owned_v_data.add(v_key)
+        if self._txn is not None:
+            self._txn.undo.append((self._undo_new_v, (v_id, v_key, reused)))
+        return v_key
+
+    def _undo_new_v(self, v_id: Any, v_key: Any, reused: bool):
+        r"""
+        Undo ``_new_v`` and the indexing of the vertex, once it has no hyperedges left.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``v_key`` (``Any``): The internal key of the vertex.
+            ``reused`` (``bool``): Whether the key of an interned vertex was taken from the free list rather than
+                appended.
+        """
+        self._unindex_v(v_key, 0)
+        if self._versions is not None:
+            self._save_v(v_id, v_key)
+            if reused:
+                self._versions.save("_v_free", self._v_free, len(self._v_free))
+                self._versions.save("_v_reuses", self._v_reuses, v_key)
+        if self.intern_v:
+            del self._v_index[v_id]
+            if reused:
+                self._v_label[v_key] = self._v_data[v_key] = self._v_inci[v_key] = None
+                self._v_free.append(v_key)
+                self._v_reuses[v_key] -= 1
+            else:
+                self._v_label.pop()
+                self._v_data.pop()
+                self._v_inci.pop()
+        else:
+            del self._v_data[v_key]
+            del self._v_inci[v_key]
+
+    def _unindex_v(self, v_key: Any, degree: int):
+        r"""
+        Remove a vertex from the indexes.
+
+        Args:
+            ``v_key`` (``Any``): The internal key of the vertex.
+            ``degree`` (``int``): The degree of the vertex.
+        """
+        for index in self._v_indexes.values():
+            index.remove(v_key, self._v_data[v_key])
+        for index in self._v_id_indexes.values():
+            index.remove_text(v_key)
+        if self._v_degree_index is not None:
+            self._v_degree_index.remove(v_key, degree)
+
+    def _drop_v(self, v_id: Any, v_key: Any):
+        r"""
+        Remove a vertex whose hyperedges were all shrunk or removed, and its index entries. The key of an interned
+        vertex goes to the free list, to be reused by the next new vertex.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``v_key`` (``Any``): The internal key of the vertex.
+        """
+        v_data, inci = self._v_data[v_key], self._v_inci[v_key]
+        self._unindex_v(v_key, len(inci))
+        if self._versions is not None:
+            self._save_v(v_id, v_key)
+            self._versions.save("_v_free", self._v_free, len(self._v_free))
+        if self.intern_v:
+            del self._v_index[v_id]
+            self._v_label[v_key] = self._v_data[v_key] = self._v_inci[v_key] = None
+            self._v_free.append(v_key)
+        else:
+            del self._v_data[v_key]
+            del self._v_inci[v_key]
+        if self._txn is not None:
+            self._txn.undo.append((self._restore_v, (v_id, v_key, v_data, inci)))
+
+    def _restore_v(self, v_id: Any, v_key: Any, v_data: Dict, inci: Iterable[int]):
+        r"""
+        Undo ``_drop_v``, taking the key of an interned vertex back from the free list.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``v_key`` (``Any``): The internal key of the vertex.
+            ``v_data`` (``dict``): The vertex data.
+            ``inci`` (``Iterable[int]``): The incidence of the vertex.
+        """
+        if self._versions is not None:
+            self._save_v(v_id, v_key)
+            self._versions.save("_v_free", self._v_free, len(self._v_free) - 1)
+        if self.intern_v:
+            self._v_free.pop()
+            self._v_index[v_id] = v_key
+            self._v_label[v_key], self._v_data[v_key], self._v_inci[v_key] = v_id, v_data, inci
+        else:
+            self._v_data[v_key], self._v_inci[v_key] = v_data, inci
+        if self._owned_inci is not None:
+            self._owned_inci.discard(v_key)
+            self._owned_v_data.discard(v_key)
+        self._index_new_v(v_key, v_id, v_data, len(inci))
+
+    def _update_v_data(self, v_key: Any, v_data: Dict):
+        r"""
+        Merge new data into the data of an existing vertex, keeping the indexes up to date.
+
+        Args:
+            ``v_key`` (``Any``): The internal key of the vertex.
+            ``v_data`` (``dict``): The new vertex data.
+        """
+        data = self._v_data[v_key] if self._owned_v_data is None else self._own_v_data(v_key)
+        if self._txn is not None:
+            self._txn.undo.append((self._restore_v_data, (v_key, dict(data))))
+        for index in self._v_indexes.values():
+            index.remove(v_key, data)
+        data.update(v_data)
+        for index in self._v_indexes.values():
+            index.add(v_key, data)
+
+    def _update_e_data(self, e_id: int, e_data: Dict):
+        r"""
+        Merge new data into the data of an existing hyperedge, keeping the indexes up to date.
+
+        Args:
+            ``e_id`` (``int``): The edge id.
+            ``e_data`` (``dict``): The new hyperedge data.
+        """
+        data = self._e_data[e_id] if self._owned_e_data is None else self._own_e_data(e_id)
+        if self._txn is not None:
+            self._txn.undo.append((self._restore_e_data, (e_id, dict(data))))
+        for index in self._e_indexes.values():
+            index.remove(e_id, data)
+        data.update(e_data)
+        for index in self._e_indexes.values():
+            index.add(e_id, data)
+
+    def _restore_v_data(self, v_key: Any, v_data: Dict):
+        r"""
+        Undo ``_update_v_data``: put back the previous content of the vertex data dict.
+
+        Args:
+            ``v_key`` (``Any``): The internal key of the vertex.
+            ``v_data`` (``dict``): A copy of the previous vertex data.
+        """
+        data = self._v_data[v_key] if self._owned_v_data is None else self._own_v_data(v_key)
+        for index in self._v_indexes.values():
+            index.remove(v_key, data)
+        data.clear()
+        data.update(v_data)
+        for index in self._v_indexes.values():
+            index.add(v_key, data)
+
+    def _restore_e_data(self, e_id: int, e_data: Dict):
+        r"""
+        Undo ``_update_e_data``: put back the previous content of the hyperedge data dict.
+
+        Args:
+            ``e_id`` (``int``): The edge id.
+            ``e_data`` (``dict``): A copy of the previous hyperedge data.
+        """
+        data = self._e_data[e_id] if self._owned_e_data is None else self._own_e_data(e_id)
+        for index in self._e_indexes.values():
+            index.remove(e_id, data)
+        data.clear()
+        data.update(e_data)
+        for index in self._e_indexes.values():
+            index.add(e_id, data)
+
+    def v(self, v_id: str, default: Any = None) -> dict:
+        r"""
+        Return the vertex data.
+
+        Args:
+            ``v_id`` (``str``): The vertex id.
+            ``default`` (``Any``): The default value if the vertex does not exist.
+        """
+        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
+        v_key = self._v_key(v_id)
+        if v_key is _MISSING:
+            return default
+        return self._v_data[v_key]
+
+    def e(self, e_tuple: Union[List, Set, Tuple], default: Any = None) -> dict:
+        r"""
+        Return the hyperedge data.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+            ``default`` (``Any``): The default value if the hyperedge does not exist.
+        """
+        assert isinstance(e_tuple, (set, list, tuple)), "The hyperedge must be a set, list, or tuple of vertex ids."
+        e_id = self._e_id(e_tuple)
+        if e_id is None:
+            return default
+        return self._e_data[e_id]
+
+    def encode_e(self, e_tuple: Union[List, Set, Tuple]) -> Tuple:
+        r"""
+        Sort and check the hyperedge tuple.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        return self._e_label(self._encode_e(e_tuple))
+
+    @property
+    def all_v(self) -> AbstractSet[Any]:
+        r"""
+        Return a read-only set-like view of all vertices in the hypergraph.
+
+        The view is live: it reflects later mutations without being rebuilt. Take a ``set(...)`` copy
+        before mutating the hypergraph while iterating over it.
+        """
+        if self.intern_v:
+            return self._v_index.keys()
+        return self._v_data.keys()
+
+    @property
+    def all_e(self) -> AbstractSet[Tuple]:
+        r"""
+        Return a read-only set-like view of all hyperedges in the hypergraph.
+
+        The view is live: it reflects later mutations without being rebuilt. Take a ``set(...)`` copy
+        before mutating the hypergraph while iterating over it.
+        """
+        if self.intern_v:
+            return _InternedEdgeView(self)
+        return self._e_index.keys()
+
+    @property
+    def num_v(self) -> int:
+        r"""
+        Return the number of vertices in the hypergraph.
+        """
+        if self.intern_v:
+            return len(self._v_index)
+        return len(self._v_data)
+
+    @property
+    def num_e(self) -> int:
+        r"""
+        Return the number of hyperedges in the hypergraph.
+        """
+        return len(self._e_index)
+
+    def _intern_v(self, v_id: Any, v_data: Dict):
+        r"""
+        Add the vertex to an interned hypergraph, assigning the next free integer to new ids.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``v_data`` (``dict``): The vertex data.
+        """
+        v_key = self._v_index.get(v_id)
+        if v_key is None:
+            v_key = self._new_v(v_id, v_data)
+            self._index_new_v(v_key, v_id, v_data)
+        else:
+            self._update_v_data(v_key, v_data)
+
+    @_mutating
+    def add_v(self, v_id: Any, v_data: Optional[Dict] = None):
+        r"""
+        Add a vertex to the hypergraph.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``v_data`` (``dict``, optional): The vertex data.
+        """
+        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
+        if v_data is not None:
+            assert isinstance(v_data, dict), "The vertex data must be a dictionary."
+        else:
+            v_data = {}
+        if self.intern_v:
+            self._intern_v(v_id, v_data)
+        elif v_id not in self._v_data:
+            self._new_v(v_id, v_data)
+            self._index_new_v(v_id, v_id, v_data)
+        else:
+            self._update_v_data(v_id, v_data)
+        self._log("add_v", v_id, v_data)
+        self._clear_cache()
+
+    @_mutating
+    def add_e(self, e_tuple: Union[List, Set, Tuple], e_data: Optional[Dict] = None):
+        r"""
+        Add a hyperedge to the hypergraph.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+            ``e_data`` (``dict``, optional): The hyperedge data.
+        """
+        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
+        if e_data is not None:
+            assert isinstance(e_data, dict), "The hyperedge data must be a dictionary."
+        else:
+            e_data = {}
+        e_key = self._encode_e(e_tuple)
+        e_id = self._e_index.get(e_key)
+        if e_id is None:
+            self._add_e_key(e_key, e_data)
+        else:
+            self._update_e_data(e_id, e_data)
+        self._log("add_e", e_tuple, e_data)
+        self._clear_cache()
+
+    @_mutating
+    def add_v_batch(self, v_list: Iterable[Any], v_data_list: Optional[Iterable[Optional[Dict]]] = None):
+        r"""
+        Add multiple vertices to the hypergraph in one call.
+
+        The result is the same as calling ``add_v`` for each vertex in order, but the whole batch is
+        validated before anything is written and derived caches are invalidated only once.
+
+        Args:
+            ``v_list`` (``Iterable[Any]``): The vertex ids. Generators are accepted.
+            ``v_data_list`` (``Iterable[Optional[dict]]``, optional): The vertex data, aligned with ``v_list``.
+        """
+        if v_data_list is None:
+            pairs = list(zip(v_list, repeat(None)))
+        else:
+            pairs = list(zip(v_list, v_data_list, strict=True))
+        for v_id, v_data in pairs:
+            assert isinstance(v_id, Hashable), "The vertex id must be hashable."
+            assert v_data is None or isinstance(v_data, dict), "The vertex data must be a dictionary."
+        if self.intern_v:
+            for v_id, v_data in pairs:
+                self._intern_v(v_id, {} if v_data is None else v_data)
+        else:
+            _v_data, _v_inci = self._v_data, self._v_inci
+            indexed = bool(self._v_indexes or self._v_id_indexes) or self._v_degree_index is not None
+            undo = self._txn.undo if self._txn is not None else None
+            owned = self._owned_inci
+            for v_id, v_data in pairs:
+                if v_id not in _v_data:
+                    if owned is not None:
+                        self._save_v(v_id, v_id)
+                        owned.add(v_id)
+                        self._owned_v_data.add(v_id)
+                    v_data = _v_data[v_id] = {} if v_data is None else v_data
+                    _v_inci[v_id] = array("q")
+                    if undo is not None:
+                        undo.append((self._undo_new_v, (v_id, v_id, False)))
+                    if indexed:
+                        self._index_new_v(v_id, v_id, v_data)
+                elif v_data:
+                    self._update_v_data(v_id, v_data)
+        if self._wal_file is not None:
+            self._log("add_v_batch", [v_id for v_id, _ in pairs], [v_data for _, v_data in pairs])
+        self._clear_cache()
+
+    @_mutating
+    def add_e_batch(
+        self,
+        e_list: Iterable[Union[List, Set, Tuple]],
+        e_data_list: Optional[Iterable[Optional[Dict]]] = None,
+    ):
+        r"""
+        Add multiple hyperedges to the hypergraph in one call.
+
+        The result is the same as calling ``add_e`` for each hyperedge in order: duplicated hyperedges
+        (in the batch or already in the hypergraph) have their data merged. All hyperedges are encoded and
+        validated before anything is written, so a failing batch leaves the hypergraph untouched.
+
+        Args:
+            ``e_list`` (``Iterable[Union[List, Set, Tuple]]``): The hyperedge tuples. Generators are accepted.
+            ``e_data_list`` (``Iterable[Optional[dict]]``, optional): The hyperedge data, aligned with ``e_list``.
+        """
+        if e_data_list is None:
+            pairs = zip(e_list, repeat(None))
+        else:
+            pairs = zip(e_list, e_data_list, strict=True)
+        v_keys = self._v_index.keys() if self.intern_v else self._v_data.keys()
+        v_index = self._v_index
+        pending: Dict[Tuple, Dict] = {}
+        for e_tuple, e_data in pairs:
+            assert isinstance(
+                e_tuple, (list, set, tuple)
+            ), "The hyperedge must be a list, set, or tuple of vertex ids."
+            assert e_data is None or isinstance(e_data, dict), "The hyperedge data must be a dictionary."
+            e_set = set(e_tuple)
+            if not v_keys >= e_set:
+                missing = next(v_id for v_id in e_set if v_id not in v_keys)
+                raise AssertionError(f"The vertex {missing} does not exist in the hypergraph.")
+            if self.intern_v:
+                e_key = tuple(sorted(map(v_index.__getitem__, e_set)))
+            else:
+                e_key = tuple(sorted(e_set))
+            if e_key not in pending:
+                pending[e_key] = {} if e_data is None else e_data
+            elif e_data:
+                pending[e_key].update(e_data)
+        _e_index = self._e_index
+        for e_key, e_data in pending.items():
+            e_id = _e_index.get(e_key)
+            if e_id is None:
+                self._add_e_key(e_key, e_data)
+            else:
+                self._update_e_data(e_id, e_data)
+        if self._wal_file is not None:
+            self._log("add_e_batch", list(map(self._e_label, pending)), list(pending.values()))
+        self._clear_cache()
+
+    def _merge_e_data(self, e_id: int, other_e_id: int, merge: Union[str, Callable[[Dict, Dict], Dict]]):
+        r"""
+        Give the data of a shrunken hyperedge to the existing hyperedge it collides with, following a merge policy
+        of ``remove_v``. The data dict is moved, not copied.
+
+        Args:
+            ``e_id`` (``int``): The edge id of the shrunken hyperedge, which is dropped afterwards.
+            ``other_e_id`` (``int``): The edge id of the existing hyperedge.
+            ``merge`` (``Union[str, Callable[[dict, dict], dict]]``): The merge policy.
+        """
+        e_data = self._e_data[e_id]
+        if merge == "overwrite":
+            self._replace_e_data(other_e_id, e_data)
+        elif merge == "update":
+            self._update_e_data(other_e_id, e_data)
+        elif merge != "keep":
+            merged = merge(self._e_data[other_e_id], e_data)
+            assert isinstance(merged, dict), "The merge policy must return a dictionary."
+            self._replace_e_data(other_e_id, merged)
+
+    def _shrink_e(
+        self, e_ids: Iterable[int], v_keys: AbstractSet[Any], merge: Union[str, Callable[[Dict, Dict], Dict]]
+    ):
+        r"""
+        Shrink hyperedges to the vertices that are not removed, see ``_shrink_e_ids``. A callable merge policy may
+        raise halfway, so its writes are recorded in an undo log and reverted if it does, even outside of a
+        transaction.
+
+        Args:
+            ``e_ids`` (``Iterable[int]``): The edge ids of the hyperedges, each once.
+            ``v_keys`` (``AbstractSet[Any]``): The internal keys of the removed vertices.
+            ``merge`` (``Union[str, Callable[[dict, dict], dict]]``): The merge policy of colliding hyperedges.
+        """
+        if not callable(merge):
+            self._shrink_e_ids(e_ids, v_keys, merge)
+            return
+        outer = self._txn
+        txn = outer if outer is not None else _Transaction()
+        undo_mark = len(txn.undo)
+        self._txn = txn
+        try:
+            self._shrink_e_ids(e_ids, v_keys, merge)
+        except BaseException:
+            self._rollback(txn, undo_mark)
+            raise
+        finally:
+            self._txn = outer
+
+    def _shrink_e_ids(
+        self, e_ids: Iterable[int], v_keys: AbstractSet[Any], merge: Union[str, Callable[[Dict, Dict], Dict]]
+    ):
+        r"""
+        Shrink hyperedges to the vertices that are not removed, in one pass: a hyperedge keeps its edge id and
+        data under its new key, so the incidence of the remaining vertices does not change, unless it is left with
+        fewer than two vertices or collides with an existing hyperedge, in which case its id is dropped from the
+        remaining vertices and released. The incidence of the removed vertices is left as is.
+
+        Args:
+            ``e_ids`` (``Iterable[int]``): The edge ids of the hyperedges, each once.
+            ``v_keys`` (``AbstractSet[Any]``): The internal keys of the removed vertices.
+            ``merge`` (``Union[str, Callable[[dict, dict], dict]]``): The merge policy of colliding hyperedges.
+        """
+        _e_tuple, _e_index = self._e_tuple, self._e_index
+        for e_id in e_ids:
+            new_e_key = tuple(v for v in _e_tuple[e_id] if v not in v_keys)
+            if len(new_e_key) >= 2:
+                other_e_id = _e_index.get(new_e_key)
+                if other_e_id is None:
+                    # the neighbors keep referencing the same edge id
+                    self._rekey_e(e_id, new_e_key)
+                    continue
+                self._merge_e_data(e_id, other_e_id, merge)
+            for _v_key in new_e_key:
+                self._remove_inci(_v_key, e_id)
+            self._drop_e_id(e_id)
+
+    def _check_merge(self, merge: Union[str, Callable[[Dict, Dict], Dict]]):
+        r"""
+        Check a merge policy of ``remove_v``, before anything is written.
+
+        Args:
+            ``merge`` (``Union[str, Callable[[dict, dict], dict]]``): The merge policy.
+        """
+        assert merge in _MERGE_POLICIES or callable(
+            merge
+        ), f"The merge policy must be one of {', '.join(_MERGE_POLICIES)} or a callable."
+        if self._wal_file is not None and callable(merge):
+            # a policy that cannot be logged fails before the hypergraph changes
+            pkl.dumps(merge, protocol=pkl.HIGHEST_PROTOCOL)
+
+    @_mutating
+    def remove_v(self, v_id: Any, merge: Union[str, Callable[[Dict, Dict], Dict]] = "overwrite"):
+        r"""
+        Remove a vertex from the hypergraph.
+
+        Each incident hyperedge keeps its edge id and data and shrinks to the remaining vertices. Hyperedges
+        left with fewer than two vertices are removed. If the shrunken hyperedge already exists, the two are merged
+        into the existing one, whose data is chosen by ``merge``. Data dicts are moved, never copied, so removing a
+        hub vertex costs time proportional to the size of its hyperedges.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``merge`` (``Union[str, Callable[[dict, dict], dict]]``): What the existing hyperedge keeps when a
+                shrunken hyperedge collides with it: ``"overwrite"`` the data of the shrunken hyperedge,
+                ``"keep"`` its own data, ``"update"`` its own data updated with the data of the shrunken
+                hyperedge, or the dict returned by a callable ``merge(existing_data, shrunken_data)``, which must
+                not modify its arguments. With ``wal``, a callable must be picklable, like a module-level function.
+                Defaults to ``"overwrite"``.
+        """
+        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
+        self._check_merge(merge)
+        v_key = self._v_key(v_id)
+        assert v_key is not _MISSING, f"The vertex {v_id} does not exist in the hypergraph."
+        self._shrink_e(self._v_inci[v_key], (v_key,), merge)
+        self._drop_v(v_id, v_key)
+        self._log("remove_v", v_id, merge)
+        self._clear_cache()
+
+    @_mutating
+    def remove_v_batch(self, v_ids: Iterable[Any], merge: Union[str, Callable[[Dict, Dict], Dict]] = "overwrite"):
+        r"""
+        Remove multiple vertices from the hypergraph in one call.
+
+        The vertices and hyperedges left are the same as calling ``remove_v`` for each vertex, but each hyperedge
+        shrinks once, directly to the vertices that are not removed, so a hyperedge incident to several removed
+        vertices is rewritten once and never collides with intermediate hyperedges. Shrunken hyperedges that
+        collide, with an existing hyperedge or with each other, are merged following ``merge``. All the vertices
+        are checked before anything is written, and derived caches are invalidated only once.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids. Generators are accepted and repeated ids are ignored.
+            ``merge`` (``Union[str, Callable[[dict, dict], dict]]``): The merge policy of colliding hyperedges,
+                see ``remove_v``. Defaults to ``"overwrite"``.
+        """
+        self._check_merge(merge)
+        v_items = {}
+        for v_id in v_ids:
+            assert isinstance(v_id, Hashable), "The vertex id must be hashable."
+            v_key = self._v_key(v_id)
+            assert v_key is not _MISSING, f"The vertex {v_id} does not exist in the hypergraph."
+            v_items[v_id] = v_key
+        if len(v_items) == 1:
+            e_ids = self._v_inci[next(iter(v_items.values()))]
+        else:
+            # hyperedges incident to several removed vertices are shrunk once, in a stable order
+            e_ids = dict.fromkeys(e_id for v_key in v_items.values() for e_id in self._v_inci[v_key])
+        self._shrink_e(e_ids, set(v_items.values()), merge)
+        for v_id, v_key in v_items.items():
+            self._drop_v(v_id, v_key)
+        if self._wal_file is not None:
+            self._log("remove_v_batch", list(v_items), merge)
+        self._clear_cache()
+
+    @_mutating
+    def remove_e(self, e_tuple: Union[List, Set, Tuple]):
+        r"""
+        Remove a hyperedge from the hypergraph.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
+        e_key = self._encode_e(e_tuple)
+        e_id = self._e_index.get(e_key)
+        assert e_id is not None, f"The hyperedge {e_tuple} does not exist in the hypergraph."
+        for v in e_key:
+            self._remove_inci(v, e_id)
+        self._drop_e_id(e_id)
+        self._log("remove_e", e_tuple)
+        self._clear_cache()
+
+    @_mutating
+    def update_v(self, v_id: Any, v_data: dict):
+        r"""
+        Update the vertex data.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``v_data`` (``dict``): The vertex data.
+        """
+        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
+        assert isinstance(v_data, dict), "The vertex data must be a dictionary."
+        v_key = self._v_key(v_id)
+        assert v_key is not _MISSING, f"The vertex {v_id} does not exist in the hypergraph."
+        self._update_v_data(v_key, v_data)
+        self._log("update_v", v_id, v_data)
+        self._clear_cache()
+
+    @_mutating
+    def update_e(self, e_tuple: Union[List, Set, Tuple], e_data: dict):
+        r"""
+        Update the hyperedge data.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+            ``e_data`` (``dict``): The hyperedge data.
+        """
+        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
+        assert isinstance(e_data, dict), "The hyperedge data must be a dictionary."
+        e_id = self._e_id(e_tuple)
+        assert e_id is not None, f"The hyperedge {e_tuple} does not exist in the hypergraph."
+        self._update_e_data(e_id, e_data)
+        self._log("update_e", e_tuple, e_data)
+        self._clear_cache()
+
+    def has_v(self, v_id: Any) -> bool:
+        r"""
+        Check if the vertex exists.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+        """
+        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
+        return self._v_key(v_id) is not _MISSING
+
+    def has_e(self, e_tuple: Union[List, Set, Tuple]) -> bool:
+        r"""
+        Check if the hyperedge exists.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
+        try:
+            e_key = self._encode_e(e_tuple)
+        except AssertionError:
+            return False
+        return e_key in self._e_index
+
+    def degree_v(self, v_id: Any) -> int:
+        r"""
+        Return the degree of the vertex.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+        """
+        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
+        v_key = self._v_key(v_id)
+        assert v_key is not _MISSING, f"The vertex {v_id} does not exist in the hypergraph."
+        return len(self._v_inci[v_key])
+
+    def degree_e(self, e_tuple: Union[List, Set, Tuple]) -> int:
+        r"""
+        Return the degree of the hyperedge.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
+        e_key = self._encode_e(e_tuple)
+        assert e_key in self._e_index, f"The hyperedge {e_tuple} does not exist in the hypergraph."
+        return len(e_key)
+
+    def nbr_e_of_v(self, v_id: Any, copy: bool = True) -> AbstractSet[Tuple]:
+        r"""
+        Return the incident hyperedges of the vertex.
+
+        With ``copy=False`` a read-only set-like view over the incidence set of the vertex is returned
+        instead of a new set. The view is live: it follows later changes to the hyperedges of the vertex.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``copy`` (``bool``): Whether to return a new set, or a read-only view over the stored incidence.
+        """
+        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
+        v_key = self._v_key(v_id)
+        assert v_key is not _MISSING, f"The vertex {v_id} does not exist in the hypergraph."
+        if not copy:
+            return _IncidenceView(self, v_key)
+        e_keys = map(self._e_tuple.__getitem__, self._v_inci[v_key])
+        if self.intern_v:
+            return set(map(self._e_label, e_keys))
+        return set(e_keys)
+
+    def nbr_v_of_e(self, e_tuple: Union[List, Set, Tuple], copy: bool = True) -> Union[set, Tuple]:
+        r"""
+        Return the incident vertices of the hyperedge.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+            ``copy`` (``bool``): Whether to return a new set, or the stored (immutable) hyperedge tuple itself.
+        """
+        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
+        e_key = self._encode_e(e_tuple)
+        assert e_key in self._e_index, f"The hyperedge {e_tuple} does not exist in the hypergraph."
+        if not copy:
+            return self._e_label(e_key)
+        return set(self._e_label(e_key))
+
+    def nbr_v(self, v_id: Any, exclude_self=True) -> set:
+        r"""
+        Return the neighbors of the vertex.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+        """
+        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
+        v_key = self._v_key(v_id)
+        assert v_key is not _MISSING, f"The vertex {v_id} does not exist in the hypergraph."
+        nbrs: set = set()
+        _e_tuple = self._e_tuple
+        for e_id in self._v_inci[v_key]:
+            nbrs.update(_e_tuple[e_id])
+        if exclude_self:
+            nbrs.discard(v_key)
+        if self.intern_v:
+            return set(map(self._v_label.__getitem__, nbrs))
+        return nbrs
+
+    def iter_nbr_v(self, v_id: Any, exclude_self: bool = True) -> Iterator[Any]:
+        r"""
+        Lazily iterate over the neighbors of the vertex, each yielded once.
+
+        Nothing is collected up front, so breaking out of the loop early skips the remaining hyperedges.
+        The hypergraph must not be modified while iterating.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``exclude_self`` (``bool``): Whether to exclude the vertex itself from neighbors.
+        """
+        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
+        v_key = self._v_key(v_id)
+        assert v_key is not _MISSING, f"The vertex {v_id} does not exist in the hypergraph."
+        return self._iter_nbr_v(v_key, exclude_self)
+
+    def _iter_nbr_v(self, v_key: Any, exclude_self: bool) -> Iterator[Any]:
+        r"""
+        Generator behind ``iter_nbr_v``, kept separate so that the vertex is checked when it is called.
+
+        Args:
+            ``v_key`` (``Any``): The internal key of the vertex.
+            ``exclude_self`` (``bool``): Whether to exclude the vertex itself from neighbors.
+        """
+        _e_tuple, _v_label = self._e_tuple, self._v_label
+        seen = {v_key} if exclude_self else set()
+        for e_id in self._v_inci[v_key]:
+            for u in _e_tuple[e_id]:
+                if u not in seen:
+                    seen.add(u)
+                    yield _v_label[u] if self.intern_v else u
+
+    def _v_keys(self, v_ids: Iterable[Any]) -> List:
+        r"""
+        Return the internal keys of many vertex ids, checking them all in one pass.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+        """
+        v_ids = list(v_ids)
+        try:
+            if self.intern_v:
+                v_keys = list(map(self._v_index.get, v_ids))
+                missing = None in v_keys
+            else:
+                v_keys = v_ids
+                missing = not all(map(self._v_data.__contains__, v_ids))
+        except TypeError:
+            raise AssertionError("The vertex id must be hashable.") from None
+        if missing:
+            for v_id in v_ids:
+                assert self._v_key(v_id) is not _MISSING, f"The vertex {v_id} does not exist in the hypergraph."
+        return v_keys
+
+    def degree_v_many(self, v_ids: Iterable[Any], as_numpy: bool = False) -> Union[List[int], Any]:
+        r"""
+        Return the degrees of many vertices at once.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+            ``as_numpy`` (``bool``): Whether to return a NumPy ``int64`` array instead of a list. Requires ``numpy``.
+        """
+        v_keys = self._v_keys(v_ids)
+        degrees = map(len, map(self._v_inci.__getitem__, v_keys))
+        if as_numpy:
+            np = _require_numpy("degree_v_many(as_numpy=True)")
+            return np.fromiter(degrees, dtype=np.int64, count=len(v_keys))
+        return list(degrees)
+
+    def nbr_e_of_v_many(self, v_ids: Iterable[Any]) -> List[set]:
+        r"""
+        Return the incident hyperedges of many vertices at once.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+        """
+        _v_inci, _e_tuple = self._v_inci, self._e_tuple
+        if self.intern_v:
+            _e_label = self._e_label
+            return [{_e_label(_e_tuple[e_id]) for e_id in _v_inci[v_key]} for v_key in self._v_keys(v_ids)]
+        return [set(map(_e_tuple.__getitem__, _v_inci[v_key])) for v_key in self._v_keys(v_ids)]
+
+    def nbr_v_many(self, v_ids: Iterable[Any], exclude_self: bool = True) -> List[set]:
+        r"""
+        Return the neighbors of many vertices at once.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+            ``exclude_self`` (``bool``): Whether to exclude each vertex itself from its neighbors.
+        """
+        _v_inci, _e_tuple = self._v_inci, self._e_tuple
+        result = []
+        for v_key in self._v_keys(v_ids):
+            nbrs: set = set()
+            for e_id in _v_inci[v_key]:
+                nbrs.update(_e_tuple[e_id])
+            if exclude_self:
+                nbrs.discard(v_key)
+            result.append(nbrs)
+        if self.intern_v:
+            _v_label = self._v_label
+            return [set(map(_v_label.__getitem__, nbrs)) for nbrs in result]
+        return result
+
+    def subgraph(self, v_ids: Iterable[Any]) -> HypergraphView:
+        r"""
+        Return a read-only view of the vertices and the hyperedges whose vertices are all among them, see
+        ``HypergraphView``. Nothing is copied: queries on the view filter the hypergraph as they run.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+        """
+        _v_reuses = self._v_reuses
+        return HypergraphView(hg=self, v_keys={v_key: _v_reuses.get(v_key, 0) for v_key in self._v_keys(v_ids)})
+
+    def edge_subgraph(self, e_tuples: Iterable[Union[List, Set, Tuple]]) -> HypergraphView:
+        r"""
+        Return a read-only view of the hyperedges and their vertices, see ``HypergraphView``. Hyperedges are
+        followed by edge id, so a hyperedge that shrinks when one of its vertices is removed stays in the view
+        and one that is removed leaves it.
+
+        Args:
+            ``e_tuples`` (``Iterable[Union[List, Set, Tuple]]``): The hyperedge tuples.
+        """
+        e_ids = {}
+        for e_tuple in e_tuples:
+            e_id = self._e_id(e_tuple)
+            assert e_id is not None, f"The hyperedge {e_tuple} does not exist in the hypergraph."
+            e_ids[e_id] = self._e_reuses.get(e_id, 0)
+        _e_tuple, _v_reuses = self._e_tuple, self._v_reuses
+        v_keys = {u: _v_reuses.get(u, 0) for e_id in e_ids for u in _e_tuple[e_id]}
+        return HypergraphView(hg=self, v_keys=v_keys, e_ids=e_ids)
+
+    def _k_hop(
+        self,
+        v_id: Any,
+        k: int,
+        max_vertices: Optional[int] = None,
+        max_edges: Optional[int] = None,
+        edge_filter: Optional[Callable[[Tuple, Dict], bool]] = None,
+    ) -> Tuple[FrozenHypergraph, bool]:
+        r"""
+        Return the ``k``-hop neighborhood of the vertex (see ``k_hop``) and whether a limit truncated it.
+
+        The search runs over the internal vertex keys and edge ids, which are only turned into ids at the end.
+        """
+        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
+        v_key = self._v_key(v_id)
+        assert v_key is not _MISSING, f"The vertex {v_id} does not exist in the hypergraph."
+        _e_tuple, _e_data = self._e_tuple, self._e_data
+        if edge_filter is not None:
+            _e_label = self._e_label
+
+            def keep(e_id: int) -> bool:
+                return edge_filter(_e_label(_e_tuple[e_id]), _e_data[e_id])
+
+        else:
+            keep = None
+
+        v_keys, e_ids, truncated = k_hop_search(
+            v_key, k, self._v_inci.__getitem__, _e_tuple.__getitem__, max_vertices, max_edges, keep
+        )
+        pos = {v_key: i for i, v_key in enumerate(v_keys)}
+        v_ids = list(map(self._v_label.__getitem__, v_keys)) if self.intern_v else v_keys
+        csr = build_csr(v_ids, ([pos[u] for u in _e_tuple[e_id]] for e_id in e_ids))
+        sub = FrozenHypergraph(
+            csr=csr,
+            v_data=list(map(self._v_data.__getitem__, v_keys)),
+            e_data=list(map(_e_data.__getitem__, e_ids)),
+        )
+        return sub, truncated
+
+    def bfs(self, v_id: Any, max_depth: Optional[int] = None) -> Iterator[Tuple[Any, int]]:
+        r"""
+        Lazily iterate over the vertices reachable from the vertex in breadth-first order, each yielded once
+        with its number of hops from the vertex (the vertex itself first, with 0).
+
+        Each hyperedge is expanded once, so the search takes time linear in the incidences it reaches, and
+        breaking out of the loop skips the rest. The hypergraph must not be modified while iterating.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``max_depth`` (``Optional[int]``): The maximum number of hops, ``None`` for no limit.
+        """
+        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
+        v_key = self._v_key(v_id)
+        assert v_key is not _MISSING, f"The vertex {v_id} does not exist in the hypergraph."
+        visits = bfs_search(v_key, self._v_inci.__getitem__, self._e_tuple.__getitem__, max_depth)
+        if self.intern_v:
+            _v_label = self._v_label
+            return ((_v_label[v_key], depth) for v_key, depth in visits)
+        return visits
+
+    def shortest_path(self, src_v_id: Any, dst_v_id: Any) -> Optional[List[Any]]:
+        r"""
+        Return a path with the fewest hyperedges between two vertices, as the list of vertex ids and hyperedge
+        tuples alternating from ``src_v_id`` to ``dst_v_id``, or ``None`` if there is none.
+
+        The search is a bidirectional breadth-first search over the stored incidence.
+
+        Args:
+            ``src_v_id`` (``Any``): The source vertex id.
+            ``dst_v_id`` (``Any``): The target vertex id.
+        """
+        src, dst = self._v_keys((src_v_id, dst_v_id))
+        _e_tuple = self._e_tuple
+        path = shortest_path_search(src, dst, self._v_inci.__getitem__, _e_tuple.__getitem__)
+        if path is None:
+            return None
+        # vertices are at even positions, edge ids at odd ones
+        path[::2] = self._v_labels(path[::2])
+        path[1::2] = (self._e_label(_e_tuple[e_id]) for e_id in path[1::2])
+        return path
+
+    def connected_components(self) -> Iterator[Set[Any]]:
+        r"""
+        Iterate over the connected components of the hypergraph, as sets of vertex ids. Isolated vertices form
+        components of their own.
+
+        The components are found with a union-find over the hyperedges, in one pass over them.
+        """
+        v_keys = self._v_index.values() if self.intern_v else self._v_data.keys()
+        components = union_find_components(v_keys, self._e_index)
+        return (set(self._v_labels(component)) for component in components)
+
+    def s_connected_components(self, s: int = 1, return_singletons: bool = False) -> Iterator[Set[Tuple]]:
+        r"""
+        Iterate over the s-connected components of the hypergraph, as sets of hyperedge tuples. Two hyperedges
+        are s-adjacent when they share at least ``s`` vertices, and s-connected when a chain of s-adjacent
+        hyperedges joins them.
+
+        With ``s=1`` these are the hyperedges of each connected component. Larger ``s`` counts the vertices each
+        hyperedge shares with the others over the incidence of its vertices, which grows with the square of the
+        degree of the vertices.
+
+        Args:
+            ``s`` (``int``): The number of shared vertices. Defaults to ``1``.
+            ``return_singletons`` (``bool``): Whether to include components of a single hyperedge.
+        """
+        assert isinstance(s, int) and s >= 1, "s must be a positive integer."
+        _e_tuple = self._e_tuple
+        components = s_components_search(self._e_index.values(), self._v_inci.__getitem__, _e_tuple.__getitem__, s)
+        _e_label = self._e_label
+        return (
+            {_e_label(_e_tuple[e_id]) for e_id in component}
+            for component in components
+            if return_singletons or len(component) > 1
+        )
+
+    def _index_records(
+        self, target: str
+    ) -> Tuple[Dict[str, Union[AttributeIndex, TextIndex]], Iterator[Tuple[Any, Dict]]]:
+        r"""
+        Return the indexes of the vertices or hyperedges and an iterator over their ``(key, data)`` records.
+
+        Args:
+            ``target`` (``str``): ``"v"`` or ``"e"``.
+        """
+        assert target in ("v", "e"), "The target must be 'v' or 'e'."
+        if target == "e":
+            records = ((e_id, data) for e_id, data in enumerate(self._e_data) if data is not None)
+            return self._e_indexes, records
+        if self.intern_v:
+            records = ((v_key, data) for v_key, data in enumerate(self._v_data) if data is not None)
+        else:
+            records = iter(self._v_data.items())
+        return self._v_indexes, records
+
+    def _v_id_records(self) -> Iterator[Tuple[Any, Any]]:
+        r"""
+        Return an iterator over the ``(key, id)`` pairs of the vertices.
+        """
+        if self.intern_v:
+            return ((v_key, v_id) for v_id, v_key in self._v_index.items())
+        return ((v_id, v_id) for v_id in self._v_data)
+
+    @property
+    def indexes(self) -> Dict[str, Dict[Optional[str], Any]]:
+        r"""
+        Return the kind (``"hash"``, ``"sorted"`` or ``"text"``) of each index, by target and field:
+        ``{"v": {field: kind}, "e": {field: kind}}``. The indexes on the vertices themselves are listed under
+        the field ``None``, as a sorted tuple of their kinds (``"degree"``, ``"sorted"`` and ``"text"``).
+        """
+        v_indexes: Dict[Optional[str], Any] = {name: index.kind for name, index in self._v_indexes.items()}
+        kinds = list(self._v_id_indexes)
+        if self._v_degree_index is not None:
+            kinds.append(self._v_degree_index.kind)
+        if kinds:
+            v_indexes[None] = tuple(sorted(kinds))
+        return {"v": v_indexes, "e": {name: index.kind for name, index in self._e_indexes.items()}}
+
+    @_mutating
+    def create_index(self, target: str, field: Optional[str], kind: str = "hash"):
+        r"""
+        Index the vertices or hyperedges by a field of their data.
+
+        The index is kept up to date by every mutation and saved with the hypergraph. ``find_v`` and ``find_e``
+        look up conditions on hash and sorted indexes instead of scanning, ``range_v`` and ``range_e`` need a
+        ``"sorted"`` index and ``search_v`` uses ``"text"`` indexes. Creating an index that exists replaces it.
+
+        With ``field=None``, the vertices themselves are indexed: ``"text"`` indexes their ids for
+        ``search_v``, ``"sorted"`` orders them by id for ``iter_v_by_id`` and ``"degree"`` orders them by degree
+        for ``iter_v_by_degree``.
+
+        Args:
+            ``target`` (``str``): ``"v"`` to index vertices, ``"e"`` to index hyperedges.
+            ``field`` (``str``, optional): The field of the vertex or hyperedge data, ``None`` for the vertices.
+            ``kind`` (``str``): ``"hash"`` for lookups by value, ``"sorted"`` for lookups by value and by range,
+                ``"text"`` for substring search in string values, or ``"degree"``. Defaults to ``"hash"``.
+        """
+        assert kind in (
+            "hash",
+            "sorted",
+            "text",
+            "degree",
+        ), "The index kind must be 'hash', 'sorted', 'text' or 'degree'."
+        indexes, records = self._index_records(target)
+        if field is None:
+            assert target == "v" and kind != "hash", "The vertices can only have text, sorted and degree indexes."
+            if kind == "degree":
+                self._v_degree_index = DegreeIndex()
+                for v_key, _ in self._v_id_records():
+                    self._v_degree_index.add(v_key, len(self._v_inci[v_key]))
+            else:
+                index = TextIndex(None) if kind == "text" else IdIndex()
+                for v_key, v_id in self._v_id_records():
+                    index.add_text(v_key, str(v_id))
+                self._v_id_indexes[kind] = index
+        else:
+            assert kind != "degree", "Only the vertices can have a degree index."
+            index = TextIndex(field) if kind == "text" else AttributeIndex(field, ordered=kind == "sorted")
+            index.build(records)
+            indexes[field] = index
+        self._log("create_index", target, field, kind)
+
+    @_mutating
+    def drop_index(self, target: str, field: Optional[str], kind: Optional[str] = None):
+        r"""
+        Remove an index.
+
+        Args:
+            ``target`` (``str``): ``"v"`` or ``"e"``.
+            ``field`` (``str``, optional): The indexed field, ``None`` for the indexes on the vertices.
+            ``kind`` (``str``, optional): With ``field=None``, the kind of the index to remove, ``None`` for all.
+        """
+        indexes, _ = self._index_records(target)
+        if field is None and target == "v":
+            kinds = self.indexes["v"].get(None, ()) if kind is None else (kind,)
+            assert kinds and set(kinds) <= set(self.indexes["v"].get(None, ())), "There is no such index."
+            for name in kinds:
+                if name == "degree":
+                    self._v_degree_index = None
+                else:
+                    del self._v_id_indexes[name]
+        else:
+            assert field in indexes, f"There is no index on {field}."
+            del indexes[field]
+        self._log("drop_index", target, field, kind)
+
+    def _find(self, target: str, conditions: Dict[str, Any]) -> List[Any]:
+        r"""
+        Return the keys of the records whose data matches all conditions.
+
+        Args:
+            ``target`` (``str``): ``"v"`` or ``"e"``.
+            ``conditions`` (``Dict[str, Any]``): The value of each field.
+        """
+        assert conditions, "At least one condition is required."
+        indexes, records = self._index_records(target)
+        # text indexes do not answer equality conditions, and values that cannot be hashed are compared by scanning
+        indexed = [
+            name
+            for name, value in conditions.items()
+            if name in indexes and indexes[name].kind != "text" and _is_hashable(value)
+        ]
+        # start from the smallest indexed match and check the other conditions on its records; an index with
+        # records whose value cannot be hashed only narrows down the candidates, so its condition is checked too
+        matches = sorted((indexes[name].find(conditions[name]) for name in indexed), key=len)
+        if matches:
+            keys = matches[0].intersection(*matches[1:])
+            data = self._e_data if target == "e" else self._v_data
+            records = ((key, data[key]) for key in keys)
+        exact = {name for name in indexed if not indexes[name].unhashable}
+        rest = [(name, value) for name, value in conditions.items() if name not in exact]
+        return [key for key, data in records if all(name in data and data[name] == value for name, value in rest)]
+
+    def find_v(self, **conditions: Any) -> Set[Any]:
+        r"""
+        Return the vertices whose data has all the given field values, e.g. ``find_v(entity_type="person")``.
+
+        Conditions on indexed fields are looked up in the index, the others are checked on the matching
+        vertices, or on all vertices if no condition is indexed.
+
+        Args:
+            ``conditions`` (``Any``): The value of each field.
         """
-        try:
-            with open(storage_file, "rb") as f:
-                data = pkl.load(f)
-            self._v_data = data.get("v_data", {})
-            self._v_inci = data.get("v_inci", {})
-            self._e_data = data.get("e_data", {})
-            return True
-        except Exception:
-            return False
+        keys = self._find("v", conditions)
+        if self.intern_v:
+            return set(map(self._v_label.__getitem__, keys))
+        return set(keys)
 
-    def save(self, storage_file: Union[str, Path]) -> bool:
+    def find_e(self, **conditions: Any) -> Set[Tuple]:
         r"""
-        Save the hypergraph database to the storage file.
+        Return the hyperedges whose data has all the given field values, e.g. ``find_e(relation="knows")``.
+
+        Conditions on indexed fields are looked up in the index, the others are checked on the matching
+        hyperedges, or on all hyperedges if no condition is indexed.
+
+        Args:
+            ``conditions`` (``Any``): The value of each field.
         """
-        data = {
-            "v_data": self._v_data,
-            "v_inci": self._v_inci,
-            "e_data": self._e_data,
-        }
-        try:
-            with open(storage_file, "wb") as f:
-                pkl.dump(data, f)
-            return True
-        except Exception:
-            return False
+        _e_tuple, _e_label = self._e_tuple, self._e_label
+        return {_e_label(_e_tuple[e_id]) for e_id in self._find("e", conditions)}
 
-    def _clear_cache(self):
+    def query_v(self, filters: Dict[str, Any]) -> List[Any]:
         r"""
-        Clear the cached properties.
+        Query and return vertices that match the given filters, see ``find_v``.
+
+        Args:
+            ``filters`` (``Dict[str, Any]``): The value of each field.
         """
-        self.__dict__.pop("all_v", None)
-        self.__dict__.pop("all_e", None)
-        self.__dict__.pop("num_v", None)
-        self.__dict__.pop("num_e", None)
+        return list(self.find_v(**filters))
 
-    def v(self, v_id: str, default: Any = None) -> dict:
+    def query_e(self, filters: Dict[str, Any]) -> List[Tuple]:
         r"""
-        Return the vertex data.
+        Query and return hyperedges that match the given filters, see ``find_e``.
 
         Args:
-            ``v_id`` (``str``): The vertex id.
-            ``default`` (``Any``): The default value if the vertex does not exist.
+            ``filters`` (``Dict[str, Any]``): The value of each field.
         """
-        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
-        try:
-            return self._v_data[v_id]
-        except KeyError:
-            return default
+        return list(self.find_e(**filters))
 
-    def e(self, e_tuple: Union[List, Set, Tuple], default: Any = None) -> dict:
+    def _range_index(self, indexes: Dict[str, Union[AttributeIndex, TextIndex]], field: str) -> AttributeIndex:
         r"""
-        Return the hyperedge data.
+        Return the sorted index on a field.
 
         Args:
-            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
-            ``default`` (``Any``): The default value if the hyperedge does not exist.
+            ``indexes`` (``Dict[str, Union[AttributeIndex, TextIndex]]``): The vertex or hyperedge indexes.
+            ``field`` (``str``): The field.
         """
-        assert isinstance(e_tuple, (set, list, tuple)), "The hyperedge must be a set, list, or tuple of vertex ids."
-        e_tuple = self.encode_e(e_tuple)
-        try:
-            return self._e_data[e_tuple]
-        except KeyError:
-            return default
+        index = indexes.get(field)
+        assert index is not None and index.kind == "sorted", f"Range queries on {field} need a sorted index."
+        return index
 
-    def encode_e(self, e_tuple: Union[List, Set, Tuple]) -> Tuple:
+    def range_v(self, field: str, lo: Optional[Any] = None, hi: Optional[Any] = None) -> List[Any]:
         r"""
-        Sort and check the hyperedge tuple.
+        Return the vertices whose ``field`` is between ``lo`` and ``hi`` (both included), in ascending order
+        of the field. Needs a ``"sorted"`` index on the field.
 
         Args:
-            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+            ``field`` (``str``): The field of the vertex data.
+            ``lo`` (``Any``, optional): The lower bound, ``None`` for no bound.
+            ``hi`` (``Any``, optional): The upper bound, ``None`` for no bound.
         """
-        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
-        tmp = sorted(list(set(e_tuple)))
-        for v_id in tmp:
-            assert isinstance(v_id, Hashable), "The vertex id must be hashable."
-            assert v_id in self._v_data, f"The vertex {v_id} does not exist in the hypergraph."
-        return tuple(tmp)
+        keys = self._range_index(self._v_indexes, field).range(lo, hi)
+        if self.intern_v:
+            return list(map(self._v_label.__getitem__, keys))
+        return list(keys)
 
-    @cached_property
-    def all_v(self) -> Set[Any]:
+    def range_e(self, field: str, lo: Optional[Any] = None, hi: Optional[Any] = None) -> List[Tuple]:
         r"""
-        Return a set of all vertices in the hypergraph.
+        Return the hyperedges whose ``field`` is between ``lo`` and ``hi`` (both included), in ascending order
+        of the field. Needs a ``"sorted"`` index on the field.
+
+        Args:
+            ``field`` (``str``): The field of the hyperedge data.
+            ``lo`` (``Any``, optional): The lower bound, ``None`` for no bound.
+            ``hi`` (``Any``, optional): The upper bound, ``None`` for no bound.
         """
-        return set(self._v_data.keys())
+        _e_tuple, _e_label = self._e_tuple, self._e_label
+        return [_e_label(_e_tuple[e_id]) for e_id in self._range_index(self._e_indexes, field).range(lo, hi)]
 
-    @cached_property
-    def all_e(self) -> Set[Tuple]:
+    def _v_labels(self, keys: Iterator[Any]) -> Iterator[Any]:
         r"""
-        Return a set of all hyperedges in the hypergraph.
+        Map internal vertex keys to vertex ids, lazily.
+
+        Args:
+            ``keys`` (``Iterator[Any]``): The internal keys.
         """
-        return set(self._e_data.keys())
+        if self.intern_v:
+            return map(self._v_label.__getitem__, keys)
+        return keys
 
-    @cached_property
-    def num_v(self) -> int:
+    def _degree_index(self) -> DegreeIndex:
         r"""
-        Return the number of vertices in the hypergraph.
+        Return the degree index of the vertices.
         """
-        return len(self._v_data)
+        assert self._v_degree_index is not None, 'Ordering by degree needs create_index("v", None, kind="degree").'
+        return self._v_degree_index
 
-    @cached_property
-    def num_e(self) -> int:
+    def _id_index(self) -> IdIndex:
         r"""
-        Return the number of hyperedges in the hypergraph.
+        Return the index of the vertices ordered by id.
         """
-        return len(self._e_data)
+        index = self._v_id_indexes.get("sorted")
+        assert index is not None, 'Ordering by id needs create_index("v", None, kind="sorted").'
+        return index
 
-    def add_v(self, v_id: Any, v_data: Optional[Dict] = None):
+    def count_v_by_degree(self, lo: int = 0, hi: Optional[int] = None) -> int:
         r"""
-        Add a vertex to the hypergraph.
+        Return the number of vertices whose degree is between ``lo`` and ``hi`` (both included). Needs a
+        ``"degree"`` index on the vertices.
 
         Args:
-            ``v_id`` (``Any``): The vertex id.
-            ``v_data`` (``dict``, optional): The vertex data.
+            ``lo`` (``int``): The lowest degree. Defaults to 0.
+            ``hi`` (``int``, optional): The highest degree, ``None`` for no bound.
         """
-        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
-        if v_data is not None:
-            assert isinstance(v_data, dict), "The vertex data must be a dictionary."
-        else:
-            v_data = {}
-        if v_id not in self._v_data:
-            self._v_data[v_id] = v_data
-            self._v_inci[v_id] = set()
-        else:
-            self._v_data[v_id].update(v_data)
-        self._clear_cache()
+        return self._degree_index().count(lo, hi)
 
-    def add_e(self, e_tuple: Union[List, Set, Tuple], e_data: Optional[Dict] = None):
+    def iter_v_by_degree(
+        self, lo: int = 0, hi: Optional[int] = None, start: int = 0, descending: bool = False
+    ) -> Iterator[Any]:
         r"""
-        Add a hyperedge to the hypergraph.
+        Iterate over the vertices whose degree is between ``lo`` and ``hi`` (both included), in ascending or
+        descending order of degree, skipping the first ``start`` ones. Needs a ``"degree"`` index on the vertices.
+
+        Finding the first vertex costs about the number of distinct degrees divided by 64, each next one is
+        constant time, so a page of vertices is read without sorting. The order of vertices of the same degree
+        is arbitrary but fixed until the hypergraph changes.
 
         Args:
-            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
-            ``e_data`` (``dict``, optional): The hyperedge data.
+            ``lo`` (``int``): The lowest degree. Defaults to 0.
+            ``hi`` (``int``, optional): The highest degree, ``None`` for no bound.
+            ``start`` (``int``): The number of vertices to skip. Defaults to 0.
+            ``descending`` (``bool``): Iterate from the highest degree. Defaults to ``False``.
         """
-        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
-        if e_data is not None:
-            assert isinstance(e_data, dict), "The hyperedge data must be a dictionary."
-        else:
-            e_data = {}
-        e_tuple = self.encode_e(e_tuple)
-        if e_tuple not in self._e_data:
-            self._e_data[e_tuple] = e_data
-            for v in e_tuple:
-                self._v_inci[v].add(e_tuple)
-        else:
-            self._e_data[e_tuple].update(e_data)
-        self._clear_cache()
+        return self._v_labels(self._degree_index().iter(lo, hi, start, descending))
 
-    def remove_v(self, v_id: Any):
+    def iter_v_by_id(self, start: int = 0, descending: bool = False, after: Optional[str] = None) -> Iterator[Any]:
         r"""
-        Remove a vertex from the hypergraph.
+        Iterate over the vertices in ascending or descending order of their ids compared as strings, skipping the
+        first ``start`` ones. Needs a ``"sorted"`` index on the vertices.
+
+        Finding the first vertex costs ``O(log V)``, each next one is constant time.
 
         Args:
-            ``v_id`` (``Any``): The vertex id.
+            ``start`` (``int``): The number of vertices to skip. Defaults to 0.
+            ``descending`` (``bool``): Iterate in descending order. Defaults to ``False``.
+            ``after`` (``str``, optional): Start after the vertices whose id, as a string, is ``after`` or sorts
+                before it (after it if ``descending``), e.g. the last id of the previous page. ``start`` is counted
+                from there.
         """
-        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
-        assert v_id in self._v_data, f"The vertex {v_id} does not exist in the hypergraph."
-        del self._v_data[v_id]
-        old_e_tuples, new_e_tuples = [], []
-        for e_tuple in self._v_inci[v_id]:
-            new_e_tuple = self.encode_e(set(e_tuple) - {v_id})
-            if len(new_e_tuple) >= 2:
-                # todo: maybe new e tuple existing in hg, need to merge to hyperedge information
-                self._e_data[new_e_tuple] = deepcopy(self._e_data[e_tuple])
-            del self._e_data[e_tuple]
-            old_e_tuples.append(e_tuple)
-            new_e_tuples.append(new_e_tuple)
-        del self._v_inci[v_id]
-        for old_e_tuple, new_e_tuple in zip(old_e_tuples, new_e_tuples):
-            for _v_id in old_e_tuple:
-                if _v_id != v_id:
-                    self._v_inci[_v_id].remove(old_e_tuple)
-                    if len(new_e_tuple) >= 2:
-                        self._v_inci[_v_id].add(new_e_tuple)
-        self._clear_cache()
+        index = self._id_index()
+        if after is not None:
+            start += len(index) - index.rank(after) if descending else index.rank(after, after=True)
+        return self._v_labels(index.iter(start, descending))
 
-    def remove_e(self, e_tuple: Union[List, Set, Tuple]):
+    def rank_v_by_id(self, v_id: Any) -> int:
         r"""
-        Remove a hyperedge from the hypergraph.
+        Return the number of vertices whose id sorts before ``v_id``, compared as strings. Needs a ``"sorted"``
+        index on the vertices.
 
         Args:
-            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+            ``v_id`` (``Any``): The vertex id, which need not exist.
         """
-        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
-        e_tuple = self.encode_e(e_tuple)
-        assert e_tuple in self._e_data, f"The hyperedge {e_tuple} does not exist in the hypergraph."
-        for v in e_tuple:
-            self._v_inci[v].remove(e_tuple)
-        del self._e_data[e_tuple]
-        self._clear_cache()
+        return self._id_index().rank(str(v_id))
 
-    def update_v(self, v_id: Any, v_data: dict):
+    def search_v(
+        self, query: str, weights: Optional[Dict[Optional[str], int]] = None, prefix: bool = False
+    ) -> Dict[Any, int]:
         r"""
-        Update the vertex data.
+        Search vertices whose id or text fields contain ``query``, ignoring case, and score them.
+
+        Each field with a ``"text"`` index (``create_index("v", field, kind="text")``, or ``None`` for the
+        ids) is searched in time proportional to its matches, the others are scanned.
 
         Args:
-            ``v_id`` (``Any``): The vertex id.
-            ``v_data`` (``dict``): The vertex data.
-        """
-        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
-        assert isinstance(v_data, dict), "The vertex data must be a dictionary."
-        assert v_id in self._v_data, f"The vertex {v_id} does not exist in the hypergraph."
-        self._v_data[v_id].update(v_data)
-        self._clear_cache()
+            ``query`` (``str``): The text to look for, not empty.
+            ``weights`` (``Dict[Optional[str], int]``, optional): The score of a match in each field, ``None``
+                standing for the vertex id. Defaults to ``{None: 1}``, a search of the ids.
+            ``prefix`` (``bool``): Only match values that start with ``query``. Defaults to ``False``.
 
-    def update_e(self, e_tuple: Union[List, Set, Tuple], e_data: dict):
+        Returns:
+            ``Dict[Any, int]``: The matching vertices and the sum of the weights of their matching fields.
+        """
+        assert query, "The query must not be empty."
+        if weights is None:
+            weights = {None: 1}
+        scores: Dict[Any, int] = defaultdict(int)
+        for name, weight in weights.items():
+            index = self._v_id_indexes.get("text") if name is None else self._v_indexes.get(name)
+            if index is not None and index.kind == "text":
+                keys = index.search(query, prefix)
+            else:
+                keys = self._scan_text(name, query, prefix)
+            for key in keys:
+                scores[key] += weight
+        if self.intern_v:
+            _v_label = self._v_label
+            return {_v_label[key]: score for key, score in scores.items()}
+        return dict(scores)
+
+    def _scan_text(self, name: Optional[str], query: str, prefix: bool) -> Iterator[Any]:
         r"""
-        Update the hyperedge data.
+        Scan the vertices for the keys of those whose id or text field contains ``query``, ignoring case.
 
         Args:
-            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
-            ``e_data`` (``dict``): The hyperedge data.
+            ``name`` (``str``, optional): The field, ``None`` for the vertex id.
+            ``query`` (``str``): The text to look for.
+            ``prefix`` (``bool``): Only match values that start with ``query``.
         """
-        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
-        assert isinstance(e_data, dict), "The hyperedge data must be a dictionary."
-        e_tuple = self.encode_e(e_tuple)
-        assert e_tuple in self._e_data, f"The hyperedge {e_tuple} does not exist in the hypergraph."
-        self._e_data[e_tuple].update(e_data)
-        self._clear_cache()
+        query = query.lower()
+        if name is None:
+            texts = ((key, str(v_id)) for key, v_id in self._v_id_records())
+        else:
+            _, records = self._index_records("v")
+            texts = ((key, data.get(name)) for key, data in records)
+        for key, text in texts:
+            if isinstance(text, str):
+                text = text.lower()
+                if text.startswith(query) if prefix else query in text:
+                    yield key
+
+    def to_csr(self) -> CSRIncidence:
+        r"""
+        Export the incidence structure in compressed sparse row form.
 
-    def has_v(self, v_id: Any) -> bool:
+        Vertices are numbered in ``all_v`` order and hyperedges in ``all_e`` order.
+
+        Returns:
+            ``CSRIncidence``: The vertex-to-hyperedge and hyperedge-to-vertex offset and index arrays.
+        """
+        v_ids = list(self.all_v)
+        v_keys = list(self._v_index.values()) if self.intern_v else v_ids
+        pos = {v_key: i for i, v_key in enumerate(v_keys)}
+        return build_csr(v_ids, ([pos[v] for v in e_key] for e_key in self._e_index))
+
+    def freeze(self) -> FrozenHypergraph:
         r"""
-        Check if the vertex exists.
+        Return a read-only snapshot of the hypergraph backed by its CSR incidence structure.
 
-        Args:
-            ``v_id`` (``Any``): The vertex id.
+        Later changes to the topology are not reflected in the snapshot, but the vertex and hyperedge data
+        dicts are shared with it rather than copied.
         """
-        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
-        return v_id in self._v_data
+        v_data = [v_data for _, v_data in self._v_items()]
+        e_data = [self._e_data[e_id] for e_id in self._e_index.values()]
+        return FrozenHypergraph(csr=self.to_csr(), v_data=v_data, e_data=e_data)
 
-    def has_e(self, e_tuple: Union[List, Set, Tuple]) -> bool:
+    def share(self) -> SharedHypergraph:
         r"""
-        Check if the hyperedge exists.
+        Publish a frozen copy of the hypergraph in a shared memory block for worker processes, returning the
+        ``SharedHypergraph`` to run ``map`` on. Close it when done, or use it as a context manager.
 
-        Args:
-            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        The copy is taken under the read lock and holds the vertex and hyperedge data as of this call.
         """
-        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
-        try:
-            e_tuple = self.encode_e(e_tuple)
-        except AssertionError:
-            return False
-        return e_tuple in self._e_data
+        with self.lock.read():
+            return SharedHypergraph(self.freeze())
 
-    def degree_v(self, v_id: Any) -> int:
+    def _matrix(self, name: str, backend: str, build: Callable[[CSRIncidence, List[float], str], Any]) -> Any:
         r"""
-        Return the degree of the vertex.
+        Return a matrix operator from the cache, building it if the hypergraph changed since it was cached.
 
         Args:
-            ``v_id`` (``Any``): The vertex id.
+            ``name`` (``str``): The name of the operator.
+            ``backend`` (``str``): ``"auto"``, ``"scipy"`` or ``"coo"``.
+            ``build`` (``Callable``): Called with the incidence structure, the hyperedge weights and the backend.
         """
-        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
-        assert v_id in self._v_data, f"The vertex {v_id} does not exist in the hypergraph."
-        return len(self._v_inci[v_id])
-
-    def degree_e(self, e_tuple: Union[List, Set, Tuple]) -> int:
+        backend = matrix.resolve_backend(backend)
+        if self._matrix_version != self._version:
+            self._matrix_cache, self._matrix_version = {}, self._version
+        key = (name, backend)
+        if key not in self._matrix_cache:
+            if "csr" not in self._matrix_cache:
+                self._matrix_cache["csr"] = (self.to_csr(), self._e_weights())
+            self._matrix_cache[key] = build(*self._matrix_cache["csr"], backend)
+        return self._matrix_cache[key]
+
+    def _e_weights(self) -> List[float]:
         r"""
-        Return the degree of the hyperedge.
+        Return the ``weight`` of each hyperedge in ``all_e`` order, ``1.0`` for hyperedges without one.
+        """
+        _e_data, weights = self._e_data, []
+        for e_id in self._e_index.values():
+            weight = _e_data[e_id].get("weight", 1.0)
+            assert isinstance(weight, (int, float)) and weight >= 0, "Hyperedge weights must be non-negative numbers."
+            weights.append(float(weight))
+        return weights
+
+    def incidence_matrix(self, backend: str = "auto") -> Any:
+        r"""
+        Return the ``num_v x num_e`` incidence matrix ``H``: ``H[i, j] = 1`` when the ``i``-th vertex of ``all_v``
+        belongs to the ``j``-th hyperedge of ``all_e``.
+
+        Matrix operators are ``scipy.sparse.csr_matrix`` objects with the ``"scipy"`` backend and ``COOMatrix``
+        objects with the pure-Python ``"coo"`` one; ``"auto"`` uses SciPy when it is installed. They are cached
+        until the hypergraph changes (see ``version``) and shared between calls, so copy one before modifying
+        it. Edits made directly to a data dict do not change the version, call ``update_e`` to change a weight.
 
         Args:
-            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+            ``backend`` (``str``): ``"auto"``, ``"scipy"`` or ``"coo"``. Defaults to ``"auto"``.
         """
-        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
-        e_tuple = self.encode_e(e_tuple)
-        assert e_tuple in self._e_data, f"The hyperedge {e_tuple} does not exist in the hypergraph."
-        return len(e_tuple)
+        return self._matrix("incidence", backend, lambda csr, weights, backend: matrix.incidence_matrix(csr, backend))
 
-    def nbr_e_of_v(self, v_id: Any) -> set:
+    def degree_vectors(self, backend: str = "auto") -> Tuple[Any, Any]:
         r"""
-        Return the incident hyperedges of the vertex.
+        Return the vertex degrees, weighted by the ``weight`` of the hyperedges (``1`` by default), in ``all_v``
+        order and the hyperedge degrees in ``all_e`` order, as NumPy arrays with the ``"scipy"`` backend and as
+        lists with the ``"coo"`` one (see ``incidence_matrix``).
 
         Args:
-            ``v_id`` (``Any``): The vertex id.
+            ``backend`` (``str``): ``"auto"``, ``"scipy"`` or ``"coo"``. Defaults to ``"auto"``.
         """
-        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
-        assert v_id in self._v_data, f"The vertex {v_id} does not exist in the hypergraph."
-        return set(self._v_inci[v_id])
 
-    def nbr_v_of_e(self, e_tuple: Union[List, Set, Tuple]) -> set:
+        def build(csr: CSRIncidence, weights: List[float], backend: str) -> Tuple[Any, Any]:
+            if backend == "scipy":
+                import numpy as np
+
+                h = csr.to_scipy()
+                return h @ np.asarray(weights, dtype=np.float64), np.diff(np.frombuffer(csr.e_ptr, dtype=np.int64))
+            return matrix.degree_vectors(csr, weights)
+
+        return self._matrix("degrees", backend, build)
+
+    def laplacian(self, backend: str = "auto") -> Any:
         r"""
-        Return the incident vertices of the hyperedge.
+        Return the ``num_v x num_v`` normalized hypergraph Laplacian ``I - Dv^-1/2 H W De^-1 H^T Dv^-1/2``, where
+        ``W`` holds the hyperedge weights and ``Dv``, ``De`` the degrees of ``degree_vectors``. Isolated vertices
+        have a ``1`` on the diagonal. See ``incidence_matrix`` for the backends and caching.
 
         Args:
-            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+            ``backend`` (``str``): ``"auto"``, ``"scipy"`` or ``"coo"``. Defaults to ``"auto"``.
         """
-        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
-        e_tuple = self.encode_e(e_tuple)
-        assert e_tuple in self._e_data, f"The hyperedge {e_tuple} does not exist in the hypergraph."
-        return set(e_tuple)
+        return self._matrix("laplacian", backend, matrix.laplacian)
 
-    def nbr_v(self, v_id: Any, exclude_self=True) -> set:
+    def clique_adjacency(self, backend: str = "auto") -> Any:
         r"""
-        Return the neighbors of the vertex.
+        Return the ``num_v x num_v`` adjacency matrix of the clique expansion: the entry of two vertices is the
+        sum of the weights of the hyperedges holding both, and the diagonal is zero. See ``incidence_matrix``
+        for the backends and caching.
 
         Args:
-            ``v_id`` (``Any``): The vertex id.
+            ``backend`` (``str``): ``"auto"``, ``"scipy"`` or ``"coo"``. Defaults to ``"auto"``.
         """
-        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
-        assert v_id in self._v_data, f"The vertex {v_id} does not exist in the hypergraph."
-        nbrs: set = set()
-        for e_tuple in self._v_inci[v_id]:
-            nbrs.update(e_tuple)
-        if exclude_self:
-            nbrs.remove(v_id)
-        return nbrs
+        return self._matrix("clique_adjacency", backend, matrix.clique_adjacency)
 
-    def to_hif(self, file_path: Optional[Union[str, Path]] = None) -> Dict[str, Any]:
+    def random_walk_matrix(self, backend: str = "auto") -> Any:
         r"""
-        Export the hypergraph to HIF (Hypergraph Interchange Format) format.
+        Return the ``num_v x num_v`` transition matrix ``Dv^-1 H W De^-1 H^T`` of the random walk that follows an
+        incident hyperedge chosen in proportion to its weight to one of its vertices chosen uniformly. Rows of
+        isolated vertices are zero. See ``incidence_matrix`` for the backends and caching.
 
         Args:
-            ``file_path`` (``Union[str, Path]``, optional): If provided, save to file. Otherwise return dict.
-
-        Returns:
-            ``Dict[str, Any]``: HIF format dictionary.
+            ``backend`` (``str``): ``"auto"``, ``"scipy"`` or ``"coo"``. Defaults to ``"auto"``.
         """
-        # Build incidences array (required)
-        incidences = []
-        edge_to_id = {}
-
-        # First pass: assign edge IDs
-        for e_tuple in self._e_data.keys():
-            e_data = self._e_data[e_tuple]
-            # Check if edge has an ID/name attribute
-            if "id" in e_data:
-                edge_id = e_data["id"]
-            elif "name" in e_data:
-                edge_id = e_data["name"]
-            else:
-                # Create a unique edge identifier
-                # Use a string representation of sorted vertices
-                edge_id = "_".join(str(v) for v in sorted(e_tuple))
-            edge_to_id[e_tuple] = edge_id
+        return self._matrix("random_walk", backend, matrix.random_walk)
 
-        # Second pass: build incidences
-        for e_tuple in self._e_data.keys():
-            edge_id = edge_to_id[e_tuple]
-            e_data = self._e_data[e_tuple]
+    @staticmethod
+    def _hif_edge_id(e_tuple: Tuple, e_data: Dict) -> Any:
+        r"""
+        Return the HIF edge id of a hyperedge: its ``id`` or ``name`` attribute, or its joined (sorted) vertex ids.
 
-            # Extract attrs (all fields except weight)
-            e_attrs = {k: v for k, v in e_data.items() if k != "weight"}
+        Args:
+            ``e_tuple`` (``Tuple``): The hyperedge tuple.
+            ``e_data`` (``dict``): The hyperedge data.
+        """
+        if "id" in e_data:
+            return e_data["id"]
+        if "name" in e_data:
+            return e_data["name"]
+        return "_".join(str(v) for v in e_tuple)
 
+    def _hif_incidences(self) -> Iterator[Dict[str, Any]]:
+        r"""
+        Iterate over the HIF incidence records, one for each vertex of each hyperedge.
+        """
+        for e_tuple, e_data in self._e_items():
+            edge_id = self._hif_edge_id(e_tuple, e_data)
             for v_id in e_tuple:
-                v_data = self._v_data.get(v_id, {})
+                v_data = self.v(v_id, {})
                 # Extract attrs for incidence (all fields except weight)
-                v_attrs = {k: v for k, v in v_data.items() if k != "weight"}
-
                 incidence = {
                     "edge": edge_id,
                     "node": v_id,
-                    "attrs": v_attrs,
+                    "attrs": {k: v for k, v in v_data.items() if k != "weight"},
                 }
                 # Only include weight if it exists
                 if "weight" in v_data:
                     incidence["weight"] = v_data["weight"]
-                incidences.append(incidence)
-
-        # Build nodes array (optional)
-        nodes = []
-        for v_id in self._v_data.keys():
-            v_data = self._v_data[v_id]
-            v_attrs = {k: v for k, v in v_data.items() if k != "weight"}
+                yield incidence
 
-            node = {"node": v_id, "attrs": v_attrs}
-            # Only include weight if it exists
+    def _hif_nodes(self) -> Iterator[Dict[str, Any]]:
+        r"""
+        Iterate over the HIF node records.
+        """
+        for v_id, v_data in self._v_items():
+            node = {"node": v_id, "attrs": {k: v for k, v in v_data.items() if k != "weight"}}
             if "weight" in v_data:
                 node["weight"] = v_data["weight"]
-            nodes.append(node)
+            yield node
 
-        # Build edges array (optional)
-        edges = []
-        for e_tuple in self._e_data.keys():
-            e_data = self._e_data[e_tuple]
-            edge_id = edge_to_id[e_tuple]
-            e_attrs = {k: v for k, v in e_data.items() if k != "weight"}
-
-            edge = {"edge": edge_id, "attrs": e_attrs}
-            # Only include weight if it exists
+    def _hif_edges(self) -> Iterator[Dict[str, Any]]:
+        r"""
+        Iterate over the HIF edge records.
+        """
+        for e_tuple, e_data in self._e_items():
+            edge = {
+                "edge": self._hif_edge_id(e_tuple, e_data),
+                "attrs": {k: v for k, v in e_data.items() if k != "weight"},
+            }
             if "weight" in e_data:
                 edge["weight"] = e_data["weight"]
-            edges.append(edge)
+            yield edge
+
+    def to_hif(self, file_path: Optional[Union[str, Path]] = None) -> Dict[str, Any]:
+        r"""
+        Export the hypergraph to HIF (Hypergraph Interchange Format) format.
+
+        To write a large hypergraph to a file without building the dictionary, use ``save_as_hif`` instead.
 
-        # Build HIF structure
+        Args:
+            ``file_path`` (``Union[str, Path]``, optional): If provided, save to file. Otherwise return dict.
+
+        Returns:
+            ``Dict[str, Any]``: HIF format dictionary.
+        """
         hif_data = {
-            "incidences": incidences,
+            "incidences": list(self._hif_incidences()),
             "network-type": "undirected",  # Default to undirected
         }
-
+        nodes, edges = list(self._hif_nodes()), list(self._hif_edges())
         if nodes:
             hif_data["nodes"] = nodes
         if edges:
@@ -427,11 +2669,9 @@ class HypergraphDB(BaseHypergraphDB):
 
         # Save to file if path provided
         if file_path is not None:
-            if isinstance(file_path, str):
-                file_path = Path(file_path)
             try:
                 with open(file_path, "w", encoding="utf-8") as f:
-                    json.dump(hif_data, f, ensure_ascii=False, indent=2)
+                    write_hif(f, hif_data["incidences"], nodes, edges)
             except Exception as e:
                 raise IOError(f"Failed to save HIF file: {e}")
 
@@ -441,6 +2681,9 @@ class HypergraphDB(BaseHypergraphDB):
         r"""
         Save the hypergraph to HIF format JSON file.
 
+        The records are generated from the storage and written incrementally, so the document is never built in
+        memory.
+
         Args:
             ``file_path`` (``Union[str, Path]``): The file path to save the HIF file.
 
@@ -448,75 +2691,49 @@ class HypergraphDB(BaseHypergraphDB):
             ``bool``: True if successful, False otherwise.
         """
         try:
-            self.to_hif(file_path)
+            with open(file_path, "w", encoding="utf-8") as f:
+                write_hif(f, self._hif_incidences(), self._hif_nodes(), self._hif_edges())
             return True
         except Exception:
             return False
 
-    def from_hif(self, hif_data: Union[str, Path, Dict]) -> bool:
+    @staticmethod
+    def _parse_hif(members: Iterable[Tuple[str, Any]]) -> Optional[Tuple[Dict, Dict, Dict, Dict]]:
         r"""
-        Load hypergraph from HIF format data.
+        Group the records of a HIF document from its top-level ``(key, value)`` members: the nodes of each
+        hyperedge, and the attributes of each hyperedge and node.
+
+        The members may come in any order, and array values may be iterators that are consumed once.
 
         Args:
-            ``hif_data`` (``Union[str, Path, Dict]``): HIF data as dict, file path, or JSON string.
+            ``members`` (``Iterable[Tuple[str, Any]]``): The top-level members of the HIF document.
 
         Returns:
-            ``bool``: True if successful, False otherwise.
+            ``Optional[Tuple[dict, dict, dict, dict]]``: The nodes and attributes of each hyperedge, and the
+            attributes of each node from the incidences and from the nodes, or None if the document has no
+            ``incidences``.
         """
-        try:
-            # Load data if it's a file path or JSON string
-            if isinstance(hif_data, (str, Path)):
-                if isinstance(hif_data, str):
-                    # Check if it's a JSON string or file path
-                    if hif_data.strip().startswith("{"):
-                        data = json.loads(hif_data)
-                    else:
-                        file_path = Path(hif_data)
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            data = json.load(f)
-                else:
-                    with open(hif_data, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-            elif isinstance(hif_data, dict):
-                data = hif_data
-            else:
-                return False
-
-            # Validate required field
-            if "incidences" not in data:
-                return False
-
-            # Clear existing data
-            self._v_data = {}
-            self._e_data = {}
-            self._v_inci = defaultdict(set)
-            self._clear_cache()
-
-            # Build edge mapping from incidences
-            edge_nodes_map: Dict[str, Set[str]] = {}  # edge_id -> set of nodes
-            edge_attrs_map: Dict[str, Dict[str, Any]] = {}  # edge_id -> attrs
-            node_attrs_map: Dict[str, Dict[str, Any]] = {}  # node_id -> attrs
-
-            # Process incidences
-            for incidence in data["incidences"]:
-                edge_id = incidence["edge"]
-                node_id = incidence["node"]
-
-                # Initialize edge if not seen
-                if edge_id not in edge_nodes_map:
-                    edge_nodes_map[edge_id] = set()
-
-                edge_nodes_map[edge_id].add(node_id)
-
-                # Store node attributes from incidence
-                if "attrs" in incidence:
-                    if node_id not in node_attrs_map:
-                        node_attrs_map[node_id] = {}
-                    node_attrs_map[node_id].update(incidence["attrs"])
-
-            # Process nodes array if present
-            if "nodes" in data:
-                for node in data["nodes"]:
+        edge_nodes_map: Dict[str, Set[str]] = {}  # edge_id -> set of nodes
+        edge_attrs_map: Dict[str, Dict[str, Any]] = {}  # edge_id -> attrs
+        inci_attrs_map: Dict[str, Dict[str, Any]] = {}  # node_id -> attrs from incidences
+        node_attrs_map: Dict[str, Dict[str, Any]] = {}  # node_id -> attrs from nodes, which take precedence
+        has_incidences = False
+        for key, value in members:
+            if key == "incidences":
+                has_incidences = True
+                for incidence in value:
+                    edge_id = incidence["edge"]
+                    node_id = incidence["node"]
+                    if edge_id not in edge_nodes_map:
+                        edge_nodes_map[edge_id] = set()
+                    edge_nodes_map[edge_id].add(node_id)
+                    # Store node attributes from incidence
+                    if "attrs" in incidence:
+                        if node_id not in inci_attrs_map:
+                            inci_attrs_map[node_id] = {}
+                        inci_attrs_map[node_id].update(incidence["attrs"])
+            elif key == "nodes":
+                for node in value:
                     node_id = node["node"]
                     if node_id not in node_attrs_map:
                         node_attrs_map[node_id] = {}
@@ -524,10 +2741,8 @@ class HypergraphDB(BaseHypergraphDB):
                         node_attrs_map[node_id].update(node["attrs"])
                     if "weight" in node:
                         node_attrs_map[node_id]["weight"] = node["weight"]
-
-            # Process edges array if present
-            if "edges" in data:
-                for edge in data["edges"]:
+            elif key == "edges":
+                for edge in value:
                     edge_id = edge["edge"]
                     if edge_id not in edge_attrs_map:
                         edge_attrs_map[edge_id] = {}
@@ -535,46 +2750,118 @@ class HypergraphDB(BaseHypergraphDB):
                         edge_attrs_map[edge_id].update(edge["attrs"])
                     if "weight" in edge:
                         edge_attrs_map[edge_id]["weight"] = edge["weight"]
+        if not has_incidences:
+            return None
+        return edge_nodes_map, edge_attrs_map, inci_attrs_map, node_attrs_map
+
+    @staticmethod
+    def _take_hif_vertices(
+        edge_nodes_map: Dict[str, Set[str]], inci_attrs_map: Dict[str, Dict], node_attrs_map: Dict[str, Dict]
+    ) -> Iterator[Tuple[Any, Dict]]:
+        r"""
+        Generate the nodes of the hyperedges of at least two nodes with their data, in order of first appearance.
+        The attributes are taken out of the maps of ``_parse_hif`` as they are generated, not copied.
+
+        Args:
+            ``edge_nodes_map`` (``Dict[str, Set[str]]``): The nodes of each hyperedge.
+            ``inci_attrs_map`` (``Dict[str, dict]``): The attributes of each node from the incidences.
+            ``node_attrs_map`` (``Dict[str, dict]``): The attributes of each node from the nodes, which take
+                precedence.
+        """
+        seen_v: Set[Any] = set()
+        for node_set in edge_nodes_map.values():
+            if len(node_set) < 2:
+                continue  # Skip edges with less than 2 nodes
+            for node_id in node_set:
+                if node_id not in seen_v:
+                    seen_v.add(node_id)
+                    v_data = inci_attrs_map.pop(node_id, {})
+                    v_data.update(node_attrs_map.pop(node_id, ()))
+                    yield node_id, v_data
+
+    @staticmethod
+    def _take_hif_edges(
+        edge_nodes_map: Dict[str, Set[str]], edge_attrs_map: Dict[str, Dict]
+    ) -> Iterator[Tuple[Set, Dict]]:
+        r"""
+        Generate the hyperedges of at least two nodes with their data, in document order. Each hyperedge is taken
+        out of the maps of ``_parse_hif`` as it is generated, so that the maps shrink while the hyperedges are
+        inserted.
 
-            # Build hypergraph from edge mappings
-            for edge_id, node_set in edge_nodes_map.items():
-                if len(node_set) < 2:
-                    continue  # Skip edges with less than 2 nodes
-
-                # Convert to sorted tuple for edge key
-                e_tuple = tuple(sorted(node_set))
-
-                # Add nodes
-                for node_id in node_set:
-                    if node_id not in self._v_data:
-                        node_data = node_attrs_map.get(node_id, {}).copy()
-                        self._v_data[node_id] = node_data
-                        self._v_inci[node_id] = set()
-
-                # Add edge
-                e_data = edge_attrs_map.get(edge_id, {}).copy()
-                # Store the original HIF edge ID if it's meaningful (not just a generated ID)
-                # Check if edge_id looks like a generated ID (contains underscores and numbers)
-                # If it's a meaningful string (like a paper title), store it as 'id' or 'name'
-                if not (
-                    edge_id.startswith("_")
-                    or "_" in edge_id
-                    and all(c.isdigit() or c == "_" for c in edge_id.replace("_", ""))
-                ):
-                    # It's a meaningful ID, store it
-                    if "id" not in e_data and "name" not in e_data:
-                        e_data["id"] = edge_id
-                self._e_data[e_tuple] = e_data
-
-                # Update incidence mapping
-                for node_id in node_set:
-                    self._v_inci[node_id].add(e_tuple)
+        Args:
+            ``edge_nodes_map`` (``Dict[str, Set[str]]``): The nodes of each hyperedge.
+            ``edge_attrs_map`` (``Dict[str, dict]``): The attributes of each hyperedge.
+        """
+        for edge_id in list(edge_nodes_map):
+            node_set = edge_nodes_map.pop(edge_id)
+            e_data = edge_attrs_map.pop(edge_id, {})
+            if len(node_set) < 2:
+                continue  # Skip edges with less than 2 nodes
+            # Store the original HIF edge ID if it's meaningful (not just a generated ID)
+            # Check if edge_id looks like a generated ID (contains underscores and numbers)
+            # If it's a meaningful string (like a paper title), store it as 'id' or 'name'
+            if not (
+                edge_id.startswith("_")
+                or "_" in edge_id
+                and all(c.isdigit() or c == "_" for c in edge_id.replace("_", ""))
+            ):
+                # It's a meaningful ID, store it
+                if "id" not in e_data and "name" not in e_data:
+                    e_data["id"] = edge_id
+            yield node_set, e_data
+
+    @_write_locked
+    def from_hif(self, hif_data: Union[str, Path, Dict]) -> bool:
+        r"""
+        Load hypergraph from HIF format data.
+
+        Files are parsed incrementally with ``iter_hif``, which keeps only the nodes of each hyperedge and the
+        attributes of each node and hyperedge, not the JSON text or its records. They are then fed to the batch
+        insertion path by generators that take them out as they go, so the parsed data is held about once.
+
+        Args:
+            ``hif_data`` (``Union[str, Path, Dict]``): HIF data as dict, file path, or JSON string.
+
+        Returns:
+            ``bool``: True if successful, False otherwise.
+        """
+        try:
+            if isinstance(hif_data, dict):
+                parsed = self._parse_hif(hif_data.items())
+            elif isinstance(hif_data, str) and hif_data.strip().startswith("{"):
+                parsed = self._parse_hif(json.loads(hif_data).items())
+            elif isinstance(hif_data, (str, Path)):
+                with open(hif_data, "r", encoding="utf-8") as f:
+                    parsed = self._parse_hif(iter_hif(f))
+            else:
+                return False
+            # Validate required field
+            if parsed is None:
+                return False
+            edge_nodes_map, edge_attrs_map, inci_attrs_map, node_attrs_map = parsed
+            del parsed
+
+            # Clear existing data, the import is logged as a checkpoint rather than as mutations
+            self._wal_paused = True
+            self._reset()
+            v_ids, v_data = tee(self._take_hif_vertices(edge_nodes_map, inci_attrs_map, node_attrs_map))
+            self.add_v_batch((v_id for v_id, _ in v_ids), (data for _, data in v_data))
+            # the attributes of nodes outside the hyperedges are not imported
+            inci_attrs_map.clear()
+            node_attrs_map.clear()
+            e_list, e_data = tee(self._take_hif_edges(edge_nodes_map, edge_attrs_map))
+            self.add_e_batch((node_set for node_set, _ in e_list), (data for _, data in e_data))
 
             self._clear_cache()
+            if self._wal_file is not None:
+                self._wal_paused = False
+                return self.checkpoint()
             return True
 
         except Exception:
             return False
+        finally:
+            self._wal_paused = False
 
     def load_from_hif(self, file_path: Union[str, Path]) -> bool:
         r"""
@@ -587,3 +2874,33 @@ class HypergraphDB(BaseHypergraphDB):
             ``bool``: True if successful, False otherwise.
         """
         return self.from_hif(file_path)
+
+
+class HypergraphSnapshot(HypergraphDB):
+    r"""
+    Read-only snapshot of a ``HypergraphDB``, returned by ``HypergraphDB.snapshot()``.
+
+    It has the read API of the hypergraph (queries, indexes, traversals, views, matrices, ``freeze()`` and
+    ``save()``) and keeps seeing the hypergraph as it was when the snapshot was taken, whatever happens to the
+    hypergraph afterwards. Mutations raise an ``AssertionError``. A snapshot cannot be saved over the storage file
+    of its hypergraph, whose write-ahead log would not match it.
+    """
+
+    def _read_only(self, *args: Any, **kwargs: Any):
+        raise AssertionError("A snapshot is read-only.")
+
+    add_v = add_e = add_v_batch = add_e_batch = remove_v = remove_v_batch = remove_e = update_v = update_e = _read_only
+    create_index = drop_index = load = load_from = from_hif = checkpoint = transaction = _read_only
+
+    def save(self, storage_file: Union[str, Path]) -> bool:
+        r"""
+        Save the snapshot to a storage file, which must not be the one of its hypergraph.
+        """
+        assert Path(storage_file) != self.storage_file, "A snapshot cannot be saved over its hypergraph."
+        return super().save(storage_file)
+
+    def snapshot(self) -> "HypergraphSnapshot":
+        r"""
+        Return the snapshot itself, which never changes.
+        """
+        return self
@@ -0,0 +1,964 @@
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from itertools import accumulate, repeat
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from hyperdb.versions import VersionedDict, VersionedList, Versions, newer_versions
+
+# Text is indexed by its trigrams, after marking its start and padding its end, so that every character of the
+# text starts a trigram and a prefix is a substring that starts with the mark.
+_START, _END = "\0", "\1\1"
+
+# Sorted ids are kept in blocks of up to twice this many ids.
+_ID_BLOCK = 512
+
+# Vertices are counted in blocks of this many degrees.
+_DEGREE_BLOCK = 64
+
+# Marks ``AttributeIndex.unhashable`` as copied since the last snapshot in the owned values of the index.
+_UNHASHABLE = object()
+
+
+def _trigrams(text: str) -> Set[str]:
+    r"""
+    Return the distinct trigrams of a marked and padded text.
+    """
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _sorted_values(values: Iterable[Any]) -> List[Any]:
+    r"""
+    Return the values in order, leaving out those that do not compare with the others.
+    """
+    values = list(values)
+    try:
+        return sorted(values)
+    except TypeError:
+        result: List[Any] = []
+        for value in values:
+            try:
+                insort(result, value)
+            except TypeError:
+                pass
+        return result
+
+
+def _unshared_state(index: Any) -> Dict[str, Any]:
+    r"""
+    Return the state of an index to pickle, without what it shares with its copies and snapshots.
+    """
+    return {name: value for name, value in index.__dict__.items() if name not in ("_owned", "_versions")}
+
+
+class _SortedValues(Sequence):
+    r"""
+    Distinct values of a snapshot of a sorted ``AttributeIndex``, sorted from its buckets when a range query first
+    reads them, so that the index does not copy its values for the snapshot.
+    """
+
+    __slots__ = ("_buckets", "_values")
+
+    def __init__(self, buckets: Mapping):
+        self._buckets = buckets
+        self._values: Optional[List[Any]] = None
+
+    def _sorted(self) -> List[Any]:
+        if self._values is None:
+            self._values = _sorted_values(self._buckets)
+        return self._values
+
+    def __getitem__(self, idx: Any) -> Any:
+        return self._sorted()[idx]
+
+    def __len__(self) -> int:
+        return len(self._sorted())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, _SortedValues)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return list, (self._sorted(),)
+
+
+@dataclass
+class AttributeIndex:
+    r"""
+    Secondary index of the vertices or hyperedges of a hypergraph by the value of one field of their data.
+
+    Records are grouped in buckets by value, so a lookup costs one hash probe. A sorted index additionally
+    keeps the distinct values in order, so that a range query bisects to its first value and only visits
+    the matching buckets. Adding a value to a sorted index shifts the values after it, which is cheap
+    unless the field has millions of distinct values.
+
+    Records without the field are not indexed. Records whose value cannot be hashed (a list, a dict) have no
+    bucket: they are kept in ``unhashable`` instead, and lookups check them by value. A sorted index expects the
+    values to be comparable with each other: a value that is not (a string among numbers) is still found by
+    value, but not by range.
+
+    Args:
+        ``name`` (``str``): The indexed field.
+        ``ordered`` (``bool``): Keep the values sorted for range queries. Defaults to ``False``.
+    """
+
+    name: str
+    ordered: bool = False
+    buckets: Dict[Any, Set[Any]] = field(default_factory=dict, repr=False)
+    values: List[Any] = field(default_factory=list, repr=False)
+    unhashable: Set[Any] = field(default_factory=set, repr=False)
+    # values whose bucket belongs to this index, None when all do; the others are shared with the copied index or
+    # with the snapshots
+    _owned: Optional[Set[Any]] = field(default=None, repr=False, compare=False)
+    # pre-images of the buckets changed since the last snapshot, None without snapshots
+    _versions: Optional[Versions] = field(default=None, repr=False, compare=False)
+
+    @property
+    def kind(self) -> str:
+        r"""
+        Return ``"sorted"`` or ``"hash"``.
+        """
+        return "sorted" if self.ordered else "hash"
+
+    def clear(self):
+        r"""
+        Remove all records from the index.
+        """
+        self.buckets, self.values, self.unhashable = {}, [], set()
+        self.unshare()
+
+    def copy(self) -> "AttributeIndex":
+        r"""
+        Return a copy of the index that can be updated independently. The copy shares the buckets until it
+        changes them, so the index must not be changed afterwards.
+        """
+        return AttributeIndex(
+            self.name, self.ordered, self.buckets.copy(), self.values.copy(), set(self.unhashable), _owned=set()
+        )
+
+    def snapshot(self) -> "AttributeIndex":
+        r"""
+        Return a read-only snapshot of the index in constant time. The index keeps the previous version of the
+        buckets it changes afterwards for the snapshot (see ``Versions``), whose values are sorted from its buckets
+        when a range query first needs them.
+        """
+        versions = self._versions = newer_versions(self._versions)
+        self._owned = set()
+        buckets = VersionedDict(self.buckets, "buckets", versions)
+        values = _SortedValues(buckets) if self.ordered else []
+        return AttributeIndex(self.name, self.ordered, buckets, values, self.unhashable)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return _unshared_state(self)
+
+    def __setstate__(self, state: Dict[str, Any]):
+        # indexes saved before unhashable values were tracked
+        state.setdefault("unhashable", set())
+        self.__dict__.update(state)
+
+    def unshare(self):
+        r"""
+        Change the buckets in place again, once the index or the snapshots they are shared with are gone.
+        """
+        self._owned = self._versions = None
+
+    def _own(self, value: Any) -> Set[Any]:
+        r"""
+        Return the bucket of a value to change it, after copying it if it is shared.
+
+        Args:
+            ``value`` (``Any``): The value.
+        """
+        bucket = self.buckets[value]
+        if value not in self._owned:
+            self._owned.add(value)
+            if self._versions is not None:
+                self._versions.save("buckets", self.buckets, value)
+            bucket = self.buckets[value] = bucket.copy()
+        return bucket
+
+    def _own_unhashable(self) -> Set[Any]:
+        r"""
+        Return ``unhashable`` to change it, after copying it if a snapshot shares it.
+        """
+        if self._versions is not None and _UNHASHABLE not in self._owned:
+            self._owned.add(_UNHASHABLE)
+            self.unhashable = set(self.unhashable)
+        return self.unhashable
+
+    def build(self, records: Iterable[Tuple[Any, Dict]]):
+        r"""
+        Index many records at once. The distinct values of a sorted index are sorted once at the end instead
+        of being inserted one at a time.
+
+        Args:
+            ``records`` (``Iterable[Tuple[Any, dict]]``): The ``(key, data)`` pairs.
+        """
+        ordered, self.ordered = self.ordered, False
+        try:
+            for key, data in records:
+                self.add(key, data)
+        finally:
+            self.ordered = ordered
+        if ordered:
+            self.values = _sorted_values(self.buckets)
+
+    def add(self, key: Any, data: Dict):
+        r"""
+        Index a record.
+
+        Args:
+            ``key`` (``Any``): The internal key of the record.
+            ``data`` (``dict``): The record data.
+        """
+        if self.name not in data:
+            return
+        value = data[self.name]
+        try:
+            bucket = self.buckets.get(value)
+        except TypeError:
+            self._own_unhashable().add(key)
+            return
+        if bucket is None:
+            if self._versions is not None:
+                self._versions.save("buckets", self.buckets, value)
+            bucket = self.buckets[value] = set()
+            if self.ordered:
+                try:
+                    insort(self.values, value)
+                except TypeError:
+                    pass
+        elif self._owned is not None:
+            bucket = self._own(value)
+        bucket.add(key)
+
+    def remove(self, key: Any, data: Dict):
+        r"""
+        Remove a record from the index. Must be called with the data the record was indexed with.
+
+        Args:
+            ``key`` (``Any``): The internal key of the record.
+            ``data`` (``dict``): The record data.
+        """
+        if self.name not in data:
+            return
+        value = data[self.name]
+        try:
+            bucket = self.buckets.get(value)
+        except TypeError:
+            self._own_unhashable().discard(key)
+            return
+        if bucket is None:
+            return
+        if self._owned is not None:
+            bucket = self._own(value)
+        bucket.discard(key)
+        if not bucket:
+            del self.buckets[value]
+            if self.ordered:
+                try:
+                    idx = bisect_left(self.values, value)
+                except TypeError:
+                    return
+                if idx < len(self.values) and self.values[idx] == value:
+                    del self.values[idx]
+
+    def find(self, value: Any) -> Set[Any]:
+        r"""
+        Return the keys of the records whose field may equal ``value``: the records in its bucket, and those whose
+        value cannot be hashed, which the caller checks by value. The set must not be modified.
+
+        Args:
+            ``value`` (``Any``): The value.
+        """
+        try:
+            bucket = self.buckets.get(value, set())
+        except TypeError:
+            return self.unhashable
+        return bucket | self.unhashable if self.unhashable else bucket
+
+    def range(self, lo: Optional[Any] = None, hi: Optional[Any] = None) -> Iterator[Any]:
+        r"""
+        Iterate over the keys of the records whose field is between ``lo`` and ``hi`` (both included), in
+        ascending order of the field.
+
+        Args:
+            ``lo`` (``Any``, optional): The lower bound, ``None`` for no bound.
+            ``hi`` (``Any``, optional): The upper bound, ``None`` for no bound.
+        """
+        assert self.ordered, f"The index on {self.name} is not sorted."
+        values, buckets = self.values, self.buckets
+        start = 0 if lo is None else bisect_left(values, lo)
+        stop = len(values) if hi is None else bisect_right(values, hi)
+        for idx in range(start, stop):
+            yield from buckets[values[idx]]
+
+
+@dataclass
+class TextIndex:
+    r"""
+    Inverted trigram index for case-insensitive substring and prefix search in a text field.
+
+    Each trigram of a lowercased text points to the records containing it, and each one or two character
+    prefix of a trigram to the trigrams starting with it. A query of up to three characters is answered from
+    the trigrams starting with it, a longer one from its rarest trigram, checking only the records holding
+    it. A search therefore costs in proportion to its matches rather than to the number of records. The index
+    keeps the lowercased text of each record and about one posting entry per character, so it is meant for
+    ids, names and descriptions rather than for long documents.
+
+    Only string values are indexed.
+
+    Args:
+        ``name`` (``str``, optional): The indexed field, ``None`` for an index fed with ``add_text``.
+    """
+
+    name: Optional[str]
+    grams: Dict[str, Set[Any]] = field(default_factory=dict, repr=False)
+    prefixes: Dict[str, Set[str]] = field(default_factory=dict, repr=False)
+    texts: Dict[Any, str] = field(default_factory=dict, repr=False)
+    # trigrams and prefixes (shorter, so they never collide) whose set belongs to this index, None when all do
+    _owned: Optional[Set[str]] = field(default=None, repr=False, compare=False)
+    # pre-images of the trigrams, prefixes and texts changed since the last snapshot, None without snapshots
+    _versions: Optional[Versions] = field(default=None, repr=False, compare=False)
+
+    @property
+    def kind(self) -> str:
+        r"""
+        Return ``"text"``.
+        """
+        return "text"
+
+    def clear(self):
+        r"""
+        Remove all records from the index.
+        """
+        self.grams, self.prefixes, self.texts = {}, {}, {}
+        self.unshare()
+
+    def copy(self) -> "TextIndex":
+        r"""
+        Return a copy of the index that can be updated independently. The copy shares the sets of keys and of
+        trigrams until it changes them, so the index must not be changed afterwards.
+        """
+        return TextIndex(self.name, self.grams.copy(), self.prefixes.copy(), self.texts.copy(), _owned=set())
+
+    def snapshot(self) -> "TextIndex":
+        r"""
+        Return a read-only snapshot of the index in constant time. The index keeps the previous version of the
+        sets and texts it changes afterwards for the snapshot, see ``Versions``.
+        """
+        versions = self._versions = newer_versions(self._versions)
+        self._owned = set()
+        return TextIndex(
+            self.name,
+            VersionedDict(self.grams, "grams", versions),
+            VersionedDict(self.prefixes, "prefixes", versions),
+            VersionedDict(self.texts, "texts", versions),
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return _unshared_state(self)
+
+    def unshare(self):
+        r"""
+        Change the sets in place again, once the index or the snapshots they are shared with are gone.
+        """
+        self._owned = self._versions = None
+
+    def _own(self, table: str, name: str) -> Set[Any]:
+        r"""
+        Return the set of a trigram or prefix to change it, after copying it if it is shared.
+
+        Args:
+            ``table`` (``str``): ``"grams"`` or ``"prefixes"``.
+            ``name`` (``str``): The trigram or prefix.
+        """
+        sets = getattr(self, table)
+        items = sets[name]
+        if name not in self._owned:
+            self._owned.add(name)
+            if self._versions is not None:
+                self._versions.save(table, sets, name)
+            items = sets[name] = items.copy()
+        return items
+
+    def build(self, records: Iterable[Tuple[Any, Dict]]):
+        r"""
+        Index many records at once.
+
+        Args:
+            ``records`` (``Iterable[Tuple[Any, dict]]``): The ``(key, data)`` pairs.
+        """
+        for key, data in records:
+            self.add(key, data)
+
+    def add(self, key: Any, data: Dict):
+        r"""
+        Index the field of a record.
+
+        Args:
+            ``key`` (``Any``): The internal key of the record.
+            ``data`` (``dict``): The record data.
+        """
+        value = data.get(self.name)
+        if isinstance(value, str):
+            self.add_text(key, value)
+
+    def add_text(self, key: Any, text: str):
+        r"""
+        Index a text for a record that has none indexed yet.
+
+        Args:
+            ``key`` (``Any``): The internal key of the record.
+            ``text`` (``str``): The text.
+        """
+        if not text:
+            return
+        grams, versions = self.grams, self._versions
+        if versions is not None:
+            versions.save("texts", self.texts, key)
+        text = self.texts[key] = _START + text.lower() + _END
+        for gram in _trigrams(text):
+            bucket = grams.get(gram)
+            if bucket is None:
+                if versions is not None:
+                    versions.save("grams", grams, gram)
+                grams[gram] = {key}
+                self._add_prefixes(gram)
+            elif self._owned is None:
+                bucket.add(key)
+            else:
+                self._own("grams", gram).add(key)
+
+    def _add_prefixes(self, gram: str):
+        r"""
+        Register a new trigram under its one and two character prefixes.
+        """
+        prefixes = self.prefixes
+        for prefix in (gram[:1], gram[:2]):
+            if prefix not in prefixes:
+                if self._versions is not None:
+                    self._versions.save("prefixes", prefixes, prefix)
+                prefixes[prefix] = {gram}
+            elif self._owned is None:
+                prefixes[prefix].add(gram)
+            else:
+                self._own("prefixes", prefix).add(gram)
+
+    def remove(self, key: Any, data: Dict):
+        r"""
+        Remove a record from the index.
+
+        Args:
+            ``key`` (``Any``): The internal key of the record.
+            ``data`` (``dict``): The record data, unused: the index keeps the text it indexed.
+        """
+        self.remove_text(key)
+
+    def remove_text(self, key: Any):
+        r"""
+        Remove the text of a record from the index, if it has one.
+
+        Args:
+            ``key`` (``Any``): The internal key of the record.
+        """
+        if self._versions is not None:
+            self._versions.save("texts", self.texts, key)
+        text = self.texts.pop(key, None)
+        if text is None:
+            return
+        # with snapshots, _own keeps the sets before they are removed
+        grams, prefixes, owned = self.grams, self.prefixes, self._owned
+        for gram in _trigrams(text):
+            bucket = grams[gram] if owned is None else self._own("grams", gram)
+            bucket.discard(key)
+            if not bucket:
+                del grams[gram]
+                for prefix in (gram[:1], gram[:2]):
+                    gram_set = prefixes[prefix] if owned is None else self._own("prefixes", prefix)
+                    gram_set.discard(gram)
+                    if not gram_set:
+                        del prefixes[prefix]
+
+    def search(self, query: str, prefix: bool = False) -> Set[Any]:
+        r"""
+        Return the keys of the records whose text contains ``query``, ignoring case.
+
+        Args:
+            ``query`` (``str``): The text to look for, not empty.
+            ``prefix`` (``bool``): Only match texts that start with ``query``. Defaults to ``False``.
+        """
+        query = query.lower()
+        if prefix:
+            query = _START + query
+        grams = self.grams
+        if len(query) < 3:
+            # every occurrence of the query starts a trigram
+            keys: Set[Any] = set()
+            for gram in self.prefixes.get(query, ()):
+                keys.update(grams[gram])
+            return keys
+        if len(query) == 3:
+            return set(grams.get(query, ()))
+        buckets = []
+        for gram in _trigrams(query):
+            bucket = grams.get(gram)
+            if bucket is None:
+                return set()
+            buckets.append(bucket)
+        texts = self.texts
+        return {key for key in min(buckets, key=len) if query in texts[key]}
+
+
+@dataclass
+class IdIndex:
+    r"""
+    Vertices in the order of their ids, compared as strings, for pages of vertices sorted by id.
+
+    The ids are kept in a list of sorted blocks of up to ``2 * _ID_BLOCK`` strings, so that adding or removing
+    one moves at most a block instead of the whole list. The n-th id is found by bisecting the running
+    sizes of the blocks, which are recomputed after a change, once per query.
+
+    Args:
+        ``name`` (``str``, optional): Always ``None``, the index is fed with ``add_text``.
+    """
+
+    name: Optional[str] = None
+    blocks: List[List[str]] = field(default_factory=list, repr=False)
+    maxes: List[str] = field(default_factory=list, repr=False)
+    keys: Dict[str, List[Any]] = field(default_factory=dict, repr=False)
+    texts: Dict[Any, str] = field(default_factory=dict, repr=False)
+    _offsets: Optional[List[int]] = field(default=None, repr=False, compare=False)
+    # ids of the blocks, and of the list of blocks, that belong to this index, None when the snapshots share none
+    _owned: Optional[Set[int]] = field(default=None, repr=False, compare=False)
+    # pre-images of the keys and texts changed since the last snapshot, None without snapshots
+    _versions: Optional[Versions] = field(default=None, repr=False, compare=False)
+
+    @property
+    def kind(self) -> str:
+        r"""
+        Return ``"sorted"``.
+        """
+        return "sorted"
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def clear(self):
+        r"""
+        Remove all records from the index.
+        """
+        self.blocks, self.maxes, self.keys, self.texts = [], [], {}, {}
+        self._offsets = None
+        self.unshare()
+
+    def copy(self) -> "IdIndex":
+        r"""
+        Return a copy of the index that can be updated independently.
+        """
+        blocks = [block.copy() for block in self.blocks]
+        return IdIndex(self.name, blocks, self.maxes.copy(), self.keys.copy(), self.texts.copy())
+
+    def snapshot(self) -> "IdIndex":
+        r"""
+        Return a read-only snapshot of the index in constant time. The index keeps the previous version of the keys
+        and texts it changes afterwards for the snapshot (see ``Versions``), and copies the list of blocks and each
+        block before changing them for the first time since.
+        """
+        versions = self._versions = newer_versions(self._versions)
+        self._owned = set()
+        keys, texts = VersionedDict(self.keys, "keys", versions), VersionedDict(self.texts, "texts", versions)
+        return IdIndex(self.name, self.blocks, self.maxes, keys, texts)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return _unshared_state(self)
+
+    def unshare(self):
+        r"""
+        Change the blocks in place again, once the snapshots they are shared with are gone.
+        """
+        self._owned = self._versions = None
+
+    def _own_blocks(self) -> Tuple[List[List[str]], List[str]]:
+        r"""
+        Return ``blocks`` and ``maxes`` to change them, after copying them if a snapshot shares them.
+        """
+        owned = self._owned
+        if owned is not None and id(self.blocks) not in owned:
+            self.blocks, self.maxes = self.blocks.copy(), self.maxes.copy()
+            owned.add(id(self.blocks))
+        return self.blocks, self.maxes
+
+    def _own_block(self, i: int) -> List[str]:
+        r"""
+        Return a block to change it, after copying it if a snapshot shares it. ``_own_blocks`` must come first.
+
+        Args:
+            ``i`` (``int``): The position of the block.
+        """
+        block = self.blocks[i]
+        owned = self._owned
+        if owned is not None and id(block) not in owned:
+            block = self.blocks[i] = block.copy()
+            owned.add(id(block))
+        return block
+
+    def add_text(self, key: Any, text: str):
+        r"""
+        Index the id of a record that has none indexed yet.
+
+        Args:
+            ``key`` (``Any``): The internal key of the record.
+            ``text`` (``str``): The id as a string.
+        """
+        if self._versions is not None:
+            self._versions.save("texts", self.texts, key)
+            self._versions.save("keys", self.keys, text)
+        self.texts[key] = text
+        # the lists of keys are replaced rather than changed, so that copies and snapshots of the index can share them
+        keys = self.keys.get(text)
+        self.keys[text] = [key] if keys is None else [*keys, key]
+        blocks, maxes = self._own_blocks()
+        if not blocks:
+            blocks.append([text])
+            maxes.append(text)
+        else:
+            i = bisect_right(maxes, text)
+            if i == len(maxes):
+                i -= 1
+                self._own_block(i).append(text)
+                maxes[i] = text
+            else:
+                insort(self._own_block(i), text)
+            block = blocks[i]
+            if len(block) > 2 * _ID_BLOCK:
+                blocks[i : i + 1] = [block[:_ID_BLOCK], block[_ID_BLOCK:]]
+                maxes.insert(i, block[_ID_BLOCK - 1])
+        self._offsets = None
+
+    def remove_text(self, key: Any):
+        r"""
+        Remove the id of a record from the index, if it has one.
+
+        Args:
+            ``key`` (``Any``): The internal key of the record.
+        """
+        text = self.texts.get(key)
+        if text is None:
+            return
+        if self._versions is not None:
+            self._versions.save("texts", self.texts, key)
+            self._versions.save("keys", self.keys, text)
+        del self.texts[key]
+        keys = self.keys[text]
+        if len(keys) == 1:
+            del self.keys[text]
+        else:
+            keys = self.keys[text] = keys.copy()
+            keys.remove(key)
+        blocks, maxes = self._own_blocks()
+        i = bisect_left(maxes, text)
+        block = self._own_block(i)
+        del block[bisect_left(block, text)]
+        if not block:
+            del blocks[i], maxes[i]
+        else:
+            maxes[i] = block[-1]
+        self._offsets = None
+
+    def _positions(self) -> List[int]:
+        r"""
+        Return the position of the first id of each block.
+        """
+        if self._offsets is None:
+            self._offsets = [0, *accumulate(map(len, self.blocks))]
+        return self._offsets
+
+    def rank(self, text: str, after: bool = False) -> int:
+        r"""
+        Return the number of ids sorting before ``text``, or up to ``text`` included if ``after``.
+
+        Args:
+            ``text`` (``str``): The id as a string.
+            ``after`` (``bool``): Count the ids equal to ``text`` as well. Defaults to ``False``.
+        """
+        bisect = bisect_right if after else bisect_left
+        i = bisect(self.maxes, text)
+        if i == len(self.blocks):
+            return len(self.texts)
+        return self._positions()[i] + bisect(self.blocks[i], text)
+
+    def iter(self, start: int = 0, descending: bool = False) -> Iterator[Any]:
+        r"""
+        Iterate over the keys of the records in ascending or descending order of their ids, skipping the first
+        ``start`` ones.
+
+        Args:
+            ``start`` (``int``): The number of records to skip.
+            ``descending`` (``bool``): Iterate in descending order. Defaults to ``False``.
+        """
+        size = len(self.texts)
+        if start >= size:
+            return
+        blocks, keys = self.blocks, self.keys
+        offsets = self._positions()
+        pos = size - 1 - start if descending else start
+        i = bisect_right(offsets, pos) - 1
+        j = pos - offsets[i]
+        # ids printing the same are told apart by their rank among equal ids
+        text = blocks[i][j]
+        n = pos - self.rank(text)
+        step = -1 if descending else 1
+        while 0 <= i < len(blocks):
+            block = blocks[i]
+            while 0 <= j < len(block):
+                if block[j] != text:
+                    text = block[j]
+                    n = 0 if step == 1 else len(keys[text]) - 1
+                yield keys[text][n]
+                n += step
+                j += step
+            i += step
+            j = 0 if step == 1 else (len(blocks[i]) - 1 if 0 <= i < len(blocks) else 0)
+
+
+@dataclass
+class DegreeIndex:
+    r"""
+    Vertices bucketed by degree, for pages of vertices sorted by degree.
+
+    Each degree has a list of the vertices of that degree, and a vertex whose degree changes is swapped out
+    of its list in constant time, so the order of the vertices of a degree is arbitrary. The number of
+    vertices in each block of ``_DEGREE_BLOCK`` degrees is kept as well, so that the n-th vertex is found
+    by skipping whole blocks.
+    """
+
+    buckets: List[List[Any]] = field(default_factory=list, repr=False)
+    pos: Dict[Any, int] = field(default_factory=dict, repr=False)
+    counts: List[int] = field(default_factory=list, repr=False)
+    # pre-images of the buckets (named by degree), positions and counts changed since the last snapshot, None
+    # without snapshots
+    _versions: Optional[Versions] = field(default=None, repr=False, compare=False)
+
+    @property
+    def kind(self) -> str:
+        r"""
+        Return ``"degree"``.
+        """
+        return "degree"
+
+    def __len__(self) -> int:
+        return len(self.pos)
+
+    def clear(self):
+        r"""
+        Remove all records from the index.
+        """
+        self.buckets, self.pos, self.counts = [], {}, []
+        self.unshare()
+
+    def copy(self) -> "DegreeIndex":
+        r"""
+        Return a copy of the index that can be updated independently.
+        """
+        return DegreeIndex([bucket.copy() for bucket in self.buckets], self.pos.copy(), self.counts.copy())
+
+    def snapshot(self) -> "DegreeIndex":
+        r"""
+        Return a read-only snapshot of the index in constant time. The index keeps the previous version of the
+        positions in the buckets, the positions and the counts it changes afterwards for the snapshot, see
+        ``Versions``.
+        """
+        versions = self._versions = newer_versions(self._versions)
+        return DegreeIndex(
+            VersionedList(
+                self.buckets, "buckets", versions, lambda degree, bucket: VersionedList(bucket, degree, versions)
+            ),
+            VersionedDict(self.pos, "pos", versions),
+            VersionedList(self.counts, "counts", versions),
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return _unshared_state(self)
+
+    def unshare(self):
+        r"""
+        Change the buckets in place again, once the snapshots they are shared with are gone.
+        """
+        self._versions = None
+
+    def _save_in(self, key: Any, degree: int):
+        r"""
+        Keep what adding a vertex to the bucket of ``degree`` changes for the snapshots, before adding it.
+        """
+        versions, bucket = self._versions, self.buckets[degree]
+        versions.save("pos", self.pos, key)
+        versions.save(degree, bucket, len(bucket))
+        versions.save("counts", self.counts, degree // _DEGREE_BLOCK)
+
+    def _save_out(self, key: Any, degree: int):
+        r"""
+        Keep what removing a vertex from the bucket of ``degree`` changes for the snapshots, before removing it:
+        its slot and the last one, which moves into it.
+        """
+        versions, bucket, pos = self._versions, self.buckets[degree], self.pos
+        versions.save("pos", pos, key)
+        versions.save("pos", pos, bucket[-1])
+        versions.save(degree, bucket, pos[key])
+        versions.save(degree, bucket, len(bucket) - 1)
+        versions.save("counts", self.counts, degree // _DEGREE_BLOCK)
+
+    def add(self, key: Any, degree: int):
+        r"""
+        Index a vertex.
+
+        Args:
+            ``key`` (``Any``): The internal key of the vertex.
+            ``degree`` (``int``): Its degree.
+        """
+        buckets = self.buckets
+        if degree >= len(buckets):
+            if self._versions is not None:
+                self._versions.save("buckets", buckets, len(buckets))
+                self._versions.save("counts", self.counts, len(self.counts))
+            buckets.extend([] for _ in range(degree + 1 - len(buckets)))
+            self.counts.extend(repeat(0, degree // _DEGREE_BLOCK + 1 - len(self.counts)))
+        if self._versions is not None:
+            self._save_in(key, degree)
+        bucket = buckets[degree]
+        self.pos[key] = len(bucket)
+        bucket.append(key)
+        self.counts[degree // _DEGREE_BLOCK] += 1
+
+    def remove(self, key: Any, degree: int):
+        r"""
+        Remove a vertex from the index.
+
+        Args:
+            ``key`` (``Any``): The internal key of the vertex.
+            ``degree`` (``int``): Its degree.
+        """
+        if self._versions is not None:
+            self._save_out(key, degree)
+        bucket = self.buckets[degree]
+        idx = self.pos.pop(key)
+        last = bucket.pop()
+        if idx < len(bucket):
+            bucket[idx] = last
+            self.pos[last] = idx
+        self.counts[degree // _DEGREE_BLOCK] -= 1
+
+    def move(self, key: Any, old: int, new: int):
+        r"""
+        Move a vertex whose degree changed.
+
+        Args:
+            ``key`` (``Any``): The internal key of the vertex.
+            ``old`` (``int``): Its previous degree.
+            ``new`` (``int``): Its new degree.
+        """
+        buckets, pos = self.buckets, self.pos
+        if new >= len(buckets):
+            self.remove(key, old)
+            self.add(key, new)
+            return
+        if self._versions is not None:
+            self._save_out(key, old)
+            self._save_in(key, new)
+        bucket = buckets[old]
+        idx = pos[key]
+        last = bucket.pop()
+        if idx < len(bucket):
+            bucket[idx] = last
+            pos[last] = idx
+        bucket = buckets[new]
+        pos[key] = len(bucket)
+        bucket.append(key)
+        if old // _DEGREE_BLOCK != new // _DEGREE_BLOCK:
+            self.counts[old // _DEGREE_BLOCK] -= 1
+            self.counts[new // _DEGREE_BLOCK] += 1
+
+    def _count_upto(self, degree: int) -> int:
+        r"""
+        Return the number of vertices whose degree is at most ``degree``.
+        """
+        if degree < 0:
+            return 0
+        degree = min(degree, len(self.buckets) - 1)
+        block = degree // _DEGREE_BLOCK
+        return sum(self.counts[:block]) + sum(map(len, self.buckets[block * _DEGREE_BLOCK : degree + 1]))
+
+    def count(self, lo: int = 0, hi: Optional[int] = None) -> int:
+        r"""
+        Return the number of vertices whose degree is between ``lo`` and ``hi`` (both included).
+
+        Args:
+            ``lo`` (``int``): The lowest degree. Defaults to 0.
+            ``hi`` (``int``, optional): The highest degree, ``None`` for no bound.
+        """
+        if hi is None:
+            return len(self.pos) - self._count_upto(lo - 1)
+        return max(0, self._count_upto(hi) - self._count_upto(lo - 1))
+
+    def _locate(self, rank: int) -> Tuple[int, int]:
+        r"""
+        Return the degree and the position in its bucket of the vertex of ascending ``rank``, which must exist.
+        """
+        block = 0
+        for block, count in enumerate(self.counts):
+            if rank < count:
+                break
+            rank -= count
+        degree = block * _DEGREE_BLOCK
+        while rank >= len(self.buckets[degree]):
+            rank -= len(self.buckets[degree])
+            degree += 1
+        return degree, rank
+
+    def iter(self, lo: int = 0, hi: Optional[int] = None, start: int = 0, descending: bool = False) -> Iterator[Any]:
+        r"""
+        Iterate over the vertices whose degree is between ``lo`` and ``hi`` (both included), in ascending or
+        descending order of degree, skipping the first ``start`` ones.
+
+        Args:
+            ``lo`` (``int``): The lowest degree. Defaults to 0.
+            ``hi`` (``int``, optional): The highest degree, ``None`` for no bound.
+            ``start`` (``int``): The number of vertices to skip.
+            ``descending`` (``bool``): Iterate in descending order of degree. Defaults to ``False``.
+        """
+        buckets, counts = self.buckets, self.counts
+        lo = max(lo, 0)
+        hi = len(buckets) - 1 if hi is None else min(hi, len(buckets) - 1)
+        if start < 0 or start >= self.count(lo, hi):
+            return
+        if descending:
+            degree, idx = self._locate(self._count_upto(hi) - 1 - start)
+            while degree >= lo:
+                if not counts[degree // _DEGREE_BLOCK]:
+                    # skip to the last degree of the previous block
+                    degree = degree // _DEGREE_BLOCK * _DEGREE_BLOCK - 1
+                    idx = None
+                    continue
+                bucket = buckets[degree]
+                idx = len(bucket) - 1 if idx is None else idx
+                while idx >= 0:
+                    yield bucket[idx]
+                    idx -= 1
+                degree -= 1
+                idx = None
+        else:
+            degree, idx = self._locate(self._count_upto(lo - 1) + start)
+            while degree <= hi:
+                if not counts[degree // _DEGREE_BLOCK]:
+                    degree = (degree // _DEGREE_BLOCK + 1) * _DEGREE_BLOCK
+                    idx = 0
+                    continue
+                bucket = buckets[degree]
+                while idx < len(bucket):
+                    yield bucket[idx]
+                    idx += 1
+                degree += 1
+                idx = 0
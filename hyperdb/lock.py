@@ -0,0 +1,103 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class RWLock:
+    r"""
+    Reader-writer lock: any number of threads may hold the read lock at the same time, the write lock is
+    exclusive.
+
+    Writers take precedence: once a writer is waiting, new readers wait until it is done, so a steady stream of
+    reads cannot starve writes. Both locks are re-entrant, and a thread holding the write lock may also take
+    the read lock. A thread holding only the read lock cannot upgrade to the write lock, which would deadlock
+    with another reader doing the same.
+
+    The lock is not copied or pickled with its owner: copies get a new, released lock.
+    """
+
+    def __init__(self):
+        # Held by a writer for the whole write and by readers only while they register, so that a waiting
+        # writer holds back new readers. Uncontended writes cost one acquire and release of it.
+        self._write_lock = threading.RLock()
+        self._writes = 0
+        self._readers_changed = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._local = threading.local()
+
+    def __deepcopy__(self, memo) -> "RWLock":
+        return RWLock()
+
+    def __copy__(self) -> "RWLock":
+        return RWLock()
+
+    def __reduce__(self):
+        return RWLock, ()
+
+    def acquire_read(self):
+        r"""
+        Acquire the read lock, waiting while a writer holds or waits for the write lock.
+        """
+        local = self._local
+        reads = getattr(local, "reads", 0)
+        if not reads:
+            with self._write_lock:
+                with self._readers_changed:
+                    self._readers += 1
+        local.reads = reads + 1
+
+    def release_read(self):
+        r"""
+        Release the read lock.
+        """
+        local = self._local
+        assert getattr(local, "reads", 0), "The read lock is not held by this thread."
+        local.reads -= 1
+        if not local.reads:
+            with self._readers_changed:
+                self._readers -= 1
+                if not self._readers:
+                    self._readers_changed.notify_all()
+
+    def acquire_write(self):
+        r"""
+        Acquire the write lock, waiting until no other thread holds the read or the write lock.
+        """
+        self._write_lock.acquire()
+        if not self._writes and self._readers:
+            if getattr(self._local, "reads", 0):
+                self._write_lock.release()
+                raise AssertionError("The read lock cannot be upgraded to the write lock.")
+            with self._readers_changed:
+                while self._readers:
+                    self._readers_changed.wait()
+        self._writes += 1
+
+    def release_write(self):
+        r"""
+        Release the write lock.
+        """
+        self._writes -= 1
+        self._write_lock.release()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        r"""
+        Hold the read lock for the duration of a ``with`` block.
+        """
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        r"""
+        Hold the write lock for the duration of a ``with`` block.
+        """
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
@@ -0,0 +1,259 @@
+from array import array
+from math import sqrt
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+
+from hyperdb.frozen import CSRIncidence
+
+BACKENDS = ("auto", "scipy", "coo")
+
+
+class COOMatrix(NamedTuple):
+    r"""
+    Sparse matrix in coordinate form, the pure-Python fallback of the matrix operators when SciPy is not
+    installed. Entry ``k`` holds ``data[k]`` at ``(row[k], col[k])``, each position appears at most once.
+
+    Args:
+        ``shape`` (``Tuple[int, int]``): The number of rows and columns.
+        ``row`` (``array``): Row index of each entry.
+        ``col`` (``array``): Column index of each entry.
+        ``data`` (``array``): Value of each entry.
+    """
+
+    shape: Tuple[int, int]
+    row: Sequence[int]
+    col: Sequence[int]
+    data: Sequence[float]
+
+    @property
+    def nnz(self) -> int:
+        r"""
+        Return the number of stored entries.
+        """
+        return len(self.data)
+
+    def to_dense(self) -> List[List[float]]:
+        r"""
+        Return the matrix as a list of rows.
+        """
+        dense = [[0.0] * self.shape[1] for _ in range(self.shape[0])]
+        for i, j, x in zip(self.row, self.col, self.data):
+            dense[i][j] = x
+        return dense
+
+    def dot(self, x: Sequence[float]) -> List[float]:
+        r"""
+        Return the product of the matrix with a vector.
+
+        Args:
+            ``x`` (``Sequence[float]``): The vector, of ``shape[1]`` entries.
+        """
+        assert len(x) == self.shape[1], "The vector must have one entry per column."
+        y = [0.0] * self.shape[0]
+        for i, j, a in zip(self.row, self.col, self.data):
+            y[i] += a * x[j]
+        return y
+
+    def to_scipy(self):
+        r"""
+        Return the matrix as a ``scipy.sparse.csr_matrix``. Requires ``numpy`` and ``scipy``.
+        """
+        np, sp = _require_scipy("COOMatrix.to_scipy()")
+        data = np.asarray(self.data, dtype=np.float64)
+        row, col = np.asarray(self.row, dtype=np.int64), np.asarray(self.col, dtype=np.int64)
+        return sp.coo_matrix((data, (row, col)), shape=self.shape).tocsr()
+
+
+def _require_scipy(caller: str):
+    r"""
+    Import and return ``numpy`` and ``scipy.sparse``, with an install hint if they are missing.
+
+    Args:
+        ``caller`` (``str``): The name of the function that needs them, for the error message.
+    """
+    try:
+        import numpy as np
+        import scipy.sparse as sp
+    except ImportError as e:
+        raise ImportError(f"{caller} requires numpy and scipy: pip install numpy scipy") from e
+    return np, sp
+
+
+def resolve_backend(backend: str) -> str:
+    r"""
+    Return the backend to build matrices with: ``"scipy"`` or ``"coo"``. ``"auto"`` picks ``"scipy"`` when
+    ``numpy`` and ``scipy`` can be imported.
+
+    Args:
+        ``backend`` (``str``): ``"auto"``, ``"scipy"`` or ``"coo"``.
+    """
+    assert backend in BACKENDS, f"The backend must be one of {BACKENDS}."
+    if backend == "auto":
+        try:
+            _require_scipy("")
+        except ImportError:
+            return "coo"
+        return "scipy"
+    return backend
+
+
+def degree_vectors(csr: CSRIncidence, weights: Sequence[float]) -> Tuple[List[float], List[int]]:
+    r"""
+    Return the weighted vertex degrees (the sum of the weights of the incident hyperedges) and the hyperedge
+    degrees (the number of vertices of each hyperedge).
+
+    Args:
+        ``csr`` (``CSRIncidence``): The incidence structure.
+        ``weights`` (``Sequence[float]``): The weight of each hyperedge index.
+    """
+    v_ptr, v_edges, e_ptr = csr.v_ptr, csr.v_edges, csr.e_ptr
+    d_v = [sum(weights[v_edges[k]] for k in range(v_ptr[i], v_ptr[i + 1])) for i in range(csr.num_v)]
+    d_e = [e_ptr[j + 1] - e_ptr[j] for j in range(csr.num_e)]
+    return d_v, d_e
+
+
+def incidence_matrix(csr: CSRIncidence, backend: str) -> Any:
+    r"""
+    Return the ``num_v x num_e`` incidence matrix ``H``, with ``H[i, j] = 1`` when vertex ``i`` belongs to
+    hyperedge ``j``.
+
+    Args:
+        ``csr`` (``CSRIncidence``): The incidence structure.
+        ``backend`` (``str``): ``"scipy"`` or ``"coo"``.
+    """
+    if backend == "scipy":
+        return csr.to_scipy()
+    v_ptr = csr.v_ptr
+    row = array("q")
+    for i in range(csr.num_v):
+        row.extend([i] * (v_ptr[i + 1] - v_ptr[i]))
+    return COOMatrix((csr.num_v, csr.num_e), row, array("q", csr.v_edges), array("d", [1.0]) * len(row))
+
+
+def _pair_sums(csr: CSRIncidence, coefs: Sequence[float], diagonal: bool) -> Dict[Tuple[int, int], float]:
+    r"""
+    Return ``sum(coefs[j] for the hyperedges j holding both u and v)`` for every pair of vertex indices
+    ``(u, v)`` sharing a hyperedge, i.e. the entries of ``H diag(coefs) H^T``.
+
+    Args:
+        ``csr`` (``CSRIncidence``): The incidence structure.
+        ``coefs`` (``Sequence[float]``): The coefficient of each hyperedge index.
+        ``diagonal`` (``bool``): Whether to include the pairs ``(u, u)``.
+    """
+    sums: Dict[Tuple[int, int], float] = {}
+    e_ptr, e_verts = csr.e_ptr, csr.e_verts
+    for j in range(csr.num_e):
+        c = coefs[j]
+        if not c:
+            continue
+        members = e_verts[e_ptr[j] : e_ptr[j + 1]]
+        for u in members:
+            for v in members:
+                if diagonal or u != v:
+                    sums[u, v] = sums.get((u, v), 0.0) + c
+    return sums
+
+
+def _coo_from_sums(shape: Tuple[int, int], sums: Dict[Tuple[int, int], float]) -> COOMatrix:
+    r"""
+    Return the ``COOMatrix`` of the entries, in row-major order.
+
+    Args:
+        ``shape`` (``Tuple[int, int]``): The number of rows and columns.
+        ``sums`` (``Dict[Tuple[int, int], float]``): The value at each position.
+    """
+    row, col, data = array("q"), array("q"), array("d")
+    for (i, j), x in sorted(sums.items()):
+        row.append(i)
+        col.append(j)
+        data.append(x)
+    return COOMatrix(shape, row, col, data)
+
+
+def clique_adjacency(csr: CSRIncidence, weights: Sequence[float], backend: str) -> Any:
+    r"""
+    Return the ``num_v x num_v`` adjacency matrix of the clique expansion, ``H W H^T`` with a zero diagonal:
+    the entry of two vertices is the sum of the weights of the hyperedges holding both.
+
+    Args:
+        ``csr`` (``CSRIncidence``): The incidence structure.
+        ``weights`` (``Sequence[float]``): The weight of each hyperedge index.
+        ``backend`` (``str``): ``"scipy"`` or ``"coo"``.
+    """
+    if backend == "scipy":
+        np, sp = _require_scipy("clique_adjacency()")
+        h = csr.to_scipy()
+        adjacency = (h @ sp.diags(np.asarray(weights, dtype=np.float64)) @ h.T).tocsr()
+        adjacency = (adjacency - sp.diags(adjacency.diagonal())).tocsr()
+        adjacency.eliminate_zeros()
+        return adjacency
+    return _coo_from_sums((csr.num_v, csr.num_v), _pair_sums(csr, weights, diagonal=False))
+
+
+def _propagation(csr: CSRIncidence, weights: Sequence[float], backend: str, normalized: bool) -> Any:
+    r"""
+    Return ``Dv^-1/2 H W De^-1 H^T Dv^-1/2`` (``normalized``) or ``Dv^-1 H W De^-1 H^T``, taking the inverse of
+    a zero vertex degree as zero.
+
+    Args:
+        ``csr`` (``CSRIncidence``): The incidence structure.
+        ``weights`` (``Sequence[float]``): The weight of each hyperedge index.
+        ``backend`` (``str``): ``"scipy"`` or ``"coo"``.
+        ``normalized`` (``bool``): Whether to scale symmetrically instead of by rows.
+    """
+    if backend == "scipy":
+        np, sp = _require_scipy("_propagation()")
+        h = csr.to_scipy()
+        w = np.asarray(weights, dtype=np.float64)
+        d_v = h @ w
+        with np.errstate(divide="ignore"):
+            scale = np.where(d_v > 0, 1.0 / (np.sqrt(d_v) if normalized else d_v), 0.0)
+        d_scale = sp.diags(scale)
+        theta = d_scale @ h @ sp.diags(w / np.diff(np.frombuffer(csr.e_ptr, dtype=np.int64))) @ h.T
+        return (theta @ d_scale if normalized else theta).tocsr()
+    d_v, d_e = degree_vectors(csr, weights)
+    coefs = [w / d for w, d in zip(weights, d_e)]
+    if normalized:
+        scale = [1.0 / sqrt(d) if d > 0 else 0.0 for d in d_v]
+    else:
+        scale = [1.0 / d if d > 0 else 0.0 for d in d_v]
+    sums = _pair_sums(csr, coefs, diagonal=True)
+    for (u, v), x in sums.items():
+        sums[u, v] = x * scale[u] * scale[v] if normalized else x * scale[u]
+    return sums
+
+
+def laplacian(csr: CSRIncidence, weights: Sequence[float], backend: str) -> Any:
+    r"""
+    Return the ``num_v x num_v`` normalized hypergraph Laplacian of Zhou et al.,
+    ``I - Dv^-1/2 H W De^-1 H^T Dv^-1/2``. Isolated vertices get a ``1`` on the diagonal.
+
+    Args:
+        ``csr`` (``CSRIncidence``): The incidence structure.
+        ``weights`` (``Sequence[float]``): The weight of each hyperedge index.
+        ``backend`` (``str``): ``"scipy"`` or ``"coo"``.
+    """
+    theta = _propagation(csr, weights, backend, normalized=True)
+    if backend == "scipy":
+        _, sp = _require_scipy("laplacian()")
+        return (sp.identity(csr.num_v, format="csr") - theta).tocsr()
+    sums = {pos: -x for pos, x in theta.items()}
+    for i in range(csr.num_v):
+        sums[i, i] = 1.0 + sums.get((i, i), 0.0)
+    return _coo_from_sums((csr.num_v, csr.num_v), sums)
+
+
+def random_walk(csr: CSRIncidence, weights: Sequence[float], backend: str) -> Any:
+    r"""
+    Return the ``num_v x num_v`` transition matrix ``Dv^-1 H W De^-1 H^T`` of the random walk that picks an
+    incident hyperedge with probability proportional to its weight, then one of its vertices uniformly.
+    Rows of isolated vertices are zero.
+
+    Args:
+        ``csr`` (``CSRIncidence``): The incidence structure.
+        ``weights`` (``Sequence[float]``): The weight of each hyperedge index.
+        ``backend`` (``str``): ``"scipy"`` or ``"coo"``.
+    """
+    transitions = _propagation(csr, weights, backend, normalized=False)
+    if backend == "scipy":
+        return transitions
+    return _coo_from_sums((csr.num_v, csr.num_v), transitions)
@@ -0,0 +1,168 @@
+import gc
+import multiprocessing as mp
+import os
+from array import array
+from multiprocessing import shared_memory, util
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+from hyperdb.columnar import encode_columnar
+from hyperdb.frozen import FrozenHypergraph
+
+# The state of a worker process, set once by ``_init_worker``: the shared memory block it attached, the hypergraph
+# read from it and the function to map
+_shm: Optional[shared_memory.SharedMemory] = None
+_graph: Optional[FrozenHypergraph] = None
+_fn: Optional[Callable[[FrozenHypergraph, Any], Any]] = None
+
+
+def _init_worker(name: str, fn: Callable[[FrozenHypergraph, Any], Any]):
+    r"""
+    Attach the worker process to the shared memory block of the hypergraph.
+
+    Args:
+        ``name`` (``str``): The name of the shared memory block.
+        ``fn`` (``Callable[[FrozenHypergraph, Any], Any]``): The function to map.
+    """
+    global _shm, _graph, _fn
+    _shm = shared_memory.SharedMemory(name=name)
+    graph = FrozenHypergraph.from_buffer(_shm.buf)
+    # vertex ids are decoded on every query otherwise: unpickle them once into a list and a dict, the incidence
+    # arrays, the hyperedge hash table and the data stay in the block
+    _graph = FrozenHypergraph(
+        csr=graph.csr._replace(v_ids=list(graph.csr.v_ids)),
+        v_data=graph.v_data,
+        e_data=graph.e_data,
+        _e_index=graph._e_index,
+    )
+    _fn = fn
+    util.Finalize(None, _release_worker, exitpriority=0)
+
+
+def _release_worker():
+    r"""
+    Drop the views of the shared memory block and close it, which fails while any view is alive.
+    """
+    global _graph, _fn
+    _graph = _fn = None
+    gc.collect()
+    try:
+        _shm.close()
+    except BufferError:
+        # the function kept a reference to the hypergraph, the mapping goes away with the process
+        pass
+
+
+def _run_chunk(v_idxs: Sequence[int]) -> List[Any]:
+    r"""
+    Call the function on the vertices of a chunk in a worker process.
+
+    Args:
+        ``v_idxs`` (``Sequence[int]``): The vertex indices.
+    """
+    graph, fn = _graph, _fn
+    v_ids = graph.csr.v_ids
+    return [fn(graph, v_ids[v_idx]) for v_idx in v_idxs]
+
+
+class SharedHypergraph:
+    r"""
+    A frozen hypergraph published once in a shared memory block, for worker processes to query in parallel.
+
+    The block holds the columnar encoding of the hypergraph (see ``FrozenHypergraph.save``). Each worker
+    attaches to it when it starts and reads it through ``FrozenHypergraph.from_buffer``, so the topology is
+    neither copied nor pickled per worker or per task; only vertex indices and results cross process boundaries.
+    Each worker only decodes the vertex ids into a list and a dict of its own, to look vertices up at dict speed.
+    Create one with ``share()`` and close it when done, or use it as a context manager.
+
+    Args:
+        ``frozen`` (``FrozenHypergraph``): The hypergraph to publish.
+    """
+
+    def __init__(self, frozen: FrozenHypergraph):
+        csr = frozen.csr
+        arrays = (csr.v_ptr, csr.v_edges, csr.e_ptr, csr.e_verts)
+        chunks = [
+            memoryview(chunk).cast("B") for chunk in encode_columnar(csr.v_ids, arrays, frozen.v_data, frozen.e_data)
+        ]
+        self._shm = shared_memory.SharedMemory(create=True, size=sum(map(len, chunks)))
+        pos = 0
+        for chunk in chunks:
+            self._shm.buf[pos : pos + len(chunk)] = chunk
+            pos += len(chunk)
+        self._frozen = frozen
+
+    @property
+    def name(self) -> str:
+        r"""
+        Return the name of the shared memory block.
+        """
+        return self._shm.name
+
+    @property
+    def closed(self) -> bool:
+        r"""
+        Return whether the shared memory block was released.
+        """
+        return self._frozen is None
+
+    def map(
+        self,
+        fn: Callable[[FrozenHypergraph, Any], Any],
+        v_ids: Optional[Iterable[Any]] = None,
+        workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        context: Optional[str] = None,
+    ) -> List[Any]:
+        r"""
+        Return ``[fn(graph, v_id) for v_id in v_ids]``, computed by a pool of worker processes that each read the
+        shared hypergraph as ``graph``.
+
+        The vertices are split into chunks of consecutive vertices that the workers take in turn. With one
+        worker, ``fn`` runs in this process on the frozen hypergraph instead. With the ``"fork"`` start method
+        ``fn`` is inherited by the workers and may be a lambda or a closure; other start methods pickle it.
+
+        Args:
+            ``fn`` (``Callable[[FrozenHypergraph, Any], Any]``): Called with the hypergraph and a vertex id.
+            ``v_ids`` (``Optional[Iterable[Any]]``): The vertex ids, ``None`` for all the vertices.
+            ``workers`` (``Optional[int]``): The number of worker processes, ``None`` for the number of CPUs.
+            ``chunksize`` (``Optional[int]``): The number of vertices per task, ``None`` for four tasks per worker.
+            ``context`` (``Optional[str]``): The ``multiprocessing`` start method, ``None`` for the default.
+        """
+        assert not self.closed, "The shared hypergraph is closed."
+        workers = (os.cpu_count() or 1) if workers is None else workers
+        assert isinstance(workers, int) and workers >= 1, "The number of workers must be a positive integer."
+        frozen = self._frozen
+        if v_ids is None:
+            v_idxs = range(frozen.num_v)
+        else:
+            v_idxs = array("q", map(frozen._checked_v_idx, v_ids))
+        if workers == 1 or len(v_idxs) <= 1:
+            all_v_ids = frozen.csr.v_ids
+            return [fn(frozen, all_v_ids[v_idx]) for v_idx in v_idxs]
+        if chunksize is None:
+            chunksize = -(-len(v_idxs) // (workers * 4))
+        assert chunksize >= 1, "The chunk size must be positive."
+        chunks = [v_idxs[i : i + chunksize] for i in range(0, len(v_idxs), chunksize)]
+        ctx = mp.get_context(context)
+        with ctx.Pool(min(workers, len(chunks)), _init_worker, (self.name, fn)) as pool:
+            results = pool.map(_run_chunk, chunks, chunksize=1)
+        return [result for chunk_results in results for result in chunk_results]
+
+    def close(self):
+        r"""
+        Release the shared memory block. Calling it again does nothing.
+        """
+        if self._frozen is not None:
+            self._frozen = None
+            self._shm.unlink()
+            try:
+                self._shm.close()
+            except BufferError:
+                # a hypergraph read from the block is still alive, the memory is freed once it is gone
+                pass
+
+    def __enter__(self) -> "SharedHypergraph":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
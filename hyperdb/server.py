@@ -0,0 +1,204 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import chain
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .base import BaseHypergraphDB
+from .draw import (
+    CORS_HEADERS,
+    STATIC_ROUTES,
+    HypergraphAPI,
+    ResponseCache,
+    create_order_indexes,
+    create_search_indexes,
+)
+
+_REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class AsyncHypergraphServer(HypergraphAPI):
+    """
+    Visualization API server on asyncio streams, serving the same routes as ``HypergraphViewer``
+
+    Routes that read the hypergraph run in an executor on a snapshot of it, so a slow query never blocks
+    the event loop or the writers. Cached responses and the static routes are answered on the event loop.
+    Connections are kept alive between requests (the default for HTTP/1.1 clients) until they are idle for
+    ``keep_alive_timeout`` seconds.
+
+    Start and stop it from a running event loop, ``await server.start()`` returns once it accepts
+    connections (``ready`` is set as well), or use it as an async context manager::
+
+        async with AsyncHypergraphServer(hg, port=0) as server:
+            print(server.port)
+            ...
+
+    Args:
+        hypergraph_db: HypergraphDB instance
+        host: Host to bind
+        port: Port to bind, 0 picks a free port (available as ``port`` once started)
+        executor: Executor running the queries. Defaults to a thread pool that the server shuts down on ``stop()``.
+        keep_alive_timeout: Seconds an idle connection is kept open
+        indexes: Create the indexes of the vertex search and list, see ``HypergraphViewer``
+        response_cache: Cache of serialized responses, see ``HypergraphViewer``. Defaults to a new cache of 256
+            responses, pass ``ResponseCache(max_entries=0)`` to disable it.
+    """
+
+    def __init__(
+        self,
+        hypergraph_db: BaseHypergraphDB,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        executor: Optional[Executor] = None,
+        keep_alive_timeout: float = 5.0,
+        indexes: bool = False,
+        response_cache: Optional[ResponseCache] = None,
+    ):
+        self.hypergraph_db = hypergraph_db
+        self.response_cache = response_cache if response_cache is not None else ResponseCache()
+        self.host = host
+        self.port = port
+        self.keep_alive_timeout = keep_alive_timeout
+        self.ready = asyncio.Event()
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.Task] = set()
+        if indexes:
+            create_search_indexes(hypergraph_db)
+            create_order_indexes(hypergraph_db)
+
+    async def __aenter__(self) -> "AsyncHypergraphServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def start(self):
+        """Bind the server and start accepting connections"""
+        assert self._server is None, "The server is already started."
+        if self._owns_executor:
+            self._executor = ThreadPoolExecutor(thread_name_prefix="hyperdb-api")
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.ready.set()
+
+    async def serve_forever(self):
+        """Start the server if needed and serve until the task is cancelled or ``stop()`` is called"""
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            # stop() closes the server, which cancels serve_forever
+            if self._server is not None:
+                raise
+
+    async def stop(self):
+        """Stop accepting connections, close the open ones and wait until they are closed"""
+        if self._server is None:
+            return
+        server, self._server = self._server, None
+        self.ready.clear()
+        server.close()
+        connections = list(self._connections)
+        for task in connections:
+            task.cancel()
+        await asyncio.gather(*connections, return_exceptions=True)
+        await server.wait_closed()
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve the requests of one connection until it is closed or not kept alive"""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while await self._handle_request(reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            # the client went away or sent a request that could not be read
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _handle_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """Read one request and write its response, return whether to keep the connection alive"""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), self.keep_alive_timeout)
+        except asyncio.TimeoutError:
+            return False
+        if not request_line:
+            return False
+        parts = request_line.decode("latin-1").split()
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if len(parts) != 3:
+            await self._send(writer, 400, _text_headers(), b"400 Bad Request", False)
+            return False
+        method, target, version = parts
+        length = int(headers.get("content-length") or 0)
+        if length:
+            await reader.readexactly(length)
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+        if method == "OPTIONS":
+            status, response_headers, body = 200, [], b""
+        elif method == "GET":
+            status, response_headers, body = await self._get(target, headers)
+        else:
+            status, response_headers, body = 405, _text_headers(), b"405 Method Not Allowed"
+        await self._send(writer, status, response_headers, body, keep_alive)
+        return keep_alive
+
+    async def _get(self, target: str, headers: Dict[str, str]) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        """Return the status, headers and body of the response to a GET request"""
+        parsed_path = urlparse(target)
+        path = parsed_path.path
+        query_params: Dict[str, List[str]] = parse_qs(parsed_path.query)
+        try:
+            entry = self._cached(path, query_params)
+            if entry is None and path in STATIC_ROUTES:
+                entry = self._respond(path, query_params)
+            elif entry is None:
+                loop = asyncio.get_running_loop()
+                entry = await loop.run_in_executor(self._executor, self._respond, path, query_params)
+        except Exception:
+            return 500, _text_headers(), b"500 Internal Server Error"
+        return self._http_response(entry, headers.get("if-none-match"), headers.get("accept-encoding"))
+
+    async def _send(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        headers: List[Tuple[str, str]],
+        body: bytes,
+        keep_alive: bool,
+    ):
+        """Write a response"""
+        lines = [f"HTTP/1.1 {status} {_REASONS[status]}"]
+        lines += [f"{header}: {value}" for header, value in chain(CORS_HEADERS, headers)]
+        lines.append(f"Content-Length: {len(body)}")
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+
+def _text_headers() -> List[Tuple[str, str]]:
+    """Headers of a plain text error response"""
+    return [("Content-Type", "text/plain; charset=utf-8")]
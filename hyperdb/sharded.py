@@ -0,0 +1,981 @@
+import multiprocessing as mp
+import threading
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+from functools import wraps
+from itertools import repeat
+from pathlib import Path
+from typing import AbstractSet, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from hyperdb.base import BaseHypergraphDB, _require_numpy
+from hyperdb.columnar import _v_hash
+from hyperdb.hypergraph import _MERGE_POLICIES, HypergraphDB
+from hyperdb.lock import RWLock
+
+
+def shard_of(v_id: Any, num_shards: int) -> int:
+    r"""
+    Return the shard that owns the vertex. Vertices are placed by ``columnar._v_hash``, which is the same in every
+    process and, unlike a hash of the pickle, for equal ids such as ``1``, ``1.0`` and ``True``.
+
+    Args:
+        ``v_id`` (``Any``): The vertex id.
+        ``num_shards`` (``int``): The number of shards.
+    """
+    return _v_hash(v_id) % num_shards
+
+
+def placement_of(e_key: Tuple, num_shards: int) -> Tuple[List[int], int]:
+    r"""
+    Return the member shards of the hyperedge, those owning one of its vertices, which all store it, and its
+    primary shard, the member that stores its data, picked by hashing the hyperedge so that primaries spread
+    evenly over the member shards.
+
+    Args:
+        ``e_key`` (``Tuple``): The sorted hyperedge tuple.
+        ``num_shards`` (``int``): The number of shards.
+    """
+    members = sorted({shard_of(v_id, num_shards) for v_id in e_key})
+    return members, members[_v_hash(e_key) % len(members)]
+
+
+def primary_of(e_key: Tuple, num_shards: int) -> int:
+    r"""
+    Return the primary shard of the hyperedge, see ``placement_of``.
+
+    Args:
+        ``e_key`` (``Tuple``): The sorted hyperedge tuple.
+        ``num_shards`` (``int``): The number of shards.
+    """
+    return placement_of(e_key, num_shards)[1]
+
+
+def _merge_data(existing: Dict, data: Dict, merge: Union[str, Callable[[Dict, Dict], Dict]]) -> Dict:
+    r"""
+    Return the data a hyperedge keeps when a shrunken hyperedge collides with it, see ``HypergraphDB.remove_v``.
+
+    Args:
+        ``existing`` (``dict``): The data of the existing hyperedge.
+        ``data`` (``dict``): The data of the shrunken hyperedge.
+        ``merge`` (``Union[str, Callable[[dict, dict], dict]]``): The merge policy.
+    """
+    if merge == "overwrite":
+        return data
+    if merge == "keep":
+        return existing
+    if merge == "update":
+        return {**existing, **data}
+    merged = merge(existing, data)
+    assert isinstance(merged, dict), "The merge policy must return a dictionary."
+    return merged
+
+
+class HypergraphShard:
+    r"""
+    The local store of one shard of a ``ShardedHypergraphDB``.
+
+    The shard keeps the vertices it owns and every hyperedge incident to them in a ``HypergraphDB``, with the
+    other vertices of those hyperedges as ghost vertices without data, so that the incidence, degree and
+    neighbors of its vertices are answered locally. Only the primary shard of a hyperedge stores its data, the
+    other member shards keep an empty dict. Methods take and return lists, one entry per vertex or hyperedge,
+    so that the coordinator makes one call per shard for a whole batch.
+
+    Args:
+        ``index`` (``int``): The index of the shard.
+        ``num_shards`` (``int``): The number of shards.
+        ``storage_file`` (``Union[str, Path]``): The storage file of the shard, loaded if it exists.
+    """
+
+    def __init__(self, index: int, num_shards: int, storage_file: Union[str, Path]):
+        self.index = index
+        self.num_shards = num_shards
+        self.hg = HypergraphDB(storage_file=storage_file)
+        self._reindex()
+
+    def _reindex(self):
+        r"""
+        Find the ghost vertices and the hyperedges the shard is primary for, after loading the store.
+        """
+        index, num_shards = self.index, self.num_shards
+        self._ghosts: Set[Any] = {v_id for v_id in self.hg.all_v if shard_of(v_id, num_shards) != index}
+        self._primary: Set[Tuple] = {e_key for e_key in self.hg.all_e if primary_of(e_key, num_shards) == index}
+
+    def has_v(self, v_ids: List[Any]) -> List[bool]:
+        r"""
+        Return whether each vertex exists and is owned by the shard.
+        """
+        hg, ghosts = self.hg, self._ghosts
+        return [v_id not in ghosts and hg.has_v(v_id) for v_id in v_ids]
+
+    def v(self, v_ids: List[Any]) -> List[Optional[Dict]]:
+        r"""
+        Return the data of each owned vertex, ``None`` for the others.
+        """
+        hg, ghosts = self.hg, self._ghosts
+        return [None if v_id in ghosts else hg.v(v_id) for v_id in v_ids]
+
+    def add_v(self, v_ids: List[Any], v_data_list: List[Optional[Dict]]):
+        r"""
+        Add vertices owned by the shard, or update their data.
+        """
+        self.hg.add_v_batch(v_ids, v_data_list)
+
+    def update_v(self, v_id: Any, v_data: Dict):
+        r"""
+        Update the data of an owned vertex.
+        """
+        assert v_id not in self._ghosts, f"The vertex {v_id} does not exist in the hypergraph."
+        self.hg.update_v(v_id, v_data)
+
+    def remove_v(self, v_ids: List[Any]):
+        r"""
+        Remove owned vertices whose hyperedges were already removed from every shard.
+        """
+        for v_id in v_ids:
+            self.hg.remove_v(v_id)
+
+    def all_v(self) -> List[Any]:
+        r"""
+        Return the owned vertices.
+        """
+        ghosts = self._ghosts
+        return [v_id for v_id in self.hg.all_v if v_id not in ghosts]
+
+    def counts(self) -> Tuple[int, int]:
+        r"""
+        Return the number of owned vertices and the number of hyperedges the shard is primary for.
+        """
+        return self.hg.num_v - len(self._ghosts), len(self._primary)
+
+    def degree_v(self, v_ids: List[Any]) -> List[int]:
+        r"""
+        Return the degree of each owned vertex.
+        """
+        return self.hg.degree_v_many(v_ids)
+
+    def nbr_e_of_v(self, v_ids: List[Any]) -> List[Set[Tuple]]:
+        r"""
+        Return the incident hyperedges of each owned vertex.
+        """
+        return self.hg.nbr_e_of_v_many(v_ids)
+
+    def nbr_v(self, v_ids: List[Any], exclude_self: bool) -> List[Set[Any]]:
+        r"""
+        Return the neighbors of each owned vertex.
+        """
+        return self.hg.nbr_v_many(v_ids, exclude_self)
+
+    def add_e(self, e_keys: List[Tuple], e_data_list: List[Optional[Dict]]):
+        r"""
+        Add hyperedges the shard owns a vertex of, creating the ghost vertices they need. ``e_data_list`` holds
+        the data of the hyperedges the shard is primary for and ``None`` for the others.
+        """
+        hg, ghosts, primary = self.hg, self._ghosts, self._primary
+        v_ids = hg.all_v
+        new_ghosts = {v_id for e_key in e_keys for v_id in e_key if v_id not in v_ids}
+        hg.add_v_batch(new_ghosts)
+        ghosts.update(new_ghosts)
+        hg.add_e_batch(e_keys, e_data_list)
+        primary.update(e_key for e_key, e_data in zip(e_keys, e_data_list) if e_data is not None)
+
+    def remove_e(self, e_keys: List[Tuple]):
+        r"""
+        Remove hyperedges, and the ghost vertices left without any hyperedge.
+        """
+        hg, ghosts, primary = self.hg, self._ghosts, self._primary
+        for e_key in e_keys:
+            hg.remove_e(e_key)
+            primary.discard(e_key)
+        for v_id in {v_id for e_key in e_keys for v_id in e_key}:
+            if v_id in ghosts and hg.degree_v(v_id) == 0:
+                hg.remove_v(v_id)
+                ghosts.discard(v_id)
+
+    def has_e(self, e_keys: List[Tuple]) -> List[bool]:
+        r"""
+        Return whether each hyperedge exists, for hyperedges the shard is the primary of.
+        """
+        primary = self._primary
+        return [e_key in primary for e_key in e_keys]
+
+    def e(self, e_keys: List[Tuple]) -> List[Optional[Dict]]:
+        r"""
+        Return the data of each hyperedge the shard is primary for, ``None`` for the others.
+        """
+        hg, primary = self.hg, self._primary
+        return [hg.e(e_key) if e_key in primary else None for e_key in e_keys]
+
+    def update_e(self, e_key: Tuple, e_data: Dict):
+        r"""
+        Update the data of a hyperedge the shard is primary for.
+        """
+        assert e_key in self._primary, f"The hyperedge {e_key} does not exist in the hypergraph."
+        self.hg.update_e(e_key, e_data)
+
+    def all_e(self) -> List[Tuple]:
+        r"""
+        Return the hyperedges the shard is primary for.
+        """
+        return list(self._primary)
+
+    def save(self, file_path: Union[str, Path]) -> bool:
+        r"""
+        Save the store of the shard.
+        """
+        return self.hg.save(file_path)
+
+    def load(self, file_path: Union[str, Path]) -> bool:
+        r"""
+        Load the store of the shard.
+        """
+        if not self.hg.load(file_path):
+            return False
+        self._reindex()
+        return True
+
+
+class _LocalShard:
+    r"""
+    Shard running in the coordinator process, called through the same ``send`` and ``recv`` as a shard process.
+    """
+
+    def __init__(self, index: int, num_shards: int, storage_file: Union[str, Path]):
+        self._shard = HypergraphShard(index, num_shards, storage_file)
+        self._replies: List[Tuple[bool, Any]] = []
+
+    def send(self, method: str, args: Tuple):
+        try:
+            self._replies.append((True, getattr(self._shard, method)(*args)))
+        except Exception as e:
+            self._replies.append((False, e))
+
+    def recv(self) -> Tuple[bool, Any]:
+        return self._replies.pop(0)
+
+    def close(self):
+        pass
+
+
+def _serve_shard(conn: Any, index: int, num_shards: int, storage_file: Union[str, Path]):
+    r"""
+    Run a shard in a worker process, answering ``(method, args)`` requests until it receives ``None``.
+
+    Args:
+        ``conn`` (``Connection``): The end of the pipe to the coordinator.
+        ``index`` (``int``): The index of the shard.
+        ``num_shards`` (``int``): The number of shards.
+        ``storage_file`` (``Union[str, Path]``): The storage file of the shard.
+    """
+    shard = HypergraphShard(index, num_shards, storage_file)
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        method, args = request
+        try:
+            reply = (True, getattr(shard, method)(*args))
+        except Exception as e:
+            reply = (False, e)
+        conn.send(reply)
+    conn.close()
+
+
+class _ShardProcess:
+    r"""
+    Shard running in a worker process, called over a pipe.
+    """
+
+    def __init__(self, ctx: Any, index: int, num_shards: int, storage_file: Union[str, Path]):
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_serve_shard, args=(child_conn, index, num_shards, storage_file), daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+
+    def send(self, method: str, args: Tuple):
+        self._conn.send((method, args))
+
+    def recv(self) -> Tuple[bool, Any]:
+        return self._conn.recv()
+
+    def close(self):
+        self._conn.send(None)
+        self._process.join()
+        self._conn.close()
+
+
+def _write_locked(method):
+    r"""
+    Run a method of ``ShardedHypergraphDB`` while holding the write lock, so that a change spanning several
+    rounds of shard calls is not interleaved with another one.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock.write():
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+@dataclass
+class ShardedHypergraphDB(BaseHypergraphDB):
+    r"""
+    Hypergraph partitioned over several shard stores, in this process or in worker processes.
+
+    Each vertex is owned by the shard its id hashes to. Each hyperedge is stored by every shard owning one of
+    its vertices, so that the incidence, degree and neighbors of a vertex are answered by its owner alone, and
+    its data lives on one of them, its primary shard (see ``primary_of``). Operations are routed to the owner or
+    primary shard, and batched operations make one call per shard, sent to all the shards before any reply is
+    read so that shard processes work in parallel.
+
+    With ``processes=True`` data dicts returned by ``v()`` and ``e()`` are copies: change them with
+    ``update_v()`` and ``update_e()``. Call ``close()`` to stop the shard processes, or use the hypergraph as a
+    context manager. Reads do not take the lock, as with ``HypergraphDB``.
+
+    Args:
+        ``storage_file`` (``Union[str, Path]``): The storage file prefix, shard ``i`` is stored in
+            ``{storage_file}.{i}`` and loaded from it when it exists.
+        ``num_shards`` (``int``): The number of shards. Defaults to ``4``.
+        ``processes`` (``bool``): Whether to run each shard in a worker process. Defaults to ``False``.
+        ``context`` (``Optional[str]``): The ``multiprocessing`` start method, ``None`` for the default.
+    """
+
+    num_shards: int = 4
+    processes: bool = False
+    context: Optional[str] = field(default=None, compare=False)
+
+    def __post_init__(self):
+        assert isinstance(self.num_shards, int) and self.num_shards >= 1, "The number of shards must be positive."
+        self.lock = RWLock()
+        self._rpc_lock = threading.Lock()
+        self._version = 0
+        if self.processes:
+            ctx = mp.get_context(self.context)
+            self._shards = [
+                _ShardProcess(ctx, i, self.num_shards, self._shard_file(self.storage_file, i))
+                for i in range(self.num_shards)
+            ]
+        else:
+            self._shards = [
+                _LocalShard(i, self.num_shards, self._shard_file(self.storage_file, i)) for i in range(self.num_shards)
+            ]
+
+    @staticmethod
+    def _shard_file(file_path: Union[str, Path], index: int) -> Path:
+        r"""
+        Return the file of a shard.
+
+        Args:
+            ``file_path`` (``Union[str, Path]``): The storage file prefix.
+            ``index`` (``int``): The index of the shard.
+        """
+        return Path(f"{file_path}.{index}")
+
+    def close(self):
+        r"""
+        Stop the shard processes. The hypergraph cannot be used afterwards.
+        """
+        with self._rpc_lock:
+            for shard in self._shards:
+                shard.close()
+            self._shards = []
+
+    def __enter__(self) -> "ShardedHypergraphDB":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _gather(self, calls: List[Tuple[int, str, Tuple]]) -> List[Any]:
+        r"""
+        Send the calls to their shards, then collect the replies in order. If a call raised, the exception is
+        raised once all the replies are read.
+
+        Args:
+            ``calls`` (``List[Tuple[int, str, Tuple]]``): The shard index, method name and arguments of each call.
+        """
+        with self._rpc_lock:
+            assert self._shards, "The hypergraph is closed."
+            shards = self._shards
+            for index, method, args in calls:
+                shards[index].send(method, args)
+            replies = [shards[index].recv() for index, _, _ in calls]
+        for ok, result in replies:
+            if not ok:
+                raise result
+        return [result for _, result in replies]
+
+    def _call(self, index: int, method: str, *args: Any) -> Any:
+        r"""
+        Call a method of one shard and return its result.
+
+        Args:
+            ``index`` (``int``): The index of the shard.
+            ``method`` (``str``): The method name.
+        """
+        return self._gather([(index, method, args)])[0]
+
+    def _broadcast(self, method: str, *args: Any) -> List[Any]:
+        r"""
+        Call a method of every shard and return their results.
+
+        Args:
+            ``method`` (``str``): The method name.
+        """
+        return self._gather([(i, method, args) for i in range(self.num_shards)])
+
+    def _group(self, v_ids: List[Any]) -> Dict[int, List[int]]:
+        r"""
+        Return the positions of the vertices grouped by owner shard.
+
+        Args:
+            ``v_ids`` (``List[Any]``): The vertex ids.
+        """
+        groups: Dict[int, List[int]] = {}
+        num_shards = self.num_shards
+        try:
+            for pos, v_id in enumerate(v_ids):
+                hash(v_id)
+                groups.setdefault(shard_of(v_id, num_shards), []).append(pos)
+        except TypeError:
+            raise AssertionError("The vertex id must be hashable.") from None
+        return groups
+
+    def _per_vertex(self, method: str, v_ids: Iterable[Any], *args: Any) -> List[Any]:
+        r"""
+        Call a per-vertex list method on the owner shards, one call per shard, and return the results in the
+        order of the vertices.
+
+        Args:
+            ``method`` (``str``): The method name.
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+        """
+        v_ids = list(v_ids)
+        groups = self._group(v_ids)
+        calls = [(index, method, ([v_ids[pos] for pos in positions],) + args) for index, positions in groups.items()]
+        results: List[Any] = [None] * len(v_ids)
+        for positions, shard_results in zip(groups.values(), self._gather(calls)):
+            for pos, result in zip(positions, shard_results):
+                results[pos] = result
+        return results
+
+    def _check_v(self, v_ids: Iterable[Any]):
+        r"""
+        Assert that the vertices exist, with one call per owner shard.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+        """
+        v_ids = list(set(v_ids))
+        for v_id, exists in zip(v_ids, self._per_vertex("has_v", v_ids)):
+            assert exists, f"The vertex {v_id} does not exist in the hypergraph."
+
+    def _encode_e(self, e_tuple: Union[List, Set, Tuple]) -> Tuple:
+        r"""
+        Check the hyperedge tuple and return it sorted, without checking that its vertices exist.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
+        try:
+            e_set = set(e_tuple)
+        except TypeError:
+            raise AssertionError("The vertex id must be hashable.") from None
+        return tuple(sorted(e_set))
+
+    def _check_e(self, e_tuple: Union[List, Set, Tuple]) -> Tuple:
+        r"""
+        Return the sorted hyperedge tuple, asserting that the hyperedge exists.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        e_key = self._encode_e(e_tuple)
+        assert self.has_e(e_key), f"The hyperedge {e_tuple} does not exist in the hypergraph."
+        return e_key
+
+    def _clear_cache(self):
+        r"""
+        Record a change of the hypergraph.
+        """
+        self._version += 1
+
+    @property
+    def version(self) -> int:
+        r"""
+        Return the mutation version, increased by every change made through this object.
+        """
+        return self._version
+
+    def shard_of(self, v_id: Any) -> int:
+        r"""
+        Return the index of the shard that owns the vertex.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+        """
+        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
+        return shard_of(v_id, self.num_shards)
+
+    def save(self, file_path: Union[str, Path]) -> bool:
+        r"""
+        Save every shard to its own file, ``{file_path}.{i}`` for shard ``i``.
+
+        Args:
+            ``file_path`` (``Union[str, Path]``): The file path prefix.
+
+        Returns:
+            ``bool``: True if successful, False otherwise.
+        """
+        return all(self._gather([(i, "save", (self._shard_file(file_path, i),)) for i in range(self.num_shards)]))
+
+    @_write_locked
+    def load(self, file_path: Union[str, Path]) -> bool:
+        r"""
+        Load every shard from its own file, ``{file_path}.{i}`` for shard ``i``, saved with the same number of
+        shards.
+
+        Args:
+            ``file_path`` (``Union[str, Path]``): The file path prefix.
+
+        Returns:
+            ``bool``: True if successful, False otherwise.
+        """
+        ok = all(self._gather([(i, "load", (self._shard_file(file_path, i),)) for i in range(self.num_shards)]))
+        self._clear_cache()
+        return ok
+
+    def v(self, v_id: Any, default: Any = None) -> dict:
+        r"""
+        Return the vertex data.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``default`` (``Any``): The default value if the vertex does not exist.
+        """
+        v_data = self._per_vertex("v", [v_id])[0]
+        return default if v_data is None else v_data
+
+    def e(self, e_tuple: Union[List, Set, Tuple], default: Any = None) -> dict:
+        r"""
+        Return the hyperedge data.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+            ``default`` (``Any``): The default value if the hyperedge does not exist.
+        """
+        e_key = self._encode_e(e_tuple)
+        e_data = self._call(primary_of(e_key, self.num_shards), "e", [e_key])[0] if e_key else None
+        if e_data is None:
+            # only a missing hyperedge needs the vertices checked
+            self._check_v(e_key)
+            return default
+        return e_data
+
+    def encode_e(self, e_tuple: Union[List, Set, Tuple]) -> Tuple:
+        r"""
+        Sort and check the hyperedge tuple.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        e_key = self._encode_e(e_tuple)
+        self._check_v(e_key)
+        return e_key
+
+    @property
+    def all_v(self) -> AbstractSet[Any]:
+        r"""
+        Return the set of all vertices, collected from the shards. Unlike ``HypergraphDB.all_v`` it is a copy.
+        """
+        return {v_id for v_ids in self._broadcast("all_v") for v_id in v_ids}
+
+    @property
+    def all_e(self) -> AbstractSet[Tuple]:
+        r"""
+        Return the set of all hyperedges, collected from their primary shards. Unlike ``HypergraphDB.all_e``
+        it is a copy.
+        """
+        return {e_key for e_keys in self._broadcast("all_e") for e_key in e_keys}
+
+    @property
+    def num_v(self) -> int:
+        r"""
+        Return the number of vertices in the hypergraph.
+        """
+        return sum(num_v for num_v, _ in self._broadcast("counts"))
+
+    @property
+    def num_e(self) -> int:
+        r"""
+        Return the number of hyperedges in the hypergraph.
+        """
+        return sum(num_e for _, num_e in self._broadcast("counts"))
+
+    def add_v(self, v_id: Any, v_data: Optional[Dict] = None):
+        r"""
+        Add a vertex to the hypergraph, or update the data of an existing one.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``v_data`` (``dict``, optional): The vertex data.
+        """
+        self.add_v_batch([v_id], [v_data])
+
+    @_write_locked
+    def add_v_batch(self, v_list: Iterable[Any], v_data_list: Optional[Iterable[Optional[Dict]]] = None):
+        r"""
+        Add multiple vertices to the hypergraph, with one call per owner shard.
+
+        Args:
+            ``v_list`` (``Iterable[Any]``): The vertex ids. Generators are accepted.
+            ``v_data_list`` (``Iterable[Optional[dict]]``, optional): The vertex data, aligned with ``v_list``.
+        """
+        v_ids = list(v_list)
+        v_data_list = [None] * len(v_ids) if v_data_list is None else list(v_data_list)
+        assert len(v_data_list) == len(v_ids), "The vertex data must be aligned with the vertices."
+        for v_data in v_data_list:
+            assert v_data is None or isinstance(v_data, dict), "The vertex data must be a dictionary."
+        groups = self._group(v_ids)
+        self._gather(
+            [
+                (index, "add_v", ([v_ids[pos] for pos in positions], [v_data_list[pos] for pos in positions]))
+                for index, positions in groups.items()
+            ]
+        )
+        self._clear_cache()
+
+    def add_e(self, e_tuple: Union[List, Set, Tuple], e_data: Optional[Dict] = None):
+        r"""
+        Add a hyperedge to the hypergraph, or update the data of an existing one.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+            ``e_data`` (``dict``, optional): The hyperedge data.
+        """
+        self.add_e_batch([e_tuple], [e_data])
+
+    @_write_locked
+    def add_e_batch(
+        self,
+        e_list: Iterable[Union[List, Set, Tuple]],
+        e_data_list: Optional[Iterable[Optional[Dict]]] = None,
+    ):
+        r"""
+        Add multiple hyperedges to the hypergraph: one round of calls checks that their vertices exist and
+        one more adds them, with one call per shard in each round. Duplicated hyperedges have their data merged
+        as with ``HypergraphDB.add_e_batch``.
+
+        Args:
+            ``e_list`` (``Iterable[Union[List, Set, Tuple]]``): The hyperedge tuples. Generators are accepted.
+            ``e_data_list`` (``Iterable[Optional[dict]]``, optional): The hyperedge data, aligned with ``e_list``.
+        """
+        pairs = zip(e_list, repeat(None)) if e_data_list is None else zip(e_list, e_data_list, strict=True)
+        pending: Dict[Tuple, Dict] = {}
+        for e_tuple, e_data in pairs:
+            assert e_data is None or isinstance(e_data, dict), "The hyperedge data must be a dictionary."
+            e_key = self._encode_e(e_tuple)
+            if e_key not in pending:
+                pending[e_key] = {} if e_data is None else e_data
+            elif e_data:
+                pending[e_key].update(e_data)
+        self._check_v({v_id for e_key in pending for v_id in e_key})
+        self._put_e(pending)
+        self._clear_cache()
+
+    def _put_e(self, e_data: Dict[Tuple, Dict]):
+        r"""
+        Add hyperedges of existing vertices to all their member shards, with one call per shard.
+
+        Args:
+            ``e_data`` (``Dict[Tuple, Dict]``): The data of each sorted hyperedge tuple.
+        """
+        num_shards = self.num_shards
+        per_shard: Dict[int, Tuple[List[Tuple], List[Optional[Dict]]]] = {}
+        for e_key, data in e_data.items():
+            members, primary = placement_of(e_key, num_shards)
+            for index in members:
+                e_keys, data_list = per_shard.setdefault(index, ([], []))
+                e_keys.append(e_key)
+                data_list.append(data if index == primary else None)
+        self._gather([(index, "add_e", args) for index, args in per_shard.items()])
+
+    def _drop_e(self, e_keys: Iterable[Tuple]):
+        r"""
+        Remove existing hyperedges from all their member shards, with one call per shard.
+
+        Args:
+            ``e_keys`` (``Iterable[Tuple]``): The sorted hyperedge tuples.
+        """
+        per_shard: Dict[int, List[Tuple]] = {}
+        for e_key in e_keys:
+            for index in placement_of(e_key, self.num_shards)[0]:
+                per_shard.setdefault(index, []).append(e_key)
+        self._gather([(index, "remove_e", (e_keys,)) for index, e_keys in per_shard.items()])
+
+    def remove_v(self, v_id: Any, merge: Union[str, Callable[[Dict, Dict], Dict]] = "overwrite"):
+        r"""
+        Remove a vertex from the hypergraph.
+
+        Each incident hyperedge shrinks to the remaining vertices and keeps its data, like with
+        ``HypergraphDB.remove_v``. Hyperedges left with fewer than two vertices are removed, and a shrunken
+        hyperedge that already exists is merged into the existing one following ``merge``.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``merge`` (``Union[str, Callable[[dict, dict], dict]]``): The merge policy of colliding hyperedges,
+                see ``HypergraphDB.remove_v``. Defaults to ``"overwrite"``.
+        """
+        self.remove_v_batch([v_id], merge)
+
+    @_write_locked
+    def remove_v_batch(self, v_ids: Iterable[Any], merge: Union[str, Callable[[Dict, Dict], Dict]] = "overwrite"):
+        r"""
+        Remove multiple vertices from the hypergraph, like ``HypergraphDB.remove_v_batch``: each hyperedge
+        shrinks once to the vertices that are not removed. A shrunken hyperedge may have another primary shard, so
+        the hyperedges are removed and added again with their data, in five rounds of calls whatever the number of
+        vertices.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids. Generators are accepted and repeated ids are ignored.
+            ``merge`` (``Union[str, Callable[[dict, dict], dict]]``): The merge policy of colliding hyperedges,
+                see ``HypergraphDB.remove_v``. Defaults to ``"overwrite"``.
+        """
+        assert merge in _MERGE_POLICIES or callable(
+            merge
+        ), f"The merge policy must be one of {', '.join(_MERGE_POLICIES)} or a callable."
+        v_ids = list(dict.fromkeys(v_ids))
+        self._check_v(v_ids)
+        removed = set(v_ids)
+        e_keys = list(dict.fromkeys(e_key for nbr_e in self.nbr_e_of_v_many(v_ids) for e_key in nbr_e))
+        shrunk = {e_key: tuple(u for u in e_key if u not in removed) for e_key in e_keys}
+        shrunk = {e_key: new_e_key for e_key, new_e_key in shrunk.items() if len(new_e_key) >= 2}
+        # shrunken hyperedges never contain removed vertices, so the existing ones are not among e_keys
+        targets = list(set(shrunk.values()))
+        e_data = self._e_many(e_keys + targets)
+        existing = {e_key: data for e_key, data in zip(targets, e_data[len(e_keys) :]) if data is not None}
+        new_e_data, merged = dict(existing), set()
+        for e_key, data in zip(e_keys, e_data):
+            new_e_key = shrunk.get(e_key)
+            if new_e_key is None:
+                continue
+            if new_e_key in new_e_data:
+                data = _merge_data(new_e_data[new_e_key], data, merge)
+                merged.add(new_e_key)
+            new_e_data[new_e_key] = data
+        # existing hyperedges that keep their data are left in place. A merge callable may change the data of the
+        # existing hyperedge in place and return it, which is a copy on shards running in processes, so the
+        # hyperedges it ran on are added again whatever it returned
+        kept = [e_key for e_key in existing if merge == "keep" or e_key not in merged]
+        for e_key in kept:
+            del new_e_data[e_key]
+        self._drop_e(e_keys + [e_key for e_key in existing if e_key in new_e_data])
+        self._put_e(new_e_data)
+        self._gather(
+            [
+                (index, "remove_v", ([v_ids[pos] for pos in positions],))
+                for index, positions in self._group(v_ids).items()
+            ]
+        )
+        self._clear_cache()
+
+    def _e_many(self, e_keys: List[Tuple]) -> List[Optional[Dict]]:
+        r"""
+        Return the data of the hyperedges from their primary shards, ``None`` for missing ones, with one call
+        per shard.
+
+        Args:
+            ``e_keys`` (``List[Tuple]``): The sorted hyperedge tuples.
+        """
+        groups: Dict[int, List[int]] = {}
+        for pos, e_key in enumerate(e_keys):
+            groups.setdefault(primary_of(e_key, self.num_shards), []).append(pos)
+        calls = [(index, "e", ([e_keys[pos] for pos in positions],)) for index, positions in groups.items()]
+        results: List[Optional[Dict]] = [None] * len(e_keys)
+        for positions, shard_results in zip(groups.values(), self._gather(calls)):
+            for pos, result in zip(positions, shard_results):
+                results[pos] = result
+        return results
+
+    @_write_locked
+    def remove_e(self, e_tuple: Union[List, Set, Tuple]):
+        r"""
+        Remove a hyperedge from the hypergraph.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        self._drop_e([self._check_e(e_tuple)])
+        self._clear_cache()
+
+    @_write_locked
+    def update_v(self, v_id: Any, v_data: dict):
+        r"""
+        Update the vertex data.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``v_data`` (``dict``): The vertex data.
+        """
+        assert isinstance(v_data, dict), "The vertex data must be a dictionary."
+        self._call(self.shard_of(v_id), "update_v", v_id, v_data)
+        self._clear_cache()
+
+    @_write_locked
+    def update_e(self, e_tuple: Union[List, Set, Tuple], e_data: dict):
+        r"""
+        Update the hyperedge data.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+            ``e_data`` (``dict``): The hyperedge data.
+        """
+        assert isinstance(e_data, dict), "The hyperedge data must be a dictionary."
+        e_key = self._encode_e(e_tuple)
+        self._call(primary_of(e_key, self.num_shards), "update_e", e_key, e_data)
+        self._clear_cache()
+
+    def has_v(self, v_id: Any) -> bool:
+        r"""
+        Check if the vertex exists.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+        """
+        return self._per_vertex("has_v", [v_id])[0]
+
+    def has_e(self, e_tuple: Union[List, Set, Tuple]) -> bool:
+        r"""
+        Check if the hyperedge exists.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        e_key = self._encode_e(e_tuple)
+        return bool(e_key) and self._call(primary_of(e_key, self.num_shards), "has_e", [e_key])[0]
+
+    def degree_v(self, v_id: Any) -> int:
+        r"""
+        Return the degree of the vertex.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+        """
+        return self.degree_v_many([v_id])[0]
+
+    def degree_e(self, e_tuple: Union[List, Set, Tuple]) -> int:
+        r"""
+        Return the degree of the hyperedge.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        return len(self._check_e(e_tuple))
+
+    def nbr_e_of_v(self, v_id: Any, copy: bool = True) -> AbstractSet[Tuple]:
+        r"""
+        Return the incident hyperedges of the vertex, a new set whatever ``copy`` is.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``copy`` (``bool``): Ignored, kept for compatibility with ``HypergraphDB.nbr_e_of_v``.
+        """
+        return self.nbr_e_of_v_many([v_id])[0]
+
+    def nbr_v_of_e(self, e_tuple: Union[List, Set, Tuple], copy: bool = True) -> Union[set, Tuple]:
+        r"""
+        Return the incident vertices of the hyperedge.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+            ``copy`` (``bool``): Whether to return a new set, or the sorted hyperedge tuple.
+        """
+        e_key = self._check_e(e_tuple)
+        return set(e_key) if copy else e_key
+
+    def nbr_v(self, v_id: Any, exclude_self: bool = True) -> set:
+        r"""
+        Return the neighbors of the vertex.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``exclude_self`` (``bool``): Whether to exclude the vertex itself from neighbors.
+        """
+        return self.nbr_v_many([v_id], exclude_self)[0]
+
+    def iter_nbr_v(self, v_id: Any, exclude_self: bool = True) -> Iterator[Any]:
+        r"""
+        Iterate over the neighbors of the vertex, fetched in one call to its owner shard.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``exclude_self`` (``bool``): Whether to exclude the vertex itself from neighbors.
+        """
+        return iter(self.nbr_v(v_id, exclude_self))
+
+    def degree_v_many(self, v_ids: Iterable[Any], as_numpy: bool = False) -> Union[List[int], Any]:
+        r"""
+        Return the degrees of many vertices, with one call per owner shard.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+            ``as_numpy`` (``bool``): Whether to return a NumPy ``int64`` array instead of a list. Requires ``numpy``.
+        """
+        degrees = self._per_vertex("degree_v", v_ids)
+        if as_numpy:
+            np = _require_numpy("degree_v_many(as_numpy=True)")
+            return np.array(degrees, dtype=np.int64)
+        return degrees
+
+    def nbr_e_of_v_many(self, v_ids: Iterable[Any]) -> List[set]:
+        r"""
+        Return the incident hyperedges of many vertices, with one call per owner shard.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+        """
+        return self._per_vertex("nbr_e_of_v", v_ids)
+
+    def nbr_v_many(self, v_ids: Iterable[Any], exclude_self: bool = True) -> List[set]:
+        r"""
+        Return the neighbors of many vertices, with one call per owner shard.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+            ``exclude_self`` (``bool``): Whether to exclude each vertex itself from its neighbors.
+        """
+        return self._per_vertex("nbr_v", v_ids, exclude_self)
+
+    def bfs(self, v_id: Any, max_depth: Optional[int] = None) -> Iterator[Tuple[Any, int]]:
+        r"""
+        Lazily iterate over the vertices reachable from the vertex in breadth-first order, each yielded once
+        with its number of hops from the vertex (the vertex itself first, with 0).
+
+        The neighbors of a whole frontier are fetched at once, with one call per owner shard for each hop.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``max_depth`` (``Optional[int]``): The maximum number of hops, ``None`` for no limit.
+        """
+        self._check_v([v_id])
+        return self._bfs(v_id, max_depth)
+
+    def _bfs(self, v_id: Any, max_depth: Optional[int]) -> Iterator[Tuple[Any, int]]:
+        r"""
+        Generator behind ``bfs``, kept separate so that the vertex is checked when it is called.
+        """
+        seen, frontier, depth = {v_id}, [v_id], 0
+        yield v_id, 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_frontier = []
+            for nbrs in self.nbr_v_many(frontier):
+                for u in nbrs:
+                    if u not in seen:
+                        seen.add(u)
+                        next_frontier.append(u)
+                        yield u, depth
+            frontier = next_frontier
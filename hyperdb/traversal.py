@@ -0,0 +1,292 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Traversals over the incidence of a hypergraph store. Vertices and hyperedges are whatever keys ``inci`` (the
+# hyperedges incident to a vertex) and ``members`` (the vertices of a hyperedge) take and return, so that each
+# store runs them over its internal keys and only turns the results into ids.
+
+
+def bfs_search(
+    start: Any, inci: Callable[[Any], Iterable[Any]], members: Callable[[Any], Sequence[Any]], max_depth: Optional[int]
+) -> Iterator[Tuple[Any, int]]:
+    r"""
+    Breadth-first search from a vertex, yielding each vertex reached with its number of hops.
+
+    Every hyperedge is expanded once, the first time one of its vertices is visited, instead of once per
+    vertex as repeated neighbor queries would.
+
+    Args:
+        ``start`` (``Any``): The start vertex.
+        ``inci`` (``Callable[[Any], Iterable[Any]]``): Return the hyperedges incident to a vertex.
+        ``members`` (``Callable[[Any], Sequence[Any]]``): Return the vertices of a hyperedge.
+        ``max_depth`` (``Optional[int]``): The maximum number of hops, ``None`` for no limit.
+    """
+    seen_v, seen_e = {start}, set()
+    frontier, depth = [start], 0
+    yield start, 0
+    while frontier and (max_depth is None or depth < max_depth):
+        depth += 1
+        next_frontier = []
+        for v in frontier:
+            for e in inci(v):
+                if e in seen_e:
+                    continue
+                seen_e.add(e)
+                for u in members(e):
+                    if u not in seen_v:
+                        seen_v.add(u)
+                        next_frontier.append(u)
+                        yield u, depth
+        frontier = next_frontier
+
+
+def shortest_path_search(
+    src: Any, dst: Any, inci: Callable[[Any], Iterable[Any]], members: Callable[[Any], Sequence[Any]]
+) -> Optional[List[Any]]:
+    r"""
+    Find a path with the fewest hyperedges between two vertices by a bidirectional breadth-first search.
+
+    Each step expands a whole level of the side with the smaller frontier, so the search stops after visiting
+    about the neighborhoods of half the path length around both ends rather than the full one around ``src``.
+
+    Args:
+        ``src`` (``Any``): The source vertex.
+        ``dst`` (``Any``): The target vertex.
+        ``inci`` (``Callable[[Any], Iterable[Any]]``): Return the hyperedges incident to a vertex.
+        ``members`` (``Callable[[Any], Sequence[Any]]``): Return the vertices of a hyperedge.
+
+    Returns:
+        ``Optional[List[Any]]``: The vertices and hyperedges of the path, alternating from ``src`` to ``dst``,
+        or ``None`` if ``dst`` cannot be reached.
+    """
+    if src == dst:
+        return [src]
+    # the hyperedge and vertex each vertex was reached from, on the side of src and on the side of dst
+    parents: Tuple[Dict[Any, Any], Dict[Any, Any]] = ({src: None}, {dst: None})
+    seen_e: Tuple[set, set] = (set(), set())
+    frontiers = ([src], [dst])
+    while frontiers[0] and frontiers[1]:
+        # a meeting found while expanding a whole level closes a shortest path
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        parent, other, side_seen_e = parents[side], parents[1 - side], seen_e[side]
+        next_frontier = []
+        for v in frontiers[side]:
+            for e in inci(v):
+                if e in side_seen_e:
+                    continue
+                side_seen_e.add(e)
+                for u in members(e):
+                    if u in parent:
+                        continue
+                    parent[u] = (e, v)
+                    if u in other:
+                        return _join_path(u, parents)
+                    next_frontier.append(u)
+        frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+    return None
+
+
+def _join_path(meet: Any, parents: Tuple[Dict[Any, Any], Dict[Any, Any]]) -> List[Any]:
+    r"""
+    Join the two halves of a bidirectional search at the vertex where they met.
+
+    Args:
+        ``meet`` (``Any``): The vertex reached from both sides.
+        ``parents`` (``Tuple[Dict[Any, Any], Dict[Any, Any]]``): The predecessors on the side of src and of dst.
+    """
+    head, v = [], meet
+    while parents[0][v] is not None:
+        e, v = parents[0][v]
+        head += (e, v)
+    tail, v = [], meet
+    while parents[1][v] is not None:
+        e, v = parents[1][v]
+        tail += (e, v)
+    return head[::-1] + [meet] + tail
+
+
+class UnionFind:
+    r"""
+    Disjoint sets of hashable keys, with union by size and path halving. Keys never merged are not stored.
+    """
+
+    __slots__ = ("parent", "size")
+
+    def __init__(self):
+        self.parent: Dict[Any, Any] = {}
+        self.size: Dict[Any, int] = {}
+
+    def find(self, x: Any) -> Any:
+        r"""
+        Return the root of the set of the key, pointing the keys on the way halfway closer to it.
+
+        Args:
+            ``x`` (``Any``): The key.
+        """
+        parent = self.parent
+        while x in parent:
+            p = parent[x]
+            if p not in parent:
+                return p
+            grand = parent[p]
+            parent[x] = grand
+            x = grand
+        return x
+
+    def union(self, keys: Sequence[Any]):
+        r"""
+        Merge the sets of all the keys into one.
+
+        Args:
+            ``keys`` (``Sequence[Any]``): The keys.
+        """
+        if not keys:
+            return
+        find, parent, size = self.find, self.parent, self.size
+        root = find(keys[0])
+        for key in keys[1:]:
+            other = find(key)
+            if other == root:
+                continue
+            if size.get(root, 1) < size.get(other, 1):
+                root, other = other, root
+            parent[other] = root
+            size[root] = size.get(root, 1) + size.pop(other, 1)
+
+
+def union_find_components(v_keys: Iterable[Any], e_members: Iterable[Sequence[Any]]) -> List[List[Any]]:
+    r"""
+    Group the vertices into connected components with a union-find over the hyperedges.
+
+    Each hyperedge merges the sets of its vertices into one, which takes a single pass over the hyperedges and
+    no per-vertex neighbor sets.
+
+    Args:
+        ``v_keys`` (``Iterable[Any]``): All vertices, isolated ones form components of their own.
+        ``e_members`` (``Iterable[Sequence[Any]]``): The vertices of each hyperedge.
+
+    Returns:
+        ``List[List[Any]]``: The vertices of each component.
+    """
+    sets = UnionFind()
+    for members in e_members:
+        sets.union(members)
+    components: Dict[Any, List[Any]] = {}
+    find = sets.find
+    for v in v_keys:
+        components.setdefault(find(v), []).append(v)
+    return list(components.values())
+
+
+def s_components_search(
+    e_keys: Iterable[Any],
+    inci: Callable[[Any], Iterable[Any]],
+    members: Callable[[Any], Sequence[Any]],
+    s: int,
+) -> List[List[Any]]:
+    r"""
+    Group the hyperedges into s-connected components: two hyperedges are s-adjacent when they share at least
+    ``s`` vertices, and s-connected when a chain of s-adjacent hyperedges joins them.
+
+    For ``s=1`` these are the hyperedges of each connected component, found by a union-find over the vertices.
+    Otherwise the vertices shared with the other hyperedges are counted over the incidence of the members of
+    each hyperedge, which visits each pair of hyperedges sharing a vertex once per shared vertex. Hyperedges of
+    fewer than ``s`` vertices cannot be s-adjacent and are skipped. Hyperedges must be comparable (edge ids and
+    indices are), each pair is counted from its smaller hyperedge only.
+
+    Args:
+        ``e_keys`` (``Iterable[Any]``): All hyperedges.
+        ``inci`` (``Callable[[Any], Iterable[Any]]``): Return the hyperedges incident to a vertex.
+        ``members`` (``Callable[[Any], Sequence[Any]]``): Return the vertices of a hyperedge.
+        ``s`` (``int``): The number of shared vertices.
+
+    Returns:
+        ``List[List[Any]]``: The hyperedges of each component, hyperedges of fewer than ``s`` vertices
+        excluded.
+    """
+    if s == 1:
+        # hyperedges are 1-connected exactly when their vertices are connected
+        sets = UnionFind()
+        e_keys = list(e_keys)
+        for e in e_keys:
+            sets.union(members(e))
+        components: Dict[Any, List[Any]] = {}
+        for e in e_keys:
+            e_members = members(e)
+            if e_members:
+                components.setdefault(sets.find(e_members[0]), []).append(e)
+        return list(components.values())
+    e_keys = [e for e in e_keys if len(members(e)) >= s]
+
+    def adjacent_pairs() -> Iterator[Tuple[Any, Any]]:
+        for e in e_keys:
+            shared: Dict[Any, int] = {}
+            for v in members(e):
+                for f in inci(v):
+                    if f > e:
+                        count = shared.get(f, 0) + 1
+                        shared[f] = count
+                        if count == s:
+                            yield e, f
+
+    return union_find_components(e_keys, adjacent_pairs())
+
+
+def k_hop_search(
+    start: Any,
+    k: int,
+    inci: Callable[[Any], Iterable[Any]],
+    members: Callable[[Any], Sequence[Any]],
+    max_vertices: Optional[int] = None,
+    max_edges: Optional[int] = None,
+    keep: Optional[Callable[[Any], bool]] = None,
+) -> Tuple[List[Any], List[Any], bool]:
+    r"""
+    Breadth-first search of the hyperedges within ``k`` hops of a vertex, one frontier of vertices per hop.
+
+    Vertices and hyperedges are whatever keys ``inci`` and ``members`` take and return, so that each store can
+    search its internal keys. A hyperedge is taken with all its vertices: one that would exceed ``max_vertices``
+    is skipped, and once the vertices are at the limit the search stops at the first hyperedge bringing new ones,
+    instead of scanning the rest of the incidence of hub vertices. It stops as well at ``max_edges`` hyperedges.
+
+    Args:
+        ``start`` (``Any``): The start vertex.
+        ``k`` (``int``): The number of hops.
+        ``inci`` (``Callable[[Any], Iterable[Any]]``): Return the hyperedges incident to a vertex.
+        ``members`` (``Callable[[Any], Sequence[Any]]``): Return the vertices of a hyperedge.
+        ``max_vertices`` (``Optional[int]``): The maximum number of vertices, the start vertex included.
+        ``max_edges`` (``Optional[int]``): The maximum number of hyperedges.
+        ``keep`` (``Optional[Callable[[Any], bool]]``): Return whether to follow a hyperedge.
+
+    Returns:
+        ``Tuple[List[Any], List[Any], bool]``: The vertices and hyperedges in the order they were reached, and
+        whether a limit left some out.
+    """
+    seen_v, seen_e, skipped = {start: None}, {}, set()
+    frontier, truncated = [start], False
+    for _ in range(k):
+        next_frontier = []
+        for v in frontier:
+            for e in inci(v):
+                if e in seen_e or e in skipped:
+                    continue
+                if keep is not None and not keep(e):
+                    skipped.add(e)
+                    continue
+                if max_edges is not None and len(seen_e) >= max_edges:
+                    return list(seen_v), list(seen_e), True
+                new = [u for u in members(e) if u not in seen_v]
+                if max_vertices is not None and len(seen_v) + len(new) > max_vertices:
+                    if len(seen_v) >= max_vertices:
+                        return list(seen_v), list(seen_e), True
+                    # later hyperedges may still fit, this one never will
+                    skipped.add(e)
+                    truncated = True
+                    continue
+                seen_e[e] = None
+                for u in new:
+                    seen_v[u] = None
+                next_frontier += new
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    return list(seen_v), list(seen_e), truncated
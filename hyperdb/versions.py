@@ -0,0 +1,259 @@
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from itertools import repeat
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Union
+
+# Pre-image of an item that did not exist yet.
+_ABSENT = object()
+
+
+class Versions:
+    r"""
+    Pre-images of the items of the containers of a hypergraph or an index written since a snapshot was taken.
+
+    Before an item of a container is written for the first time after the snapshot, ``save`` keeps its value (its
+    pre-image) and the size the container had. The snapshot reads the containers themselves through
+    ``VersionedDict`` and ``VersionedList`` views, which return the pre-image of the items that have one, so a
+    write copies only the items it touches. Writers save a pre-image before writing and views read the container
+    before the pre-images, so a view reading an item while it is written gets its old value either way.
+
+    Taking the next snapshot starts new versions, linked as ``newer``: an item without a pre-image here did not
+    change until then, and is looked up in the newer versions, then in the container. Containers are told apart by
+    a name, and must not be replaced while versions are kept for them.
+    """
+
+    __slots__ = ("pre", "sizes", "newer")
+
+    def __init__(self):
+        self.pre: Dict[Hashable, Dict[Any, Any]] = {}
+        self.sizes: Dict[Hashable, int] = {}
+        self.newer: Optional["Versions"] = None
+
+    def save(self, name: Hashable, table: Union[Dict, List], key: Any):
+        r"""
+        Keep an item of a container before it is written, unless it was written since the snapshot already. Pass
+        ``len(table)`` before appending to a list and ``len(table) - 1`` before popping from it.
+
+        Args:
+            ``name`` (``Hashable``): The name of the container.
+            ``table`` (``Union[dict, list]``): The container.
+            ``key`` (``Any``): The key of the item, or its position in a list.
+        """
+        pre = self.pre.get(name)
+        if pre is None:
+            self.sizes[name] = len(table)
+            pre = self.pre[name] = {}
+        elif key in pre:
+            return
+        if table.__class__ is list:
+            pre[key] = table[key] if key < len(table) else _ABSENT
+        else:
+            pre[key] = table.get(key, _ABSENT)
+
+    def size(self, name: Hashable, table: Union[Dict, List]) -> int:
+        r"""
+        Return the size a container had when the snapshot was taken.
+
+        Args:
+            ``name`` (``Hashable``): The name of the container.
+            ``table`` (``Union[dict, list]``): The container.
+        """
+        size = len(table)
+        versions = self
+        while versions is not None:
+            if name in versions.sizes:
+                return versions.sizes[name]
+            versions = versions.newer
+        return size
+
+    def get(self, name: Hashable, key: Any, value: Any) -> Any:
+        r"""
+        Return the value an item had when the snapshot was taken, ``_ABSENT`` if it did not exist.
+
+        Args:
+            ``name`` (``Hashable``): The name of the container.
+            ``key`` (``Any``): The key of the item, or its position in a list.
+            ``value`` (``Any``): The item read from the container before, ``_ABSENT`` if it has none.
+        """
+        versions = self
+        while versions is not None:
+            pre = versions.pre.get(name)
+            if pre is not None and key in pre:
+                return pre[key]
+            versions = versions.newer
+        return value
+
+    def changed(self, name: Hashable) -> Dict[Any, Any]:
+        r"""
+        Return the items of a container written since the snapshot was taken, with their value then.
+
+        Args:
+            ``name`` (``Hashable``): The name of the container.
+        """
+        pres = []
+        versions = self
+        while versions is not None:
+            pre = versions.pre.get(name)
+            if pre:
+                pres.append(pre)
+            versions = versions.newer
+        changed: Dict[Any, Any] = {}
+        for pre in reversed(pres):
+            # the items are listed at once, a writer may add pre-images meanwhile
+            changed.update(list(pre.items()))
+        return changed
+
+
+def newer_versions(versions: Optional[Versions]) -> Versions:
+    r"""
+    Start the versions of a new snapshot, linked as the newer versions of the previous snapshot if any.
+
+    Args:
+        ``versions`` (``Versions``, optional): The versions of the previous snapshot.
+    """
+    newer = Versions()
+    if versions is not None:
+        versions.newer = newer
+    return newer
+
+
+class VersionedDict(Mapping):
+    r"""
+    Read-only view of a dict as it was when a snapshot was taken, see ``Versions``.
+
+    Args:
+        ``table`` (``dict``): The dict, which keeps changing.
+        ``name`` (``Hashable``): Its name in the versions.
+        ``versions`` (``Versions``): The versions started by the snapshot.
+    """
+
+    __slots__ = ("_table", "_name", "_versions", "_size", "_cache")
+
+    def __init__(self, table: Dict, name: Hashable, versions: Versions):
+        self._table, self._name, self._versions = table, name, versions
+        self._size = versions.size(name, table)
+        # the keys are listed once, so that keys(), values() and items() come in the same order
+        self._cache: Dict[str, List[Any]] = {}
+
+    def _get(self, key: Any) -> Any:
+        value = self._table.get(key, _ABSENT)
+        return self._versions.get(self._name, key, value)
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self._get(key)
+        if value is _ABSENT:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = self._get(key)
+        return default if value is _ABSENT else value
+
+    def __contains__(self, key: Any) -> bool:
+        return self._get(key) is not _ABSENT
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Any]:
+        keys = self._cache.get("keys")
+        if keys is None:
+            keys = self._cache.setdefault("keys", self._keys())
+        return iter(keys)
+
+    def _keys(self) -> List[Any]:
+        r"""
+        List the keys the dict had, in its current order, followed by the keys removed since.
+        """
+        keys = list(self._table)
+        changed = self._versions.changed(self._name)
+        result = []
+        for key in keys:
+            if changed.pop(key, None) is not _ABSENT:
+                result.append(key)
+        result.extend(key for key, value in changed.items() if value is not _ABSENT)
+        return result
+
+    def __reduce__(self):
+        if isinstance(self._table, defaultdict):
+            return defaultdict, (self._table.default_factory, dict(self.items()))
+        return dict, (dict(self.items()),)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+class VersionedList(Sequence):
+    r"""
+    Read-only view of a list as it was when a snapshot was taken, see ``Versions``.
+
+    Args:
+        ``table`` (``list``): The list, which keeps changing.
+        ``name`` (``Hashable``): Its name in the versions.
+        ``versions`` (``Versions``): The versions started by the snapshot.
+        ``item`` (``Callable[[int, Any], Any]``, optional): Called with the position and value of each item read,
+            to return a view of it instead, for lists of lists.
+    """
+
+    __slots__ = ("_table", "_name", "_versions", "_size", "_item")
+
+    def __init__(
+        self, table: List, name: Hashable, versions: Versions, item: Optional[Callable[[int, Any], Any]] = None
+    ):
+        self._table, self._name, self._versions, self._item = table, name, versions, item
+        self._size = versions.size(name, table)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("list index out of range")
+        try:
+            value = self._table[index]
+        except IndexError:
+            value = _ABSENT
+        value = self._versions.get(self._name, index, value)
+        return value if self._item is None else self._item(index, value)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Any]:
+        size = self._size
+        values = self._table[:size]
+        values.extend(repeat(_ABSENT, size - len(values)))
+        for index, value in self._versions.changed(self._name).items():
+            if index < size:
+                values[index] = value
+        if self._item is not None:
+            return map(self._item, range(size), values)
+        return iter(values)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, VersionedList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+
+def versioned(table: Union[Dict, List], name: Hashable, versions: Versions) -> Union[VersionedDict, VersionedList]:
+    r"""
+    Return a read-only view of a dict or list as it is now, see ``Versions``.
+
+    Args:
+        ``table`` (``Union[dict, list]``): The container.
+        ``name`` (``Hashable``): Its name in the versions.
+        ``versions`` (``Versions``): The versions started by the snapshot.
+    """
+    if table.__class__ is list:
+        return VersionedList(table, name, versions)
+    return VersionedDict(table, name, versions)
@@ -0,0 +1,615 @@
+from collections.abc import Hashable
+from collections.abc import Set as AbstractSetABC
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from hyperdb.base import BaseHypergraphDB, _require_numpy
+from hyperdb.frozen import FrozenHypergraph, build_csr
+from hyperdb.parallel import SharedHypergraph
+from hyperdb.traversal import (
+    bfs_search,
+    k_hop_search,
+    s_components_search,
+    shortest_path_search,
+    union_find_components,
+)
+
+if TYPE_CHECKING:
+    from hyperdb.hypergraph import HypergraphDB
+
+
+class _ViewVertexSet(AbstractSetABC):
+    r"""
+    Read-only set-like view of the vertices of a sub-hypergraph view.
+    """
+
+    __slots__ = ("_view",)
+
+    def __init__(self, view: "HypergraphView"):
+        self._view = view
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._view._iter_v_keys())
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._view._v_labels(self._view._iter_v_keys()))
+
+    def __contains__(self, v_id: Any) -> bool:
+        return isinstance(v_id, Hashable) and self._view.has_v(v_id)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({set(self)!r})"
+
+
+class _ViewEdgeSet(AbstractSetABC):
+    r"""
+    Read-only set-like view of the hyperedges of a sub-hypergraph view.
+    """
+
+    __slots__ = ("_view",)
+
+    def __init__(self, view: "HypergraphView"):
+        self._view = view
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._view._iter_e_ids())
+
+    def __iter__(self) -> Iterator[Tuple]:
+        hg = self._view.hg
+        return (hg._e_label(hg._e_tuple[e_id]) for e_id in self._view._iter_e_ids())
+
+    def __contains__(self, e_tuple: Any) -> bool:
+        if not isinstance(e_tuple, tuple):
+            return False
+        try:
+            e_id = self._view._e_id(e_tuple)
+        except (AssertionError, TypeError):
+            return False
+        return e_id is not None and self._view.hg._e_label(self._view.hg._e_tuple[e_id]) == e_tuple
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({set(self)!r})"
+
+
+@dataclass(eq=False, repr=False)
+class HypergraphView(BaseHypergraphDB):
+    r"""
+    Read-only sub-hypergraph of a ``HypergraphDB`` that filters the storage of the hypergraph on every query
+    instead of copying it. Create one with ``HypergraphDB.subgraph()`` or ``HypergraphDB.edge_subgraph()``.
+
+    Creating a view only records the internal keys of its vertices (and the edge ids of its hyperedges for an
+    edge view), and each query costs about the same as on the hypergraph, plus a membership test per incident
+    hyperedge. Data dicts are those of the hypergraph, so updates show through, and vertices or hyperedges
+    removed from the hypergraph leave the view. ``materialize()`` copies the view into a new ``HypergraphDB``.
+
+    Args:
+        ``hg`` (``HypergraphDB``): The hypergraph.
+        ``v_keys`` (``Dict[Any, int]``): The internal keys of the vertices of the view, mapped to the number of
+            times the key had been reused, which tells them from vertices added later under the same key of an
+            interned hypergraph.
+        ``e_ids`` (``Optional[Dict[int, int]]``): The edge ids of the hyperedges of an edge view, mapped to the
+            number of times the id had been reused, which tells them from hyperedges added later under the same
+            id. ``None`` takes all the hyperedges whose vertices are all in the view.
+    """
+
+    hg: Optional["HypergraphDB"] = None
+    v_keys: Dict[Any, int] = field(default_factory=dict)
+    e_ids: Optional[Dict[int, int]] = None
+
+    def __repr__(self) -> str:
+        kind = "vertices" if self.e_ids is None else "edges"
+        return f"{type(self).__name__}({kind}, num_v={self.num_v}, num_e={self.num_e})"
+
+    def _clear_cache(self):
+        r"""
+        A view stores nothing derived from the hypergraph, so there is nothing to invalidate.
+        """
+
+    @property
+    def version(self) -> int:
+        r"""
+        Return the mutation version of the hypergraph, which every change of the view goes through.
+        """
+        return self.hg.version
+
+    def _v_alive(self, v_key: Any) -> bool:
+        r"""
+        Check if the vertex of an internal key of the view still exists in the hypergraph.
+
+        Args:
+            ``v_key`` (``Any``): The internal key.
+        """
+        hg = self.hg
+        if hg.intern_v:
+            return hg._v_data[v_key] is not None and self.v_keys[v_key] == hg._v_reuses.get(v_key, 0)
+        return v_key in hg._v_data
+
+    def _has_e_id(self, e_id: int) -> bool:
+        r"""
+        Check if the hyperedge of an edge id of the hypergraph is in the view.
+
+        Args:
+            ``e_id`` (``int``): The edge id.
+        """
+        e_key = self.hg._e_tuple[e_id]
+        if e_key is None:
+            return False
+        if self.e_ids is not None:
+            reuses = self.e_ids.get(e_id)
+            return reuses is not None and reuses == self.hg._e_reuses.get(e_id, 0)
+        v_keys, v_reuses = self.v_keys, self.hg._v_reuses
+        for v_key in e_key:
+            if v_keys.get(v_key) != v_reuses.get(v_key, 0):
+                return False
+        return True
+
+    def _checked_v_key(self, v_id: Any, strict: bool = True) -> Any:
+        r"""
+        Return the internal key of a vertex of the view, asserting that it is in the view (or returning
+        ``None`` if ``strict`` is false).
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``strict`` (``bool``): Whether to assert instead of returning ``None``.
+        """
+        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
+        hg = self.hg
+        if hg.intern_v:
+            v_key = hg._v_index.get(v_id)
+        else:
+            v_key = v_id if v_id in hg._v_data else None
+        if v_key is None or self.v_keys.get(v_key) != hg._v_reuses.get(v_key, 0):
+            assert not strict, f"The vertex {v_id} does not exist in the hypergraph."
+            return None
+        return v_key
+
+    def _v_keys_of(self, v_ids: Iterable[Any]) -> List[Any]:
+        r"""
+        Return the internal keys of many vertices of the view.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+        """
+        return [self._checked_v_key(v_id) for v_id in v_ids]
+
+    def _e_id(self, e_tuple: Union[List, Set, Tuple]) -> Optional[int]:
+        r"""
+        Return the edge id of a hyperedge of the view, or ``None`` if it is not in the view.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
+        self._v_keys_of(set(e_tuple))
+        e_id = self.hg._e_id(e_tuple)
+        if e_id is None or not self._has_e_id(e_id):
+            return None
+        return e_id
+
+    def _checked_e_id(self, e_tuple: Union[List, Set, Tuple]) -> int:
+        r"""
+        Return the edge id of a hyperedge of the view, asserting that it is in the view.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        e_id = self._e_id(e_tuple)
+        assert e_id is not None, f"The hyperedge {e_tuple} does not exist in the hypergraph."
+        return e_id
+
+    def _iter_v_keys(self) -> Iterator[Any]:
+        r"""
+        Iterate over the internal keys of the vertices of the view that still exist.
+        """
+        return filter(self._v_alive, self.v_keys)
+
+    def _iter_e_ids(self) -> Iterator[int]:
+        r"""
+        Iterate over the edge ids of the hyperedges of the view, each once.
+        """
+        if self.e_ids is not None:
+            return filter(self._has_e_id, self.e_ids)
+        return self._iter_induced_e_ids()
+
+    def _iter_induced_e_ids(self) -> Iterator[int]:
+        r"""
+        Iterate over the hyperedges of the vertices of the view, each from its first vertex only, so that only
+        the incidence of the view is scanned and no set of seen hyperedges is needed.
+        """
+        _e_tuple, _v_inci, _has_e_id = self.hg._e_tuple, self.hg._v_inci, self._has_e_id
+        for v_key in self._iter_v_keys():
+            for e_id in _v_inci[v_key]:
+                if _e_tuple[e_id][0] == v_key and _has_e_id(e_id):
+                    yield e_id
+
+    def _inci(self, v_key: Any) -> Iterator[int]:
+        r"""
+        Iterate over the edge ids of the hyperedges of the view incident to a vertex.
+
+        Args:
+            ``v_key`` (``Any``): The internal key of the vertex.
+        """
+        return filter(self._has_e_id, self.hg._v_inci[v_key])
+
+    def _v_labels(self, v_keys: Iterable[Any]) -> Iterable[Any]:
+        r"""
+        Map internal vertex keys to vertex ids, lazily.
+
+        Args:
+            ``v_keys`` (``Iterable[Any]``): The internal keys.
+        """
+        return self.hg._v_labels(iter(v_keys))
+
+    def _e_labels(self, e_ids: Iterable[int]) -> Iterator[Tuple]:
+        r"""
+        Map edge ids to hyperedge tuples, lazily.
+
+        Args:
+            ``e_ids`` (``Iterable[int]``): The edge ids.
+        """
+        _e_tuple, _e_label = self.hg._e_tuple, self.hg._e_label
+        return (_e_label(_e_tuple[e_id]) for e_id in e_ids)
+
+    def materialize(self, storage_file: Union[str, Path] = "my_hypergraph.hgdb") -> "HypergraphDB":
+        r"""
+        Copy the view into a new ``HypergraphDB``, with copies of the data dicts.
+
+        Args:
+            ``storage_file`` (``Union[str, Path]``): The storage file of the copy. An existing file is not
+                loaded, the copy only holds the vertices and hyperedges of the view.
+        """
+        hg = self.hg
+        copy = type(hg)(storage_file=storage_file, intern_v=hg.intern_v, autoload=False)
+        v_keys = list(self._iter_v_keys())
+        copy.add_v_batch(self._v_labels(v_keys), (dict(hg._v_data[v_key]) for v_key in v_keys))
+        e_ids = list(self._iter_e_ids())
+        copy.add_e_batch(self._e_labels(e_ids), (dict(hg._e_data[e_id]) for e_id in e_ids))
+        return copy
+
+    def freeze(self) -> FrozenHypergraph:
+        r"""
+        Return a read-only snapshot of the view backed by its CSR incidence structure, sharing the data dicts.
+        """
+        return self._frozen(list(self._iter_v_keys()), list(self._iter_e_ids()))
+
+    def share(self) -> SharedHypergraph:
+        r"""
+        Publish a frozen copy of the view in a shared memory block for worker processes, returning the
+        ``SharedHypergraph`` to run ``map`` on. Close it when done, or use it as a context manager.
+        """
+        with self.hg.lock.read():
+            return SharedHypergraph(self.freeze())
+
+    def _frozen(self, v_keys: List[Any], e_ids: List[int]) -> FrozenHypergraph:
+        r"""
+        Build a frozen hypergraph of the vertices and hyperedges, sharing the data dicts.
+
+        Args:
+            ``v_keys`` (``List[Any]``): The internal keys of the vertices.
+            ``e_ids`` (``List[int]``): The edge ids of the hyperedges, their vertices must be in ``v_keys``.
+        """
+        hg = self.hg
+        pos = {v_key: i for i, v_key in enumerate(v_keys)}
+        csr = build_csr(list(self._v_labels(v_keys)), ([pos[u] for u in hg._e_tuple[e_id]] for e_id in e_ids))
+        v_data = list(map(hg._v_data.__getitem__, v_keys))
+        return FrozenHypergraph(csr=csr, v_data=v_data, e_data=list(map(hg._e_data.__getitem__, e_ids)))
+
+    def v(self, v_id: Any, default: Any = None) -> dict:
+        r"""
+        Return the vertex data.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``default`` (``Any``): The default value if the vertex does not exist.
+        """
+        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
+        v_key = self._checked_v_key(v_id, strict=False)
+        if v_key is None:
+            return default
+        return self.hg._v_data[v_key]
+
+    def e(self, e_tuple: Union[List, Set, Tuple], default: Any = None) -> dict:
+        r"""
+        Return the hyperedge data.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+            ``default`` (``Any``): The default value if the hyperedge does not exist.
+        """
+        e_id = self._e_id(e_tuple)
+        if e_id is None:
+            return default
+        return self.hg._e_data[e_id]
+
+    def encode_e(self, e_tuple: Union[List, Set, Tuple]) -> Tuple:
+        r"""
+        Sort and check the hyperedge tuple, and return it in the order of the hypergraph.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
+        self._v_keys_of(set(e_tuple))
+        return self.hg.encode_e(e_tuple)
+
+    @property
+    def all_v(self) -> AbstractSet[Any]:
+        r"""
+        Return a read-only set-like view of all vertices in the view.
+        """
+        return _ViewVertexSet(self)
+
+    @property
+    def all_e(self) -> AbstractSet[Tuple]:
+        r"""
+        Return a read-only set-like view of all hyperedges in the view.
+        """
+        return _ViewEdgeSet(self)
+
+    @property
+    def num_v(self) -> int:
+        r"""
+        Return the number of vertices in the view.
+        """
+        return len(self.all_v)
+
+    @property
+    def num_e(self) -> int:
+        r"""
+        Return the number of hyperedges in the view.
+        """
+        return len(self.all_e)
+
+    def has_v(self, v_id: Any) -> bool:
+        r"""
+        Check if the vertex exists.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+        """
+        assert isinstance(v_id, Hashable), "The vertex id must be hashable."
+        return self._checked_v_key(v_id, strict=False) is not None
+
+    def has_e(self, e_tuple: Union[List, Set, Tuple]) -> bool:
+        r"""
+        Check if the hyperedge exists.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        assert isinstance(e_tuple, (list, set, tuple)), "The hyperedge must be a list, set, or tuple of vertex ids."
+        try:
+            return self._e_id(e_tuple) is not None
+        except AssertionError:
+            return False
+
+    def degree_v(self, v_id: Any) -> int:
+        r"""
+        Return the number of hyperedges of the view incident to the vertex.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+        """
+        return sum(1 for _ in self._inci(self._checked_v_key(v_id)))
+
+    def degree_e(self, e_tuple: Union[List, Set, Tuple]) -> int:
+        r"""
+        Return the degree of the hyperedge.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+        """
+        return len(self.hg._e_tuple[self._checked_e_id(e_tuple)])
+
+    def nbr_e_of_v(self, v_id: Any, copy: bool = True) -> AbstractSet[Tuple]:
+        r"""
+        Return the hyperedges of the view incident to the vertex, as a new set whatever ``copy`` is.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``copy`` (``bool``): Accepted for compatibility with ``HypergraphDB.nbr_e_of_v``.
+        """
+        return set(self._e_labels(self._inci(self._checked_v_key(v_id))))
+
+    def nbr_v_of_e(self, e_tuple: Union[List, Set, Tuple], copy: bool = True) -> Union[set, Tuple]:
+        r"""
+        Return the incident vertices of the hyperedge.
+
+        Args:
+            ``e_tuple`` (``Union[List, Set, Tuple]``): The hyperedge tuple: (v1_name, v2_name, ..., vn_name).
+            ``copy`` (``bool``): Whether to return a new set, or the stored (immutable) hyperedge tuple itself.
+        """
+        e_label = next(self._e_labels((self._checked_e_id(e_tuple),)))
+        return set(e_label) if copy else e_label
+
+    def nbr_v(self, v_id: Any, exclude_self: bool = True) -> set:
+        r"""
+        Return the neighbors of the vertex in the view.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``exclude_self`` (``bool``): Whether to exclude the vertex itself from neighbors.
+        """
+        return set(self.iter_nbr_v(v_id, exclude_self))
+
+    def iter_nbr_v(self, v_id: Any, exclude_self: bool = True) -> Iterator[Any]:
+        r"""
+        Lazily iterate over the neighbors of the vertex in the view, each yielded once.
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``exclude_self`` (``bool``): Whether to exclude the vertex itself from neighbors.
+        """
+        v_key = self._checked_v_key(v_id)
+        return self._v_labels(self._iter_nbr_keys(v_key, exclude_self))
+
+    def _iter_nbr_keys(self, v_key: Any, exclude_self: bool) -> Iterator[Any]:
+        r"""
+        Generator behind ``iter_nbr_v``, over internal keys.
+
+        Args:
+            ``v_key`` (``Any``): The internal key of the vertex.
+            ``exclude_self`` (``bool``): Whether to exclude the vertex itself from neighbors.
+        """
+        _e_tuple = self.hg._e_tuple
+        seen = {v_key} if exclude_self else set()
+        for e_id in self._inci(v_key):
+            for u in _e_tuple[e_id]:
+                if u not in seen:
+                    seen.add(u)
+                    yield u
+
+    def degree_v_many(self, v_ids: Iterable[Any], as_numpy: bool = False) -> Union[List[int], Any]:
+        r"""
+        Return the degrees of many vertices at once.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+            ``as_numpy`` (``bool``): Whether to return a NumPy ``int64`` array instead of a list. Requires ``numpy``.
+        """
+        degrees = [sum(1 for _ in self._inci(v_key)) for v_key in self._v_keys_of(v_ids)]
+        if as_numpy:
+            np = _require_numpy("degree_v_many(as_numpy=True)")
+            return np.array(degrees, dtype=np.int64)
+        return degrees
+
+    def nbr_e_of_v_many(self, v_ids: Iterable[Any]) -> List[set]:
+        r"""
+        Return the incident hyperedges of many vertices at once.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+        """
+        return [set(self._e_labels(self._inci(v_key))) for v_key in self._v_keys_of(v_ids)]
+
+    def nbr_v_many(self, v_ids: Iterable[Any], exclude_self: bool = True) -> List[set]:
+        r"""
+        Return the neighbors of many vertices at once.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+            ``exclude_self`` (``bool``): Whether to exclude each vertex itself from its neighbors.
+        """
+        return [set(self._v_labels(self._iter_nbr_keys(v_key, exclude_self))) for v_key in self._v_keys_of(v_ids)]
+
+    def subgraph(self, v_ids: Iterable[Any]) -> "HypergraphView":
+        r"""
+        Return the view of the given vertices of this view and the hyperedges of the view between them.
+
+        Args:
+            ``v_ids`` (``Iterable[Any]``): The vertex ids.
+        """
+        v_keys = {v_key: self.v_keys[v_key] for v_key in self._v_keys_of(v_ids)}
+        if self.e_ids is None:
+            return HypergraphView(hg=self.hg, v_keys=v_keys)
+        _e_tuple, reuses = self.hg._e_tuple, self.e_ids
+        e_ids = {e_id: reuses[e_id] for e_id in self._iter_e_ids() if all(u in v_keys for u in _e_tuple[e_id])}
+        return HypergraphView(hg=self.hg, v_keys=v_keys, e_ids=e_ids)
+
+    def edge_subgraph(self, e_tuples: Iterable[Union[List, Set, Tuple]]) -> "HypergraphView":
+        r"""
+        Return the view of the given hyperedges of this view and their vertices.
+
+        Args:
+            ``e_tuples`` (``Iterable[Union[List, Set, Tuple]]``): The hyperedge tuples.
+        """
+        _e_tuple, _e_reuses, _v_reuses = self.hg._e_tuple, self.hg._e_reuses, self.hg._v_reuses
+        e_ids = {e_id: _e_reuses.get(e_id, 0) for e_id in map(self._checked_e_id, e_tuples)}
+        v_keys = {u: _v_reuses.get(u, 0) for e_id in e_ids for u in _e_tuple[e_id]}
+        return HypergraphView(hg=self.hg, v_keys=v_keys, e_ids=e_ids)
+
+    def _k_hop(
+        self,
+        v_id: Any,
+        k: int,
+        max_vertices: Optional[int] = None,
+        max_edges: Optional[int] = None,
+        edge_filter: Optional[Callable[[Tuple, Dict], bool]] = None,
+    ) -> Tuple[FrozenHypergraph, bool]:
+        r"""
+        Return the ``k``-hop neighborhood of the vertex in the view (see ``k_hop``) and whether a limit truncated
+        it.
+        """
+        v_key = self._checked_v_key(v_id)
+        _e_tuple, _e_data, _e_label = self.hg._e_tuple, self.hg._e_data, self.hg._e_label
+        if edge_filter is not None:
+
+            def keep(e_id: int) -> bool:
+                return edge_filter(_e_label(_e_tuple[e_id]), _e_data[e_id])
+
+        else:
+            keep = None
+        v_keys, e_ids, truncated = k_hop_search(
+            v_key, k, self._inci, _e_tuple.__getitem__, max_vertices, max_edges, keep
+        )
+        return self._frozen(v_keys, e_ids), truncated
+
+    def bfs(self, v_id: Any, max_depth: Optional[int] = None) -> Iterator[Tuple[Any, int]]:
+        r"""
+        Lazily iterate over the vertices reachable from the vertex in the view in breadth-first order, each
+        yielded once with its number of hops from the vertex (the vertex itself first, with 0).
+
+        Args:
+            ``v_id`` (``Any``): The vertex id.
+            ``max_depth`` (``Optional[int]``): The maximum number of hops, ``None`` for no limit.
+        """
+        v_key = self._checked_v_key(v_id)
+        visits = bfs_search(v_key, self._inci, self.hg._e_tuple.__getitem__, max_depth)
+        if self.hg.intern_v:
+            _v_label = self.hg._v_label
+            return ((_v_label[v_key], depth) for v_key, depth in visits)
+        return visits
+
+    def shortest_path(self, src_v_id: Any, dst_v_id: Any) -> Optional[List[Any]]:
+        r"""
+        Return a path with the fewest hyperedges of the view between two vertices, as the list of vertex ids and
+        hyperedge tuples alternating from ``src_v_id`` to ``dst_v_id``, or ``None`` if there is none.
+
+        Args:
+            ``src_v_id`` (``Any``): The source vertex id.
+            ``dst_v_id`` (``Any``): The target vertex id.
+        """
+        src, dst = self._v_keys_of((src_v_id, dst_v_id))
+        path = shortest_path_search(src, dst, self._inci, self.hg._e_tuple.__getitem__)
+        if path is None:
+            return None
+        path[::2] = self._v_labels(path[::2])
+        path[1::2] = self._e_labels(path[1::2])
+        return path
+
+    def connected_components(self) -> Iterator[Set[Any]]:
+        r"""
+        Iterate over the connected components of the view, as sets of vertex ids. Isolated vertices form
+        components of their own.
+        """
+        _e_tuple = self.hg._e_tuple
+        components = union_find_components(self._iter_v_keys(), map(_e_tuple.__getitem__, self._iter_e_ids()))
+        return (set(self._v_labels(component)) for component in components)
+
+    def s_connected_components(self, s: int = 1, return_singletons: bool = False) -> Iterator[Set[Tuple]]:
+        r"""
+        Iterate over the s-connected components of the view, as sets of hyperedge tuples. Two hyperedges are
+        s-adjacent when they share at least ``s`` vertices, and s-connected when a chain of s-adjacent
+        hyperedges joins them.
+
+        Args:
+            ``s`` (``int``): The number of shared vertices. Defaults to ``1``.
+            ``return_singletons`` (``bool``): Whether to include components of a single hyperedge.
+        """
+        assert isinstance(s, int) and s >= 1, "s must be a positive integer."
+        components = s_components_search(self._iter_e_ids(), self._inci, self.hg._e_tuple.__getitem__, s)
+        return (set(self._e_labels(component)) for component in components if return_singletons or len(component) > 1)
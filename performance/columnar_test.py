@@ -0,0 +1,104 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import time
+import random
+import logging
+import tempfile
+
+from hyperdb.frozen import FrozenHypergraph
+from hyperdb.hypergraph import HypergraphDB
+
+
+# Configure log directory and file
+log_root = Path(__file__).parent / "logs"
+if not log_root.exists():
+    log_root.mkdir()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    filename=log_root / "columnar_test.log",
+    filemode="w",
+)
+logger = logging.getLogger(__name__)
+
+
+def build_hypergraph(num_vertices, num_edges):
+    """Build a random hypergraph with string vertex ids and small data dicts."""
+    random.seed(0)
+    hg = HypergraphDB()
+    hg.add_v_batch(
+        (f"Vertex-{i}" for i in range(1, num_vertices + 1)),
+        ({"name": f"Vertex {i}", "value": i} for i in range(1, num_vertices + 1)),
+    )
+    hg.add_e_batch(
+        tuple(f"Vertex-{i}" for i in random.sample(range(1, num_vertices + 1), random.randint(2, 5)))
+        for _ in range(num_edges)
+    )
+    return hg
+
+
+def query(hg, v_ids):
+    """Run a degree, a neighborhood and a data query for each vertex id."""
+    for v_id in v_ids:
+        hg.degree_v(v_id)
+        hg.nbr_v(v_id)
+        hg.v(v_id)
+
+
+def columnar_test(num_vertices=5000, num_edges=1000, num_queries=1000, scale_factors=(1, 5, 10, 50, 100)):
+    """
+    Compare opening a saved hypergraph from the pickle format (load) with memory-mapping the columnar
+    format (FrozenHypergraph.open), and the time of the first queries after opening.
+    """
+    results = []
+    for scale in scale_factors:
+        vertices, edges = num_vertices * scale, num_edges * scale
+        hg = build_hypergraph(vertices, edges)
+        v_ids = [f"Vertex-{random.randint(1, vertices)}" for _ in range(num_queries)]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pickle_file, columnar_file = Path(tmp_dir) / "hg.hgdb", Path(tmp_dir) / "hg.hgdbc"
+            hg.save(pickle_file)
+            hg.save_as("columnar", columnar_file)
+            size = columnar_file.stat().st_size
+
+            start_time = time.time()
+            loaded = HypergraphDB(storage_file=pickle_file)
+            load_time = time.time() - start_time
+            start_time = time.time()
+            query(loaded, v_ids)
+            load_query_time = time.time() - start_time
+
+            start_time = time.time()
+            mapped = FrozenHypergraph.open(columnar_file)
+            open_time = time.time() - start_time
+            start_time = time.time()
+            query(mapped, v_ids)
+            open_query_time = time.time() - start_time
+            del mapped
+        results.append((vertices, edges, size, load_time, open_time, load_query_time, open_query_time))
+        logger.info(f"{vertices} vertices / {edges} edges: load {load_time:.3f}s, open {open_time * 1e3:.2f}ms")
+
+    logger.info("\nSummary of Columnar Format Results:\n")
+    logger.info(
+        f"{'num v':<10}{'num e':<10}{'file MiB':<10}{'load (s)':<10}{'open (ms)':<11}"
+        f"{'load q (s)':<12}{'open q (s)':<12}"
+    )
+    logger.info("-" * 75)
+    for vertices, edges, size, load_time, open_time, load_query_time, open_query_time in results:
+        logger.info(
+            f"{vertices:<10}"
+            f"{edges:<10}"
+            f"{size / 2**20:<10.1f}"
+            f"{load_time:<10.3f}"
+            f"{open_time * 1e3:<11.2f}"
+            f"{load_query_time:<12.3f}"
+            f"{open_query_time:<12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    columnar_test()
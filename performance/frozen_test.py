@@ -0,0 +1,113 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import time
+import random
+import logging
+import tracemalloc
+
+from hyperdb.hypergraph import HypergraphDB
+
+
+# Configure log directory and file
+log_root = Path(__file__).parent / "logs"
+if not log_root.exists():
+    log_root.mkdir()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    filename=log_root / "frozen_test.log",
+    filemode="w",
+)
+logger = logging.getLogger(__name__)
+
+
+def build_hypergraph(num_vertices, num_edges):
+    """Build a random hypergraph and return it with its traced memory footprint."""
+    random.seed(0)
+    tracemalloc.start()
+    hg = HypergraphDB()
+    hg.add_v_batch(range(1, num_vertices + 1))
+    hg.add_e_batch(
+        tuple(random.sample(range(1, num_vertices + 1), random.randint(2, 5))) for _ in range(num_edges)
+    )
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return hg, memory
+
+
+def freeze_hypergraph(hg):
+    """Freeze the hypergraph and return the snapshot with its extra traced memory and the freeze time."""
+    tracemalloc.start()
+    start_time = time.time()
+    fhg = hg.freeze()
+    freeze_time = time.time() - start_time
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return fhg, memory, freeze_time
+
+
+def read_queries(hg, v_ids, e_tuples):
+    """Time degree and neighborhood queries and return the time of each kind."""
+    timings = {}
+    start_time = time.time()
+    for v_id in v_ids:
+        hg.degree_v(v_id)
+    timings["degree_v"] = time.time() - start_time
+    start_time = time.time()
+    for v_id in v_ids:
+        hg.nbr_e_of_v(v_id)
+    timings["nbr_e_of_v"] = time.time() - start_time
+    start_time = time.time()
+    for v_id in v_ids:
+        hg.nbr_v(v_id)
+    timings["nbr_v"] = time.time() - start_time
+    start_time = time.time()
+    for e_tuple in e_tuples:
+        hg.nbr_v_of_e(e_tuple)
+    timings["nbr_v_of_e"] = time.time() - start_time
+    return timings
+
+
+def frozen_test(num_vertices=5000, num_edges=1000, num_queries=20000, scale_factors=(1, 2, 5, 10, 20, 50)):
+    """
+    Compare the mutable store with its frozen CSR snapshot on the stress test graph sizes.
+    The frozen memory excludes the vertex and hyperedge data dicts, which are shared.
+    """
+    results = []
+    for scale in scale_factors:
+        vertices, edges = num_vertices * scale, num_edges * scale
+        hg, hg_memory = build_hypergraph(vertices, edges)
+        fhg, fhg_memory, freeze_time = freeze_hypergraph(hg)
+        v_ids = [random.randint(1, vertices) for _ in range(num_queries)]
+        e_tuples = random.choices(list(hg.all_e), k=num_queries)
+        hg_timings = read_queries(hg, v_ids, e_tuples)
+        fhg_timings = read_queries(fhg, v_ids, e_tuples)
+        results.append((vertices, edges, hg_memory, fhg_memory, freeze_time, hg_timings, fhg_timings))
+        logger.info(f"{vertices} vertices / {edges} edges: frozen in {freeze_time:.2f} seconds")
+
+    logger.info("\nSummary of Frozen Hypergraph Results:\n")
+    logger.info(
+        f"{'num v':<10}{'num e':<10}{'mutable MiB':<13}{'frozen MiB':<12}{'freeze s':<10}"
+        f"{'query':<12}{'mutable s':<11}{'frozen s':<10}"
+    )
+    logger.info("-" * 88)
+    for vertices, edges, hg_memory, fhg_memory, freeze_time, hg_timings, fhg_timings in results:
+        for query in hg_timings:
+            logger.info(
+                f"{vertices:<10}"
+                f"{edges:<10}"
+                f"{hg_memory / 2**20:<13.1f}"
+                f"{fhg_memory / 2**20:<12.1f}"
+                f"{freeze_time:<10.2f}"
+                f"{query:<12}"
+                f"{hg_timings[query]:<11.3f}"
+                f"{fhg_timings[query]:<10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    frozen_test()
@@ -0,0 +1,120 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import json
+import time
+import random
+import logging
+import tempfile
+import tracemalloc
+
+from hyperdb.hypergraph import HypergraphDB
+
+
+# Configure log directory and file
+log_root = Path(__file__).parent / "logs"
+if not log_root.exists():
+    log_root.mkdir()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    filename=log_root / "hif_test.log",
+    filemode="w",
+)
+logger = logging.getLogger(__name__)
+
+
+def build_hypergraph(num_vertices, num_edges):
+    """Build a random hypergraph with string vertex ids and small data dicts."""
+    random.seed(0)
+    hg = HypergraphDB()
+    hg.add_v_batch(
+        (f"Vertex-{i}" for i in range(1, num_vertices + 1)),
+        ({"name": f"Vertex {i}", "value": i} for i in range(1, num_vertices + 1)),
+    )
+    hg.add_e_batch(
+        (
+            tuple(f"Vertex-{i}" for i in random.sample(range(1, num_vertices + 1), random.randint(2, 5)))
+            for _ in range(num_edges)
+        ),
+        ({"relation": "random_edge", "weight": random.random()} for _ in range(num_edges)),
+    )
+    return hg
+
+
+def measure(func, *args):
+    """Return the time and the peak traced memory (in MiB) of a call."""
+    tracemalloc.start()
+    start_time = time.time()
+    func(*args)
+    total_time = time.time() - start_time
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return total_time, peak
+
+
+def dump_in_memory(hg, file_path):
+    """Build the whole HIF document and write it with the json module, as before the streaming writer."""
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(hg.to_hif(), f, ensure_ascii=False, indent=2)
+
+
+def load_in_memory(file_path):
+    """Parse the whole HIF document with the json module, then import it."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        HypergraphDB().from_hif(json.load(f))
+
+
+def load_streaming(file_path):
+    """Parse and import the HIF document incrementally."""
+    HypergraphDB().load_from_hif(file_path)
+
+
+def hif_test(num_vertices=5000, num_edges=1000, scale_factors=(1, 5, 10, 50)):
+    """
+    Compare HIF export and import that build the whole document in memory with the streaming writer
+    (save_as_hif) and reader (load_from_hif): wall time and peak traced memory.
+    Tracing slows both paths down by the same factor; compare the numbers relative to each other.
+    """
+    results = []
+    for scale in scale_factors:
+        vertices, edges = num_vertices * scale, num_edges * scale
+        hg = build_hypergraph(vertices, edges)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            legacy_file, stream_file = Path(tmp_dir) / "legacy.json", Path(tmp_dir) / "stream.json"
+            dump_time, dump_peak = measure(dump_in_memory, hg, legacy_file)
+            write_time, write_peak = measure(hg.save_as_hif, stream_file)
+            size = stream_file.stat().st_size
+            json_load_time, json_load_peak = measure(load_in_memory, stream_file)
+            read_time, read_peak = measure(load_streaming, stream_file)
+        results.append(
+            (vertices, edges, size, dump_time, write_time, dump_peak, write_peak,
+             json_load_time, read_time, json_load_peak, read_peak)
+        )
+        logger.info(f"{vertices} vertices / {edges} edges: export {dump_time:.2f}s -> {write_time:.2f}s, "
+                    f"import {json_load_time:.2f}s -> {read_time:.2f}s")
+
+    logger.info("\nSummary of Streaming HIF Results (in-memory -> streaming):\n")
+    logger.info(
+        f"{'num v':<10}{'num e':<10}{'file MiB':<10}{'export (s)':<16}{'export MiB':<18}"
+        f"{'import (s)':<16}{'import MiB':<18}"
+    )
+    logger.info("-" * 98)
+    for (vertices, edges, size, dump_time, write_time, dump_peak, write_peak,
+         json_load_time, read_time, json_load_peak, read_peak) in results:
+        logger.info(
+            f"{vertices:<10}"
+            f"{edges:<10}"
+            f"{size / 2**20:<10.1f}"
+            f"{f'{dump_time:.2f} -> {write_time:.2f}':<16}"
+            f"{f'{dump_peak:.1f} -> {write_peak:.1f}':<18}"
+            f"{f'{json_load_time:.2f} -> {read_time:.2f}':<16}"
+            f"{f'{json_load_peak:.1f} -> {read_peak:.1f}':<18}"
+        )
+
+
+if __name__ == "__main__":
+    hif_test()
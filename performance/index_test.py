@@ -0,0 +1,101 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import time
+import random
+import logging
+
+from hyperdb.hypergraph import HypergraphDB
+
+
+# Configure log directory and file
+log_root = Path(__file__).parent / "logs"
+if not log_root.exists():
+    log_root.mkdir()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    filename=log_root / "index_test.log",
+    filemode="w",
+)
+logger = logging.getLogger(__name__)
+
+
+def build_hypergraph(num_vertices, num_edges, num_types):
+    """Build a random hypergraph whose vertices have a type and a score, and whose edges have a year."""
+    random.seed(0)
+    hg = HypergraphDB()
+    hg.add_v_batch(
+        range(num_vertices),
+        ({"type": f"type-{random.randrange(num_types)}", "score": random.random()} for _ in range(num_vertices)),
+    )
+    hg.add_e_batch(
+        (tuple(random.sample(range(num_vertices), random.randint(2, 5))) for _ in range(num_edges)),
+        ({"year": random.randint(1900, 2024)} for _ in range(num_edges)),
+    )
+    return hg
+
+
+def scan(hg, queries):
+    """Answer the queries by scanning the vertex and edge data, as before the indexes."""
+    for kind, year_lo, score_lo in queries:
+        [v for v in hg.all_v if hg.v(v)["type"] == kind]
+        [e for e in hg.all_e if year_lo <= hg.e(e)["year"] <= year_lo + 5]
+        [v for v in hg.all_v if score_lo <= hg.v(v)["score"] <= score_lo + 0.001]
+
+
+def indexed(hg, queries):
+    """Answer the queries with find_v, range_e and range_v."""
+    for kind, year_lo, score_lo in queries:
+        hg.find_v(type=kind)
+        hg.range_e("year", year_lo, year_lo + 5)
+        hg.range_v("score", score_lo, score_lo + 0.001)
+
+
+def index_test(num_vertices=20000, num_edges=10000, num_types=1000, num_queries=20, scale_factors=(1, 5, 10)):
+    """
+    Compare equality and range queries answered by a scan of the data with the same queries answered by
+    hash and sorted attribute indexes, and measure the time to build the indexes.
+    """
+    results = []
+    for scale in scale_factors:
+        vertices, edges = num_vertices * scale, num_edges * scale
+        start_time = time.time()
+        hg = build_hypergraph(vertices, edges, num_types)
+        build_time = time.time() - start_time
+        start_time = time.time()
+        for target, field, kind in (("v", "type", "hash"), ("v", "score", "sorted"), ("e", "year", "sorted")):
+            hg.create_index(target, field, kind=kind)
+        index_time = time.time() - start_time
+
+        queries = [(f"type-{random.randrange(num_types)}", random.randint(1900, 2019), random.random())
+                    for _ in range(num_queries)]
+        start_time = time.time()
+        scan(hg, queries)
+        scan_time = time.time() - start_time
+        start_time = time.time()
+        indexed(hg, queries)
+        query_time = time.time() - start_time
+
+        results.append((vertices, edges, build_time, index_time, scan_time, query_time))
+        logger.info(f"{vertices} vertices / {edges} edges: {num_queries} queries {scan_time:.3f}s -> {query_time:.3f}s")
+
+    logger.info("\nSummary of Attribute Index Results (scan -> index):\n")
+    logger.info(f"{'num v':<10}{'num e':<10}{'build (s)':<12}{'index (s)':<12}{'queries (s)':<20}{'speedup':<10}")
+    logger.info("-" * 74)
+    for vertices, edges, build_time, index_time, scan_time, query_time in results:
+        logger.info(
+            f"{vertices:<10}"
+            f"{edges:<10}"
+            f"{build_time:<12.2f}"
+            f"{index_time:<12.2f}"
+            f"{f'{scan_time:.3f} -> {query_time:.4f}':<20}"
+            f"{scan_time / query_time:<10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    index_test()
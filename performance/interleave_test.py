@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import time
+import random
+import logging
+
+from hyperdb.hypergraph import HypergraphDB
+
+
+# Configure log directory and file
+log_root = Path(__file__).parent / "logs"
+if not log_root.exists():
+    log_root.mkdir()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    filename=log_root / "interleave_test.log",
+    filemode="w",
+)
+logger = logging.getLogger(__name__)
+
+
+class RebuildingHypergraphDB(HypergraphDB):
+    """
+    Reference store reproducing the old behaviour: every mutation dropped the cached views,
+    so each read after a write rebuilt ``all_v``/``all_e`` from scratch.
+    """
+
+    @property
+    def all_v(self):
+        return set(self._v_data.keys())
+
+    @property
+    def all_e(self):
+        return set(self._e_data.keys())
+
+
+def interleaved_writes(hg, num_vertices, num_writes):
+    """Alternate ``add_e`` with ``num_e`` and membership checks on ``all_v``/``all_e``."""
+    hg.add_v_batch(range(1, num_vertices + 1))
+    start_time = time.time()
+    for _ in range(num_writes):
+        vertices = tuple(random.sample(range(1, num_vertices + 1), random.randint(2, 5)))
+        hg.add_e(vertices, {"relation": "random_edge"})
+        _ = hg.num_e
+        _ = hg.num_v
+        _ = vertices[0] in hg.all_v
+        _ = vertices in hg.all_e
+    total_time = time.time() - start_time
+    return total_time
+
+
+def interleave_test():
+    """
+    Measure the per-write cost of interleaving writes with count and membership reads
+    as the hypergraph grows. The live views keep it flat; rebuilding them grows linearly
+    per write, i.e. quadratically overall.
+    """
+    sizes = [1000, 2000, 5000, 10000, 20000]
+    results = []
+    for size in sizes:
+        live_time = interleaved_writes(HypergraphDB(), size, size)
+        rebuild_time = interleaved_writes(RebuildingHypergraphDB(), size, size)
+        results.append((size, live_time, rebuild_time))
+        logger.info(f"{size} interleaved writes: live views {live_time:.2f}s, rebuilt views {rebuild_time:.2f}s")
+
+    logger.info("\nSummary of Interleaved Write/Read Results:\n")
+    logger.info(f"{'writes':<10}{'live (s)':<12}{'rebuild (s)':<14}{'live us/op':<14}{'rebuild us/op':<14}")
+    logger.info("-" * 64)
+    for size, live_time, rebuild_time in results:
+        logger.info(
+            f"{size:<10}"
+            f"{live_time:<12.2f}"
+            f"{rebuild_time:<14.2f}"
+            f"{live_time / size * 1e6:<14.2f}"
+            f"{rebuild_time / size * 1e6:<14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    interleave_test()
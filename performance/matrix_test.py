@@ -0,0 +1,100 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import time
+import random
+import logging
+
+import numpy as np
+import scipy.sparse as sp
+
+from hyperdb.hypergraph import HypergraphDB
+
+
+# Configure log directory and file
+log_root = Path(__file__).parent / "logs"
+if not log_root.exists():
+    log_root.mkdir()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    filename=log_root / "matrix_test.log",
+    filemode="w",
+)
+logger = logging.getLogger(__name__)
+
+
+def build_hypergraph(num_vertices, num_edges):
+    """Build a random hypergraph like the stress test: weighted hyperedges of 2 to 5 random vertices."""
+    random.seed(0)
+    hg = HypergraphDB()
+    hg.add_v_batch(range(1, num_vertices + 1))
+    hg.add_e_batch(
+        (tuple(random.sample(range(1, num_vertices + 1), random.randint(2, 5))) for _ in range(num_edges)),
+        ({"weight": random.random()} for _ in range(num_edges)),
+    )
+    return hg
+
+
+def naive_laplacian(hg):
+    """The normalized Laplacian built by iterating all_e, as done outside the library."""
+    v_pos = {v: i for i, v in enumerate(hg.all_v)}
+    rows, cols, weights = [], [], []
+    for j, e in enumerate(hg.all_e):
+        for v in e:
+            rows.append(v_pos[v])
+            cols.append(j)
+        weights.append(hg.e(e).get("weight", 1.0))
+    h = sp.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(hg.num_v, hg.num_e))
+    w = np.array(weights)
+    d_v = h @ w
+    d_e = np.asarray(h.sum(axis=0)).ravel()
+    inv_sqrt = sp.diags(np.where(d_v > 0, 1 / np.sqrt(np.maximum(d_v, 1e-300)), 0))
+    return sp.identity(hg.num_v) - inv_sqrt @ h @ sp.diags(w / d_e) @ h.T @ inv_sqrt
+
+
+def timed(func, *args):
+    """Return the result of func and the time it took, in seconds."""
+    start_time = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start_time
+
+
+def matrix_test(num_vertices=5000, num_edges=1000, scale_factors=(1, 10, 100), repeats=10):
+    """
+    Compare building the normalized Laplacian by iterating all_e with the built-in operator, cold and cached,
+    and time the pure-Python COO fallback on the smaller sizes.
+    """
+    results = []
+    for scale in scale_factors:
+        vertices, edges = num_vertices * scale, num_edges * scale
+        hg = build_hypergraph(vertices, edges)
+
+        expected, naive_time = timed(lambda: [naive_laplacian(hg) for _ in range(repeats)][-1])
+        laplacian, cold_time = timed(hg.laplacian, "scipy")
+        _, cached_time = timed(lambda: [hg.laplacian("scipy") for _ in range(repeats)])
+        assert abs(laplacian - expected).max() < 1e-9
+        coo_time = timed(hg.laplacian, "coo")[1] if scale <= 10 else float("nan")
+
+        results.append((vertices, edges, naive_time / repeats, cold_time, cached_time / repeats, coo_time))
+        logger.info(f"{vertices} vertices / {edges} edges: Laplacian with {laplacian.nnz} entries")
+
+    logger.info("\nSummary of Laplacian Results (seconds per build):\n")
+    logger.info(f"{'num v':<10}{'num e':<10}{'from all_e':<14}{'built-in':<14}{'cached':<14}{'coo fallback':<14}")
+    logger.info("-" * 76)
+    for vertices, edges, naive_time, cold_time, cached_time, coo_time in results:
+        logger.info(
+            f"{vertices:<10}"
+            f"{edges:<10}"
+            f"{naive_time:<14.4f}"
+            f"{cold_time:<14.4f}"
+            f"{cached_time:<14.6f}"
+            f"{coo_time:<14.4f}"
+        )
+
+
+if __name__ == "__main__":
+    matrix_test()
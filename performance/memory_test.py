@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import time
+import random
+import logging
+import tracemalloc
+
+from hyperdb.hypergraph import HypergraphDB
+
+
+# Configure log directory and file
+log_root = Path(__file__).parent / "logs"
+if not log_root.exists():
+    log_root.mkdir()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    filename=log_root / "memory_test.log",
+    filemode="w",
+)
+logger = logging.getLogger(__name__)
+
+
+def build_hypergraph(num_vertices, num_edges, **kwargs):
+    """
+    Build a random hypergraph with string vertex ids and return it with its traced
+    memory footprint and build time. Ids are formatted again for every hyperedge, as
+    they would be when parsed from a text file.
+    """
+    random.seed(0)
+    tracemalloc.start()
+    start_time = time.time()
+    hg = HypergraphDB(**kwargs)
+    hg.add_v_batch(f"Vertex-{i}" for i in range(1, num_vertices + 1))
+    for _ in range(num_edges):
+        edge_size = random.randint(2, min(5, num_vertices))
+        hg.add_e(tuple(f"Vertex-{i}" for i in random.sample(range(1, num_vertices + 1), edge_size)))
+    build_time = time.time() - start_time
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return hg, memory, build_time
+
+
+def memory_test(num_vertices=5000, num_edges=1000, scale_factors=(1, 2, 5, 10, 20, 50)):
+    """
+    Compare the memory footprint of the plain and the interned vertex-id layouts on
+    the stress test graph sizes (5 vertices per hyperedge), followed by edge-heavy
+    graphs with the vertex and hyperedge counts swapped.
+    """
+    results = []
+    shapes = [(num_vertices * scale, num_edges * scale) for scale in scale_factors]
+    shapes += [(num_edges * scale, num_vertices * scale) for scale in scale_factors]
+    for vertices, edges in shapes:
+        _, plain_memory, plain_time = build_hypergraph(vertices, edges)
+        _, interned_memory, interned_time = build_hypergraph(vertices, edges, intern_v=True)
+        results.append((vertices, edges, plain_memory, interned_memory, plain_time, interned_time))
+        logger.info(
+            f"{vertices} vertices / {edges} edges: plain {plain_memory / 2**20:.1f} MiB, "
+            f"interned {interned_memory / 2**20:.1f} MiB"
+        )
+
+    logger.info("\nSummary of Memory Results:\n")
+    logger.info(
+        f"{'num v':<10}{'num e':<10}{'plain MiB':<12}{'interned MiB':<14}{'saving':<10}"
+        f"{'plain s':<10}{'interned s':<10}"
+    )
+    logger.info("-" * 76)
+    for vertices, edges, plain_memory, interned_memory, plain_time, interned_time in results:
+        logger.info(
+            f"{vertices:<10}"
+            f"{edges:<10}"
+            f"{plain_memory / 2**20:<12.1f}"
+            f"{interned_memory / 2**20:<14.1f}"
+            f"{1 - interned_memory / plain_memory:<10.1%}"
+            f"{plain_time:<10.2f}"
+            f"{interned_time:<10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    memory_test()
@@ -0,0 +1,90 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import os
+import time
+import random
+import logging
+
+from hyperdb.hypergraph import HypergraphDB
+
+
+# Configure log directory and file
+log_root = Path(__file__).parent / "logs"
+if not log_root.exists():
+    log_root.mkdir()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    filename=log_root / "parallel_test.log",
+    filemode="w",
+)
+logger = logging.getLogger(__name__)
+
+
+def build_hypergraph(num_vertices, num_edges):
+    """Build a random hypergraph like the stress test."""
+    random.seed(0)
+    hg = HypergraphDB()
+    hg.add_v_batch(range(1, num_vertices + 1), ({"name": f"Vertex-{v}"} for v in range(1, num_vertices + 1)))
+    hg.add_e_batch(
+        tuple(random.sample(range(1, num_vertices + 1), random.randint(2, 5))) for _ in range(num_edges)
+    )
+    return hg
+
+
+def neighborhood_features(g, v_id):
+    """Per-vertex features: degree, number of neighbors and number of vertices within two hops."""
+    return g.degree_v(v_id), len(g.nbr_v(v_id)), sum(1 for _ in g.bfs(v_id, max_depth=2))
+
+
+def parallel_test(num_vertices=5000, num_edges=1000, scale_factors=(1, 10, 50), worker_counts=None):
+    """
+    Map neighborhood features over all the vertices, serially on the hypergraph and with parallel_map on 1, 2,
+    4, ... worker processes reading a frozen copy published once in shared memory. The parallel times include
+    publishing the copy and starting the workers.
+    """
+    cpus = os.cpu_count() or 1
+    if worker_counts is None:
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= cpus:
+            worker_counts.append(worker_counts[-1] * 2)
+    logger.info(f"{cpus} CPUs, worker counts {worker_counts}")
+
+    results = []
+    for scale in scale_factors:
+        vertices, edges = num_vertices * scale, num_edges * scale
+        hg = build_hypergraph(vertices, edges)
+
+        start_time = time.perf_counter()
+        expected = [neighborhood_features(hg, v_id) for v_id in hg.all_v]
+        serial_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        shared = hg.share()
+        share_time = time.perf_counter() - start_time
+        shared.close()
+
+        times = []
+        for workers in worker_counts:
+            start_time = time.perf_counter()
+            features = hg.parallel_map(neighborhood_features, workers=workers)
+            times.append(time.perf_counter() - start_time)
+            assert features == expected
+            logger.info(f"{vertices} vertices / {edges} edges: {workers} workers in {times[-1]:.2f}s")
+        results.append((vertices, edges, serial_time, share_time, times))
+
+    logger.info(f"\nSummary of Parallel Map Results ({cpus} CPUs, seconds, speedup over 1 worker):\n")
+    header = "".join(f"{f'{workers} workers':<18}" for workers in worker_counts)
+    logger.info(f"{'num v':<10}{'num e':<10}{'serial':<10}{'share':<10}{header}")
+    logger.info("-" * (40 + 18 * len(worker_counts)))
+    for vertices, edges, serial_time, share_time, times in results:
+        cells = "".join(f"{f'{t:.2f} (x{times[0] / t:.2f})':<18}" for t in times)
+        logger.info(f"{vertices:<10}{edges:<10}{serial_time:<10.2f}{share_time:<10.3f}{cells}")
+
+
+if __name__ == "__main__":
+    parallel_test()
@@ -0,0 +1,95 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import time
+import random
+import logging
+
+from hyperdb.hypergraph import HypergraphDB
+
+
+# Configure log directory and file
+log_root = Path(__file__).parent / "logs"
+if not log_root.exists():
+    log_root.mkdir()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    filename=log_root / "remove_v_test.log",
+    filemode="w",
+)
+logger = logging.getLogger(__name__)
+
+
+def build_hub_hypergraph(num_vertices, degree, num_hubs, collide, intern_v=False):
+    """
+    Build a random hypergraph whose hub vertices 0 .. num_hubs - 1 each have ``degree`` hyperedges of 2 to 5
+    vertices. With ``collide``, every hub hyperedge of three or more vertices shrinks onto an existing hyperedge when
+    its hub is removed.
+    """
+    random.seed(0)
+    hg = HypergraphDB(intern_v=intern_v, autoload=False)
+    hg.add_v_batch(range(num_vertices), ({"name": f"Vertex-{v}"} for v in range(num_vertices)))
+    others = range(num_hubs, num_vertices)
+    hub_edges = [
+        (hub,) + tuple(random.sample(others, random.randint(1, 4))) for hub in range(num_hubs) for _ in range(degree)
+    ]
+    hg.add_e_batch(hub_edges, ({"relation": "hub", "weight": i} for i in range(len(hub_edges))))
+    if collide:
+        existing = [e[1:] for e in hub_edges if len(e) > 2]
+        hg.add_e_batch(existing, ({"relation": "existing", "since": i} for i in range(len(existing))))
+    # background hyperedges between the other vertices
+    hg.add_e_batch(tuple(random.sample(others, random.randint(2, 5))) for _ in range(num_vertices // 2))
+    return hg
+
+
+def timed(hg, hubs, remove):
+    """Time the removal of hub vertices, per removed incident hyperedge."""
+    degree = sum(hg.degree_v_many(hubs))
+    start_time = time.perf_counter()
+    remove(hg)
+    elapsed = time.perf_counter() - start_time
+    assert not any(map(hg.has_v, hubs))
+    return elapsed / degree
+
+
+def remove_v_test(num_vertices=100000, degrees=(1000, 10000, 50000), num_hubs=4):
+    """
+    Remove hub vertices of growing degree: one hub with remove_v, then all the hubs one by one and with a single
+    remove_v_batch, without collisions and with every hub hyperedge shrinking onto an existing one under each
+    merge policy. Times are per removed incident hyperedge, so a flat column means linear cost in the degree.
+    """
+    merges = ["overwrite", "keep", "update", lambda existing, data: {**data, **existing}]
+    merge_names = ["overwrite", "keep", "update", "callable"]
+    results = []
+    for degree in degrees:
+        for intern_v in (False, True):
+            hg = build_hub_hypergraph(num_vertices, degree, num_hubs, collide=False, intern_v=intern_v)
+            single = timed(hg, [0], lambda g: g.remove_v(0))
+            sequential = timed(hg, range(1, num_hubs), lambda g: [g.remove_v(hub) for hub in range(1, num_hubs)])
+            hg = build_hub_hypergraph(num_vertices, degree, num_hubs, collide=False, intern_v=intern_v)
+            batch = timed(hg, range(num_hubs), lambda g: g.remove_v_batch(range(num_hubs)))
+            collided = []
+            for merge in merges:
+                hg = build_hub_hypergraph(num_vertices, degree, num_hubs, collide=True, intern_v=intern_v)
+                collided.append(timed(hg, range(num_hubs), lambda g: g.remove_v_batch(range(num_hubs), merge=merge)))
+            results.append((degree, intern_v, single, sequential, batch, collided))
+            logger.info(f"degree {degree}, intern_v={intern_v}: remove_v {single * 1e6:.2f}us, sequential "
+                        f"{sequential * 1e6:.2f}us, remove_v_batch {batch * 1e6:.2f}us, colliding "
+                        f"{', '.join(f'{n} {t * 1e6:.2f}us' for n, t in zip(merge_names, collided))} per hyperedge")
+
+    logger.info(f"\nSummary of remove_v Results ({num_vertices} vertices, {num_hubs} hubs, microseconds per removed "
+                f"hub hyperedge):\n")
+    header = "".join(f"{name:<12}" for name in merge_names)
+    logger.info(f"{'degree':<10}{'interned':<10}{'remove_v':<12}{'sequential':<12}{'batch':<12}{header}")
+    logger.info("-" * (56 + 12 * len(merge_names)))
+    for degree, intern_v, single, sequential, batch, collided in results:
+        cells = "".join(f"{t * 1e6:<12.2f}" for t in collided)
+        logger.info(f"{degree:<10}{str(intern_v):<10}{single * 1e6:<12.2f}{sequential * 1e6:<12.2f}{batch * 1e6:<12.2f}{cells}")
+
+
+if __name__ == "__main__":
+    remove_v_test()
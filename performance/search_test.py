@@ -0,0 +1,109 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import time
+import random
+import logging
+import tracemalloc
+
+from hyperdb.base import BaseHypergraphDB
+from hyperdb.draw import SEARCH_WEIGHTS, create_search_indexes
+from hyperdb.hypergraph import HypergraphDB
+
+
+# Configure log directory and file
+log_root = Path(__file__).parent / "logs"
+if not log_root.exists():
+    log_root.mkdir()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    filename=log_root / "search_test.log",
+    filemode="w",
+)
+logger = logging.getLogger(__name__)
+
+WORDS = ["graph", "vertex", "edge", "database", "search", "index", "query", "python", "network", "model",
+         "company", "person", "city", "river", "music", "science", "history", "market", "energy", "language"]
+TYPES = ["person", "organization", "location", "event", "concept", "product"]
+QUERIES = ["r", "ci", "net", "python", "Entity-123", "history of", "zzz"]
+
+
+def build_hypergraph(num_vertices, indexed=False):
+    """Build a hypergraph of named entities with a type and a description of about 80 characters."""
+    random.seed(0)
+    hg = HypergraphDB()
+    if indexed:
+        create_search_indexes(hg)
+    hg.add_v_batch(
+        (f"Entity-{i}" for i in range(num_vertices)),
+        (
+            {"entity_type": random.choice(TYPES), "description": " ".join(random.choices(WORDS, k=12))}
+            for _ in range(num_vertices)
+        ),
+    )
+    return hg
+
+
+def time_queries(search, hg, repeat):
+    """Return the mean time of each query, in milliseconds."""
+    times = []
+    for query in QUERIES:
+        start_time = time.perf_counter()
+        for _ in range(repeat):
+            search(hg, query, SEARCH_WEIGHTS)
+        times.append((time.perf_counter() - start_time) / repeat * 1000)
+    return times
+
+
+def search_test(num_vertices=10000, scale_factors=(1, 5, 10), repeat=3):
+    """
+    Compare the vertex search of the viewer scanning every vertex (BaseHypergraphDB.search_v) with the same
+    search answered by the n-gram text indexes (HypergraphDB.search_v): time per query, time and memory to
+    build the indexes, and the cost of the indexes on add_v.
+    """
+    results = []
+    for scale in scale_factors:
+        vertices = num_vertices * scale
+        hg = build_hypergraph(vertices)
+        matches = [len(BaseHypergraphDB.search_v(hg, query, SEARCH_WEIGHTS)) for query in QUERIES]
+        scan_times = time_queries(BaseHypergraphDB.search_v, hg, repeat)
+
+        tracemalloc.start()
+        start_time = time.time()
+        create_search_indexes(hg)
+        build_time = time.time() - start_time
+        index_mib = tracemalloc.get_traced_memory()[0] / 2**20
+        tracemalloc.stop()
+        index_times = time_queries(HypergraphDB.search_v, hg, repeat)
+
+        start_time = time.time()
+        build_hypergraph(vertices)
+        plain_add = time.time() - start_time
+        start_time = time.time()
+        build_hypergraph(vertices, indexed=True)
+        indexed_add = time.time() - start_time
+
+        results.append((vertices, build_time, index_mib, plain_add, indexed_add, matches, scan_times, index_times))
+        logger.info(f"{vertices} vertices: indexes built in {build_time:.2f}s, {index_mib:.0f} MiB")
+
+    logger.info("\nSummary of Vertex Search Results (scan -> index, ms per query):\n")
+    logger.info(f"{'num v':<10}{'build (s)':<12}{'index MiB':<12}{'add (s)':<16}"
+                + "".join(f"{repr(query):<22}" for query in QUERIES))
+    logger.info("-" * (50 + 22 * len(QUERIES)))
+    for vertices, build_time, index_mib, plain_add, indexed_add, matches, scan_times, index_times in results:
+        logger.info(
+            f"{vertices:<10}"
+            f"{build_time:<12.2f}"
+            f"{index_mib:<12.0f}"
+            f"{f'{plain_add:.2f} -> {indexed_add:.2f}':<16}"
+            + "".join(f"{f'{scan:.1f} -> {index:.1f} ({match})':<22}"
+                      for match, scan, index in zip(matches, scan_times, index_times))
+        )
+
+
+if __name__ == "__main__":
+    search_test()
@@ -0,0 +1,170 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import time
+import random
+import logging
+import threading
+import http.client
+
+from hyperdb.draw import HypergraphViewer
+from hyperdb.hypergraph import HypergraphDB
+
+
+# Configure log directory and file
+log_root = Path(__file__).parent / "logs"
+if not log_root.exists():
+    log_root.mkdir()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    filename=log_root / "server_test.log",
+    filemode="w",
+)
+logger = logging.getLogger(__name__)
+
+
+def build_hypergraph(num_vertices, num_edges):
+    """Build a random hypergraph with string vertex ids and viewer-like data dicts."""
+    random.seed(0)
+    hg = HypergraphDB()
+    hg.add_v_batch(
+        (f"Vertex-{i}" for i in range(1, num_vertices + 1)),
+        (
+            {"entity_type": random.choice(["person", "place", "event"]), "description": f"Description of vertex {i}"}
+            for i in range(1, num_vertices + 1)
+        ),
+    )
+    hg.add_e_batch(
+        tuple(f"Vertex-{i}" for i in random.sample(range(1, num_vertices + 1), random.randint(2, 5)))
+        for _ in range(num_edges)
+    )
+    return hg
+
+
+def random_path(rng, num_vertices):
+    """
+    A request mix of the viewer: mostly neighborhoods of a vertex and database info, with some
+    full scans of the vertex list (a page or a search).
+    """
+    r = rng.random()
+    if r < 0.1:
+        return "/api/vertices?page=1&page_size=50", True
+    if r < 0.15:
+        return f"/api/vertices?search={rng.randint(1, num_vertices)}", True
+    if r < 0.3:
+        return "/api/database/info", False
+    return f"/api/graph?vertex_id=Vertex-{rng.randint(1, num_vertices)}", False
+
+
+def client(seed, port, num_vertices, num_requests, latencies, errors):
+    """Send requests one after the other, recording (is slow route, latency) of each."""
+    rng = random.Random(seed)
+    for _ in range(num_requests):
+        path, slow = random_path(rng, num_vertices)
+        start_time = time.time()
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            conn.request("GET", path)
+            conn.getresponse().read()
+            conn.close()
+        except OSError:
+            errors.append(path)
+            continue
+        latencies.append((slow, time.time() - start_time))
+
+
+def writer(hg, num_vertices, stop):
+    """Keep adding hyperedges until stopped, like an ingestion thread."""
+    while not stop.is_set():
+        hg.add_e(tuple(f"Vertex-{i}" for i in random.sample(range(1, num_vertices + 1), 3)), {"relation": "new"})
+        time.sleep(0.001)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+def run_clients(hg, num_vertices, num_requests, num_clients, server_kwargs, with_writer):
+    """Serve the hypergraph and run concurrent clients against it, optionally with a writer thread."""
+    viewer = HypergraphViewer(hg, port=0, **server_kwargs)
+    viewer.start_server(open_browser=False)
+    stop = threading.Event()
+    writer_thread = threading.Thread(target=writer, args=(hg, num_vertices, stop))
+    if with_writer:
+        writer_thread.start()
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(
+            target=client, args=(seed, viewer.port, num_vertices, num_requests, latencies, errors)
+        )
+        for seed in range(num_clients)
+    ]
+    start_time = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    total_time = time.time() - start_time
+    stop.set()
+    if with_writer:
+        writer_thread.join()
+    viewer.stop_server()
+    return total_time, latencies, errors
+
+
+def server_test(num_vertices=50000, num_edges=10000, num_requests=40, clients=(1, 4, 16)):
+    """
+    Measure requests/sec and latency of the visualization API for concurrent clients, with the
+    single-threaded, the threaded and the asyncio server, without and with a writer thread mutating the hypergraph.
+    The p99 of the fast routes shows how long they wait behind the slow full-scan requests; errors are
+    connections refused or reset by a server that does not accept them in time.
+    """
+    servers = [("single", {"threaded": False}), ("threaded", {"threaded": True}), ("asyncio", {"use_asyncio": True})]
+    hg = build_hypergraph(num_vertices, num_edges)
+    results = []
+    for with_writer in (False, True):
+        for server_name, server_kwargs in servers:
+            for num_clients in clients:
+                total_time, latencies, errors = run_clients(
+                    hg, num_vertices, num_requests, num_clients, server_kwargs, with_writer
+                )
+                fast = [latency for slow, latency in latencies if not slow]
+                name = server_name + (" + writer" if with_writer else "")
+                results.append(
+                    (
+                        name,
+                        num_clients,
+                        len(latencies) / total_time,
+                        percentile([latency for _, latency in latencies], 0.5),
+                        percentile([latency for _, latency in latencies], 0.99),
+                        percentile(fast, 0.99),
+                        len(errors),
+                    )
+                )
+                logger.info(f"{name} server, {num_clients} clients: {len(latencies) / total_time:.1f} req/s")
+
+    logger.info("\nSummary of API Server Load Test Results:\n")
+    logger.info(
+        f"{'server':<20}{'clients':<10}{'req/s':<10}{'p50 (ms)':<10}{'p99 (ms)':<10}"
+        f"{'fast p99 (ms)':<14}{'errors':<8}"
+    )
+    logger.info("-" * 82)
+    for name, num_clients, rps, p50, p99, fast_p99, num_errors in results:
+        logger.info(
+            f"{name:<20}"
+            f"{num_clients:<10}"
+            f"{rps:<10.1f}"
+            f"{p50 * 1e3:<10.1f}"
+            f"{p99 * 1e3:<10.1f}"
+            f"{fast_p99 * 1e3:<14.1f}"
+            f"{num_errors:<8}"
+        )
+
+
+if __name__ == "__main__":
+    server_test()
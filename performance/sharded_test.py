@@ -0,0 +1,111 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import time
+import random
+import logging
+import tempfile
+
+from hyperdb.hypergraph import HypergraphDB
+from hyperdb.sharded import ShardedHypergraphDB
+
+
+# Configure log directory and file
+log_root = Path(__file__).parent / "logs"
+if not log_root.exists():
+    log_root.mkdir()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    filename=log_root / "sharded_test.log",
+    filemode="w",
+)
+logger = logging.getLogger(__name__)
+
+
+def random_edges(num_vertices, num_edges):
+    """Random hyperedges of 2 to 5 vertices like the stress test."""
+    random.seed(0)
+    return [tuple(random.sample(range(1, num_vertices + 1), random.randint(2, 5))) for _ in range(num_edges)]
+
+
+def run(hg, num_vertices, edges, num_queries):
+    """Time batch loading, single and batched neighbor queries, and single hyperedge additions."""
+    timings = {}
+    start_time = time.perf_counter()
+    hg.add_v_batch(range(1, num_vertices + 1), ({"name": f"Vertex-{v}"} for v in range(1, num_vertices + 1)))
+    hg.add_e_batch(edges, ({"relation": "random_edge"} for _ in edges))
+    timings["load"] = time.perf_counter() - start_time
+
+    random.seed(1)
+    v_ids = [random.randint(1, num_vertices) for _ in range(num_queries)]
+    start_time = time.perf_counter()
+    single = [hg.nbr_v(v_id) for v_id in v_ids]
+    timings["nbr_v"] = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    batched = hg.nbr_v_many(v_ids)
+    timings["nbr_v_many"] = time.perf_counter() - start_time
+    assert single == batched
+
+    start_time = time.perf_counter()
+    for _ in range(num_queries // 10):
+        hg.add_e(tuple(random.sample(range(1, num_vertices + 1), 3)))
+    timings["add_e"] = time.perf_counter() - start_time
+    return timings, batched
+
+
+def shard_sizes(sg):
+    """Owned vertices, stored vertices (ghosts included) and stored hyperedges of each in-process shard."""
+    return [
+        (local._shard.counts()[0], local._shard.hg.num_v, local._shard.hg.num_e) for local in sg._shards
+    ]
+
+
+def sharded_test(num_vertices=5000, num_edges=1000, scale_factors=(1, 10, 50), num_shards=4, num_queries=20000):
+    """
+    Compare a HypergraphDB with a ShardedHypergraphDB whose shards run in this process or in worker processes:
+    batch loading, single neighbor queries (one round trip each), the same queries batched (one call per shard)
+    and single hyperedge additions (a check round and an add round). Also log how much of the hypergraph each
+    shard stores, ghost vertices and replicated hyperedges included.
+    """
+    results = []
+    for scale in scale_factors:
+        vertices, edges = num_vertices * scale, num_edges * scale
+        e_list = random_edges(vertices, edges)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            hg = HypergraphDB(storage_file=Path(tmp_dir) / "plain.hgdb")
+            plain, expected = run(hg, vertices, e_list, num_queries)
+
+            sg = ShardedHypergraphDB(storage_file=Path(tmp_dir) / "local.hgdb", num_shards=num_shards)
+            local, nbrs = run(sg, vertices, e_list, num_queries)
+            assert nbrs == expected
+            sizes = shard_sizes(sg)
+
+            with ShardedHypergraphDB(
+                storage_file=Path(tmp_dir) / "procs.hgdb", num_shards=num_shards, processes=True
+            ) as pg:
+                procs, nbrs = run(pg, vertices, e_list, num_queries)
+                assert nbrs == expected
+        results.append((vertices, edges, plain, local, procs))
+        stored_e = sum(num_e for _, _, num_e in sizes)
+        logger.info(f"{vertices} vertices / {edges} edges over {num_shards} shards: "
+                    f"owned/stored vertices {[(owned, stored) for owned, stored, _ in sizes]}, "
+                    f"stored hyperedges {[num_e for _, _, num_e in sizes]} "
+                    f"({stored_e / hg.num_e:.2f} copies per hyperedge)")
+
+    logger.info(f"\nSummary of Sharded Results ({num_shards} shards, {num_queries} neighbor queries, "
+                f"{num_queries // 10} single add_e, seconds as plain / in-process shards / shard processes):\n")
+    logger.info(f"{'num v':<10}{'num e':<10}{'load':<24}{'nbr_v':<24}{'nbr_v_many':<24}{'add_e':<24}")
+    logger.info("-" * 116)
+    for vertices, edges, plain, local, procs in results:
+        cells = "".join(
+            f"{f'{plain[k]:.2f} / {local[k]:.2f} / {procs[k]:.2f}':<24}" for k in ("load", "nbr_v", "nbr_v_many", "add_e")
+        )
+        logger.info(f"{vertices:<10}{edges:<10}{cells}")
+
+
+if __name__ == "__main__":
+    sharded_test()
@@ -0,0 +1,145 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import time
+import random
+import logging
+import threading
+
+from hyperdb.hypergraph import HypergraphDB
+
+
+# Configure log directory and file
+log_root = Path(__file__).parent / "logs"
+if not log_root.exists():
+    log_root.mkdir()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    filename=log_root / "snapshot_test.log",
+    filemode="w",
+)
+logger = logging.getLogger(__name__)
+
+
+def build_hypergraph(num_vertices, num_edges):
+    """Build a random hypergraph like the stress test, with the indexes of the viewer."""
+    random.seed(0)
+    hg = HypergraphDB()
+    hg.add_v_batch(range(1, num_vertices + 1), ({"name": f"vertex {v}"} for v in range(1, num_vertices + 1)))
+    hg.add_e_batch(
+        tuple(random.sample(range(1, num_vertices + 1), random.randint(2, 5))) for _ in range(num_edges)
+    )
+    hg.create_index("v", None, kind="degree")
+    hg.create_index("v", None, kind="sorted")
+    return hg
+
+
+def random_writes(hg, num_vertices, num_writes, seed):
+    """Add hyperedges between random vertices and update random vertices, returning the slowest write."""
+    random.seed(seed)
+    slowest = 0.0
+    for i in range(num_writes):
+        start_time = time.perf_counter()
+        if i % 2:
+            hg.add_e(tuple(random.sample(range(1, num_vertices + 1), 3)))
+        else:
+            hg.update_v(random.randint(1, num_vertices), {"seen": i})
+        slowest = max(slowest, time.perf_counter() - start_time)
+    return slowest
+
+
+def writes_during_reads(hg, num_vertices, num_writes, read):
+    """Run the writes while another thread keeps computing the connected components; return the total and slowest
+    write."""
+    done = threading.Event()
+
+    def reader():
+        while not done.is_set():
+            read(lambda g: sum(1 for _ in g.connected_components()))
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    time.sleep(0.05)
+    start_time = time.perf_counter()
+    slowest = random_writes(hg, num_vertices, num_writes, seed=2)
+    total = time.perf_counter() - start_time
+    done.set()
+    thread.join()
+    return total, slowest
+
+
+def read_locked(hg):
+    def read(query):
+        with hg.lock.read():
+            return query(hg)
+
+    return read
+
+
+def read_snapshot(hg):
+    def read(query):
+        return query(hg.snapshot())
+
+    return read
+
+
+def snapshot_test(num_vertices=5000, num_edges=1000, scale_factors=(1, 10, 50), num_writes=2000):
+    """
+    Measure what a snapshot costs: taking it, the first write after it, and the following writes while it is
+    alive (which keep the previous version of the records they change), against writes without snapshot. Then compare writers running next to a long-running reader, under the read lock or on
+    snapshots.
+    """
+    results = []
+    for scale in scale_factors:
+        vertices, edges = num_vertices * scale, num_edges * scale
+        hg = build_hypergraph(vertices, edges)
+
+        start_time = time.perf_counter()
+        random_writes(hg, vertices, num_writes, seed=1)
+        plain_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        snap = hg.snapshot()
+        snapshot_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        hg.add_v(0)
+        first_write_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        random_writes(hg, vertices, num_writes, seed=1)
+        cow_time = time.perf_counter() - start_time
+        assert snap.num_v == vertices and hg.num_v == vertices + 1
+        del snap
+
+        locked_total, locked_slowest = writes_during_reads(hg, vertices, num_writes // 10, read_locked(hg))
+        snap_total, snap_slowest = writes_during_reads(hg, vertices, num_writes // 10, read_snapshot(hg))
+        results.append(
+            (vertices, edges, snapshot_time, first_write_time, plain_time, cow_time,
+             locked_total, locked_slowest, snap_total, snap_slowest)
+        )
+        logger.info(f"{vertices} vertices / {edges} edges: snapshot in {snapshot_time * 1e6:.1f}us, "
+                    f"first write after it in {first_write_time:.4f}s")
+
+    logger.info(f"\nSummary of Snapshot Results ({num_writes} writes, then {num_writes // 10} writes next to a "
+                f"reader computing connected components, seconds):\n")
+    logger.info(f"{'num v':<10}{'num e':<10}{'snapshot':<12}{'1st write':<12}{'writes':<20}"
+                f"{'read lock: total / max':<26}{'snapshot: total / max':<26}")
+    logger.info("-" * 116)
+    for (vertices, edges, snapshot_time, first_write_time, plain_time, cow_time,
+         locked_total, locked_slowest, snap_total, snap_slowest) in results:
+        logger.info(
+            f"{vertices:<10}"
+            f"{edges:<10}"
+            f"{snapshot_time:<12.6f}"
+            f"{first_write_time:<12.4f}"
+            f"{f'{plain_time:.3f} -> {cow_time:.3f}':<20}"
+            f"{f'{locked_total:.3f} / {locked_slowest:.4f}':<26}"
+            f"{f'{snap_total:.3f} / {snap_slowest:.4f}':<26}"
+        )
+
+
+if __name__ == "__main__":
+    snapshot_test()
@@ -48,6 +48,32 @@ def add_edges(hg, num_edges, max_vertices):
     return total_time
 
 
+def add_vertices_batch(hg, num_vertices):
+    """Add multiple vertices to the hypergraph with a single batch call."""
+    start_time = time.time()
+    hg.add_v_batch(range(1, num_vertices + 1), ({"name": f"Vertex-{i}"} for i in range(1, num_vertices + 1)))
+    end_time = time.time()
+    total_time = end_time - start_time
+    logger.info(f"Batch-added {num_vertices} vertices in {total_time:.2f} seconds.")
+    return total_time
+
+
+def add_edges_batch(hg, num_edges, max_vertices):
+    """Add multiple hyperedges to the hypergraph with a single batch call."""
+
+    def edge_gen():
+        for _ in range(num_edges):
+            edge_size = random.randint(2, min(5, max_vertices))
+            yield tuple(random.sample(range(1, max_vertices + 1), edge_size))
+
+    start_time = time.time()
+    hg.add_e_batch(edge_gen(), ({"relation": "random_edge"} for _ in range(num_edges)))
+    end_time = time.time()
+    total_time = end_time - start_time
+    logger.info(f"Batch-added {num_edges} edges in {total_time:.2f} seconds.")
+    return total_time
+
+
 def query_vertices(hg, num_queries, max_vertices):
     """Randomly query vertex data."""
     start_time = time.time()
@@ -73,11 +99,11 @@ def query_edges(hg, num_queries, max_vertices):
     return total_time
 
 
-def stress_test(num_vertices=5000, num_edges=1000, num_queries=2000, scale_factor=1):
+def stress_test(num_vertices=5000, num_edges=1000, num_queries=2000, scale_factor=1, batch=False):
     """
     Single-threaded stress test for HypergraphDB.
-    - Add vertices
-    - Add hyperedges
+    - Add vertices (one call per vertex, or a single ``add_v_batch`` call if ``batch`` is set)
+    - Add hyperedges (one call per hyperedge, or a single ``add_e_batch`` call if ``batch`` is set)
     - Query vertices and hyperedges
     """
     hg = HypergraphDB()
@@ -87,13 +113,13 @@ def stress_test(num_vertices=5000, num_edges=1000, num_queries=2000, scale_facto
     edges = num_edges * scale_factor
     queries = num_queries * scale_factor
 
-    logger.info(f"Starting stress test with scale factor {scale_factor}...")
+    logger.info(f"Starting {'batch ' if batch else ''}stress test with scale factor {scale_factor}...")
 
     # Step 1: Add vertices
-    vertex_add_time = add_vertices(hg, vertices)
+    vertex_add_time = add_vertices_batch(hg, vertices) if batch else add_vertices(hg, vertices)
 
     # Step 2: Add hyperedges
-    edge_add_time = add_edges(hg, edges, vertices)
+    edge_add_time = add_edges_batch(hg, edges, vertices) if batch else add_edges(hg, edges, vertices)
 
     # Step 3: Query vertices
     vertex_query_time = query_vertices(hg, queries, vertices)
@@ -105,6 +131,7 @@ def stress_test(num_vertices=5000, num_edges=1000, num_queries=2000, scale_facto
 
     # Collect test results
     result = {
+        "batch": batch,
         "vertices_added": vertices,
         "edges_added": edges,
         "vertex_queries": queries,
@@ -130,23 +157,29 @@ def stress_test(num_vertices=5000, num_edges=1000, num_queries=2000, scale_facto
 
 def stress_increasing_scales_test():
     """
-    Perform stress tests on hypergraphs with increasing scales.
+    Perform stress tests on hypergraphs with increasing scales, once with per-call
+    insertion and once with batch insertion.
     """
     scale_factors = [1, 2, 5, 10, 20, 50, 100, 200]  # Increasing scale factors
     results = []
 
     # Collect results for each scale factor
     for scale in scale_factors:
-        logger.info(f"Starting stress test for scale factor: {scale}")
-        result = stress_test(num_vertices=5000, num_edges=1000, num_queries=2000, scale_factor=scale)
-        results.append(result)
+        for batch in (False, True):
+            logger.info(f"Starting {'batch ' if batch else ''}stress test for scale factor: {scale}")
+            result = stress_test(num_vertices=5000, num_edges=1000, num_queries=2000, scale_factor=scale, batch=batch)
+            results.append(result)
 
     # Output test results as a table
     logger.info("\nSummary of Stress Test Results:\n")
-    logger.info(f"{'num v':<10}{'num e':<10}{'add v':<10}{'add e':<10}{'query v':<15}{'query e':<15}{'total time':<10}")
-    logger.info("-" * 80)
+    logger.info(
+        f"{'mode':<8}{'num v':<10}{'num e':<10}{'add v':<10}{'add e':<10}"
+        f"{'query v':<15}{'query e':<15}{'total time':<10}"
+    )
+    logger.info("-" * 88)
     for result in results:
         logger.info(
+            f"{'batch' if result['batch'] else 'loop':<8}"
             f"{result['vertices_added']:<10}"
             f"{result['edges_added']:<10}"
             f"{result['vertex_add_time']:<10.2f}"
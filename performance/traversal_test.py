@@ -0,0 +1,122 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import time
+import random
+import logging
+
+from hyperdb.hypergraph import HypergraphDB
+
+
+# Configure log directory and file
+log_root = Path(__file__).parent / "logs"
+if not log_root.exists():
+    log_root.mkdir()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    filename=log_root / "traversal_test.log",
+    filemode="w",
+)
+logger = logging.getLogger(__name__)
+
+
+def build_hypergraph(num_vertices, num_edges):
+    """Build a random hypergraph like the stress test: hyperedges of 2 to 5 random vertices."""
+    random.seed(0)
+    hg = HypergraphDB()
+    hg.add_v_batch(range(1, num_vertices + 1))
+    hg.add_e_batch(
+        tuple(random.sample(range(1, num_vertices + 1), random.randint(2, 5))) for _ in range(num_edges)
+    )
+    return hg
+
+
+def naive_bfs(hg, v_id):
+    """Breadth-first search on top of nbr_v, which builds a neighbor set for every vertex visited."""
+    depths, frontier, depth = {v_id: 0}, [v_id], 0
+    while frontier:
+        depth, next_frontier = depth + 1, []
+        for v in frontier:
+            for u in hg.nbr_v(v):
+                if u not in depths:
+                    depths[u] = depth
+                    next_frontier.append(u)
+        frontier = next_frontier
+    return depths
+
+
+def naive_components(hg):
+    """Connected components by repeated breadth-first searches on top of nbr_v."""
+    seen, components = set(), []
+    for v_id in hg.all_v:
+        if v_id not in seen:
+            component = naive_bfs(hg, v_id).keys()
+            seen |= component
+            components.append(component)
+    return components
+
+
+def timed(func, *args):
+    """Return the result of func and the time it took, in seconds."""
+    start_time = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start_time
+
+
+def traversal_test(num_vertices=5000, num_edges=1000, scale_factors=(1, 10, 50), density=5, num_paths=20):
+    """
+    Compare the built-in traversals with the same traversals written on top of nbr_v, on the stress test
+    sizes with ``density`` times more hyperedges so that most vertices are connected.
+    """
+    results = []
+    for scale in scale_factors:
+        vertices, edges = num_vertices * scale, num_edges * scale * density
+        hg = build_hypergraph(vertices, edges)
+        start = max(range(1, vertices + 1), key=hg.degree_v) if scale == 1 else 1
+
+        naive_depths, naive_bfs_time = timed(naive_bfs, hg, start)
+        depths, bfs_time = timed(lambda: dict(hg.bfs(start)))
+        assert depths == naive_depths
+
+        random.seed(1)
+        pairs = [random.sample(range(1, vertices + 1), 2) for _ in range(num_paths)]
+        _, naive_path_time = timed(lambda: [naive_bfs(hg, src).get(dst) for src, dst in pairs])
+        _, path_time = timed(lambda: [hg.shortest_path(src, dst) for src, dst in pairs])
+
+        naive_comps, naive_comp_time = timed(naive_components, hg)
+        comps, comp_time = timed(lambda: list(hg.connected_components()))
+        assert len(comps) == len(naive_comps)
+        _, s1_time = timed(lambda: list(hg.s_connected_components(1)))
+        s2_comps, s2_time = timed(lambda: list(hg.s_connected_components(2)))
+
+        results.append(
+            (vertices, edges, naive_bfs_time, bfs_time, naive_path_time, path_time, naive_comp_time, comp_time,
+             s1_time, s2_time, len(comps), len(s2_comps))
+        )
+        logger.info(f"{vertices} vertices / {edges} edges: {len(comps)} components, {len(s2_comps)} 2-components")
+
+    logger.info("\nSummary of Traversal Results (on top of nbr_v -> built-in, seconds):\n")
+    logger.info(f"{'num v':<10}{'num e':<10}{'bfs':<18}{f'{num_paths} paths':<18}{'components':<18}"
+                f"{'s=1':<10}{'s=2':<10}{'#comp':<8}{'#2-comp':<8}")
+    logger.info("-" * 110)
+    for (vertices, edges, naive_bfs_time, bfs_time, naive_path_time, path_time, naive_comp_time, comp_time,
+         s1_time, s2_time, num_comps, num_s2_comps) in results:
+        logger.info(
+            f"{vertices:<10}"
+            f"{edges:<10}"
+            f"{f'{naive_bfs_time:.3f} -> {bfs_time:.3f}':<18}"
+            f"{f'{naive_path_time:.3f} -> {path_time:.3f}':<18}"
+            f"{f'{naive_comp_time:.3f} -> {comp_time:.3f}':<18}"
+            f"{s1_time:<10.3f}"
+            f"{s2_time:<10.3f}"
+            f"{num_comps:<8}"
+            f"{num_s2_comps:<8}"
+        )
+
+
+if __name__ == "__main__":
+    traversal_test()
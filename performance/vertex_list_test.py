@@ -0,0 +1,95 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import time
+import random
+import logging
+
+from hyperdb.draw import HypergraphAPI, create_order_indexes
+from hyperdb.hypergraph import HypergraphDB
+
+
+# Configure log directory and file
+log_root = Path(__file__).parent / "logs"
+if not log_root.exists():
+    log_root.mkdir()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    filename=log_root / "vertex_list_test.log",
+    filemode="w",
+)
+logger = logging.getLogger(__name__)
+
+# (sort_by, sort_order, page) of the measured /api/vertices requests
+REQUESTS = [("degree", "desc", 1), ("degree", "asc", 1000), ("id", "asc", 1), ("id", "desc", 1000)]
+
+
+def build_hypergraph(num_vertices, num_edges, indexed=False):
+    """Build a random hypergraph with string vertex ids and a few high degree vertices."""
+    random.seed(0)
+    hg = HypergraphDB()
+    if indexed:
+        create_order_indexes(hg)
+    hg.add_v_batch(f"Vertex-{i}" for i in range(num_vertices))
+    hubs = [f"Vertex-{i}" for i in range(100)]
+    hg.add_e_batch(
+        tuple({f"Vertex-{random.randrange(num_vertices)}" for _ in range(random.randint(2, 5))} | {random.choice(hubs)})
+        for _ in range(num_edges)
+    )
+    return hg
+
+
+def time_requests(api, repeat):
+    """Return the mean time of each request, in milliseconds."""
+    times = []
+    for sort_by, sort_order, page in REQUESTS:
+        start_time = time.perf_counter()
+        for _ in range(repeat):
+            api._get_vertices(page, 50, "", sort_by, sort_order)
+        times.append((time.perf_counter() - start_time) / repeat * 1000)
+    return times
+
+
+def vertex_list_test(num_vertices=100000, num_edges=50000, scale_factors=(1, 5, 10), repeat=3):
+    """
+    Compare a page of /api/vertices sorted by degree or id when all vertices are sorted for each request
+    with the same page read from the degree and id indexes, and measure what the indexes cost on inserts.
+    """
+    results = []
+    for scale in scale_factors:
+        vertices, edges = num_vertices * scale, num_edges * scale
+        start_time = time.time()
+        hg = build_hypergraph(vertices, edges)
+        plain_build = time.time() - start_time
+        api = HypergraphAPI()
+        api.hypergraph_db = hg
+        sort_times = time_requests(api, 1)
+
+        start_time = time.time()
+        hg = build_hypergraph(vertices, edges, indexed=True)
+        indexed_build = time.time() - start_time
+        api.hypergraph_db = hg
+        index_times = time_requests(api, repeat)
+
+        results.append((vertices, edges, plain_build, indexed_build, sort_times, index_times))
+        logger.info(f"{vertices} vertices / {edges} edges: build {plain_build:.2f}s -> {indexed_build:.2f}s")
+
+    logger.info("\nSummary of Vertex List Results (sort all -> indexes, ms per request):\n")
+    logger.info(f"{'num v':<10}{'num e':<10}{'build (s)':<16}"
+                + "".join(f"{f'{sort_by} {sort_order} p{page}':<22}" for sort_by, sort_order, page in REQUESTS))
+    logger.info("-" * (36 + 22 * len(REQUESTS)))
+    for vertices, edges, plain_build, indexed_build, sort_times, index_times in results:
+        logger.info(
+            f"{vertices:<10}"
+            f"{edges:<10}"
+            f"{f'{plain_build:.2f} -> {indexed_build:.2f}':<16}"
+            + "".join(f"{f'{sort:.0f} -> {index:.2f}':<22}" for sort, index in zip(sort_times, index_times))
+        )
+
+
+if __name__ == "__main__":
+    vertex_list_test()
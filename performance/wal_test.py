@@ -0,0 +1,101 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import time
+import random
+import logging
+import tempfile
+
+from hyperdb.hypergraph import HypergraphDB
+
+
+# Configure log directory and file
+log_root = Path(__file__).parent / "logs"
+if not log_root.exists():
+    log_root.mkdir()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    filename=log_root / "wal_test.log",
+    filemode="w",
+)
+logger = logging.getLogger(__name__)
+
+
+def durable_writes(storage_file, num_vertices, num_edges, num_writes, transaction_size=1, **kwargs):
+    """
+    Build a hypergraph, then time ``num_writes`` hyperedge insertions that are each made durable,
+    either by the write-ahead log (``wal=True``) or by re-saving the whole hypergraph. With a
+    ``transaction_size`` above 1, the insertions are grouped in transactions of that many writes.
+    """
+    random.seed(0)
+    hg = HypergraphDB(storage_file=storage_file, **kwargs)
+    hg.add_v_batch(range(1, num_vertices + 1))
+    hg.add_e_batch(tuple(random.sample(range(1, num_vertices + 1), random.randint(2, 5))) for _ in range(num_edges))
+    hg.save(storage_file)
+    start_time = time.time()
+    for _ in range(0, num_writes, transaction_size):
+        with hg.transaction():
+            for _ in range(transaction_size):
+                hg.add_e(
+                    tuple(random.sample(range(1, num_vertices + 1), random.randint(2, 5))), {"relation": "random_edge"}
+                )
+        if not hg.wal:
+            hg.save(storage_file)
+    total_time = time.time() - start_time
+    hg.close()
+    return total_time
+
+
+def recovery(storage_file, **kwargs):
+    """Time opening the hypergraph, i.e. loading the snapshot and replaying the log."""
+    start_time = time.time()
+    hg = HypergraphDB(storage_file=storage_file, **kwargs)
+    total_time = time.time() - start_time
+    hg.close()
+    return total_time, hg.num_e
+
+
+def wal_test(num_vertices=5000, num_edges=1000, num_writes=1000, scale_factors=(1, 5, 10)):
+    """
+    Compare the cost of a durable single-edge write with the write-ahead log (fsync per record,
+    batched fsync, and one fsynced record per transaction of 100 writes) against re-saving the whole
+    hypergraph, and the time to recover from the log.
+    """
+    modes = [
+        ("save()", {}, 1),
+        ("wal sync=1", {"wal": True, "wal_sync_every": 1, "wal_checkpoint_every": 0}, 1),
+        ("wal sync=100", {"wal": True, "wal_sync_every": 100, "wal_checkpoint_every": 0}, 1),
+        ("wal sync=0", {"wal": True, "wal_sync_every": 0, "wal_checkpoint_every": 0}, 1),
+        ("wal txn=100", {"wal": True, "wal_sync_every": 1, "wal_checkpoint_every": 0}, 100),
+    ]
+    results = []
+    for scale in scale_factors:
+        vertices, edges = num_vertices * scale, num_edges * scale
+        for name, kwargs, transaction_size in modes:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                storage_file = Path(tmp_dir) / "wal_test.hgdb"
+                total_time = durable_writes(storage_file, vertices, edges, num_writes, transaction_size, **kwargs)
+                recovery_time, num_e = recovery(storage_file, **kwargs)
+            results.append((vertices, edges, name, total_time, recovery_time))
+            logger.info(f"{vertices} vertices / {edges} edges, {name}: {total_time:.2f}s, {num_e} edges recovered")
+
+    logger.info("\nSummary of Write-Ahead Log Results:\n")
+    logger.info(f"{'num v':<10}{'num e':<10}{'mode':<15}{'writes (s)':<12}{'us/write':<12}{'recovery (s)':<12}")
+    logger.info("-" * 71)
+    for vertices, edges, name, total_time, recovery_time in results:
+        logger.info(
+            f"{vertices:<10}"
+            f"{edges:<10}"
+            f"{name:<15}"
+            f"{total_time:<12.2f}"
+            f"{total_time / num_writes * 1e6:<12.1f}"
+            f"{recovery_time:<12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    wal_test()
@@ -0,0 +1,14 @@
+import pytest
+
+from hyperdb import HypergraphDB
+
+
+@pytest.fixture(params=[False, True], ids=["plain", "interned"])
+def hg(request):
+    bd = HypergraphDB(intern_v=request.param)
+    bd.add_v_batch(range(1, 10), ({"name": str(v)} for v in range(1, 10)))
+    bd.add_e_batch(
+        [(1, 2), (1, 3), (2, 3, 4), (3, 4, 1, 5), (6, 5, 4), (1, 5, 6), (7, 8)],
+        ({"relation": relation} for relation in ["knows"] * 3 + ["study"] * 3 + ["knows"]),
+    )
+    return bd
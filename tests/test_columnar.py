@@ -0,0 +1,124 @@
+import pytest
+
+from hyperdb import FrozenHypergraph, HypergraphDB
+
+
+def test_columnar_roundtrip(hg, tmpdir):
+    file_path = str(tmpdir.join("hg.hgdbc"))
+    assert hg.save_as("columnar", file_path)
+    fhg = FrozenHypergraph.open(file_path)
+    assert fhg.num_v == hg.num_v
+    assert fhg.num_e == hg.num_e
+    assert fhg.all_v == hg.all_v
+    assert fhg.all_e == hg.all_e
+    for v_id in hg.all_v:
+        assert fhg.v(v_id) == hg.v(v_id)
+        assert fhg.degree_v(v_id) == hg.degree_v(v_id)
+        assert fhg.nbr_e_of_v(v_id) == hg.nbr_e_of_v(v_id)
+        assert fhg.nbr_v(v_id) == hg.nbr_v(v_id)
+    for e_tuple in hg.all_e:
+        assert fhg.e(tuple(reversed(e_tuple))) == hg.e(e_tuple)
+        assert fhg.degree_e(e_tuple) == hg.degree_e(e_tuple)
+        assert fhg.nbr_v_of_e(e_tuple) == hg.nbr_v_of_e(e_tuple)
+    assert fhg.degree_v_many([1, 9, 4]) == [4, 0, 3]
+    assert fhg.has_v(10) is False
+    assert fhg.has_v("1") is False
+    assert fhg.has_e((1, 4)) is False
+    assert fhg.e((1, 4), "missing") == "missing"
+    with pytest.raises(AssertionError):
+        fhg.degree_v(10)
+    with pytest.raises(AssertionError):
+        fhg.degree_v([1])
+
+
+def test_columnar_mixed_ids(tmpdir):
+    hg = HypergraphDB(intern_v=True)
+    hg.add_v_batch(["a", 1, ("t", 2), "b" * 1000], [{"x": i} for i in range(4)])
+    hg.add_e(("a", 1))
+    hg.add_e((1, ("t", 2), "b" * 1000), {"w": 0.5})
+    file_path = str(tmpdir.join("hg.hgdbc"))
+    assert hg.save_as("columnar", file_path)
+    fhg = FrozenHypergraph.open(file_path)
+    assert fhg.all_v == hg.all_v
+    assert fhg.all_e == hg.all_e
+    assert fhg.v(("t", 2)) == {"x": 2}
+    assert fhg.e(["b" * 1000, 1, ("t", 2)]) == {"w": 0.5}
+    assert fhg.nbr_v(1) == {"a", ("t", 2), "b" * 1000}
+
+
+def test_columnar_equal_ids(tmpdir):
+    # equal ids that pickle differently: numbers of other types, and tuples sharing an item or not
+    item = "x" * 10
+    hg = HypergraphDB(intern_v=True)
+    hg.add_v_batch([1, 2.5, (item, item), ("a", (1, 2)), frozenset({3, 4}), b"k"], [{"i": i} for i in range(6)])
+    hg.add_e([1, 2.5, (item, item)])
+    hg.add_e([frozenset({3, 4}), b"k"])
+    file_path = str(tmpdir.join("hg.hgdbc"))
+    assert hg.save_as("columnar", file_path)
+    fhg = FrozenHypergraph.open(file_path)
+    other = ("x" * 9 + "x", "x" * 9 + "x")
+    for g in (hg, fhg):
+        assert g.has_v(1.0) and g.has_v(True) and g.v(True) == {"i": 0}
+        assert g.has_v(other) and g.v(other) == {"i": 2}
+        assert g.nbr_v(1.0) == {2.5, (item, item)} and g.degree_v(True) == 1
+        assert g.v(("a", (1.0, 2))) == {"i": 3} and g.v(frozenset({4, 3})) == {"i": 4}
+        assert g.has_e([True, 2.5, other]) and g.e([b"k", frozenset([4, 3])]) == {}
+        assert not g.has_v(1.5) and not g.has_v("1") and not g.has_v(("a", (1, 3)))
+    assert fhg.parallel_map(lambda g, v_id: g.v(v_id)["i"], [1.0, True, other], workers=2) == [0, 0, 2]
+
+
+def test_columnar_reads_older_files(hg, tmpdir, monkeypatch):
+    from hyperdb import columnar
+
+    file_path = str(tmpdir.join("hg.hgdbc"))
+    with monkeypatch.context() as m:
+        # the format before vertex ids were hashed by value
+        m.setattr(columnar, "_MAGIC", columnar._MAGIC_V1)
+        m.setattr(columnar, "_v_hash", columnar._v_hash_v1)
+        assert hg.save_as("columnar", file_path)
+    with open(file_path, "rb") as f:
+        assert f.read(8) == b"HGDBCOL1"
+    fhg = FrozenHypergraph.open(file_path)
+    assert all(fhg.v(v_id) == hg.v(v_id) for v_id in hg.all_v)
+    assert fhg.nbr_v(1) == hg.nbr_v(1) and not fhg.has_v(10)
+
+
+def test_columnar_empty(tmpdir):
+    file_path = str(tmpdir.join("hg.hgdbc"))
+    assert HypergraphDB().save_as("columnar", file_path)
+    fhg = FrozenHypergraph.open(file_path)
+    assert fhg.num_v == fhg.num_e == 0
+    assert fhg.has_v(1) is False
+    assert list(fhg.all_e) == []
+
+
+def test_columnar_load_from(hg, tmpdir):
+    file_path = str(tmpdir.join("hg.hgdbc"))
+    assert hg.save_as("columnar", file_path)
+    hg2 = HypergraphDB(intern_v=hg.intern_v)
+    hg2.add_v("stale")
+    assert hg2.load_from("columnar", file_path)
+    assert hg2.all_v == hg.all_v
+    assert hg2.all_e == hg.all_e
+    for e_tuple in hg.all_e:
+        assert hg2.e(e_tuple) == hg.e(e_tuple)
+    hg2.add_e((6, 9))
+    assert hg2.degree_v(9) == 1
+    assert hg2.load_from("columnar", str(tmpdir.join("missing.hgdbc"))) is False
+
+
+def test_columnar_rejects_other_files(hg, tmpdir):
+    file_path = str(tmpdir.join("hg.hgdb"))
+    hg.save(file_path)
+    with pytest.raises(AssertionError):
+        FrozenHypergraph.open(file_path)
+
+
+def test_columnar_numpy_views(hg, tmpdir):
+    np = pytest.importorskip("numpy")
+    file_path = str(tmpdir.join("hg.hgdbc"))
+    assert hg.save_as("columnar", file_path)
+    fhg = FrozenHypergraph.open(file_path)
+    arrays = fhg.csr.to_numpy()
+    assert np.array_equal(np.diff(arrays["v_ptr"]), [hg.degree_v(v_id) for v_id in fhg.csr.v_ids])
+    assert fhg.degree_v_many([1, 2], as_numpy=True).tolist() == [4, 2]
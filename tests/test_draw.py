@@ -0,0 +1,264 @@
+import gzip
+import json
+import random
+import threading
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from hyperdb import HypergraphDB, draw
+from hyperdb.draw import HypergraphViewer
+
+
+@pytest.fixture
+def hg():
+    bd = HypergraphDB()
+    bd.add_v("a", {"entity_type": "person", "description": "Alice"})
+    bd.add_v("b", {"entity_type": "person", "description": "Bob"})
+    bd.add_v("c", {"entity_type": "place", "description": "Paris"})
+    bd.add_e(("a", "b"), {"relation": "knows"})
+    bd.add_e(("a", "b", "c"), {"relation": "visited"})
+    return bd
+
+
+@pytest.fixture(
+    params=[{"threaded": True}, {"threaded": False}, {"use_asyncio": True}], ids=["threaded", "single", "asyncio"]
+)
+def viewer(hg, request):
+    viewer = HypergraphViewer(hg, port=0, **request.param)
+    viewer.start_server(open_browser=False)
+    yield viewer
+    viewer.stop_server()
+
+
+def get(viewer, path):
+    with urlopen(f"http://127.0.0.1:{viewer.port}{path}", timeout=5) as response:
+        body = response.read()
+        assert int(response.headers["Content-Length"]) == len(body)
+        assert "Content-Encoding" not in response.headers
+        if response.headers["Content-type"].startswith("application/json"):
+            return json.loads(body)
+        return body.decode("utf-8")
+
+
+def test_routes(viewer):
+    assert get(viewer, "/api/database/info") == {"name": "current_hypergraph", "vertices": 3, "edges": 2}
+    vertices = get(viewer, "/api/vertices?page_size=2")
+    assert sorted(v["id"] for v in vertices["data"]) == ["a", "b"]
+    assert vertices["pagination"]["total"] == 3
+    assert [v["id"] for v in get(viewer, "/api/vertices?search=par")["data"]] == ["c"]
+    graph = get(viewer, "/api/graph?vertex_id=c")
+    assert set(graph["vertices"]) == {"a", "b", "c"}
+    assert graph["truncated"] is False
+    assert get(viewer, "/api/graph?vertex_id=c&depth=2")["edges"].keys() == {"a|#|b", "a|#|b|#|c"}
+    assert graph["edges"]["a|#|b|#|c"]["relation"] == "visited"
+    assert get(viewer, "/api/graph?vertex_id=d") == {"error": "Vertex d not found"}
+    assert get(viewer, "/api/graph") == {"error": "vertex_id parameter is required"}
+    assert "<html" in get(viewer, "/").lower()
+    assert get(viewer, "/missing") == "404 Not Found"
+
+
+def fetch(viewer, path, **headers):
+    request = Request(f"http://127.0.0.1:{viewer.port}{path}", headers=headers)
+    try:
+        with urlopen(request, timeout=5) as response:
+            return response.status, response.headers, response.read()
+    except HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_response_cache(viewer, hg):
+    assert hg.version == 5
+    status, headers, body = fetch(viewer, "/api/vertices?page_size=2")
+    assert status == 200
+    assert headers["Cache-Control"] == "no-cache"
+    etag = headers["ETag"]
+    assert fetch(viewer, "/api/vertices?page_size=2")[2] == body
+    assert len(viewer.response_cache) == 1
+    # the order of the parameters does not matter
+    by_id = fetch(viewer, "/api/vertices?sort_by=id&page_size=2")[1]["ETag"]
+    assert by_id != etag
+    assert fetch(viewer, "/api/vertices?page_size=2&sort_by=id")[1]["ETag"] == by_id
+    assert len(viewer.response_cache) == 2
+    status, headers, body = fetch(viewer, "/api/vertices?page_size=2", **{"If-None-Match": etag})
+    assert (status, body, headers["ETag"]) == (304, b"", etag)
+    assert fetch(viewer, "/api/vertices?page_size=2", **{"If-None-Match": '"other", *'})[0] == 304
+    assert fetch(viewer, "/api/vertices?page_size=2", **{"If-None-Match": '"other"'})[0] == 200
+
+    # a mutation changes the version, the response is built again
+    hg.add_v("d", {"description": "Dan"})
+    assert hg.version == 6
+    status, headers, body = fetch(viewer, "/api/vertices?page_size=2", **{"If-None-Match": etag})
+    assert status == 200
+    assert json.loads(body)["pagination"]["total"] == 4
+    assert len(viewer.response_cache) == 1
+    hg.remove_v("d")
+    # the same body has the same ETag
+    assert fetch(viewer, "/api/vertices?page_size=2", **{"If-None-Match": etag})[0] == 304
+
+    # large bodies are compressed for the clients accepting gzip
+    hg.add_v_batch([f"v{i}" for i in range(200)])
+    path = "/api/vertices?page_size=200"
+    status, headers, body = fetch(viewer, path, **{"Accept-Encoding": "gzip, deflate"})
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["Vary"] == "Accept-Encoding"
+    assert int(headers["Content-Length"]) == len(body)
+    plain_status, plain_headers, plain_body = fetch(viewer, path)
+    assert gzip.decompress(body) == plain_body
+    assert headers["ETag"] != plain_headers["ETag"]
+    assert fetch(viewer, path, **{"Accept-Encoding": "gzip", "If-None-Match": headers["ETag"]})[0] == 304
+    # small bodies are not compressed
+    assert "Content-Encoding" not in fetch(viewer, "/api/database/info", **{"Accept-Encoding": "gzip"})[1]
+    assert fetch(viewer, "/")[0] == 200
+
+
+def test_response_cache_eviction():
+    cache = draw.ResponseCache(max_entries=2, max_bytes=10)
+    entries = {name: draw.CachedResponse.build("text/plain", name.encode() * 3) for name in "abcd"}
+    cache.put(("a", (), 1), 1, entries["a"])
+    cache.put(("b", (), 1), 1, entries["b"])
+    assert cache.get(("a", (), 1)) is entries["a"]
+    cache.put(("c", (), 1), 1, entries["c"])
+    # b is the least recently used
+    assert cache.get(("b", (), 1)) is None
+    assert len(cache) == 2 and cache.size == 6
+    # a larger body is not cached, a body that does not fit evicts
+    cache.put(("x", (), 1), 1, draw.CachedResponse.build("text/plain", b"x" * 11))
+    cache.put(("d", (), None), None, entries["d"])
+    assert cache.get(("d", (), None)) is entries["d"]
+    assert len(cache) == 2 and cache.size == 6
+    # a newer version drops the responses of the older ones, but not the static ones
+    cache.put(("a", (), 2), 2, entries["a"])
+    assert set(cache.entries) == {("d", (), None), ("a", (), 2)}
+    cache.put(("b", (), 1), 1, entries["b"])
+    assert cache.get(("b", (), 1)) is None
+    cache.clear()
+    assert len(cache) == 0 and cache.size == 0
+
+
+def test_template_read_once(monkeypatch):
+    api = draw.HypergraphAPI()
+    api._get_html_template()
+    monkeypatch.setattr(draw, "open", lambda *args, **kwargs: pytest.fail("template read again"), raising=False)
+    assert "<html" in api._get_html_template().lower()
+
+
+@pytest.mark.parametrize("indexes", [True, False])
+def test_search(hg, indexes):
+    viewer = HypergraphViewer(hg, port=0, indexes=indexes)
+    # the search and order indexes are opt-in
+    expected = {None: ("degree", "sorted", "text"), "entity_type": "text", "description": "text"}
+    assert hg.indexes["v"] == (expected if indexes else {})
+    viewer.start_server(open_browser=False)
+    hg.add_v("pa", {"entity_type": 1})
+    # ids score 3, types 2 and descriptions 1, ties are ordered by id
+    vertices = get(viewer, "/api/vertices?search=P&page_size=2")
+    assert [v["id"] for v in vertices["data"]] == ["c", "pa"]
+    assert vertices["pagination"]["total"] == 4
+    assert [v["id"] for v in get(viewer, "/api/vertices?search=P&page=2&page_size=2")["data"]] == ["a", "b"]
+    assert get(viewer, "/api/vertices?search=xyz")["data"] == []
+    viewer.stop_server()
+
+
+@pytest.mark.parametrize("intern_v", [False, True])
+def test_vertex_pages(monkeypatch, intern_v):
+    # list vertices of a degree above 3 last, so that the random hypergraph has some
+    monkeypatch.setattr(draw, "HUB_DEGREE", 3)
+    random.seed(3)
+    hg = HypergraphDB(intern_v=intern_v)
+    hg.add_v_batch([str(i) for i in range(60)] + [f"v{i}" for i in range(40)])
+    v_ids = list(hg.all_v)
+    hg.add_e_batch(random.sample(v_ids, random.randint(2, 4)) for _ in range(80))
+    indexed = draw.HypergraphAPI()
+    indexed.hypergraph_db = hg
+    draw.create_order_indexes(hg)
+    hg.remove_v("7")
+    hg.remove_e(next(iter(hg.all_e)))
+    hg.add_e(("v1", "v2", "3"))
+    scanned = draw.HypergraphAPI()
+    scanned.hypergraph_db = hg.freeze()
+
+    def page_ids(api, **params):
+        response = api._get_vertices(**{"search": "", "sort_order": "desc", **params})
+        return [v["id"] for v in response["data"]], response["pagination"]
+
+    for sort_order in ("asc", "desc"):
+        # sorted by degree, the order of vertices of the same degree is arbitrary
+        for page in range(1, 6):
+            params = {"page": page, "page_size": 22, "sort_by": "degree", "sort_order": sort_order}
+            assert [hg.degree_v(v) for v in page_ids(indexed, **params)[0]] == [
+                hg.degree_v(v) for v in page_ids(scanned, **params)[0]
+            ]
+        all_ids, _ = page_ids(scanned, page=1, page_size=200, sort_by="id", sort_order=sort_order)
+        assert [hg.degree_v(v) > 3 for v in all_ids] == sorted(hg.degree_v(v) > 3 for v in all_ids)
+        for api in (indexed, scanned):
+            pages, cursor_pages, cursor = [], [], None
+            for page in range(1, 6):
+                ids, pagination = page_ids(api, page=page, page_size=22, sort_by="id", sort_order=sort_order)
+                pages += ids
+                params = {"page": 1, "page_size": 22, "sort_by": "id", "sort_order": sort_order, "cursor": cursor}
+                ids, pagination = page_ids(api, **params)
+                cursor_pages += ids
+                cursor = pagination["next_cursor"]
+                assert (cursor is None) == (page == 5)
+            assert pages == cursor_pages == all_ids
+    assert indexed._get_vertices(1, 10, "", "degree", "desc", "0:a") == {
+        "error": "cursor requires sort_by=id and no search"
+    }
+
+
+def test_graph_depth(monkeypatch):
+    hg = HypergraphDB()
+    hg.add_v_batch(["a", "b", "c", "d", "hub"] + [f"n{i}" for i in range(10)])
+    hg.add_e_batch([("a", "b"), ("b", "c"), ("c", "d"), ("b", "hub")] + [("hub", f"n{i}") for i in range(10)])
+    api = draw.HypergraphAPI()
+    api.hypergraph_db = hg
+    graph = api._get_graph_data("a")
+    assert (set(graph["vertices"]), list(graph["edges"]), graph["truncated"]) == ({"a", "b"}, ["a|#|b"], False)
+    graph = api._get_graph_data("a", 2)
+    assert set(graph["vertices"]) == {"a", "b", "c", "hub"}
+    assert graph["edges"]["b|#|c"] == {"keywords": "", "summary": "", "weight": 2}
+    assert len(api._get_graph_data("a", 3)["vertices"]) == 15
+    assert api._get_graph_data("a", 0) == {"error": "depth must be at least 1"}
+    # the hyperedges of the hub are cut at the limits
+    monkeypatch.setattr(draw, "GRAPH_MAX_EDGES", 5)
+    graph = api._get_graph_data("hub")
+    assert (len(graph["edges"]), graph["truncated"]) == (5, True)
+    monkeypatch.setattr(draw, "GRAPH_MAX_VERTICES", 4)
+    graph = api._get_graph_data("a", 3)
+    assert (len(graph["vertices"]), graph["truncated"]) == (4, True)
+
+
+def test_concurrent_reads_and_writes(hg):
+    viewer = HypergraphViewer(hg, port=0)
+    viewer.start_server(open_browser=False)
+    errors = []
+
+    def writer():
+        try:
+            for i in range(500):
+                hg.add_v(f"v{i}")
+                hg.add_e(("a", f"v{i}"))
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            for _ in range(20):
+                info = get(viewer, "/api/database/info")
+                # each response sees the state between two writes: before or after the hyperedge of a new vertex
+                assert info["edges"] - info["vertices"] in (-2, -1)
+                get(viewer, "/api/vertices?page_size=5")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(4)]
+    with hg.lock.write():
+        for t in threads:
+            t.start()
+    for t in threads:
+        t.join()
+    viewer.stop_server()
+    assert errors == []
+    assert hg.num_e == 502
@@ -0,0 +1,139 @@
+import pytest
+
+from hyperdb import FrozenHypergraph
+
+
+def test_to_csr(hg):
+    csr = hg.to_csr()
+    assert list(csr.v_ids) == list(hg.all_v)
+    assert csr.num_v == 9
+    assert csr.num_e == 7
+    assert len(csr.v_edges) == len(csr.e_verts) == 19
+    for i, v_id in enumerate(csr.v_ids):
+        edges = csr.v_edges[csr.v_ptr[i] : csr.v_ptr[i + 1]]
+        assert list(edges) == sorted(edges)
+        for j in edges:
+            assert i in csr.e_verts[csr.e_ptr[j] : csr.e_ptr[j + 1]]
+        assert len(edges) == hg.degree_v(v_id)
+
+
+def test_frozen_matches_mutable(hg):
+    fhg = hg.freeze()
+    assert isinstance(fhg, FrozenHypergraph)
+    assert fhg.num_v == hg.num_v
+    assert fhg.num_e == hg.num_e
+    assert fhg.all_v == hg.all_v
+    assert fhg.all_e == hg.all_e
+    for v_id in hg.all_v:
+        assert fhg.v(v_id) == hg.v(v_id)
+        assert fhg.degree_v(v_id) == hg.degree_v(v_id)
+        assert fhg.nbr_e_of_v(v_id) == hg.nbr_e_of_v(v_id)
+        assert fhg.nbr_v(v_id) == hg.nbr_v(v_id)
+        assert fhg.nbr_v(v_id, exclude_self=False) == hg.nbr_v(v_id, exclude_self=False)
+    for e_tuple in hg.all_e:
+        assert fhg.e(e_tuple) == hg.e(e_tuple)
+        assert fhg.e(tuple(reversed(e_tuple))) == hg.e(e_tuple)
+        assert fhg.degree_e(e_tuple) == hg.degree_e(e_tuple)
+        assert fhg.nbr_v_of_e(e_tuple) == hg.nbr_v_of_e(e_tuple)
+        assert fhg.encode_e(set(e_tuple)) == e_tuple
+    assert fhg.nbr_v(9) == set()
+    assert fhg.has_v(10) is False
+    assert fhg.has_e((1, 4)) is False
+    assert fhg.has_e((1, 10)) is False
+    assert fhg.e((1, 4)) is None
+    with pytest.raises(AssertionError):
+        fhg.degree_v(10)
+    with pytest.raises(AssertionError):
+        fhg.nbr_v_of_e((1, 4))
+
+
+def test_frozen_many_queries(hg):
+    fhg = hg.freeze()
+    v_ids = [1, 9, 4, 1]
+    assert fhg.degree_v_many(v_ids) == hg.degree_v_many(v_ids)
+    assert fhg.nbr_e_of_v_many(v_ids) == hg.nbr_e_of_v_many(v_ids)
+    assert fhg.nbr_v_many(v_ids) == hg.nbr_v_many(v_ids)
+    assert fhg.nbr_v_many(v_ids, exclude_self=False) == hg.nbr_v_many(v_ids, exclude_self=False)
+    with pytest.raises(AssertionError, match="10"):
+        fhg.degree_v_many([1, 10])
+    pytest.importorskip("numpy")
+    assert fhg.degree_v_many(v_ids, as_numpy=True).tolist() == hg.degree_v_many(v_ids)
+
+
+def test_frozen_nbr_views(hg):
+    fhg = hg.freeze()
+    for v_id in hg.all_v:
+        view = fhg.nbr_e_of_v(v_id, copy=False)
+        assert view == hg.nbr_e_of_v(v_id)
+        assert all(e_tuple in view for e_tuple in hg.nbr_e_of_v(v_id))
+        assert set(fhg.iter_nbr_v(v_id)) == hg.nbr_v(v_id)
+        assert set(fhg.iter_nbr_v(v_id, exclude_self=False)) == hg.nbr_v(v_id, exclude_self=False)
+    assert (2, 3, 4) not in fhg.nbr_e_of_v(1, copy=False)
+    assert (1, 10) not in fhg.nbr_e_of_v(1, copy=False)
+    assert len(fhg.nbr_e_of_v(9, copy=False)) == 0
+    for e_tuple in hg.all_e:
+        assert fhg.nbr_v_of_e(set(e_tuple), copy=False) == e_tuple
+
+
+def test_frozen_is_a_snapshot(hg):
+    fhg = hg.freeze()
+    hg.add_e((6, 7), {"relation": "new"})
+    hg.remove_v(2)
+    assert fhg.num_e == 7
+    assert fhg.has_e((6, 7)) is False
+    assert fhg.has_e((1, 2)) is True
+    with pytest.raises(NotImplementedError):
+        fhg.add_v(10)
+
+
+def test_csr_numpy_views(hg):
+    np = pytest.importorskip("numpy")
+    csr = hg.to_csr()
+    arrays = csr.to_numpy()
+    assert np.array_equal(np.diff(arrays["v_ptr"]), [hg.degree_v(v_id) for v_id in csr.v_ids])
+    pytest.importorskip("scipy")
+    H = csr.to_scipy()
+    assert H.shape == (9, 7)
+    assert H.sum() == 19
+
+
+def test_k_hop(hg):
+    for g in (hg, hg.freeze()):
+        sub = g.k_hop(1, 0)
+        assert set(sub.all_v) == {1} and sub.num_e == 0
+        sub = g.k_hop(1)
+        assert isinstance(sub, FrozenHypergraph)
+        assert set(sub.all_v) == {1, 2, 3, 4, 5, 6}
+        assert set(sub.all_e) == set(g.nbr_e_of_v(1))
+        # the data dicts are shared, the vertex order follows the search
+        assert sub.v(5) is g.v(5)
+        assert sub.e((1, 5, 6)) is g.e((1, 5, 6))
+        assert list(sub.all_v)[0] == 1
+        assert set(g.k_hop(1, 2).all_e) == set(g.all_e) - {(7, 8)}
+        assert g.sub_from_v(1, 2).all_e == g.k_hop(1, 2).all_e
+        assert set(g.k_hop(9, 3).all_v) == {9}
+
+        knows = g.k_hop(1, 5, edge_filter=lambda e_tuple, e_data: e_data["relation"] == "knows")
+        assert set(knows.all_v) == {1, 2, 3, 4}
+        assert knows.num_e == 3
+        assert g._k_hop(1, 5, edge_filter=lambda e_tuple, e_data: e_data["relation"] == "knows")[1] is False
+
+        sub, truncated = g._k_hop(1, 2, max_edges=2)
+        assert (sub.num_e, truncated) == (2, True)
+        assert g._k_hop(1, 2, max_edges=6)[1] is False
+        # hyperedges too large for the remaining vertices are left out, smaller ones are still taken
+        sub, truncated = g._k_hop(1, 1, max_vertices=4)
+        assert set(sub.all_e) == {(1, 2), (1, 3)} and truncated
+        sub, truncated = g._k_hop(1, 3, max_vertices=5)
+        assert sub.num_v <= 5 and truncated
+        for e_tuple in sub.all_e:
+            assert g.has_e(e_tuple) and sub.nbr_v_of_e(e_tuple) == g.nbr_v_of_e(e_tuple)
+        for v_id in sub.all_v:
+            assert sub.nbr_e_of_v(v_id) <= g.nbr_e_of_v(v_id)
+
+        with pytest.raises(AssertionError):
+            g.k_hop(10)
+        with pytest.raises(AssertionError):
+            g.k_hop(1, -1)
+        with pytest.raises(AssertionError):
+            g.k_hop(1, max_vertices=0)
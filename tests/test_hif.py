@@ -0,0 +1,154 @@
+import io
+import json
+
+import pytest
+
+from hyperdb import HypergraphDB
+from hyperdb.hif import iter_hif, write_hif
+
+
+@pytest.fixture
+def hg():
+    bd = HypergraphDB()
+    bd.add_v(1, {"name": "Alice", "weight": 0.5})
+    bd.add_v(2, {"name": "Bob"})
+    bd.add_v(3, {"name": "Charlie", "note": "名字"})
+    bd.add_v(4, {"name": "David"})
+    bd.add_e((1, 2), {"relation": "knows"})
+    bd.add_e((2, 3, 4), {"name": "trio", "weight": 2.25})
+    bd.add_e((1, 4), {"id": "Paper Title"})
+    return bd
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1 << 16])
+def test_iter_hif_chunks(chunk_size):
+    doc = {
+        "edges": [{"edge": "e1", "attrs": {"w": 123456789, "s": 'a , ] } " b'}}],
+        "network-type": "undirected",
+        "incidences": [{"edge": "e1", "node": 10}, {"edge": "e1", "node": -2.5e-3}],
+        "nodes": [],
+        "extra": {"nested": [1, [2, 3]]},
+    }
+    text = json.dumps(doc, indent=4)
+    members = [
+        (key, list(value) if key in ("edges", "incidences", "nodes") else value)
+        for key, value in iter_hif(io.StringIO(text), chunk_size)
+    ]
+    assert dict(members) == doc
+    assert [key for key, _ in members] == list(doc)
+
+
+def test_iter_hif_numbers_cut_by_chunks():
+    # the chunk sizes cut some number right before its ".", "e", "E" or exponent sign
+    text = (
+        '{"incidences": [-25000000000.0, 1.5, 3e10, 2.5e-3, 7E+2, 10, 0.125, {"w": -1.0E-7}], "weight": -7.5e2, '
+        '"scalars": [true, null, 12345.678, 1e-300], "last": 6.25}  '
+    )
+    for chunk_size in range(1, 40):
+        members = {
+            key: list(value) if key in ("incidences", "scalars") else value
+            for key, value in iter_hif(io.StringIO(text), chunk_size)
+        }
+        assert members == json.loads(text), chunk_size
+
+
+def test_iter_hif_skips_unconsumed_arrays():
+    text = '{"incidences": [1, 2, 3], "other": [4], "network-type": "undirected"}'
+    keys = [key for key, _ in iter_hif(io.StringIO(text), 2)]
+    assert keys == ["incidences", "other", "network-type"]
+    assert list(iter_hif(io.StringIO(" { } "))) == []
+
+
+@pytest.mark.parametrize("text", ['{"a": [1, 2}', '{"a" 1}', "[1, 2]", '{"a": 1', '{"a": tru}'])
+def test_iter_hif_invalid(text):
+    with pytest.raises(ValueError):
+        for _, value in iter_hif(io.StringIO(text), 2):
+            if not isinstance(value, int):
+                list(value)
+
+
+@pytest.mark.parametrize("num_items", [0, 1, 1024, 2049])
+def test_write_hif(num_items):
+    f = io.StringIO()
+    incidences = ({"edge": f"e{i // 2}", "node": i} for i in range(num_items))
+    write_hif(f, incidences, edges=[{"edge": "e0", "attrs": {}}])
+    data = json.loads(f.getvalue())
+    assert list(data) == ["incidences", "network-type", "edges"]
+    assert len(data["incidences"]) == num_items
+    assert data["edges"] == [{"edge": "e0", "attrs": {}}]
+
+
+def test_save_as_hif_matches_to_hif(hg, tmpdir):
+    file_path = str(tmpdir.join("hg.hif.json"))
+    assert hg.save_as_hif(file_path)
+    with open(file_path, encoding="utf-8") as f:
+        assert json.load(f) == hg.to_hif()
+    assert hg.save_as_hif(str(tmpdir.join("missing", "hg.hif.json"))) is False
+
+
+def test_hif_streaming_roundtrip(hg, tmpdir):
+    file_path = str(tmpdir.join("hg.hif.json"))
+    assert hg.save_as_hif(file_path)
+    hg2 = HypergraphDB()
+    hg2.add_v("stale")
+    assert hg2.load_from_hif(file_path)
+    assert hg2.all_v == hg.all_v
+    assert hg2.all_e == hg.all_e
+    for v_id in hg.all_v:
+        assert hg2.v(v_id) == hg.v(v_id)
+    assert hg2.e((2, 3, 4)) == {"name": "trio", "weight": 2.25}
+    assert hg2.e((1, 4)) == {"id": "Paper Title"}
+    # the same data is loaded from a file, a dict and a JSON string
+    hg3, hg4 = HypergraphDB(), HypergraphDB()
+    assert hg3.from_hif(hg.to_hif())
+    assert hg4.from_hif(json.dumps(hg.to_hif()))
+    assert hg3 == hg2
+    assert hg4 == hg2
+
+
+def test_from_hif_nodes_before_incidences(tmpdir):
+    file_path = str(tmpdir.join("hg.hif.json"))
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "nodes": [{"node": "a", "attrs": {"x": 2}, "weight": 3}],
+                "incidences": [
+                    {"edge": "e", "node": "a", "attrs": {"x": 1, "y": 1}},
+                    {"edge": "e", "node": "b"},
+                    {"edge": "single", "node": "c"},
+                ],
+            },
+            f,
+        )
+    hg = HypergraphDB()
+    assert hg.load_from_hif(file_path)
+    assert hg.v("a") == {"x": 2, "y": 1, "weight": 3}
+    assert hg.all_e == {("a", "b")}
+
+
+def test_from_hif_takes_parsed_records():
+    hif = {
+        "incidences": [
+            {"edge": e, "node": v} for e, nodes in [("e1", "ab"), ("e2", "bc"), ("e3", "d")] for v in nodes
+        ],
+        "nodes": [{"node": "a", "attrs": {"x": 1}}, {"node": "d", "attrs": {"x": 2}}],
+        "edges": [{"edge": "e2", "weight": 2}],
+    }
+    edge_nodes_map, edge_attrs_map, inci_attrs_map, node_attrs_map = HypergraphDB._parse_hif(hif.items())
+    vertices = list(HypergraphDB._take_hif_vertices(edge_nodes_map, inci_attrs_map, node_attrs_map))
+    assert {v_id for v_id, _ in vertices} == set("abc") and dict(vertices)["a"] == {"x": 1}
+    # the attributes of the inserted vertices, and every hyperedge, are taken out of the maps
+    assert node_attrs_map == {"d": {"x": 2}}
+    edges = list(HypergraphDB._take_hif_edges(edge_nodes_map, edge_attrs_map))
+    assert edges == [({"a", "b"}, {"id": "e1"}), ({"b", "c"}, {"weight": 2, "id": "e2"})]
+    assert edge_nodes_map == {} and edge_attrs_map == {}
+
+
+def test_from_hif_failure_keeps_data(hg, tmpdir):
+    file_path = str(tmpdir.join("bad.hif.json"))
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write('{"incidences": [{"edge": "e", "node": 1}, ')
+    assert hg.load_from_hif(file_path) is False
+    assert hg.from_hif({"nodes": []}) is False
+    assert hg.num_v == 4
+    assert hg.num_e == 3
@@ -1,6 +1,10 @@
+import copy
+import pickle
+import threading
+
 import pytest
 
-from hyperdb import HypergraphDB
+from hyperdb import HypergraphDB, HypergraphSnapshot
 
 
 @pytest.fixture()
@@ -37,6 +41,22 @@ def test_all_e(hg):
     assert hg.num_e == 5
 
 
+def test_all_v_all_e_are_live_views(hg):
+    all_v, all_e = hg.all_v, hg.all_e
+    hg.add_v(7)
+    hg.add_e((6, 7))
+    assert 7 in all_v
+    assert (6, 7) in all_e
+    assert hg.num_v == 7
+    assert hg.num_e == 7
+    hg.remove_v(7)
+    assert 7 not in all_v
+    assert (6, 7) not in all_e
+    assert hg.num_e == 6
+    with pytest.raises(AttributeError):
+        all_v.add(8)
+
+
 def test_v(hg):
     assert hg.v(1) == {"name": "Alice"}
     assert hg.v(2) == {"name": "Bob"}
@@ -78,6 +98,35 @@ def test_add_e(hg):
         hg.add_e((6, 7), {"relation": "knows"})
 
 
+def test_add_v_batch(hg):
+    hg.add_v_batch([7, 8, 1], [{"name": "Grace"}, None, {"age": 30}])
+    assert hg.v(7) == {"name": "Grace"}
+    assert hg.v(8) == {}
+    assert hg.v(1) == {"name": "Alice", "age": 30}
+    assert hg.num_v == 8
+    hg.add_v_batch(i for i in range(9, 12))
+    assert hg.all_v == set(range(1, 12))
+    with pytest.raises(ValueError):
+        hg.add_v_batch([12, 13], [{}])
+
+
+def test_add_e_batch(hg):
+    hg.add_e_batch([(6, 1), (2, 5), [1, 6]], [{"relation": "knows"}, None, {"since": 2020}])
+    assert hg.e((1, 6)) == {"relation": "knows", "since": 2020}
+    assert hg.e((2, 5)) == {}
+    assert hg.num_e == 8
+    assert hg.nbr_e_of_v(6) == {(4, 5, 6), (1, 5, 6), (1, 6)}
+    hg.add_e_batch([(1, 2)], [{"strength": "high"}])
+    assert hg.e((1, 2)) == {"relation": "knows", "strength": "high"}
+    assert hg.num_e == 8
+
+    # a batch with an unknown vertex is rejected as a whole
+    with pytest.raises(AssertionError):
+        hg.add_e_batch([(3, 6), (6, 7)])
+    assert hg.has_e((3, 6)) is False
+    assert hg.num_e == 8
+
+
 def test_remove_v(hg):
     assert hg.has_v(6) is True
     assert hg.has_e((1, 5, 6)) is True
@@ -207,6 +256,75 @@ def test_nbr_v(hg):
     assert hg.nbr_v(1, exclude_self=False) == set([1, 3, 4, 5, 6])
 
 
+def test_nbr_views(hg):
+    view = hg.nbr_e_of_v(1, copy=False)
+    assert view == hg.nbr_e_of_v(1)
+    assert len(view) == 4
+    assert (1, 2) in view
+    assert (2, 1) not in view
+    assert (2, 3, 4) not in view
+    assert [1, 2] not in view
+    assert not hasattr(view, "add")
+    hg.add_e((1, 4))
+    assert (1, 4) in view
+    assert len(view) == 5
+    assert hg.nbr_v_of_e((2, 1), copy=False) == (1, 2)
+    assert set(hg.iter_nbr_v(1)) == hg.nbr_v(1)
+    assert sorted(hg.iter_nbr_v(1, exclude_self=False)) == [1, 2, 3, 4, 5, 6]
+    assert next(hg.iter_nbr_v(2)) in hg.nbr_v(2)
+    with pytest.raises(AssertionError):
+        hg.iter_nbr_v(7)
+    with pytest.raises(AssertionError):
+        hg.nbr_e_of_v(7, copy=False)
+    hg.remove_v(1)
+    assert len(view) == 0
+
+
+def test_nbr_views_interned(hg):
+    ihg = HypergraphDB(intern_v=True)
+    ihg.add_v_batch(hg.all_v)
+    ihg.add_e_batch(hg.all_e)
+    for _ in range(70):
+        ihg.add_v(len(ihg.all_v) + 1)
+        ihg.add_e((5, len(ihg.all_v)))
+    view = ihg.nbr_e_of_v(5, copy=False)
+    # the incidence of vertex 5 was promoted to a set while the view existed
+    assert view == ihg.nbr_e_of_v(5)
+    assert (5, 10) in view
+    assert ihg.nbr_v_of_e((4, 3, 2), copy=False) == (2, 3, 4)
+    assert set(ihg.iter_nbr_v(1)) == ihg.nbr_v(1)
+    ihg.remove_v(5)
+    assert len(view) == 0
+
+
+def test_many_queries(hg):
+    v_ids = [1, 4, 6, 4]
+    assert hg.degree_v_many(v_ids) == [4, 3, 2, 3]
+    assert hg.degree_v_many(iter([])) == []
+    assert hg.nbr_e_of_v_many(v_ids) == [hg.nbr_e_of_v(v_id) for v_id in v_ids]
+    assert hg.nbr_v_many(v_ids) == [hg.nbr_v(v_id) for v_id in v_ids]
+    assert hg.nbr_v_many(v_ids, exclude_self=False) == [hg.nbr_v(v_id, exclude_self=False) for v_id in v_ids]
+    with pytest.raises(AssertionError, match="7"):
+        hg.degree_v_many([1, 7])
+    with pytest.raises(AssertionError):
+        hg.nbr_v_many([1, [2]])
+    ihg = HypergraphDB(intern_v=True)
+    ihg.add_v_batch(hg.all_v)
+    ihg.add_e_batch(hg.all_e)
+    assert ihg.degree_v_many(v_ids) == [4, 3, 2, 3]
+    assert ihg.nbr_e_of_v_many(v_ids) == [hg.nbr_e_of_v(v_id) for v_id in v_ids]
+    assert ihg.nbr_v_many(v_ids) == [hg.nbr_v(v_id) for v_id in v_ids]
+    with pytest.raises(AssertionError, match="7"):
+        ihg.nbr_e_of_v_many([1, 7])
+
+
+def test_degree_v_many_numpy(hg):
+    np = pytest.importorskip("numpy")
+    degrees = hg.degree_v_many([1, 2, 3], as_numpy=True)
+    assert degrees.dtype == np.int64
+    assert degrees.tolist() == [4, 2, 3]
+
+
 def test_save_and_load(hg, tmpdir):
     file_path = str(tmpdir.join("my_hypergraph.hgdb"))
     hg.save(file_path)
@@ -234,6 +352,78 @@ def test_save_and_load(hg, tmpdir):
     assert hg == hg3
 
 
+@pytest.mark.parametrize("intern_v", [False, True])
+def test_wal_replay(tmpdir, intern_v):
+    file_path = str(tmpdir.join("wal.hgdb"))
+    hg = HypergraphDB(storage_file=file_path, intern_v=intern_v, wal=True)
+    hg.add_v_batch([1, 2, 3, 4], [{"name": "Alice"}, None, None, None])
+    hg.add_e((1, 2), {"relation": "knows"})
+    hg.add_e_batch(e for e in [(2, 3), (3, 4, 1), (2, 3)])
+    hg.update_v(2, {"name": "Bob"})
+    hg.update_e((3, 2), {"relation": "study"})
+    hg.add_v(5)
+    hg.add_e((4, 5))
+    hg.remove_e((1, 2))
+    hg.remove_v(4)
+    with pytest.raises(AssertionError):
+        hg.add_e((1, 6))
+    hg.close()
+    assert not tmpdir.join("wal.hgdb").exists()
+    hg2 = HypergraphDB(storage_file=file_path, intern_v=intern_v, wal=True)
+    assert hg2.all_v == hg.all_v
+    assert hg2.all_e == hg.all_e
+    assert hg2.v(2) == {"name": "Bob"}
+    assert hg2.e((2, 3)) == {"relation": "study"}
+    # the replayed log keeps growing after a restart
+    hg2.add_e((1, 5))
+    hg2.close()
+    hg3 = HypergraphDB(storage_file=file_path, intern_v=intern_v, wal=True)
+    assert hg3.has_e((1, 5))
+    assert hg3.num_e == hg.num_e + 1
+
+
+def test_wal_torn_tail(tmpdir):
+    file_path = str(tmpdir.join("wal.hgdb"))
+    hg = HypergraphDB(storage_file=file_path, wal=True)
+    hg.add_v_batch([1, 2, 3])
+    hg.add_e((1, 2))
+    hg.add_e((2, 3))
+    hg.close()
+    wal_file = tmpdir.join("wal.hgdb.wal")
+    wal_file.write_binary(wal_file.read_binary()[:-3])
+    hg2 = HypergraphDB(storage_file=file_path, wal=True)
+    assert hg2.all_e == {(1, 2)}
+    hg2.add_e((1, 3))
+    hg2.close()
+    hg3 = HypergraphDB(storage_file=file_path, wal=True)
+    assert hg3.all_e == {(1, 2), (1, 3)}
+
+
+def test_wal_checkpoint(tmpdir):
+    file_path = str(tmpdir.join("wal.hgdb"))
+    hg = HypergraphDB(storage_file=file_path, wal=True, wal_sync_every=0, wal_checkpoint_every=5)
+    hg.add_v_batch(range(10))
+    for i in range(9):
+        hg.add_e((i, i + 1))
+    wal_file = tmpdir.join("wal.hgdb.wal")
+    assert tmpdir.join("wal.hgdb").exists()
+    assert hg._wal_records == 0
+    size = wal_file.size()
+    hg.remove_v(0)
+    assert wal_file.size() > size
+    assert hg.save(file_path)
+    assert hg._wal_records == 0
+    # a log left behind by a crash during a checkpoint belongs to the older snapshot and is skipped
+    stale_wal = wal_file.read_binary()
+    hg.add_e((1, 9))
+    hg.close()
+    hg.checkpoint()
+    wal_file.write_binary(stale_wal)
+    hg2 = HypergraphDB(storage_file=file_path, wal=True)
+    assert hg2.all_e == hg.all_e
+    assert hg2 == hg
+
+
 def test_hif_export_and_import(hg, tmpdir):
     """Test HIF format export and import"""
     file_path = str(tmpdir.join("test.hif.json"))
@@ -336,3 +526,580 @@ def test_hif_export_with_attributes(hg, tmpdir):
     hg2.load_from_hif(file_path)
     assert hg2.v(1)["name"] == "Alice"
     assert hg2.v(1).get("weight") == 2.0
+
+
+def test_interned_matches_plain(hg):
+    ihg = HypergraphDB(intern_v=True)
+    for v_id in hg.all_v:
+        ihg.add_v(v_id, dict(hg.v(v_id)))
+    for e_tuple in hg.all_e:
+        ihg.add_e(e_tuple, dict(hg.e(e_tuple)))
+    assert ihg.all_v == hg.all_v
+    assert {frozenset(e) for e in ihg.all_e} == {frozenset(e) for e in hg.all_e}
+    assert ihg.num_e == hg.num_e
+    for v_id in hg.all_v:
+        assert ihg.v(v_id) == hg.v(v_id)
+        assert ihg.degree_v(v_id) == hg.degree_v(v_id)
+        assert ihg.nbr_v(v_id) == hg.nbr_v(v_id)
+        assert {frozenset(e) for e in ihg.nbr_e_of_v(v_id)} == {frozenset(e) for e in hg.nbr_e_of_v(v_id)}
+    assert ihg.e((3, 4, 1, 5)) == {"relation": "study"}
+    assert ihg.nbr_v_of_e((5, 1, 6)) == {1, 5, 6}
+    assert ihg.has_e((1, 7)) is False
+    ihg.remove_v(2)
+    assert ihg.has_v(2) is False
+    assert ihg.has_e((3, 4)) is True
+    assert ihg.nbr_v(1) == {3, 4, 5, 6}
+    with pytest.raises(AssertionError):
+        ihg.degree_v(2)
+
+
+def test_interned_mixed_type_ids(tmpdir):
+    hg = HypergraphDB(intern_v=True)
+    hg.add_v_batch(["a", 1, (2, 3)])
+    hg.add_e(("a", 1, (2, 3)), {"relation": "mixed"})
+    hg.add_e_batch([[1, "a"]])
+    assert hg.encode_e([(2, 3), 1, "a"]) == ("a", 1, (2, 3))
+    assert ("a", 1) in hg.all_e
+    assert hg.e({1, "a", (2, 3)}) == {"relation": "mixed"}
+    assert hg.nbr_v("a") == {1, (2, 3)}
+
+    file_path = str(tmpdir.join("interned.hgdb"))
+    hg.save(file_path)
+    hg2 = HypergraphDB(storage_file=file_path)
+    assert hg2.intern_v is True
+    assert hg2 == hg
+    assert hg2.degree_v(1) == 2
+
+
+def test_interned_reuses_removed_keys(tmpdir):
+    hg = HypergraphDB(intern_v=True)
+    hg.add_v_batch(range(10))
+    for i in range(10, 1000):
+        hg.add_v(i, {"i": i})
+        hg.add_e((i, i % 10))
+        if i > 10:
+            hg.remove_v(i - 1)
+    # the vertices added and removed over and over take turns on two keys
+    assert len(hg._v_label) == 12 and hg.num_v == 11 and len(hg._v_free) == 1
+    assert hg.nbr_v(999) == {9} and hg.v(999) == {"i": 999} and hg.degree_v(9) == 1
+    hg.add_v(-1)
+    hg.remove_v_batch([1, 2])
+    assert sorted(hg._v_free) == [1, 2]
+
+    file_path = str(tmpdir.join("interned.hgdb"))
+    hg.save(file_path)
+    hg2 = HypergraphDB(storage_file=file_path)
+    assert hg2 == hg and sorted(hg2._v_free) == [1, 2]
+    hg2.add_v("x")
+    assert hg2._v_index["x"] in (1, 2) and len(hg2._v_label) == 12
+    # files written before the free list rebuild it from the holes
+    with open(file_path, "rb") as f:
+        data = pickle.load(f)
+    del data["v_free"]
+    with open(file_path, "wb") as f:
+        pickle.dump(data, f)
+    assert sorted(HypergraphDB(storage_file=file_path)._v_free) == [1, 2]
+
+    # a rollback takes the reused key back
+    labels = list(hg._v_label)
+    with pytest.raises(KeyError):
+        with hg.transaction():
+            hg.remove_v(3)
+            hg.add_v_batch(["y", "z", "w"])
+            raise KeyError
+    assert hg._v_label == labels and sorted(hg._v_free) == [1, 2] and hg.has_v(3)
+
+
+def test_remove_v_keeps_edge_ids(hg):
+    e_id = hg._e_index[(1, 5, 6)]
+    hg.remove_v(6)
+    assert hg._e_index[(1, 5)] == e_id
+    assert e_id in hg._v_inci[1] and e_id in hg._v_inci[5]
+    # (1, 2) collapses to a single vertex and is dropped, freeing its edge id
+    dropped_e_id = hg._e_index[(1, 2)]
+    hg.remove_v(2)
+    assert hg.has_e((1, 2)) is False
+    assert hg.nbr_e_of_v(1) == {(1, 3), (1, 3, 4, 5), (1, 5)}
+    assert hg.nbr_e_of_v(3) == {(1, 3), (3, 4), (1, 3, 4, 5)}
+    hg.add_e((3, 5), {"relation": "new"})
+    assert hg._e_index[(3, 5)] == dropped_e_id
+
+
+def test_remove_v_shrinks_onto_existing_edge(hg):
+    hg.add_e((4, 5), {"relation": "friends"})
+    hg.remove_v(6)
+    assert hg.e((4, 5)) == {"relation": "study"}
+    assert hg.degree_v(4) == 3
+    assert hg.degree_v(5) == 3
+
+
+def test_load_tuple_keyed_file(hg, tmpdir):
+    import pickle
+
+    file_path = str(tmpdir.join("legacy.hgdb"))
+    e_data = {e_tuple: dict(e_data) for e_tuple, e_data in hg._e_items()}
+    v_inci = {v_id: hg.nbr_e_of_v(v_id) for v_id in hg.all_v}
+    with open(file_path, "wb") as f:
+        pickle.dump({"v_data": hg._v_data, "v_inci": v_inci, "e_data": e_data}, f)
+    hg2 = HypergraphDB(storage_file=file_path)
+    assert hg2.all_e == hg.all_e
+    for v_id in hg.all_v:
+        assert hg2.nbr_e_of_v(v_id) == hg.nbr_e_of_v(v_id)
+    hg2.remove_v(1)
+    assert hg2.e((3, 4, 5)) == {"relation": "study"}
+
+
+def test_hub_incidence_is_promoted_to_set():
+    hg = HypergraphDB()
+    hg.add_v_batch(range(200))
+    hg.add_e_batch((0, i) for i in range(1, 100))
+    assert isinstance(hg._v_inci[0], set)
+    assert hg.degree_v(0) == 99
+    hg.remove_e((0, 50))
+    hg.remove_v(99)
+    assert hg.degree_v(0) == 97
+    assert hg.nbr_v(0) == set(range(1, 99)) - {50}
+    assert hg.degree_v(1) == 1
+
+
+def join_relations(existing, data):
+    return {"relation": f"{existing['relation']}+{data['relation']}"}
+
+
+@pytest.mark.parametrize(
+    "merge, expected",
+    [
+        ("overwrite", {"relation": "study"}),
+        ("keep", {"relation": "friends", "since": 2020}),
+        ("update", {"relation": "study", "since": 2020}),
+        (join_relations, {"relation": "friends+study"}),
+    ],
+)
+def test_remove_v_merge_policies(hg, merge, expected):
+    hg.create_index("e", "relation")
+    hg.add_e((4, 5), {"relation": "friends", "since": 2020})
+    e_id = hg._e_index[(4, 5)]
+    hg.remove_v(6, merge=merge)
+    assert hg.e((4, 5)) == expected and hg._e_index[(4, 5)] == e_id
+    assert hg.degree_v(4) == 3 and hg.degree_v(5) == 3
+    assert hg.nbr_e_of_v(4) == {(2, 3, 4), (1, 3, 4, 5), (4, 5)}
+    assert ((4, 5) in hg.find_e(relation=expected["relation"])) and hg.e((1, 5)) == {"relation": "study"}
+
+
+def test_remove_v_merge_errors(hg):
+    hg.add_e((4, 5), {"relation": "friends"})
+    before = state(hg)
+
+    def fail(existing, data):
+        raise KeyError("relation")
+
+    # invalid policies are rejected before anything changes, and the writes of a failing callable are reverted
+    for merge in ("merge", None, lambda existing, data: None, fail):
+        with pytest.raises((AssertionError, KeyError)):
+            hg.remove_v(6, merge=merge)
+        assert state(hg) == before
+    with pytest.raises(KeyError):
+        with hg.transaction():
+            hg.remove_v(1)
+            with pytest.raises(KeyError):
+                hg.remove_v_batch([2, 6], merge=fail)
+            assert hg.has_v(6) and hg.has_e((2, 3, 4))
+            raise KeyError
+    assert state(hg) == before
+
+
+@pytest.mark.parametrize("intern_v", [False, True])
+def test_remove_v_batch(intern_v):
+    import random
+
+    random.seed(4)
+    hg = HypergraphDB(intern_v=intern_v)
+    hg.add_v_batch(range(40))
+    hg.add_e_batch(
+        (tuple(random.sample(range(40), random.randint(2, 5))) for _ in range(120)), ({"i": i} for i in range(120))
+    )
+    hg.create_index("v", None, kind="degree")
+    reference = copy.deepcopy(hg)
+    removed = random.sample(range(40), 10)
+    hg.remove_v_batch(iter(removed + removed[:2]))
+    for v_id in removed:
+        reference.remove_v(v_id)
+    assert hg.all_v == reference.all_v and hg.all_e == reference.all_e
+    for v_id in hg.all_v:
+        assert hg.nbr_e_of_v(v_id) == reference.nbr_e_of_v(v_id)
+        assert hg.degree_v(v_id) == reference.degree_v(v_id)
+    assert set(hg.iter_v_by_degree(lo=3)) == set(reference.iter_v_by_degree(lo=3))
+    with pytest.raises(AssertionError):
+        hg.remove_v_batch([next(iter(hg.all_v)), 99])
+    assert hg.num_v == 30
+
+
+def test_remove_v_batch_shrinks_once(hg):
+    hg.add_e((3, 4), {"relation": "friends"})
+    e_id = hg._e_index[(1, 3, 4, 5)]
+    # (1, 2) collapses, (2, 3, 4) shrinks onto (3, 4), and (1, 3, 4, 5) shrinks once to (3, 4, 5)
+    hg.remove_v_batch([1, 2], merge="keep")
+    assert hg.all_e == {(3, 4), (3, 4, 5), (4, 5, 6), (5, 6)}
+    assert hg.e((3, 4)) == {"relation": "friends"} and hg._e_index[(3, 4, 5)] == e_id
+    assert hg.nbr_e_of_v(3) == {(3, 4), (3, 4, 5)}
+    # two shrunken hyperedges colliding with each other are merged as well
+    hg.add_v(7)
+    hg.add_e((4, 5, 7), {"relation": "a"})
+    hg.add_e((4, 5, 6, 7), {"w": 1})
+    hg.remove_v_batch([6, 7], merge="update")
+    assert hg.all_e == {(3, 4), (3, 4, 5), (4, 5)}
+    assert hg.degree_v(5) == 2 and hg.nbr_v(5) == {3, 4}
+    # in the order of the incidence of the removed vertices: (4, 5, 6), (4, 5, 6, 7), then (4, 5, 7)
+    assert hg.e((4, 5)) == {"relation": "a", "w": 1}
+    hg.remove_v_batch([])
+    assert hg.num_v == 3
+    with pytest.raises(AssertionError):
+        hg.snapshot().remove_v_batch([3])
+
+
+def test_remove_v_batch_transaction_and_wal(tmpdir):
+    file_path = str(tmpdir.join("wal.hgdb"))
+    hg = HypergraphDB(storage_file=file_path, wal=True)
+    hg.add_v_batch(range(1, 7), [{"name": name} for name in ["Alice", "Bob", "Charlie", "David", "Eve", "Frank"]])
+    hg.add_e_batch(
+        [(1, 2), (1, 3), (2, 3, 4), (3, 4, 1, 5), (6, 5, 4), (1, 5, 6), (4, 5), (3, 4)],
+        [{"relation": "knows"}] * 3 + [{"relation": "study"}] * 3 + [{"relation": "friends"}, {"relation": "study"}],
+    )
+    hg.create_index("v", "name")
+    hg.create_index("e", "relation")
+    hg.create_index("v", None, kind="text")
+    hg.create_index("v", None, kind="degree")
+    before = indexed_state(hg)
+    with pytest.raises(ValueError):
+        with hg.transaction():
+            hg.remove_v_batch([1, 6], merge="update")
+            hg.remove_v(2, merge=join_relations)
+            raise ValueError
+    assert indexed_state(hg) == before
+    # a policy that cannot be logged is rejected before anything changes
+    with pytest.raises(Exception):
+        hg.remove_v(6, merge=lambda existing, data: data)
+    assert hg.has_v(6)
+    hg.remove_v_batch([1, 6], merge="update")
+    hg.remove_v(2, merge=join_relations)
+    hg.close()
+    hg2 = HypergraphDB(storage_file=file_path, wal=True)
+    assert state(hg2) == state(hg)
+    assert hg2.e((3, 4)) == {"relation": "study+knows"} and hg2.e((4, 5)) == {"relation": "study"}
+    hg2.close()
+
+
+def state(hg):
+    return (
+        {v: dict(hg.v(v)) for v in hg.all_v},
+        {frozenset(e): dict(hg.e(e)) for e in hg.all_e},
+        {v: hg.nbr_v(v) for v in hg.all_v},
+        {v: hg.degree_v(v) for v in hg.all_v},
+        sorted(hg._e_free),
+    )
+
+
+def indexed_state(hg):
+    return (
+        state(hg),
+        hg.find_v(name="Alice"),
+        hg.find_e(relation="study"),
+        set(hg.search_v("a")),
+        set(hg.iter_v_by_degree(lo=3)),
+    )
+
+
+def test_transaction_commit(hg):
+    version = hg.version
+    with hg.transaction() as txn:
+        assert txn is hg
+        hg.remove_v(2)
+        hg.add_e((3, 4), {"relation": "merged"})
+        hg.add_v(7)
+        hg.add_e((6, 7))
+        assert hg.version == version
+        assert hg.has_e((6, 7)) and not hg.has_v(2)
+    assert hg.version == version + 1
+    assert hg.e((3, 4)) == {"relation": "merged"}
+    assert hg.nbr_v(7) == {6}
+
+
+@pytest.mark.parametrize("intern_v", [False, True])
+def test_transaction_rollback(intern_v):
+    hg = HypergraphDB(intern_v=intern_v)
+    hg.add_v_batch(range(1, 7), [{"name": name} for name in ["Alice", "Bob", "Charlie", "David", "Eve", "Frank"]])
+    hg.add_e_batch([(1, 2), (1, 3), (2, 3, 4), (3, 4, 1, 5), (6, 5, 4), (1, 5, 6), (4, 5)])
+    hg.update_e((1, 3, 4, 5), {"relation": "study"})
+    hg.remove_e((1, 2))
+    hg.create_index("v", "name")
+    hg.create_index("e", "relation")
+    hg.create_index("v", None, kind="text")
+    hg.create_index("v", None, kind="degree")
+    before, labels, version = indexed_state(hg), list(hg._v_label), hg.version
+    with pytest.raises(AssertionError):
+        with hg.transaction():
+            hg.add_v(7, {"name": "Alan"})
+            hg.add_v_batch([8, 1], [{"name": "Grace"}, {"name": "Ada"}])
+            hg.add_e_batch([(7, 8), (1, 7), (2, 3)], [{"relation": "study"}, None, {"relation": "x"}])
+            hg.remove_v(6)
+            hg.remove_e((2, 3, 4))
+            hg.update_v(3, {"name": "Carl"})
+            hg.add_e((1, 2, 3, 4, 5, 7, 8))
+            hg.remove_v(1)
+            assert hg.find_v(name="Ada") == set()
+            hg.add_e((1, 9))
+    assert indexed_state(hg) == before
+    assert hg.version > version
+    if intern_v:
+        assert hg._v_label == labels
+    # the hypergraph keeps working after a rollback
+    hg.add_v(7, {"name": "Alan"})
+    hg.add_e((1, 7), {"relation": "study"})
+    assert hg.find_e(relation="study") == {hg.encode_e((1, 7)), hg.encode_e((1, 3, 4, 5))}
+
+
+def test_transaction_rollback_random():
+    import random
+
+    random.seed(2)
+    for intern_v in (False, True):
+        hg = HypergraphDB(intern_v=intern_v)
+        hg.add_v_batch(range(30))
+        hg.add_e_batch(tuple(random.sample(range(30), random.randint(2, 4))) for _ in range(60))
+        for _ in range(20):
+            before = state(hg)
+            try:
+                with hg.transaction():
+                    for _ in range(15):
+                        op = random.random()
+                        if op < 0.3 and hg.num_v > 5:
+                            hg.remove_v(random.choice(list(hg.all_v)))
+                        elif op < 0.5 and hg.num_e:
+                            hg.remove_e(random.choice(list(hg.all_e)))
+                        elif op < 0.6:
+                            hg.add_v(random.randint(0, 40), {"x": random.random()})
+                        else:
+                            hg.add_e(random.sample(list(hg.all_v), 2), {"y": random.random()})
+                    if random.random() < 0.5:
+                        raise ValueError
+                committed = True
+            except ValueError:
+                committed = False
+            if not committed:
+                assert state(hg) == before
+
+
+def test_nested_transaction(hg):
+    with hg.transaction():
+        hg.add_v(7)
+        with pytest.raises(KeyError):
+            with hg.transaction():
+                hg.add_e((6, 7))
+                raise KeyError
+        assert hg.has_v(7) and not hg.has_e((6, 7))
+        hg.add_e((5, 7))
+    assert hg.nbr_v(7) == {5}
+    with pytest.raises(AssertionError):
+        with hg.transaction():
+            hg.save("never.hgdb")
+
+
+def test_transaction_wal(tmpdir):
+    file_path = str(tmpdir.join("wal.hgdb"))
+    hg = HypergraphDB(storage_file=file_path, wal=True)
+    hg.add_v_batch(range(5))
+    with hg.transaction():
+        hg.add_e((0, 1), {"relation": "knows"})
+        hg.add_e((1, 2, 3))
+        hg.remove_v(3)
+        hg.update_e((1, 2), {"relation": "shrunk"})
+    assert hg._wal_records == 2
+    with pytest.raises(ValueError):
+        with hg.transaction():
+            hg.add_e((0, 4))
+            raise ValueError
+    assert hg._wal_records == 2
+    hg.close()
+    hg2 = HypergraphDB(storage_file=file_path, wal=True)
+    assert hg2.all_e == hg.all_e == {(0, 1), (1, 2)}
+    assert hg2.e((1, 2)) == {"relation": "shrunk"}
+    hg2.close()
+
+
+@pytest.mark.parametrize("intern_v", [False, True])
+def test_snapshot(intern_v, tmpdir):
+    hg = HypergraphDB(intern_v=intern_v)
+    hg.add_v_batch(range(1, 7), [{"name": name} for name in ["Alice", "Bob", "Charlie", "David", "Eve", "Frank"]])
+    hg.add_e_batch([(1, 2), (1, 3), (2, 3, 4), (3, 4, 1, 5), (6, 5, 4), (1, 5, 6), (4, 5)])
+    hg.update_e((1, 3, 4, 5), {"relation": "study"})
+    hg.create_index("v", "name")
+    hg.create_index("e", "relation")
+    hg.create_index("v", None, kind="text")
+    hg.create_index("v", None, kind="degree")
+    snap = hg.snapshot()
+    assert isinstance(snap, HypergraphSnapshot) and hg.snapshot() is snap and snap.snapshot() is snap
+    before, all_e = indexed_state(snap), set(snap.all_e)
+    hg.add_v(7, {"name": "Alan"})
+    hg.add_v_batch([8, 1], [{"name": "Grace"}, {"name": "Ada"}])
+    hg.add_e_batch([(7, 8), (1, 7), (2, 3)], [{"relation": "study"}, None, {"relation": "x"}])
+    hg.remove_v(6)
+    hg.remove_e((2, 3, 4))
+    hg.update_v(3, {"name": "Carl"})
+    hg.update_e((4, 5), {"relation": "study"})
+    hg.add_e((1, 2, 3, 4, 5, 7, 8))
+    hg.create_index("e", "weight")
+    assert indexed_state(snap) == before and set(snap.all_e) == all_e
+    assert hg.find_v(name="Ada") == {1} and snap.find_v(name="Alice") == {1}
+    assert snap.version < hg.version and hg.snapshot() is not snap
+    assert snap.freeze().num_e == 7 and snap.subgraph([1, 2, 3]).num_e == 2
+    for mutation, args in [(snap.add_v, (9,)), (snap.remove_e, ((1, 2),)), (snap.create_index, ("v", "x"))]:
+        with pytest.raises(AssertionError):
+            mutation(*args)
+    with pytest.raises(AssertionError):
+        with snap.transaction():
+            pass
+    snap.save(str(tmpdir.join("snap.hgdb")))
+    assert HypergraphDB(storage_file=str(tmpdir.join("snap.hgdb"))).all_e == snap.all_e
+    with pytest.raises(AssertionError):
+        snap.save(hg.storage_file)
+
+
+def test_snapshot_random():
+    import random
+
+    random.seed(3)
+    for intern_v in (False, True):
+        hg = HypergraphDB(intern_v=intern_v)
+        hg.add_v_batch(range(30), ({"x": v % 3} for v in range(30)))
+        hg.add_e_batch(tuple(random.sample(range(30), random.randint(2, 4))) for _ in range(60))
+        hg.create_index("v", "x")
+        hg.create_index("v", None, kind="degree")
+        hg.create_index("v", None, kind="sorted")
+        snapshots = []
+        for step in range(300):
+            op = random.random()
+            if op < 0.05:
+                snap = hg.snapshot()
+                snapshots.append((snap, state(snap)))
+            elif op < 0.07 and snapshots:
+                snapshots.pop(random.randrange(len(snapshots)))
+            elif op < 0.2 and hg.num_v > 5:
+                hg.remove_v(random.choice(list(hg.all_v)))
+            elif op < 0.35 and hg.num_e:
+                hg.remove_e(random.choice(list(hg.all_e)))
+            elif op < 0.5:
+                hg.add_v(random.randint(0, 40), {"x": random.randint(0, 3)})
+            elif op < 0.6:
+                with pytest.raises(ValueError):
+                    with hg.transaction():
+                        hg.update_v(random.choice(list(hg.all_v)), {"x": -1})
+                        hg.add_e(random.sample(list(hg.all_v), 3))
+                        raise ValueError
+            else:
+                hg.add_e(random.sample(list(hg.all_v), random.randint(2, 4)), {"y": step})
+            if step % 20 == 0:
+                for snap, snap_state in snapshots:
+                    assert state(snap) == snap_state
+                    assert snap.find_v(x=1) == {v for v, data in snap_state[0].items() if data["x"] == 1}
+                    assert list(snap.iter_v_by_id()) == sorted(snap_state[0], key=str)
+                    assert [snap_state[3][v] for v in snap.iter_v_by_degree()] == sorted(snap_state[3].values())
+        snapshots.clear()
+        snap = None
+        hg.add_v(100)
+        # no snapshot is left, so writes no longer copy
+        assert hg._owned_inci is None and hg._versions is None
+
+
+@pytest.mark.parametrize("intern_v", [False, True])
+def test_snapshot_copies_touched_records(intern_v):
+    hg = HypergraphDB(intern_v=intern_v)
+    hg.add_v_batch(range(50), ({"x": v % 5, "name": f"v{v}"} for v in range(50)))
+    hg.add_e_batch([(v, v + 1) for v in range(49)], ({"w": v} for v in range(49)))
+    for field, kind in (("x", "sorted"), ("name", "text"), (None, "sorted"), (None, "degree"), (None, "text")):
+        hg.create_index("v", field, kind=kind)
+    tables = {
+        name: getattr(hg, name) for name in ("_v_data", "_v_inci", "_v_index", "_e_data", "_e_tuple", "_e_index")
+    }
+    untouched = hg._e_data[10], hg._v_inci[hg._v_key(30)]
+    snap = hg.snapshot()
+    before = (
+        state(snap),
+        snap.range_v("x", 1, 2),
+        set(snap.search_v("v1")),
+        list(snap.iter_v_by_id()),
+        list(snap.iter_v_by_degree()),
+    )
+    hg.update_e((0, 1), {"w": -1})
+    hg.remove_v(3)
+    hg.add_v(60, {"x": 9, "name": "v60"})
+    hg.add_e((60, 7), {"w": 60})
+    hg.remove_e((20, 21))
+    # the tables are written in place and only the touched records are copied
+    assert all(getattr(hg, name) is table for name, table in tables.items())
+    assert hg._e_data[10] is untouched[0] and hg._v_inci[hg._v_key(30)] is untouched[1]
+    assert snap.e((0, 1)) == {"w": 0} and hg.e((0, 1)) == {"w": -1}
+    after = (
+        state(snap),
+        snap.range_v("x", 1, 2),
+        set(snap.search_v("v1")),
+        list(snap.iter_v_by_id()),
+        list(snap.iter_v_by_degree()),
+    )
+    assert after == before
+    assert snap.has_v(3) and not snap.has_v(60) and snap.has_e((20, 21))
+
+
+def test_snapshot_copies():
+    hg = HypergraphDB()
+    hg.add_v_batch(range(4))
+    hg.add_e_batch([(0, 1), (1, 2)], [{"w": 1}, {"w": 2}])
+    e_view = hg.edge_subgraph([(0, 1)])
+    snap = hg.snapshot()
+    hg.update_e((0, 1), {"w": 3})
+    # the hyperedge data was copied on write, the edge view still follows the hyperedge
+    assert hg.e((0, 1)) is not snap.e((0, 1)) and snap.e((0, 1)) == {"w": 1}
+    assert e_view.has_e((0, 1)) and e_view.e((0, 1)) == {"w": 3}
+    # the copy is owned by the hypergraph until the next snapshot
+    data = hg.e((0, 1))
+    hg.update_e((0, 1), {"w": 4})
+    assert hg.e((0, 1)) is data
+    for copied in (pickle.loads(pickle.dumps(hg)), copy.deepcopy(hg)):
+        assert copied == hg and not copied._snapshots
+        copied.add_e((2, 3))
+    assert not snap.has_e((2, 3)) and not hg.has_e((2, 3))
+
+
+def test_snapshot_concurrent_writes():
+    hg = HypergraphDB()
+    hg.add_v("a")
+    errors = []
+
+    def writer():
+        try:
+            for i in range(500):
+                with hg.transaction():
+                    hg.add_v(f"v{i}", {"i": i})
+                    hg.add_e(("a", f"v{i}"))
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            for _ in range(50):
+                snap = hg.snapshot()
+                num_v, num_e = snap.num_v, snap.num_e
+                assert num_e == num_v - 1
+                # the snapshot does not change while the writer goes on
+                assert snap.degree_v("a") == num_e and len(snap.nbr_v("a")) == num_e
+                assert all(snap.v(v)["i"] == int(v[1:]) for v in snap.all_v if v != "a")
+                assert (snap.num_v, snap.num_e) == (num_v, num_e)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert hg.num_e == 500 and hg.degree_v("a") == 500
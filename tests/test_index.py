@@ -0,0 +1,472 @@
+import random
+
+import pytest
+
+from hyperdb import HypergraphDB
+from hyperdb.base import BaseHypergraphDB
+from hyperdb.index import AttributeIndex, DegreeIndex, IdIndex, TextIndex
+
+
+@pytest.fixture(params=[False, True], ids=["plain", "interned"])
+def hg(request):
+    bd = HypergraphDB(intern_v=request.param)
+    bd.add_v(1, {"name": "Alice", "type": "person", "age": 30})
+    bd.add_v(2, {"name": "Bob", "type": "person", "age": 25})
+    bd.add_v(3, {"name": "Paris", "type": "place"})
+    bd.add_v(4, {"name": "Dave", "type": "person", "age": 41})
+    bd.add_e((1, 2), {"relation": "knows", "year": 2019})
+    bd.add_e((1, 3), {"relation": "visited", "year": 2021})
+    bd.add_e((2, 3, 4), {"relation": "visited", "year": 2020})
+    bd.add_e((1, 2, 4), {"relation": "team"})
+    return bd
+
+
+def scan_v(hg, **conditions):
+    return {v for v in hg.all_v if all(k in hg.v(v) and hg.v(v)[k] == val for k, val in conditions.items())}
+
+
+def scan_e(hg, **conditions):
+    return {e for e in hg.all_e if all(k in hg.e(e) and hg.e(e)[k] == val for k, val in conditions.items())}
+
+
+def test_find_and_range(hg):
+    hg.create_index("v", "type")
+    hg.create_index("v", "age", kind="sorted")
+    hg.create_index("e", "year", kind="sorted")
+    assert hg.indexes == {"v": {"type": "hash", "age": "sorted"}, "e": {"year": "sorted"}}
+    assert hg.find_v(type="person") == {1, 2, 4}
+    assert hg.find_v(type="person", age=25) == {2}
+    assert hg.find_v(type="person", name="Dave") == {4}
+    assert hg.find_v(type="animal") == set()
+    assert hg.range_v("age", 26) == [1, 4]
+    assert hg.range_v("age", hi=30) == [2, 1]
+    assert hg.range_v("age") == [2, 1, 4]
+    assert hg.range_e("year", 2020, 2021) == [(2, 3, 4), (1, 3)]
+    # conditions on fields without an index are scanned
+    assert hg.find_e(relation="visited") == {(1, 3), (2, 3, 4)}
+    assert hg.query_v({"type": "place"}) == [3]
+    assert hg.query_e({"relation": "team"}) == [(1, 2, 4)]
+    with pytest.raises(AssertionError):
+        hg.range_v("type")
+    with pytest.raises(AssertionError):
+        hg.find_v()
+    with pytest.raises(AssertionError):
+        hg.create_index("x", "type")
+    hg.drop_index("v", "type")
+    assert hg.find_v(type="person") == {1, 2, 4}
+    with pytest.raises(AssertionError):
+        hg.drop_index("v", "type")
+
+
+def test_indexes_follow_mutations(hg):
+    hg.create_index("v", "type")
+    hg.create_index("v", "age", kind="sorted")
+    hg.create_index("e", "relation")
+    hg.create_index("e", "year", kind="sorted")
+    hg.add_v(5, {"type": "person", "age": 30})
+    hg.add_v(3, {"type": "city"})
+    hg.update_v(2, {"age": 50})
+    hg.add_v_batch([6, 1], [{"type": "place"}, {"type": "robot"}])
+    assert hg.find_v(type="person") == {2, 4, 5}
+    assert hg.find_v(type="robot") == {1}
+    assert [hg.v(v)["age"] for v in hg.range_v("age", 30, 45)] == [30, 30, 41]
+    assert hg.range_v("age", 45) == [2]
+
+    hg.add_e((1, 2), {"relation": "married"})
+    hg.update_e((1, 3), {"year": 1999})
+    hg.add_e_batch([(5, 6), (2, 3, 4)], [{"relation": "knows", "year": 2020}, {"year": 2030}])
+    assert hg.find_e(relation="knows") == {(5, 6)}
+    assert hg.range_e("year", hi=2020) == [(1, 3), (1, 2), (5, 6)]
+
+    hg.remove_e((5, 6))
+    assert hg.find_e(relation="knows") == set()
+    # removing vertex 3 drops (1, 3) and shrinks (2, 3, 4) to (2, 4)
+    hg.remove_v(3)
+    assert hg.find_v(type="city") == set()
+    assert hg.range_e("year") == [(1, 2), (2, 4)]
+    # removing vertex 4 shrinks (1, 2, 4) onto the existing (1, 2), whose data it replaces
+    hg.remove_v(4)
+    assert hg.find_e(relation="team") == {(1, 2)}
+    assert hg.find_e(relation="married") == set()
+    assert hg.range_e("year") == []
+    assert set(hg.range_v("age")) == {1, 2, 5}
+
+
+def test_random_mutations_match_scan():
+    random.seed(1)
+    hg = HypergraphDB()
+    hg.create_index("v", "color")
+    hg.create_index("v", "size", kind="sorted")
+    hg.create_index("e", "color", kind="sorted")
+    colors = ["red", "green", "blue"]
+    for step in range(2000):
+        op = random.random()
+        if op < 0.3 or hg.num_v < 5:
+            hg.add_v(random.randrange(60), {"color": random.choice(colors), "size": random.randrange(10)})
+        elif op < 0.6:
+            hg.add_e(random.sample(sorted(hg.all_v), random.randint(2, 4)), {"color": random.choice(colors)})
+        elif op < 0.7:
+            hg.update_v(random.choice(sorted(hg.all_v)), {"size": random.randrange(10)})
+        elif op < 0.8 and hg.num_e:
+            hg.update_e(random.choice(sorted(hg.all_e)), {"color": random.choice(colors)})
+        elif op < 0.9 and hg.num_e:
+            hg.remove_e(random.choice(sorted(hg.all_e)))
+        else:
+            hg.remove_v(random.choice(sorted(hg.all_v)))
+    for color in colors:
+        assert hg.find_v(color=color) == scan_v(hg, color=color)
+        assert hg.find_e(color=color) == scan_e(hg, color=color)
+    in_range = hg.range_v("size", 3, 6)
+    assert set(in_range) == {v for v in hg.all_v if 3 <= hg.v(v)["size"] <= 6}
+    assert [hg.v(v)["size"] for v in in_range] == sorted(hg.v(v)["size"] for v in in_range)
+    assert [hg.e(e)["color"] for e in hg.range_e("color")] == sorted(hg.e(e)["color"] for e in hg.all_e)
+
+
+def test_indexes_are_saved_and_logged(hg, tmpdir):
+    storage_file = str(tmpdir.join("hg.hgdb"))
+    hg.create_index("v", "type")
+    hg.create_index("e", "year", kind="sorted")
+    hg.save(storage_file)
+    hg2 = HypergraphDB(storage_file=storage_file)
+    assert hg2.indexes == hg.indexes
+    assert hg2.find_v(type="person") == {1, 2, 4}
+    hg2.add_v(5, {"type": "person"})
+    assert hg2.find_v(type="person") == {1, 2, 4, 5}
+
+    wal_file = str(tmpdir.join("wal.hgdb"))
+    hg3 = HypergraphDB(storage_file=wal_file, wal=True, intern_v=hg.intern_v)
+    hg3.add_v(1, {"type": "person"})
+    hg3.create_index("v", "type")
+    hg3.add_v(2, {"type": "person"})
+    hg3.close()
+    hg4 = HypergraphDB(storage_file=wal_file, wal=True)
+    assert hg4.indexes == {"v": {"type": "hash"}, "e": {}}
+    assert hg4.find_v(type="person") == {1, 2}
+    hg4.close()
+
+
+def test_indexes_are_emptied_on_import(hg, tmpdir):
+    hg.create_index("v", "type")
+    hif_file = str(tmpdir.join("hg.hif.json"))
+    other = HypergraphDB()
+    other.add_v("x", {"type": "person"})
+    other.add_v("y", {"type": "place"})
+    other.add_e(("x", "y"))
+    assert other.save_as_hif(hif_file)
+    assert hg.load_from_hif(hif_file)
+    assert hg.find_v(type="person") == {"x"}
+
+
+def test_attribute_index_values():
+    index = AttributeIndex("f", ordered=True)
+    index.add("a", {"f": 2})
+    index.add("b", {"f": [1]})  # unhashable, a candidate of every lookup
+    index.add("c", {"f": "text"})  # not comparable with the numbers, found by value only
+    index.add("d", {"g": 1})
+    index.add("e", {"f": 1.5})
+    assert index.find(2) == {"a", "b"}
+    assert index.find([1]) == {"b"} and index.unhashable == {"b"}
+    assert index.find("text") == {"c", "b"}
+    assert list(index.range()) == ["e", "a"]
+    index.remove("c", {"f": "text"})
+    index.remove("b", {"f": [1]})
+    assert index.find(2) == {"a"} and not index.unhashable
+    index.remove("a", {"f": 2})
+    assert list(index.range()) == ["e"]
+    assert index.buckets == {1.5: {"e"}}
+
+
+def test_find_unhashable_values():
+    hg = HypergraphDB()
+    hg.add_v(1, {"tags": ["a"], "set": {1}})
+    hg.add_v(2, {"tags": ("a",), "set": frozenset({1})})
+    hg.add_v(3, {"tags": "a", "set": 1})
+    hg.add_e((1, 2), {"tags": ["a"]})
+    expected = [hg.find_v(tags=["a"]), hg.find_v(tags=("a",)), hg.find_v(set={1}), hg.find_v(set=frozenset({1}))]
+    assert expected == [{1}, {2}, {1, 2}, {1, 2}]
+    for field in ("tags", "set"):
+        hg.create_index("v", field, kind="sorted")
+    hg.create_index("e", "tags")
+    # indexing a field does not change the results, whether the stored or the queried values can be hashed
+    assert [
+        hg.find_v(tags=["a"]),
+        hg.find_v(tags=("a",)),
+        hg.find_v(set={1}),
+        hg.find_v(set=frozenset({1})),
+    ] == expected
+    assert hg.find_v(tags=["a"], set={1}) == {1} and hg.find_v(tags="a") == {3}
+    assert hg.find_e(tags=["a"]) == {(1, 2)} and hg.find_e(tags=("a",)) == set()
+    hg.update_v(1, {"tags": "b"})
+    assert hg.find_v(tags=["a"]) == set() and hg.find_v(tags="b") == {1}
+    assert hg._v_indexes["tags"].unhashable == set() and hg._v_indexes["set"].unhashable == {1}
+
+
+def test_attribute_index_build():
+    index = AttributeIndex("f", ordered=True)
+    index.build([("a", {"f": 3}), ("b", {"f": 1}), ("c", {"f": 3}), ("d", {"g": 0}), ("e", {"f": {}})])
+    assert index.values == [1, 3]
+    assert sorted(index.range(2)) == ["a", "c"]
+    mixed = AttributeIndex("f", ordered=True)
+    mixed.build([("a", {"f": 2}), ("b", {"f": "x"}), ("c", {"f": 1})])
+    assert mixed.find("x") == {"b"}
+    assert list(mixed.range()) == ["c", "a"]
+    assert mixed.ordered
+
+
+def test_text_index_search():
+    index = TextIndex("name")
+    index.build([(1, {"name": "Alice Smith"}), (2, {"name": "alina"}), (3, {"name": 3}), (4, {"other": "al"})])
+    index.add_text(5, "Malik")
+    assert index.search("AL") == {1, 2, 5}
+    assert index.search("ali") == {1, 2, 5}
+    assert index.search("alice s") == {1}
+    assert index.search("ce sm") == {1}
+    assert index.search("alx") == set()
+    assert index.search("al", prefix=True) == {1, 2}
+    assert index.search("alice", prefix=True) == {1}
+    assert index.search("lice", prefix=True) == set()
+    index.remove(1, {"name": "Alice Smith"})
+    index.remove_text(3)
+    assert index.search("li") == {2, 5}
+    index.remove_text(2)
+    index.remove_text(5)
+    assert index.grams == index.prefixes == index.texts == {}
+
+
+def test_text_index_matches_scan():
+    random.seed(2)
+    words = ["".join(random.choice("abcab ") for _ in range(random.randint(0, 12))) for _ in range(300)]
+    index = TextIndex(None)
+    for key, word in enumerate(words):
+        index.add_text(key, word)
+    for query in ["a", "ab", "b a", "abca", "cab a", "bbbb", "c"]:
+        assert index.search(query) == {key for key, word in enumerate(words) if query in word}
+        assert index.search(query, prefix=True) == {key for key, word in enumerate(words) if word.startswith(query)}
+
+
+def test_search_v(hg):
+    weights = {None: 3, "type": 2, "name": 1}
+    scan = BaseHypergraphDB.search_v(hg, "P", weights)
+    assert scan == {1: 2, 2: 2, 3: 3, 4: 2}
+    assert hg.search_v("P", weights) == scan
+    assert hg.search_v("1") == {1: 1}
+    hg.create_index("v", None, kind="text")
+    hg.create_index("v", "type", kind="text")
+    hg.create_index("v", "name", kind="text")
+    assert hg.indexes["v"] == {None: ("text",), "type": "text", "name": "text"}
+    assert hg.search_v("P", weights) == scan
+    assert hg.search_v("pa", weights, prefix=True) == {3: 1}
+    # a text index does not answer equality conditions
+    assert hg.find_v(name="Bob") == {2}
+
+    hg.add_v(12, {"name": "Pam"})
+    hg.update_v(2, {"name": "Rob"})
+    hg.add_v_batch([13, 3], [{"type": "planet"}, {"type": "city"}])
+    hg.remove_v(4)
+    expected = BaseHypergraphDB.search_v(hg, "P", weights)
+    assert expected == {1: 2, 2: 2, 3: 1, 12: 1, 13: 2}
+    assert hg.search_v("P", weights) == expected
+    assert hg.search_v("1", weights) == {1: 3, 12: 3, 13: 3}
+    hg.drop_index("v", None)
+    assert None not in hg.indexes["v"]
+    assert hg.search_v("1", weights) == {1: 3, 12: 3, 13: 3}
+    with pytest.raises(AssertionError):
+        hg.create_index("e", None, kind="text")
+    with pytest.raises(AssertionError):
+        hg.search_v("")
+
+
+def test_text_indexes_are_saved_and_logged(tmpdir):
+    wal_file = str(tmpdir.join("wal.hgdb"))
+    hg = HypergraphDB(storage_file=wal_file, wal=True, intern_v=True)
+    hg.add_v("alpha", {"description": "first letter"})
+    hg.create_index("v", None, kind="text")
+    hg.create_index("v", "description", kind="text")
+    hg.add_v("beta", {"description": "second letter"})
+    hg.close()
+    hg2 = HypergraphDB(storage_file=wal_file, wal=True)
+    assert hg2.indexes["v"] == {None: ("text",), "description": "text"}
+    assert hg2.search_v("ETA") == {"beta": 1}
+    assert hg2.search_v("letter", {"description": 1}) == {"alpha": 1, "beta": 1}
+    hg2.checkpoint()
+    hg2.close()
+    hg3 = HypergraphDB(storage_file=wal_file)
+    assert hg3.search_v("al") == {"alpha": 1}
+
+
+def test_degree_index():
+    random.seed(4)
+    index = DegreeIndex()
+    degrees = {}
+    for step in range(3000):
+        key = random.randrange(300)
+        if key not in degrees:
+            degrees[key] = random.choice([0, 1, 2, 70, 200])
+            index.add(key, degrees[key])
+        elif random.random() < 0.2:
+            index.remove(key, degrees.pop(key))
+        else:
+            new = max(0, degrees[key] + random.choice([-1, 1, 1, 64]))
+            index.move(key, degrees[key], new)
+            degrees[key] = new
+    assert len(index) == len(degrees)
+    ordered = sorted(degrees.values())
+    for lo, hi in [(0, None), (0, 1), (2, 100), (65, 500), (1000, None), (3, 2)]:
+        expected = [d for d in ordered if lo <= d and (hi is None or d <= hi)]
+        assert index.count(lo, hi) == len(expected)
+        for start in [0, 1, len(expected) // 2, len(expected) - 1, len(expected)]:
+            keys = list(index.iter(lo, hi, start))
+            assert [degrees[key] for key in keys] == expected[start:]
+            keys = list(index.iter(lo, hi, start, descending=True))
+            assert [degrees[key] for key in keys] == expected[::-1][start:]
+    assert sorted(index.iter()) == sorted(degrees)
+
+
+def test_id_index():
+    random.seed(5)
+    index = IdIndex()
+    texts = {}
+    for step in range(12000):
+        key = random.randrange(6000)
+        if key in texts:
+            index.remove_text(key)
+            del texts[key]
+        else:
+            # some keys share their text, like the ids 1 and "1"
+            texts[key] = str(key % 5000)
+            index.add_text(key, texts[key])
+    assert len(index.blocks) > 1
+    ordered = sorted(texts, key=lambda key: texts[key])
+    assert [texts[key] for key in index.iter()] == [texts[key] for key in ordered]
+    for start in [0, 1, 500, len(texts) - 1, len(texts)]:
+        keys = list(index.iter(start))
+        assert [texts[key] for key in keys] == [texts[key] for key in ordered[start:]]
+        assert len(set(keys)) == len(keys)
+        keys = list(index.iter(start, descending=True))
+        assert [texts[key] for key in keys] == [texts[key] for key in ordered[::-1][start:]]
+        assert len(set(keys)) == len(keys)
+    for text in ["", "10", "999", "zz"]:
+        assert index.rank(text) == sum(t < text for t in texts.values())
+        assert index.rank(text, after=True) == sum(t <= text for t in texts.values())
+
+
+def test_vertex_order_indexes(hg, tmpdir):
+    hg.create_index("v", None, kind="degree")
+    hg.create_index("v", None, kind="sorted")
+    assert hg.indexes["v"] == {None: ("degree", "sorted")}
+    hg.add_v(0)
+    hg.add_v(10, {"name": "Erin"})
+    hg.add_e((10, 3))
+    hg.remove_e((1, 3))
+    assert [hg.degree_v(v) for v in hg.iter_v_by_degree()] == [0, 1, 2, 2, 2, 3]
+    assert list(hg.iter_v_by_degree(descending=True, start=4)) == [10, 0]
+    assert set(hg.iter_v_by_degree(2, 2)) == {1, 3, 4} and hg.count_v_by_degree(2, 2) == 3
+    assert list(hg.iter_v_by_id()) == [0, 1, 10, 2, 3, 4]
+    assert list(hg.iter_v_by_id(2, descending=True)) == [2, 10, 1, 0]
+    assert list(hg.iter_v_by_id(after="10")) == [2, 3, 4]
+    assert list(hg.iter_v_by_id(descending=True, after="2")) == [10, 1, 0]
+    assert hg.rank_v_by_id(2) == 3 and hg.rank_v_by_id("11") == 3
+    # removing 3 drops (10, 3) and shrinks (2, 3, 4) onto (2, 4)
+    hg.remove_v(3)
+    assert sorted(hg.iter_v_by_degree(1)) == [1, 2, 4]
+    assert sorted(hg.iter_v_by_degree(hi=1)) == [0, 10]
+
+    storage_file = str(tmpdir.join("hg.hgdb"))
+    hg.save(storage_file)
+    hg2 = HypergraphDB(storage_file=storage_file)
+    assert list(hg2.iter_v_by_id()) == [0, 1, 10, 2, 4]
+    hg2.drop_index("v", None, kind="sorted")
+    assert hg2.indexes["v"] == {None: ("degree",)}
+    with pytest.raises(AssertionError):
+        hg2.iter_v_by_id()
+    hg2.drop_index("v", None)
+    with pytest.raises(AssertionError):
+        hg2.count_v_by_degree()
+    with pytest.raises(AssertionError):
+        hg2.drop_index("v", None)
+    with pytest.raises(AssertionError):
+        hg2.create_index("v", "name", kind="degree")
+
+
+def test_index_copies():
+    import copy
+
+    random.seed(6)
+    words = ["".join(random.choice("abc") for _ in range(random.randint(1, 6))) for _ in range(200)]
+    records = {key: {"f": word} for key, word in enumerate(words)}
+    indexes = [AttributeIndex("f", ordered=True), TextIndex("f"), IdIndex(), DegreeIndex()]
+    for key, data in records.items():
+        for index in indexes[:2]:
+            index.add(key, data)
+        indexes[2].add_text(key, data["f"])
+        indexes[3].add(key, len(data["f"]))
+    before = copy.deepcopy(indexes)
+    copies = [index.copy() for index in indexes]
+    for key in random.sample(list(records), 100):
+        data = records.pop(key)
+        for index in copies[:2]:
+            index.remove(key, data)
+        copies[2].remove_text(key)
+        copies[3].remove(key, len(data["f"]))
+    for key in range(200, 300):
+        data = records[key] = {"f": random.choice(words)}
+        for index in copies[:2]:
+            index.add(key, data)
+        copies[2].add_text(key, data["f"])
+        copies[3].add(key, len(data["f"]))
+    # the copied indexes did not change
+    assert all(index == old for index, old in zip(indexes, before))
+    assert copies[0].find("ab") == {key for key, data in records.items() if data["f"] == "ab"}
+    assert copies[1].search("ab") == {key for key, data in records.items() if "ab" in data["f"]}
+    assert [records[key]["f"] for key in copies[2].iter()] == sorted(data["f"] for data in records.values())
+    assert copies[3].count(3, 3) == sum(len(data["f"]) == 3 for data in records.values())
+
+
+def test_index_snapshots():
+    import copy
+    import pickle
+
+    random.seed(7)
+    words = ["".join(random.choice("abc") for _ in range(random.randint(1, 6))) for _ in range(200)]
+    records = {key: {"f": word} for key, word in enumerate(words)}
+    index_types = [lambda: AttributeIndex("f", ordered=True), lambda: TextIndex("f"), IdIndex, DegreeIndex]
+    indexes = [make() for make in index_types]
+
+    def add(key, data):
+        for index in indexes[:2]:
+            index.add(key, data)
+        indexes[2].add_text(key, data["f"])
+        indexes[3].add(key, len(data["f"]))
+
+    def remove(key, data):
+        for index in indexes[:2]:
+            index.remove(key, data)
+        indexes[2].remove_text(key)
+        indexes[3].remove(key, len(data["f"]))
+
+    for key, data in records.items():
+        add(key, data)
+    snapshots = []
+    for step in range(6):
+        snapshots.append(([index.snapshot() for index in indexes], copy.deepcopy(indexes)))
+        for key in random.sample(list(records), 30):
+            remove(key, records.pop(key))
+        for key in range(200 + 30 * step, 230 + 30 * step):
+            records[key] = {"f": random.choice(words)}
+            add(key, records[key])
+        for key in random.sample(list(records), 10):
+            indexes[3].move(key, len(records[key]["f"]), len(records[key]["f"]) + 1)
+            indexes[3].move(key, len(records[key]["f"]) + 1, len(records[key]["f"]))
+    for snaps, before in snapshots:
+        # the snapshots did not change, and pickle to plain indexes
+        assert snaps == before
+        assert pickle.loads(pickle.dumps(snaps)) == before
+        assert sorted(snaps[0].range("a", "b")) == sorted(before[0].range("a", "b"))
+        assert snaps[1].search("ab") == before[1].search("ab")
+        assert list(snaps[2].iter(5, descending=True)) == list(before[2].iter(5, descending=True))
+        assert list(snaps[3].iter(2, 4)) == list(before[3].iter(2, 4))
+    assert indexes[0].find("ab") == {key for key, data in records.items() if data["f"] == "ab"}
+    assert [records[key]["f"] for key in indexes[2].iter()] == sorted(data["f"] for data in records.values())
+    for index in indexes:
+        index.unshare()
+    assert pickle.loads(pickle.dumps(indexes)) == indexes
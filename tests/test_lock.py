@@ -0,0 +1,94 @@
+import copy
+import pickle
+import threading
+import time
+
+import pytest
+
+from hyperdb import HypergraphDB
+from hyperdb.lock import RWLock
+
+
+def test_readers_share_the_lock():
+    lock = RWLock()
+    inside, release = threading.Barrier(3), threading.Event()
+
+    def reader():
+        with lock.read():
+            inside.wait(timeout=5)
+            release.wait(timeout=5)
+
+    threads = [threading.Thread(target=reader) for _ in range(2)]
+    for t in threads:
+        t.start()
+    # both readers hold the lock at the same time
+    inside.wait(timeout=5)
+    release.set()
+    for t in threads:
+        t.join()
+
+
+def test_writer_excludes_readers_and_takes_precedence():
+    lock, events = RWLock(), []
+    lock.acquire_read()
+
+    def writer():
+        with lock.write():
+            events.append("write")
+
+    def reader():
+        with lock.read():
+            events.append("read")
+
+    w = threading.Thread(target=writer)
+    w.start()
+    time.sleep(0.05)
+    r = threading.Thread(target=reader)
+    r.start()
+    time.sleep(0.05)
+    # the writer waits for the first reader, and the second reader waits for the writer
+    assert events == []
+    lock.release_read()
+    w.join()
+    r.join()
+    assert events == ["write", "read"]
+
+
+def test_reentrancy():
+    lock = RWLock()
+    with lock.write():
+        with lock.write():
+            with lock.read():
+                with lock.write():
+                    pass
+    with lock.read():
+        with lock.read():
+            with pytest.raises(AssertionError):
+                lock.acquire_write()
+    # the lock is released again
+    with lock.write():
+        pass
+    with pytest.raises(AssertionError):
+        lock.release_read()
+
+
+def test_mutations_wait_for_readers():
+    hg = HypergraphDB()
+    hg.add_v(1)
+    t = threading.Thread(target=hg.add_v, args=(2,))
+    with hg.lock.read():
+        t.start()
+        time.sleep(0.05)
+        assert hg.num_v == 1
+    t.join()
+    assert hg.num_v == 2
+
+
+def test_lock_is_not_copied():
+    hg = HypergraphDB()
+    hg.add_v(1)
+    with hg.lock.write():
+        for hg2 in (copy.deepcopy(hg), pickle.loads(pickle.dumps(hg))):
+            assert hg2 == hg
+            assert hg2.lock is not hg.lock
+            hg2.add_v(2)
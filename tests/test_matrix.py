@@ -0,0 +1,91 @@
+import pytest
+
+from hyperdb import COOMatrix
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+
+@pytest.fixture
+def hg(hg):
+    hg.update_e((1, 2), {"weight": 2})
+    hg.update_e((1, 3, 4, 5), {"weight": 0.5})
+    return hg
+
+
+def dense_operators(hg):
+    v_pos = {v: i for i, v in enumerate(hg.all_v)}
+    e_list = list(hg.all_e)
+    h = np.zeros((hg.num_v, hg.num_e))
+    for j, e in enumerate(e_list):
+        for v in e:
+            h[v_pos[v], j] = 1
+    w = np.diag([hg.e(e).get("weight", 1.0) for e in e_list])
+    d_v = h @ w @ np.ones(hg.num_e)
+    d_e = h.sum(axis=0)
+    inv_sqrt = np.diag([1 / np.sqrt(d) if d else 0 for d in d_v])
+    inv = np.diag([1 / d if d else 0 for d in d_v])
+    propagation = h @ w @ np.diag(1 / d_e) @ h.T
+    adjacency = h @ w @ h.T
+    np.fill_diagonal(adjacency, 0)
+    return {
+        "incidence": h,
+        "laplacian": np.eye(hg.num_v) - inv_sqrt @ propagation @ inv_sqrt,
+        "clique_adjacency": adjacency,
+        "random_walk": inv @ propagation,
+        "degrees": (d_v, d_e),
+    }
+
+
+def operators(hg, backend):
+    return {
+        "incidence": hg.incidence_matrix(backend),
+        "laplacian": hg.laplacian(backend),
+        "clique_adjacency": hg.clique_adjacency(backend),
+        "random_walk": hg.random_walk_matrix(backend),
+    }
+
+
+def to_dense(m):
+    return np.array(m.to_dense()) if isinstance(m, COOMatrix) else m.toarray()
+
+
+def test_operators(hg):
+    expected = dense_operators(hg)
+    for backend in ("scipy", "coo"):
+        for name, m in operators(hg, backend).items():
+            assert np.allclose(to_dense(m), expected[name]), (backend, name)
+        d_v, d_e = hg.degree_vectors(backend)
+        assert np.allclose(d_v, expected["degrees"][0]) and list(d_e) == list(expected["degrees"][1])
+    assert isinstance(hg.laplacian("coo"), COOMatrix)
+    assert not isinstance(hg.laplacian(), COOMatrix)
+    # the isolated vertex 9 has an identity row in the Laplacian and a zero row in the random walk
+    walk = to_dense(hg.random_walk_matrix())
+    assert np.allclose(walk.sum(axis=1), [1, 1, 1, 1, 1, 1, 1, 1, 0])
+    assert to_dense(hg.laplacian())[8, 8] == 1
+    with pytest.raises(AssertionError):
+        hg.laplacian("dense")
+
+
+def test_coo_matrix(hg):
+    m = hg.clique_adjacency("coo")
+    assert m.nnz == hg.clique_adjacency().nnz
+    x = list(range(hg.num_v))
+    assert np.allclose(m.dot(x), hg.clique_adjacency() @ np.array(x))
+    assert np.allclose(m.to_scipy().toarray(), to_dense(m))
+    with pytest.raises(AssertionError):
+        m.dot([1.0])
+
+
+def test_operator_cache(hg):
+    laplacian = hg.laplacian()
+    assert hg.laplacian() is laplacian and hg.laplacian("coo") is hg.laplacian("coo")
+    hg.update_e((1, 2), {"weight": 1})
+    assert hg.laplacian() is not laplacian
+    assert np.allclose(to_dense(hg.laplacian()), dense_operators(hg)["laplacian"])
+    hg.add_e((6, 9))
+    assert hg.laplacian().shape == (9, 9) and hg.incidence_matrix().shape == (9, 8)
+    assert np.allclose(to_dense(hg.random_walk_matrix("coo")).sum(axis=1), 1)
+    hg.update_e((6, 9), {"weight": -1})
+    with pytest.raises(AssertionError):
+        hg.laplacian()
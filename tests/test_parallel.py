@@ -0,0 +1,70 @@
+import multiprocessing as mp
+
+import pytest
+
+from hyperdb import FrozenHypergraph, SharedHypergraph
+
+
+@pytest.fixture
+def hg(hg):
+    hg.add_v(10, {"name": "hub"})
+    hg.add_e((1, 10))
+    return hg
+
+
+def features(g, v_id):
+    return g.degree_v(v_id), g.nbr_v(v_id), g.v(v_id)["name"], len(g.k_hop(v_id, 2).all_e)
+
+
+def test_parallel_map(hg):
+    expected = [features(hg, v_id) for v_id in hg.all_v]
+    assert hg.parallel_map(features, workers=1) == expected
+    assert hg.parallel_map(features, workers=3) == expected
+    assert hg.parallel_map(features, workers=2, chunksize=1) == expected
+    # results follow the order of the vertices asked for, repeats included
+    v_ids = [9, 10, 4, 1, 4]
+    assert hg.parallel_map(features, v_ids, workers=2) == [features(hg, v_id) for v_id in v_ids]
+    assert hg.parallel_map(features, [], workers=2) == []
+    with pytest.raises(AssertionError):
+        hg.parallel_map(features, [1, 11], workers=2)
+    with pytest.raises(AssertionError):
+        hg.parallel_map(features, workers=0)
+
+
+def test_shared_hypergraph(hg):
+    with hg.share() as shared:
+        assert isinstance(shared, SharedHypergraph)
+        # the workers only see the hypergraph as it was shared
+        hg.add_e((8, 9))
+        degrees = shared.map(lambda g, v_id: g.degree_v(v_id), [8, 9], workers=2)
+        assert degrees == [1, 0]
+        assert shared.map(lambda g, v_id: isinstance(g, FrozenHypergraph), [1, 2], workers=2) == [True, True]
+        # the block can be read by any process, like a columnar file
+        g = FrozenHypergraph.from_buffer(shared._shm.buf)
+        assert set(g.all_v) == set(hg.all_v) and g.num_e == hg.num_e - 1
+        assert g.nbr_v(10) == {1} and g.v(3) == {"name": "3"}
+        del g
+    assert shared.closed
+    shared.close()
+    with pytest.raises(AssertionError):
+        shared.map(features, workers=2)
+    with pytest.raises(AssertionError):
+        FrozenHypergraph.from_buffer(bytes(256))
+
+
+def test_parallel_map_errors(hg):
+    def fail(g, v_id):
+        assert v_id != 5, "five"
+        return v_id
+
+    with pytest.raises(AssertionError, match="five"):
+        hg.parallel_map(fail, workers=2)
+
+
+@pytest.mark.skipif("spawn" not in mp.get_all_start_methods(), reason="spawn is not available")
+def test_parallel_map_spawn(hg):
+    view = hg.subgraph([1, 2, 3, 4, 5])
+    frozen = hg.freeze()
+    expected = [features(view, v_id) for v_id in view.all_v]
+    assert view.parallel_map(features, workers=2, context="spawn") == expected
+    assert frozen.parallel_map(features, [1, 7], workers=2, context="spawn") == [features(hg, 1), features(hg, 7)]
@@ -0,0 +1,107 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from hyperdb import HypergraphDB
+from hyperdb.server import AsyncHypergraphServer
+
+
+@pytest.fixture
+def hg():
+    bd = HypergraphDB()
+    bd.add_v("a", {"entity_type": "person", "description": "Alice"})
+    bd.add_v("b", {"entity_type": "person", "description": "Bob"})
+    bd.add_v("c", {"entity_type": "place", "description": "Paris"})
+    bd.add_e(("a", "b"), {"relation": "knows"})
+    bd.add_e(("a", "b", "c"), {"relation": "visited"})
+    return bd
+
+
+async def request(reader, writer, method, path, headers=""):
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n{headers}\r\n".encode("latin-1"))
+    await writer.drain()
+    status = (await reader.readline()).decode("latin-1").split()[1]
+    response_headers = {}
+    while (line := await reader.readline()) != b"\r\n":
+        name, _, value = line.decode("latin-1").partition(":")
+        response_headers[name.lower()] = value.strip()
+    body = await reader.readexactly(int(response_headers["content-length"]))
+    return int(status), response_headers, body
+
+
+def test_keep_alive_and_routes(hg):
+    async def main():
+        async with AsyncHypergraphServer(hg, port=0) as server:
+            assert server.ready.is_set()
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            # several requests on one connection
+            status, headers, body = await request(reader, writer, "GET", "/api/database/info")
+            assert status == 200
+            assert headers["connection"] == "keep-alive"
+            assert headers["access-control-allow-origin"] == "*"
+            assert json.loads(body) == {"name": "current_hypergraph", "vertices": 3, "edges": 2}
+            status, _, body = await request(reader, writer, "GET", "/api/graph?vertex_id=c")
+            assert set(json.loads(body)["vertices"]) == {"a", "b", "c"}
+            status, _, body = await request(reader, writer, "GET", "/api/vertices?search=par")
+            assert [v["id"] for v in json.loads(body)["data"]] == ["c"]
+            status, _, body = await request(reader, writer, "GET", "/")
+            assert b"<html" in body.lower()
+            assert (await request(reader, writer, "OPTIONS", "/api/graph"))[0] == 200
+            assert (await request(reader, writer, "GET", "/api/vertices?page=x"))[0] == 500
+            assert (await request(reader, writer, "DELETE", "/api/graph"))[0] == 405
+            status, headers, body = await request(reader, writer, "GET", "/missing", "Connection: close\r\n")
+            assert body == b"404 Not Found"
+            assert headers["connection"] == "close"
+            assert await reader.read() == b""
+            writer.close()
+        assert not server.ready.is_set()
+
+    asyncio.run(main())
+
+
+def test_stop_closes_idle_connections(hg):
+    async def main():
+        server = AsyncHypergraphServer(hg, port=0, keep_alive_timeout=60)
+        await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        await request(reader, writer, "GET", "/api/database/info")
+        await asyncio.wait_for(server.stop(), 5)
+        assert await reader.read() == b""
+        writer.close()
+        # the server can be started again
+        await server.start()
+        await server.stop()
+
+    asyncio.run(main())
+
+
+def test_idle_timeout_and_executor(hg):
+    executor = ThreadPoolExecutor(1)
+
+    async def main():
+        async with AsyncHypergraphServer(hg, port=0, executor=executor, keep_alive_timeout=0.1) as server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            await request(reader, writer, "GET", "/api/database/info")
+            assert await asyncio.wait_for(reader.read(), 5) == b""
+            writer.close()
+
+    asyncio.run(main())
+    # a given executor is used and left running
+    assert executor.submit(lambda: 1).result() == 1
+    executor.shutdown()
+
+
+def test_serve_forever(hg):
+    async def main():
+        server = AsyncHypergraphServer(hg, port=0)
+        task = asyncio.create_task(server.serve_forever())
+        await asyncio.wait_for(server.ready.wait(), 5)
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        assert (await request(reader, writer, "GET", "/api/database/info"))[0] == 200
+        writer.close()
+        await server.stop()
+        await asyncio.wait_for(task, 5)
+
+    asyncio.run(main())
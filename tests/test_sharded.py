@@ -0,0 +1,231 @@
+import random
+
+import pytest
+
+from hyperdb import HypergraphDB, ShardedHypergraphDB
+from hyperdb.sharded import primary_of, shard_of
+
+
+@pytest.fixture(params=[1, 3], ids=["1-shard", "3-shards"])
+def sg(request, tmp_path):
+    bd = ShardedHypergraphDB(storage_file=tmp_path / "sharded.hgdb", num_shards=request.param)
+    bd.add_v_batch(range(1, 10), ({"name": str(v)} for v in range(1, 10)))
+    bd.add_e_batch(
+        [(1, 2), (1, 3), (2, 3, 4), (3, 4, 1, 5), (6, 5, 4), (1, 5, 6), (7, 8)], [{"w": i} for i in range(7)]
+    )
+    return bd
+
+
+def reference():
+    hg = HypergraphDB(autoload=False)
+    hg.add_v_batch(range(1, 10), ({"name": str(v)} for v in range(1, 10)))
+    hg.add_e_batch(
+        [(1, 2), (1, 3), (2, 3, 4), (3, 4, 1, 5), (6, 5, 4), (1, 5, 6), (7, 8)], [{"w": i} for i in range(7)]
+    )
+    return hg
+
+
+def assert_same(sg, hg):
+    assert sg.all_v == set(hg.all_v) and sg.num_v == hg.num_v
+    assert sg.all_e == set(hg.all_e) and sg.num_e == hg.num_e
+    v_ids = list(hg.all_v)
+    assert [sg.v(v_id) for v_id in v_ids] == [hg.v(v_id) for v_id in v_ids]
+    assert [sg.e(e) for e in hg.all_e] == [hg.e(e) for e in hg.all_e]
+    assert sg.degree_v_many(v_ids) == hg.degree_v_many(v_ids)
+    assert sg.nbr_v_many(v_ids) == hg.nbr_v_many(v_ids)
+    assert sg.nbr_e_of_v_many(v_ids) == hg.nbr_e_of_v_many(v_ids)
+
+
+def assert_placement(sg):
+    # every shard holds the hyperedges of the vertices it owns, the data only on the primary
+    for index, local in enumerate(sg._shards):
+        shard = local._shard
+        for v_id in shard.hg.all_v:
+            assert (shard_of(v_id, sg.num_shards) == index) != (v_id in shard._ghosts)
+            assert v_id not in shard._ghosts or shard.hg.degree_v(v_id) > 0
+        for e_key in shard.hg.all_e:
+            assert index in {shard_of(v_id, sg.num_shards) for v_id in e_key}
+            assert (primary_of(e_key, sg.num_shards) == index) == (e_key in shard._primary)
+            if e_key not in shard._primary:
+                assert shard.hg.e(e_key) == {}
+
+
+def test_sharded_queries(sg):
+    hg = reference()
+    assert_same(sg, hg)
+    assert_placement(sg)
+    assert sg.v(10) is None and sg.v(10, {}) == {}
+    assert sg.e((1, 2)) == {"w": 0} and sg.e((2, 1)) == {"w": 0} and sg.e((1, 4)) is None
+    assert sg.has_v(9) and not sg.has_v(10)
+    assert sg.has_e((4, 3, 2)) and not sg.has_e((1, 4)) and not sg.has_e((1, 10))
+    assert sg.encode_e([3, 1]) == (1, 3)
+    assert sg.degree_v(1) == 4 and sg.degree_e((3, 4, 1, 5)) == 4
+    assert sg.nbr_v(1) == {2, 3, 4, 5, 6} and sg.nbr_v(9) == set()
+    assert sg.nbr_v(1, exclude_self=False) == {1, 2, 3, 4, 5, 6}
+    assert set(sg.iter_nbr_v(7)) == {8}
+    assert sg.nbr_v_of_e((5, 6, 4)) == {4, 5, 6} and sg.nbr_v_of_e((5, 6, 4), copy=False) == (4, 5, 6)
+    assert dict(sg.bfs(2, max_depth=1)) == dict(hg.bfs(2, max_depth=1))
+    assert dict(sg.bfs(2)) == dict(hg.bfs(2))
+    for query in (sg.degree_v, sg.nbr_v, sg.nbr_e_of_v, sg.bfs, sg.remove_v):
+        with pytest.raises(AssertionError):
+            query(10)
+    for query in (sg.degree_e, sg.nbr_v_of_e, sg.remove_e, sg.encode_e, sg.e):
+        with pytest.raises(AssertionError):
+            query((1, 10))
+    with pytest.raises(AssertionError):
+        sg.degree_e((1, 4))
+    with pytest.raises(AssertionError):
+        sg.add_e((1, 10))
+    with pytest.raises(AssertionError):
+        sg.update_e((1, 4), {})
+    with pytest.raises(AssertionError):
+        sg.update_v(10, {})
+
+
+def test_sharded_updates(sg):
+    hg = reference()
+    version = sg.version
+    for g in (sg, hg):
+        g.add_v(10, {"name": "10"})
+        g.add_v(1, {"seen": True})
+        g.add_e((10, 9, 1), {"w": 7})
+        g.add_e((1, 2), {"x": 1})
+        g.update_v(2, {"name": "two"})
+        g.update_e((4, 5, 6), {"w": -1})
+        g.remove_e((7, 8))
+    assert sg.version > version
+    assert_same(sg, hg)
+    assert_placement(sg)
+    # (1, 5, 6) shrinks to (5, 6) and (3, 4, 1, 5) to (3, 4, 5); (1, 2) and (1, 3) are removed, and (1, 9, 10)
+    # shrinks to (9, 10)
+    for g in (sg, hg):
+        g.remove_v(1)
+    assert_same(sg, hg)
+    assert_placement(sg)
+    assert sg.e((9, 10)) == {"w": 7}
+    # (4, 5, 6) shrinks onto the existing (4, 5) and overwrites its data, (5, 6) is removed
+    for g in (sg, hg):
+        g.add_e((4, 5), {"w": "old"})
+        g.remove_v(6)
+    assert_same(sg, hg)
+    assert sg.e((4, 5)) == {"w": -1} and not sg.has_e((5, 6))
+    assert_placement(sg)
+
+
+@pytest.mark.parametrize(
+    "merge",
+    [
+        "overwrite",
+        "keep",
+        "update",
+        lambda existing, data: {"w": (existing["w"], data["w"])},
+        lambda existing, data: (existing.update(w=(existing["w"], data["w"])), existing)[1],
+    ],
+)
+def test_sharded_remove_v_merge(sg, merge):
+    hg = reference()
+    for g in (sg, hg):
+        g.add_e((4, 5), {"w": "old", "x": 1})
+        g.add_v(10)
+        g.add_e((4, 5, 10), {"w": 10})
+        g.add_e((1, 3, 10), {"w": 11})
+        # (4, 5, 6) and then (4, 5, 10) shrink onto (4, 5), while (1, 5, 6) and (1, 3, 10) shrink once to a
+        # single vertex and are removed with (1, 2) and (1, 3)
+        g.remove_v_batch(iter([6, 1, 10, 6]), merge=merge)
+    assert_same(sg, hg)
+    assert_placement(sg)
+    assert not sg.has_v(10) and sg.e((3, 4, 5)) == {"w": 3}
+    with pytest.raises(AssertionError):
+        sg.remove_v(4, merge="merge")
+    with pytest.raises(AssertionError):
+        sg.remove_v_batch([4, 10])
+    assert sg.has_v(4)
+
+
+def test_sharded_equal_ids(tmp_path):
+    sg = ShardedHypergraphDB(storage_file=tmp_path / "sharded.hgdb", num_shards=4)
+    hg = HypergraphDB(autoload=False)
+    # equal ids of different types, and equal tuples that pickle differently, are placed on the same shard
+    x, y = "".join(["a", "b"]), "".join(["a", "b"])
+    assert all(shard_of(i, 4) == shard_of(float(i), 4) for i in range(50))
+    assert shard_of(1, 4) == shard_of(True, 4) and shard_of((x, x), 4) == shard_of((x, y), 4)
+    for g in (sg, hg):
+        g.add_v_batch(range(20), ({"i": i} for i in range(20)))
+        g.add_v((x, x), {"k": 1})
+        g.add_v(2.0, {"float": True})
+        g.add_v(("c", "d"))
+        g.add_e((1.0, 3), {"w": 1})
+        g.add_e(((x, y), ("c", "d")), {"w": 2})
+    assert_same(sg, hg)
+    assert_placement(sg)
+    assert sg.num_v == 22 and sg.has_v(2) and sg.has_v(True) and sg.v((x, y)) == {"k": 1}
+    assert (
+        sg.v(2) == {"i": 2, "float": True} and sg.e((True, 3.0)) == {"w": 1} and sg.e([(y, x), ("c", "d")]) == {"w": 2}
+    )
+
+
+def test_sharded_random(tmp_path):
+    random.seed(3)
+    sg = ShardedHypergraphDB(storage_file=tmp_path / "sharded.hgdb", num_shards=4)
+    hg = HypergraphDB(autoload=False)
+    for g in (sg, hg):
+        g.add_v_batch(range(40), ({"i": i} for i in range(40)))
+    for step in range(300):
+        op = random.random()
+        v_ids = sorted(hg.all_v)
+        if op < 0.5 and len(v_ids) >= 2:
+            e = tuple(random.sample(v_ids, random.randint(2, min(4, len(v_ids)))))
+            for g in (sg, hg):
+                g.add_e(e, {"step": step})
+        elif op < 0.7 and hg.num_e:
+            e = random.choice(sorted(hg.all_e))
+            for g in (sg, hg):
+                g.remove_e(e)
+        elif op < 0.8 and v_ids:
+            v_id = random.choice(v_ids)
+            for g in (sg, hg):
+                g.remove_v(v_id)
+        else:
+            v_id = random.randrange(60)
+            for g in (sg, hg):
+                g.add_v(v_id, {"step": step})
+    assert_same(sg, hg)
+    assert_placement(sg)
+
+
+def test_sharded_save_load(sg, tmp_path):
+    storage_file = tmp_path / "copy.hgdb"
+    assert sg.save(storage_file)
+    sg.update_v(1, {"name": "changed"})
+    copy = ShardedHypergraphDB(storage_file=storage_file, num_shards=sg.num_shards)
+    assert_same(copy, reference())
+    assert_placement(copy)
+    assert sg.load(storage_file)
+    assert sg.v(1) == {"name": "1"}
+    assert not sg.load(tmp_path / "missing.hgdb")
+
+
+def test_sharded_processes(tmp_path):
+    with ShardedHypergraphDB(storage_file=tmp_path / "sharded.hgdb", num_shards=3, processes=True) as sg:
+        hg = reference()
+        sg.add_v_batch(range(1, 10), ({"name": str(v)} for v in range(1, 10)))
+        sg.add_e_batch(
+            [(1, 2), (1, 3), (2, 3, 4), (3, 4, 1, 5), (6, 5, 4), (1, 5, 6), (7, 8)], [{"w": i} for i in range(7)]
+        )
+        assert_same(sg, hg)
+        # data dicts come back as copies
+        sg.v(1)["name"] = "changed"
+        assert sg.v(1) == {"name": "1"}
+        for g in (sg, hg):
+            # (4, 5, 6) shrinks onto (5, 6), whose data the merge changes in place in the shard process
+            g.add_e((5, 6), {"n": 1})
+            g.remove_v(4, merge=lambda existing, data: (existing.update(n=existing["n"] + 5), existing)[1])
+            g.update_e((1, 2), {"x": 1})
+        assert_same(sg, hg)
+        assert sg.e((5, 6)) == {"n": 6}
+        # errors raised in a shard process are raised by the call
+        with pytest.raises(AssertionError):
+            sg.update_v(10, {})
+        assert sg.degree_v(1) == hg.degree_v(1)
+    with pytest.raises(AssertionError):
+        sg.num_v
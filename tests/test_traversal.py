@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from hyperdb import HypergraphDB
+from hyperdb.traversal import UnionFind
+
+
+def stores(hg):
+    return [hg, hg.freeze()]
+
+
+def test_bfs(hg):
+    for g in stores(hg):
+        assert list(g.bfs(9)) == [(9, 0)]
+        depths = dict(g.bfs(2))
+        assert depths == {2: 0, 1: 1, 3: 1, 4: 1, 5: 2, 6: 2}
+        assert [depth for _, depth in g.bfs(2)] == sorted(depths.values())
+        assert dict(g.bfs(2, max_depth=1)) == {2: 0, 1: 1, 3: 1, 4: 1}
+        assert dict(g.bfs(2, max_depth=0)) == {2: 0}
+        assert dict(g.bfs(7)) == {7: 0, 8: 1}
+        with pytest.raises(AssertionError):
+            g.bfs(10)
+
+
+def test_shortest_path(hg):
+    for g in stores(hg):
+        assert g.shortest_path(2, 2) == [2]
+        assert g.shortest_path(1, 2) == [1, (1, 2), 2]
+        path = g.shortest_path(2, 6)
+        assert len(path) == 5 and path[0] == 2 and path[-1] == 6
+        for i in range(1, len(path), 2):
+            assert {path[i - 1], path[i + 1]} <= set(path[i])
+            assert g.has_e(path[i])
+        assert g.shortest_path(2, 7) is None
+        assert g.shortest_path(9, 1) is None
+        with pytest.raises(AssertionError):
+            g.shortest_path(1, 10)
+
+
+def test_components(hg):
+    for g in stores(hg):
+        components = sorted(map(sorted, g.connected_components()))
+        assert components == [[1, 2, 3, 4, 5, 6], [7, 8], [9]]
+        e_components = list(g.s_connected_components())
+        assert sorted(map(len, e_components)) == [6]
+        assert sorted(map(len, g.s_connected_components(return_singletons=True))) == [1, 6]
+        # all hyperedges but (1, 2) share two vertices with (1, 3, 4, 5), no two share three
+        two = list(g.s_connected_components(2))
+        expected = {g.encode_e(e) for e in [(1, 3), (2, 3, 4), (1, 3, 4, 5), (4, 5, 6), (1, 5, 6)]}
+        assert len(two) == 1 and two[0] == expected
+        assert list(g.s_connected_components(3)) == []
+        assert len(list(g.s_connected_components(3, return_singletons=True))) == 4
+        with pytest.raises(AssertionError):
+            list(g.s_connected_components(0))
+
+
+def test_random_traversals():
+    random.seed(1)
+    for intern_v in (False, True):
+        hg = HypergraphDB(intern_v=intern_v)
+        hg.add_v_batch(range(300))
+        hg.add_e_batch(tuple(random.sample(range(300), random.randint(1, 4))) for _ in range(150))
+        for g in stores(hg):
+            # breadth-first search and components by repeated neighbor queries
+            seen, expected = set(), []
+            for v in range(300):
+                if v in seen:
+                    continue
+                depths, frontier, depth = {v: 0}, [v], 0
+                while frontier:
+                    depth, next_frontier = depth + 1, []
+                    for w in frontier:
+                        for u in g.nbr_v(w):
+                            if u not in depths:
+                                depths[u] = depth
+                                next_frontier.append(u)
+                    frontier = next_frontier
+                seen |= depths.keys()
+                expected.append(frozenset(depths))
+                assert dict(g.bfs(v)) == depths
+            assert set(map(frozenset, g.connected_components())) == set(expected)
+            for _ in range(30):
+                src, dst = random.sample(range(300), 2)
+                path = g.shortest_path(src, dst)
+                depths = dict(g.bfs(src))
+                if dst not in depths:
+                    assert path is None
+                    continue
+                assert len(path) == 2 * depths[dst] + 1
+                for i in range(1, len(path), 2):
+                    assert {path[i - 1], path[i + 1]} <= set(path[i])
+            for s in (1, 2):
+                edges = [e for e in g.all_e if len(e) >= s]
+                sets = UnionFind()
+                for a in edges:
+                    for b in edges:
+                        if len(set(a) & set(b)) >= s:
+                            sets.union((a, b))
+                groups = {}
+                for e in edges:
+                    groups.setdefault(sets.find(e), set()).add(e)
+                components = list(g.s_connected_components(s, return_singletons=True))
+                assert sorted(map(sorted, components)) == sorted(map(sorted, groups.values()))
+
+
+def test_union_find():
+    sets = UnionFind()
+    sets.union([1, 2, 3])
+    sets.union([4, 5])
+    sets.union([])
+    assert sets.find(3) == sets.find(1) != sets.find(4)
+    sets.union([5, 2])
+    assert len({sets.find(x) for x in range(1, 6)}) == 1
+    assert sets.find(6) == 6
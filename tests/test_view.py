@@ -0,0 +1,111 @@
+import pytest
+
+from hyperdb import HypergraphDB, HypergraphView
+
+
+def edges(g):
+    return {frozenset(e) for e in g.all_e}
+
+
+def test_subgraph(hg):
+    view = hg.subgraph([1, 2, 3, 4, 9])
+    assert isinstance(view, HypergraphView)
+    assert set(view.all_v) == {1, 2, 3, 4, 9}
+    assert edges(view) == {frozenset(e) for e in [(1, 2), (1, 3), (2, 3, 4)]}
+    assert view.num_v == 5 and view.num_e == 3
+    assert view.has_v(4) and not view.has_v(5) and 5 not in view.all_v
+    assert view.has_e((2, 3, 4)) and not view.has_e((1, 3, 4, 5)) and not view.has_e((4, 5, 6))
+    assert (1, 2) in view.all_e or (2, 1) in view.all_e
+    assert view.v(1) is hg.v(1) and view.v(5) is None and view.v(5, {}) == {}
+    assert view.e((1, 2)) is hg.e((1, 2)) and view.e((1, 4)) is None
+    assert view.degree_v(1) == 2 and hg.degree_v(1) == 4
+    assert view.degree_e((2, 3, 4)) == 3
+    assert view.nbr_v(1) == {2, 3} and view.nbr_v(1, exclude_self=False) == {1, 2, 3}
+    assert view.nbr_v(9) == set()
+    assert {frozenset(e) for e in view.nbr_e_of_v(4)} == {frozenset((2, 3, 4))}
+    assert view.nbr_v_of_e((3, 2, 4)) == {2, 3, 4}
+    assert view.degree_v_many([1, 4, 9]) == [2, 1, 0]
+    assert view.nbr_v_many([1, 9]) == [{2, 3}, set()]
+    assert [len(e) for e in view.nbr_e_of_v_many([3])] == [2]
+    for query in (view.degree_v, view.nbr_v, view.nbr_e_of_v):
+        with pytest.raises(AssertionError):
+            query(5)
+    with pytest.raises(AssertionError):
+        view.degree_e((4, 5, 6))
+    # base API sub() is the induced view
+    assert set(hg.sub([7, 8]).all_e) == {hg.encode_e((7, 8))}
+
+
+def test_edge_subgraph(hg):
+    view = hg.edge_subgraph([(1, 2), (4, 5, 6)])
+    assert set(view.all_v) == {1, 2, 4, 5, 6}
+    assert edges(view) == {frozenset((1, 2)), frozenset((4, 5, 6))}
+    # (1, 5, 6) has all its vertices in the view but was not picked
+    assert not view.has_e((1, 5, 6))
+    assert view.nbr_v(5) == {4, 6}
+    assert view.subgraph([4, 5, 6, 1]).num_e == 1
+    assert view.edge_subgraph([(6, 4, 5)]).num_v == 3
+    with pytest.raises(AssertionError):
+        hg.edge_subgraph([(1, 9)])
+    with pytest.raises(AssertionError):
+        view.edge_subgraph([(1, 5, 6)])
+
+
+def test_view_follows_updates(hg):
+    view = hg.subgraph([1, 2, 3, 4])
+    version = view.version
+    hg.update_v(1, {"seen": True})
+    assert view.v(1)["seen"] and view.version > version
+    hg.add_e((1, 4))
+    assert view.has_e((1, 4)) and view.num_e == 4
+    hg.remove_e((1, 2))
+    assert not view.has_e((1, 2)) and view.nbr_v(2) == {3, 4}
+    hg.remove_v(4)
+    assert set(view.all_v) == {1, 2, 3} and not view.has_v(4)
+    # (2, 3, 4) shrank to (2, 3) and is still between vertices of the view
+    assert edges(view) == {frozenset((1, 3)), frozenset((2, 3))}
+    # an interned hypergraph stores a new vertex under the freed key of 4, which does not join the view
+    hg.add_v(10)
+    hg.add_e((1, 10))
+    assert set(view.all_v) == {1, 2, 3} and not view.has_v(10) and view.num_v == 3
+    assert edges(view) == {frozenset((1, 3)), frozenset((2, 3))} and view.degree_v(1) == 1
+
+    e_view = hg.edge_subgraph([(1, 3), (7, 8)])
+    hg.remove_e((7, 8))
+    assert edges(e_view) == {frozenset((1, 3))}
+    # the freed edge id is reused by a new hyperedge, which does not join the edge view
+    hg.add_e((8, 9))
+    assert edges(e_view) == {frozenset((1, 3))} and e_view.num_e == 1
+
+
+def test_view_traversals(hg):
+    view = hg.subgraph([1, 2, 3, 4, 5, 6, 9])
+    frozen = view.materialize().freeze()
+    for g in (view, frozen):
+        assert dict(g.bfs(2, max_depth=1)) == {2: 0, 1: 1, 3: 1, 4: 1}
+        assert len(g.shortest_path(2, 6)) == 5
+        assert g.shortest_path(2, 9) is None
+        assert sorted(map(sorted, g.connected_components())) == [[1, 2, 3, 4, 5, 6], [9]]
+        assert len(list(g.s_connected_components(2))) == 1
+    hop = view.subgraph([1, 2, 3]).k_hop(1, 2)
+    assert set(hop.all_v) == {1, 2, 3} and hop.num_e == 2
+    only = view.k_hop(2, 1, edge_filter=lambda e_tuple, e_data: len(e_tuple) == 2)
+    assert {frozenset(e) for e in only.all_e} == {frozenset((1, 2))}
+    assert view.freeze().num_e == view.num_e == 6
+
+
+def test_materialize(hg, tmp_path):
+    storage_file = tmp_path / "copy.hgdb"
+    hg.save(storage_file)
+    view = hg.edge_subgraph([(1, 2), (2, 3, 4)])
+    copy = view.materialize(storage_file)
+    assert isinstance(copy, HypergraphDB) and copy.intern_v == hg.intern_v
+    assert set(copy.all_v) == {1, 2, 3, 4}
+    assert edges(copy) == edges(view)
+    assert copy.v(1) == hg.v(1) and copy.v(1) is not hg.v(1)
+    copy.update_v(1, {"copied": True})
+    assert "copied" not in hg.v(1)
+    copy.add_e((1, 3))
+    assert not view.has_e((1, 3))
+    with pytest.raises(AssertionError):
+        HypergraphDB(storage_file=tmp_path / "wal.hgdb", wal=True, autoload=False)